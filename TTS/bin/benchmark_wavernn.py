@@ -0,0 +1,77 @@
+"""Benchmark the WaveRNN inference paths and report the generated samples per second."""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+import torch
+
+from TTS.config import load_config
+from TTS.vocoder.configs import WavernnConfig
+from TTS.vocoder.models.wavernn import Wavernn
+
+
+def benchmark(name, fn, num_samples, num_runs):
+    fn()  # warmup, it also compiles the TorchScript loop
+    start = time.time()
+    for _ in range(num_runs):
+        fn()
+    duration = (time.time() - start) / num_runs
+    print(f" > {name}: {duration:.3f} sec - {num_samples / duration:.1f} samples/sec")
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Benchmark `Wavernn.inference()` against `Wavernn.inference_fast()` on random spectrograms.
+    A randomly initialized model is used if no checkpoint is given.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_wavernn.py
+    python TTS/bin/benchmark_wavernn.py --config_path config.json --model_path best_model.pth --num_inputs 8
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--config_path", type=str, help="Path to the WaveRNN config file.", default=None)
+    parser.add_argument("--model_path", type=str, help="Path to the WaveRNN checkpoint.", default=None)
+    parser.add_argument("--num_inputs", type=int, help="Number of spectrograms.", default=4)
+    parser.add_argument("--num_frames", type=int, help="Number of frames of each spectrogram.", default=100)
+    parser.add_argument("--num_runs", type=int, help="Number of timed runs of each path.", default=1)
+    parser.add_argument("--use_cuda", action="store_true", help="Run the model on the GPU.")
+    args = parser.parse_args()
+
+    config = load_config(args.config_path) if args.config_path else WavernnConfig()
+    model = Wavernn(config)
+    if args.model_path:
+        model.load_checkpoint(config, args.model_path, eval=True)
+    model.eval()
+    if args.use_cuda:
+        model.cuda()
+
+    mels = [torch.rand(model.args.feat_dims, args.num_frames) for _ in range(args.num_inputs)]
+    num_samples = args.num_inputs * (args.num_frames - 1) * config.audio.hop_length
+    print(
+        f" > {args.num_inputs} inputs of {args.num_frames} frames - batched: {config.batched} - "
+        f"target: {config.target_samples} - overlap: {config.overlap_samples}"
+    )
+
+    def run_current():
+        for mel in mels:
+            model.inference(mel, config.batched, config.target_samples, config.overlap_samples)
+        print()
+
+    current = benchmark("inference", run_current, num_samples, args.num_runs)
+    single = benchmark(
+        "inference_fast - one input at a time",
+        lambda: [model.inference_fast(mel) for mel in mels],
+        num_samples,
+        args.num_runs,
+    )
+    batch = benchmark(
+        "inference_fast - all inputs in a batch", lambda: model.inference_fast(mels), num_samples, args.num_runs
+    )
+    print(f" > Speed up: {current / single:.2f}x one input at a time - {current / batch:.2f}x in a batch")
+
+
+if __name__ == "__main__":
+    main()
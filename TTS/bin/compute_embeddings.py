@@ -1,4 +1,5 @@
 import argparse
+import json
 import os
 from argparse import RawTextHelpFormatter
 
@@ -6,6 +7,7 @@ from tqdm import tqdm
 
 from TTS.config import load_config
 from TTS.tts.datasets import load_tts_samples
+from TTS.tts.utils.embedding_store import EmbeddingStore
 from TTS.tts.utils.speakers import SpeakerManager
 
 parser = argparse.ArgumentParser(
@@ -13,6 +15,9 @@ parser = argparse.ArgumentParser(
     """
     Example runs:
     python TTS/bin/compute_embeddings.py speaker_encoder_model.pth.tar speaker_encoder_config.json  dataset_config.json embeddings_output_path/
+    python TTS/bin/compute_embeddings.py speaker_encoder_model.pth.tar speaker_encoder_config.json  dataset_config.json embeddings_output_path/ --batch_size 64 --num_workers 8
+
+    Computed embeddings are appended to `<output_file>.partial` and an interrupted run resumes from it.
     """,
     formatter_class=RawTextHelpFormatter,
 )
@@ -28,19 +33,25 @@ parser.add_argument(
     type=str,
     help="Path to dataset config file.",
 )
-parser.add_argument("output_path", type=str, help="path for output speakers.json and/or speakers.npy.")
+parser.add_argument(
+    "output_path",
+    type=str,
+    help="path for output speakers.json, or speakers.npy to save an `EmbeddingStore` loaded by memory-mapping.",
+)
 parser.add_argument(
     "--old_file", type=str, help="Previous speakers.json file, only compute for new audios.", default=None
 )
 parser.add_argument("--use_cuda", type=bool, help="flag to set cuda.", default=True)
 parser.add_argument("--eval", type=bool, help="compute eval.", default=True)
+parser.add_argument("--batch_size", type=int, help="Number of clips in an encoder batch.", default=32)
+parser.add_argument("--num_workers", type=int, help="Number of workers loading the clips.", default=0)
 
 args = parser.parse_args()
 
 c_dataset = load_config(args.config_dataset_path)
 
 meta_data_train, meta_data_eval = load_tts_samples(c_dataset.datasets, eval_split=args.eval)
-wav_files = meta_data_train + meta_data_eval
+wav_files = meta_data_train + (meta_data_eval or [])
 
 speaker_manager = SpeakerManager(
     encoder_model_path=args.model_path,
@@ -49,37 +60,75 @@ speaker_manager = SpeakerManager(
     use_cuda=args.use_cuda,
 )
 
-# compute speaker embeddings
-speaker_mapping = {}
-for idx, wav_file in enumerate(tqdm(wav_files)):
+if ".json" not in args.output_path and not args.output_path.endswith(".npy"):
+    mapping_file_path = os.path.join(args.output_path, "speakers.json")
+else:
+    mapping_file_path = args.output_path
+os.makedirs(os.path.dirname(mapping_file_path), exist_ok=True)
+
+# load the embeddings computed by an interrupted run
+partial_file_path = mapping_file_path + ".partial"
+computed_mapping = {}
+if os.path.exists(partial_file_path):
+    with open(partial_file_path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            # the last line of a killed run
+            break
+        computed_mapping[entry["clip"]] = {"name": entry["name"], "embedding": entry["embedding"]}
+    if len(computed_mapping) < len(lines):
+        with open(partial_file_path, "w", encoding="utf-8") as f:
+            f.writelines(lines[: len(computed_mapping)])
+    print(f" > Resuming with {len(computed_mapping)} embeddings from {partial_file_path}")
+
+# find the clips to compute
+clips = []
+new_wav_files = []
+new_speaker_names = []
+for wav_file in wav_files:
     if isinstance(wav_file, list):
         speaker_name = wav_file[2]
         wav_file = wav_file[1]
+    elif isinstance(wav_file, dict):
+        speaker_name = wav_file["speaker_name"]
+        wav_file = wav_file["audio_file"]
     else:
         speaker_name = None
 
     wav_file_name = os.path.basename(wav_file)
+    clips.append(wav_file_name)
+    if wav_file_name in computed_mapping:
+        continue
     if args.old_file is not None and wav_file_name in speaker_manager.clip_ids:
         # get the embedding from the old file
         embedd = speaker_manager.get_d_vector_by_clip(wav_file_name)
+        computed_mapping[wav_file_name] = {"name": speaker_name, "embedding": embedd}
     else:
-        # extract the embedding
-        embedd = speaker_manager.compute_d_vector_from_clip(wav_file)
+        new_wav_files.append(wav_file)
+        new_speaker_names.append(speaker_name)
+
+# compute speaker embeddings
+with open(partial_file_path, "a", encoding="utf-8") as partial_file:
+    d_vectors = speaker_manager.compute_d_vectors_from_clips(new_wav_files, args.batch_size, args.num_workers)
+    for idx, embedd in tqdm(d_vectors, total=len(new_wav_files)):
+        wav_file_name = os.path.basename(new_wav_files[idx])
+        speaker_name = new_speaker_names[idx]
+        computed_mapping[wav_file_name] = {"name": speaker_name, "embedding": embedd}
+        partial_file.write(json.dumps({"clip": wav_file_name, "name": speaker_name, "embedding": embedd}) + "\n")
+        partial_file.flush()
 
-    # create speaker_mapping if target dataset is defined
-    speaker_mapping[wav_file_name] = {}
-    speaker_mapping[wav_file_name]["name"] = speaker_name
-    speaker_mapping[wav_file_name]["embedding"] = embedd
+# create speaker_mapping in the dataset order
+speaker_mapping = {clip: computed_mapping[clip] for clip in clips}
 
 if speaker_mapping:
     # save speaker_mapping if target dataset is defined
-    if ".json" not in args.output_path:
-        mapping_file_path = os.path.join(args.output_path, "speakers.json")
+    if mapping_file_path.endswith(".npy"):
+        EmbeddingStore.from_dict(speaker_mapping).save(mapping_file_path)
     else:
-        mapping_file_path = args.output_path
-
-    os.makedirs(os.path.dirname(mapping_file_path), exist_ok=True)
-
-    # pylint: disable=W0212
-    speaker_manager._save_json(mapping_file_path, speaker_mapping)
+        # pylint: disable=W0212
+        speaker_manager._save_json(mapping_file_path, speaker_mapping)
     print("Speaker embeddings saved at:", mapping_file_path)
+os.remove(partial_file_path)
@@ -0,0 +1,49 @@
+"""Export a TTS or vocoder checkpoint with only the weights needed for inference."""
+import argparse
+import os
+from argparse import RawTextHelpFormatter
+
+from TTS.config import load_config
+from TTS.tts.models import setup_model as setup_tts_model
+from TTS.utils.io import save_inference_checkpoint
+from TTS.vocoder.models import setup_model as setup_vocoder_model
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Export a checkpoint to an inference checkpoint. Optimizer and scaler states are dropped, the
+    weight normalization is removed and the weights are saved in a format mapped into memory at loading. `Synthesizer`
+    and `tts` load the inference checkpoints like the training checkpoints, with the same config file.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/export_inference_checkpoint.py --model_path best_model.pth.tar --config_path config.json --output_path model_inference.pth
+    python TTS/bin/export_inference_checkpoint.py --model_path best_model.pth.tar --config_path config.json --output_path model_inference.pth --fp16
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--model_path", type=str, help="Path to the TTS or vocoder model checkpoint.", required=True)
+    parser.add_argument("--config_path", type=str, help="Path to the model config file.", required=True)
+    parser.add_argument("--output_path", type=str, help="Path of the inference checkpoint.", required=True)
+    parser.add_argument("--fp16", action="store_true", help="Save the weights in half precision.")
+    args = parser.parse_args()
+
+    config = load_config(args.config_path)
+    if type(config).__module__.startswith("TTS.vocoder"):
+        model = setup_vocoder_model(config)
+    else:
+        model = setup_tts_model(config)
+    model.load_checkpoint(config, args.model_path, eval=True)
+    if getattr(model, "model_d", None) is not None:
+        model.model_d = None
+    extra = {}
+    if hasattr(model, "decoder") and hasattr(model.decoder, "r"):
+        extra["r"] = model.decoder.r
+    save_inference_checkpoint(model, args.output_path, fp16=args.fp16, **extra)
+    input_size = os.path.getsize(args.model_path) / 1024**2
+    output_size = os.path.getsize(args.output_path) / 1024**2
+    print(f" > Inference checkpoint saved to {args.output_path}: {input_size:.1f} MB -> {output_size:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Export a TTS model or a GAN vocoder to a TorchScript or ONNX graph taking inputs of any length."""
+import argparse
+from argparse import RawTextHelpFormatter
+
+from TTS.config import load_config
+from TTS.tts.models import setup_model as setup_tts_model
+from TTS.utils.export import export_tts, export_vocoder
+from TTS.vocoder.models import setup_model as setup_vocoder_model
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Export the inference graph of a ForwardTTS (FastPitch, FastSpeech), GlowTTS or VITS model or a
+    GAN vocoder. `Synthesizer` runs the TorchScript graphs given by `tts_graph_path` and `vocoder_graph_path` with
+    `use_torchscript=True`.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/export_torchscript.py --model_path best_model.pth.tar --config_path config.json --output_path model.ts
+    python TTS/bin/export_torchscript.py --model_path best_model.pth.tar --config_path config.json --output_path model.onnx --onnx
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--model_path", type=str, help="Path to the TTS or vocoder model checkpoint.", required=True)
+    parser.add_argument("--config_path", type=str, help="Path to the model config file.", required=True)
+    parser.add_argument("--output_path", type=str, help="Path of the exported graph.", required=True)
+    parser.add_argument("--onnx", action="store_true", help="Export an ONNX graph. It needs the `onnx` package.")
+    args = parser.parse_args()
+
+    config = load_config(args.config_path)
+    if type(config).__module__.startswith("TTS.vocoder"):
+        model = setup_vocoder_model(config)
+        model.load_checkpoint(config, args.model_path, eval=True)
+        export_vocoder(model, config.audio["num_mels"], path=args.output_path, onnx=args.onnx)
+    else:
+        model = setup_tts_model(config)
+        model.load_checkpoint(config, args.model_path, eval=True)
+        export_tts(model, path=args.output_path, onnx=args.onnx)
+    print(f" > Graph saved to {args.output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Convert a per-sample phoneme cache to a packed phoneme cache"""
+import argparse
+import os
+from argparse import RawTextHelpFormatter
+
+import numpy as np
+from tqdm import tqdm
+
+from TTS.config import load_config
+from TTS.tts.datasets import load_tts_samples
+from TTS.tts.datasets.dataset import PackedPhonemeCache, get_tokenizer_hash
+from TTS.tts.utils.text.tokenizer import TTSTokenizer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""Convert the `<name>_phoneme.npy` files under `phoneme_cache_path` to a single packed phoneme
+    cache. Samples without a cache file are phonemized. Cache files are assumed to be computed with the tokenizer
+    defined by the given config.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/pack_phoneme_cache.py --config_path config.json
+    python TTS/bin/pack_phoneme_cache.py --config_path config.json --output_path phoneme_cache_packed/
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--config_path", type=str, help="Path to the model config file.", required=True)
+    parser.add_argument(
+        "--phoneme_cache_path",
+        type=str,
+        help="Path to the per-sample phoneme cache. Defaults to `phoneme_cache_path` in the config.",
+        default=None,
+    )
+    parser.add_argument(
+        "--output_path",
+        type=str,
+        help="Path to the packed phoneme cache. Defaults to the per-sample phoneme cache path.",
+        default=None,
+    )
+    parser.add_argument(
+        "--remove_old_files", action="store_true", help="Remove the per-sample cache files after packing."
+    )
+    args = parser.parse_args()
+
+    c = load_config(args.config_path)
+    phoneme_cache_path = args.phoneme_cache_path or c.phoneme_cache_path
+    output_path = args.output_path or phoneme_cache_path
+    if phoneme_cache_path is None:
+        raise ValueError(" [!] `phoneme_cache_path` is not defined.")
+
+    tokenizer, _ = TTSTokenizer.init_from_config(c)
+    train_samples, eval_samples = load_tts_samples(
+        c.datasets, eval_split=True, eval_split_max_size=c.eval_split_max_size, eval_split_size=c.eval_split_size
+    )
+    samples = train_samples + eval_samples
+
+    entries = []
+    old_files = []
+    num_computed = 0
+    for sample in tqdm(samples):
+        file_name = PackedPhonemeCache.get_key(sample["audio_file"])
+        cache_file = os.path.join(phoneme_cache_path, file_name + "_phoneme.npy")
+        if os.path.exists(cache_file):
+            token_ids = np.load(cache_file)
+            old_files.append(cache_file)
+        else:
+            token_ids = tokenizer.text_to_ids(sample["text"])
+            num_computed += 1
+        entries.append({"audio_file": sample["audio_file"], "text": sample["text"], "token_ids": token_ids})
+
+    cache = PackedPhonemeCache(output_path, get_tokenizer_hash(tokenizer))
+    cache.write(entries)
+    print(f" > Packed {len(entries)} samples to {output_path}. {num_computed} samples were phonemized.")
+
+    if args.remove_old_files:
+        for cache_file in old_files:
+            os.remove(cache_file)
+        print(f" > Removed {len(old_files)} per-sample cache files.")
+
+
+if __name__ == "__main__":
+    main()
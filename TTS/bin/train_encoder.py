@@ -7,8 +7,10 @@ import time
 import traceback
 
 import torch
+from torch.nn.parallel import DistributedDataParallel as DDP
 from torch.utils.data import DataLoader
 from trainer.torch import NoamLR
+from trainer.utils.distributed import init_distributed
 
 from TTS.speaker_encoder.dataset import SpeakerEncoderDataset
 from TTS.speaker_encoder.losses import AngleProtoLoss, GE2ELoss, SoftmaxAngleProtoLoss
@@ -20,6 +22,7 @@ from TTS.utils.audio import AudioProcessor
 from TTS.utils.generic_utils import count_parameters, remove_experiment_folder, set_init_dict
 from TTS.utils.io import load_fsspec
 from TTS.utils.radam import RAdam
+from TTS.utils.samplers import SpeakerBatchSampler
 from TTS.utils.training import check_update
 
 torch.backends.cudnn.enabled = True
@@ -42,27 +45,35 @@ def setup_loader(ap: AudioProcessor, is_val: bool = False, verbose: bool = False
             num_utter_per_speaker=c.num_utters_per_speaker,
             num_speakers_in_batch=c.num_speakers_in_batch,
             skip_speakers=c.skip_speakers,
-            storage_size=c.storage["storage_size"],
-            sample_from_storage_p=c.storage["sample_from_storage_p"],
+            cache_size_in_sec=c.storage.get("cache_size_in_sec", 0),
             verbose=verbose,
             augmentation_config=c.audio_augmentation,
         )
 
-        # sampler = DistributedSampler(dataset) if num_gpus > 1 else None
+        # plan the speaker batches, speakers are split among the processes in distributed training
+        batch_sampler = SpeakerBatchSampler(
+            dataset.get_speaker_ids(),
+            c.num_speakers_in_batch,
+            c.num_utters_per_speaker,
+            num_replicas=num_gpus if args.use_ddp else 1,
+            rank=args.rank,
+            seed=c.training_seed,
+        )
         loader = DataLoader(
             dataset,
-            batch_size=c.num_speakers_in_batch,
-            shuffle=False,
+            batch_sampler=batch_sampler,
             num_workers=c.num_loader_workers,
             collate_fn=dataset.collate_fn,
+            worker_init_fn=dataset.worker_init_fn,
+            pin_memory=use_cuda,
+            persistent_workers=c.num_loader_workers > 0,
         )
     return loader, dataset.get_num_speakers()
 
 
-def train(model, optimizer, scheduler, criterion, data_loader, global_step):
+def train(model, optimizer, scheduler, criterion, data_loader, global_step, best_loss=float("inf")):
     model.train()
     epoch_time = 0
-    best_loss = float("inf")
     avg_loss = 0
     avg_loss_all = 0
     avg_loader_time = 0
@@ -108,7 +119,7 @@ def train(model, optimizer, scheduler, criterion, data_loader, global_step):
         )
         current_lr = optimizer.param_groups[0]["lr"]
 
-        if global_step % c.steps_plot_stats == 0:
+        if global_step % c.steps_plot_stats == 0 and args.rank == 0:
             # Plot Training Epoch Stats
             train_stats = {
                 "loss": avg_loss,
@@ -124,7 +135,7 @@ def train(model, optimizer, scheduler, criterion, data_loader, global_step):
             }
             dashboard_logger.train_figures(global_step, figures)
 
-        if global_step % c.print_step == 0:
+        if global_step % c.print_step == 0 and args.rank == 0:
             print(
                 "   | > Step:{}  Loss:{:.5f}  AvgLoss:{:.5f}  GradNorm:{:.5f}  "
                 "StepTime:{:.2f}  LoaderTime:{:.2f}  AvGLoaderTime:{:.2f}  LR:{:.6f}".format(
@@ -136,14 +147,23 @@ def train(model, optimizer, scheduler, criterion, data_loader, global_step):
 
         if global_step >= c.max_train_step or global_step % c.save_step == 0:
             # save best model only
-            best_loss = save_best_model(model, optimizer, criterion, avg_loss, best_loss, OUT_PATH, global_step)
+            if args.rank == 0:
+                best_loss = save_best_model(
+                    model.module if args.use_ddp else model,
+                    optimizer,
+                    criterion,
+                    avg_loss,
+                    best_loss,
+                    OUT_PATH,
+                    global_step,
+                )
             avg_loss_all = 0
             if global_step >= c.max_train_step:
                 break
 
         end_time = time.time()
 
-    return avg_loss, global_step
+    return avg_loss, global_step, best_loss
 
 
 def main(args):  # pylint: disable=redefined-outer-name
@@ -151,6 +171,9 @@ def main(args):  # pylint: disable=redefined-outer-name
     global meta_data_train
     global meta_data_eval
 
+    if args.use_ddp:
+        init_distributed(args.rank, num_gpus, args.group_id, c.distributed_backend, c.distributed_url)
+
     ap = AudioProcessor(**c.audio)
     model = setup_speaker_encoder_model(c)
 
@@ -204,8 +227,13 @@ def main(args):  # pylint: disable=redefined-outer-name
         model = model.cuda()
         criterion.cuda()
 
+    if args.use_ddp:
+        model = DDP(model, device_ids=[args.rank % num_gpus])
+
     global_step = args.restore_step
-    _, global_step = train(model, optimizer, scheduler, criterion, data_loader, global_step)
+    best_loss = float("inf")
+    while global_step < c.max_train_step:
+        _, global_step, best_loss = train(model, optimizer, scheduler, criterion, data_loader, global_step, best_loss)
 
 
 if __name__ == "__main__":
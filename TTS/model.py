@@ -5,6 +5,8 @@ import torch
 from coqpit import Coqpit
 from torch import nn
 
+from TTS.utils.io import TORCH_MMAP, remove_weight_norm
+
 # pylint: skip-file
 
 
@@ -136,6 +138,30 @@ class BaseTrainerModel(ABC, nn.Module):
         """
         ...
 
+    def load_inference_state(self, config: Coqpit, state: Dict) -> None:
+        """Load the weights of a checkpoint saved by `TTS.utils.io.save_inference_checkpoint()` for inference.
+
+        The weights are assigned to the model instead of being copied, so the memory mapped weights are shared by
+        the processes loading the same checkpoint. With torch<2.1 they are copied. Override it to add the inference
+        setup of `load_checkpoint()` that is not saved in the weights.
+
+        Args:
+            config (Coqpit): Model configuration.
+            state (Dict): Checkpoint state returned by `TTS.utils.io.load_inference_state()`.
+        """
+        remove_weight_norm(self, state["model"])
+        current_state = self.state_dict()
+        model_state = {}
+        for key, value in state["model"].items():
+            if key in current_state and value.dtype != current_state[key].dtype:
+                value = value.to(current_state[key].dtype)
+            model_state[key] = value
+        if TORCH_MMAP:
+            self.load_state_dict(model_state, assign=True)
+        else:
+            self.load_state_dict(model_state)
+        self.eval()
+
     @staticmethod
     @abstractmethod
     def init_from_config(config: Coqpit, samples: List[Dict] = None, verbose=False) -> "BaseTrainerModel":
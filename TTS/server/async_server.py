@@ -0,0 +1,231 @@
+import asyncio
+import json
+import os
+import struct
+from http import HTTPStatus
+from typing import Dict, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from TTS.server.inference_pool import InferencePool, QueueFullError
+
+
+def streaming_wav_header(sample_rate: int, num_channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """Create a WAV header for a PCM stream of unknown length.
+
+    RIFF and data chunk sizes are set to the maximum value as the stream length is not known in advance. Most of the
+    players read the samples until the end of the stream.
+
+    Args:
+        sample_rate (int): sampling rate of the stream.
+        num_channels (int, optional): number of audio channels. Defaults to 1.
+        bits_per_sample (int, optional): bits per sample. Defaults to 16.
+
+    Returns:
+        bytes: 44 bytes WAV header.
+    """
+    block_align = num_channels * bits_per_sample // 8
+    byte_rate = sample_rate * block_align
+    max_size = 0xFFFFFFFF
+    return (
+        struct.pack("<4sI4s", b"RIFF", max_size, b"WAVE")
+        + struct.pack("<4sIHHIIHH", b"fmt ", 16, 1, num_channels, sample_rate, byte_rate, block_align, bits_per_sample)
+        + struct.pack("<4sI", b"data", max_size - 36)
+    )
+
+
+def style_wav_uri_to_dict(style_wav: str) -> Union[str, dict]:
+    """Transform an uri style_wav, in either a string (path to wav file to be use for style transfer)
+    or a dict (gst tokens/values to be use for styling)
+
+    Args:
+        style_wav (str): uri
+
+    Returns:
+        Union[str, dict]: path to file (str) or gst style (dict)
+    """
+    if style_wav:
+        if os.path.isfile(style_wav) and style_wav.endswith(".wav"):
+            return style_wav  # style_wav is a .wav file located on the server
+
+        style_wav = json.loads(style_wav)
+        return style_wav  # style_wav is a gst dictionary with {token1_id : token1_weigth, ...}
+    return None
+
+
+def http_response_head(status: HTTPStatus, headers: Dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"] + [f"{key}: {value}" for key, value in headers.items()]
+    return ("\r\n".join(lines + ["Connection: close", "", ""])).encode("latin-1")
+
+
+class AsyncTTSServer:
+    """Asyncio HTTP front end serving the requests with an `InferencePool`.
+
+    Connections are handled by the event loop and the synthesis runs in the pool workers, so a slow request does not
+    block the others. It serves:
+
+    - `GET /api/tts?text=...&speaker_id=...&style_wav=...&timeout=...`: WAV file of the whole text.
+    - `GET /api/tts-stream?...`: WAV stream with chunked transfer encoding, each sentence is sent when it is ready.
+    - `GET /health`: JSON with the number of in flight requests.
+
+    The requests get `429 Too Many Requests` when the pool queue is full and `504 Gateway Timeout` when they are not
+    done in time. A request is cancelled in the pool when its client disconnects or its timeout expires.
+
+    Voices can not be registered through this server. They are registered by another process with the same
+    `d_vector_cache_path`, e.g. the `/api/voices` endpoint of the Flask server, and the workers find them in the cache
+    file when they are first requested by `speaker_id`.
+
+    Args:
+        pool (InferencePool): Pool running the synthesis.
+        sample_rate (int): Output sampling rate of the synthesizer.
+        request_timeout (float): Largest request time in seconds. Requests can ask for a shorter one by the `timeout`
+            parameter. Defaults to 60.
+    """
+
+    def __init__(self, pool: InferencePool, sample_rate: int, request_timeout: float = 60.0):
+        self.pool = pool
+        self.sample_rate = sample_rate
+        self.request_timeout = request_timeout
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: HTTPStatus, body: bytes, content_type: str, **headers):
+        headers = {"Content-Type": content_type, "Content-Length": str(len(body)), **headers}
+        writer.write(http_response_head(status, headers) + body)
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: HTTPStatus, data: Dict, **headers):
+        await self._send(writer, status, json.dumps(data).encode("utf-8"), "application/json", **headers)
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str]]:
+        """Read the request head and return the method, the path and the query parameters."""
+        head = await reader.readuntil(b"\r\n\r\n")
+        method, target, _ = head.decode("latin-1").split("\r\n", 1)[0].split(" ", 2)
+        url = urlsplit(target)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        return method, url.path, params
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                method, path, params = await asyncio.wait_for(self._read_request(reader), timeout=10)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                await self._send_json(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request."})
+                return
+            if path == "/health":
+                await self._send_json(
+                    writer,
+                    HTTPStatus.OK,
+                    {
+                        "num_workers": self.pool.num_workers,
+                        "num_requests": self.pool.num_requests,
+                        "max_requests": self.pool.num_slots,
+                    },
+                )
+            elif path not in ("/api/tts", "/api/tts-stream"):
+                await self._send_json(writer, HTTPStatus.NOT_FOUND, {"error": f"{path} is not found."})
+            elif method != "GET":
+                await self._send_json(writer, HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Only GET is supported."})
+            elif not params.get("text"):
+                await self._send_json(writer, HTTPStatus.BAD_REQUEST, {"error": "`text` is required."})
+            else:
+                await self._tts(reader, writer, params, stream=path == "/api/tts-stream")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _tts(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, params: Dict, stream: bool):
+        try:
+            timeout = min(float(params.get("timeout", self.request_timeout)), self.request_timeout)
+            style_wav = style_wav_uri_to_dict(params.get("style_wav", ""))
+        except ValueError:
+            await self._send_json(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid `timeout` or `style_wav`."})
+            return
+        loop = asyncio.get_running_loop()
+        messages = asyncio.Queue()
+        try:
+            job = self.pool.submit(
+                params["text"],
+                lambda kind, payload: loop.call_soon_threadsafe(messages.put_nowait, (kind, payload)),
+                speaker_name=params.get("speaker_id", ""),
+                style_wav=style_wav,
+                stream=stream,
+                timeout=timeout,
+            )
+        except QueueFullError:
+            await self._send_json(
+                writer, HTTPStatus.TOO_MANY_REQUESTS, {"error": "Server is busy, retry later."}, **{"Retry-After": "1"}
+            )
+            return
+
+        # the client does not send anything after the request, so the read only returns at disconnect
+        disconnected = asyncio.ensure_future(reader.read(1))
+        deadline = loop.time() + timeout
+        streaming = False
+        finished = False
+        try:
+            while True:
+                message = asyncio.ensure_future(messages.get())
+                done, _ = await asyncio.wait(
+                    {message, disconnected}, timeout=deadline - loop.time(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if message not in done:
+                    message.cancel()
+                    if disconnected not in done and not streaming:
+                        await self._send_json(writer, HTTPStatus.GATEWAY_TIMEOUT, {"error": "Request timed out."})
+                    return
+                kind, payload = message.result()
+                finished = kind != "chunk"
+                if kind == "chunk":
+                    if not streaming:
+                        headers = {"Content-Type": "audio/wav", "Transfer-Encoding": "chunked"}
+                        writer.write(http_response_head(HTTPStatus.OK, headers))
+                        payload = streaming_wav_header(self.sample_rate) + payload
+                        streaming = True
+                    writer.write(f"{len(payload):x}\r\n".encode("latin-1") + payload + b"\r\n")
+                    await writer.drain()
+                elif kind == "done" and stream:
+                    writer.write(b"0\r\n\r\n")
+                    await writer.drain()
+                    return
+                elif kind == "done":
+                    await self._send(writer, HTTPStatus.OK, payload, "audio/wav")
+                    return
+                elif streaming:
+                    # the status is already sent, close the stream without the last chunk
+                    return
+                elif kind == "cancelled":
+                    await self._send_json(writer, HTTPStatus.GATEWAY_TIMEOUT, {"error": "Request timed out."})
+                    return
+                else:
+                    await self._send_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": payload})
+                    return
+        finally:
+            disconnected.cancel()
+            if not finished:
+                job.cancel()
+
+    async def serve(self, host: str, port: int):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f" > Serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+
+
+def run_async_server(
+    synthesizer,
+    host: str,
+    port: int,
+    num_workers: int,
+    max_queue_size: int = 16,
+    request_timeout: float = 60.0,
+):
+    """Fork the inference workers from the loaded `synthesizer` and serve the requests until interrupted."""
+    pool = InferencePool(synthesizer, num_workers=num_workers, max_queue_size=max_queue_size)
+    server = AsyncTTSServer(pool, synthesizer.output_sample_rate, request_timeout)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close()
@@ -0,0 +1,340 @@
+import io
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from typing import Callable, Deque, List, Set, Tuple, Union
+
+import torch
+
+
+class QueueFullError(Exception):
+    """Raised by `InferencePool.submit()` when all the request slots are in use."""
+
+
+class Job:
+    """Handle of a request submitted to an `InferencePool`.
+
+    Args:
+        pool (InferencePool): Pool running the request.
+        slot (int): Request slot in the pool.
+        callback (Callable): Called with the `kind` and the `payload` of each message of the request, from the pool
+            reader thread.
+    """
+
+    def __init__(self, pool: "InferencePool", slot: int, callback: Callable):
+        self.pool = pool
+        self.slot = slot
+        self.callback = callback
+        # set when the request ends and its slot is freed, guarded by `pool.lock`
+        self.finished = False
+
+    def cancel(self):
+        """Stop the request. A queued request is skipped and a running one stops after the current sentence.
+
+        It does nothing once the request has ended, since its slot may be used by a new request.
+        """
+        with self.pool.lock:
+            if not self.finished:
+                self.pool.cancelled[self.slot] = 1
+
+
+def _stopped(cancelled, slot: int, deadline: float) -> bool:
+    return bool(cancelled[slot]) or (deadline is not None and time.time() > deadline)
+
+
+def _run_worker(synthesizer, jobs, results, cancelled, num_threads: int):
+    """Serve the requests sent by the pool to an inference worker process.
+
+    Each request ends with a `done`, `cancelled` or `error` message. Streamed requests send a `chunk` message with
+    the int16 PCM bytes of each sentence before.
+    """
+    torch.set_num_threads(num_threads)
+    while True:
+        try:
+            job = jobs.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        slot, deadline, stream, kwargs = job
+        try:
+            if _stopped(cancelled, slot, deadline):
+                results.send(("cancelled", None))
+                continue
+            if stream:
+                chunks = synthesizer.tts_stream(**kwargs)
+            else:
+                chunks = synthesizer.tts_sentences(**kwargs)
+            wavs = []
+            for chunk in chunks:
+                if stream:
+                    results.send(("chunk", chunk.tobytes()))
+                else:
+                    wavs += list(chunk)
+                    wavs += [0] * synthesizer.sentence_pause_length
+                if _stopped(cancelled, slot, deadline):
+                    chunks.close()
+                    break
+            else:
+                if stream:
+                    results.send(("done", None))
+                else:
+                    out = io.BytesIO()
+                    synthesizer.save_wav(wavs, out)
+                    results.send(("done", out.getvalue()))
+                continue
+            results.send(("cancelled", None))
+        except Exception as e:  # pylint: disable=broad-except
+            results.send(("error", str(e)))
+
+
+class InferencePool:
+    """Run `Synthesizer` requests in worker processes sharing a single copy of the models.
+
+    The workers are forked after the models are loaded, so the model weights are shared with the parent process by
+    copy-on-write instead of being loaded by every worker. Requests are queued until a worker is free. At most
+    `num_workers + max_queue_size` requests are in flight and `submit()` raises `QueueFullError` beyond that.
+
+    Each request can have a deadline and can be cancelled. Workers check both before a request starts and between its
+    sentences, so an expired or cancelled request stops after the sentence in progress.
+
+    The queued requests are kept by the pool and sent to a worker when it is free. A worker that dies, e.g. killed by
+    the OOM killer, ends its running request with an `error` message and is replaced by a new worker forked from the
+    pool process, so the queued requests are not lost.
+
+    It needs the `fork` start method and the models on the CPU, since CUDA can not be used after fork. The
+    replacement workers are forked with the models too, which is only possible with `fork`.
+
+    Args:
+        synthesizer (Synthesizer): Synthesizer with the loaded models.
+        num_workers (int): Number of worker processes. Defaults to 2.
+        max_queue_size (int): Number of requests waiting for a free worker. Defaults to 16.
+        num_threads (int): Number of torch threads of each worker. Defaults to None, the CPU cores divided among the
+            workers.
+
+    Examples:
+        >>> pool = InferencePool(synthesizer, num_workers=4)
+        >>> wav_bytes = pool.tts("Hello world!", timeout=10)
+        >>> pool.close()
+    """
+
+    def __init__(self, synthesizer, num_workers: int = 2, max_queue_size: int = 16, num_threads: int = None):
+        if "fork" not in mp.get_all_start_methods():
+            raise ValueError(" [!] InferencePool needs the `fork` start method.")
+        if synthesizer.use_cuda:
+            raise ValueError(" [!] InferencePool workers can not use CUDA after fork.")
+        self.ctx = mp.get_context("fork")
+        self.synthesizer = synthesizer
+        self.num_workers = num_workers
+        self.max_queue_size = max_queue_size
+        self.num_slots = num_workers + max_queue_size
+        self.num_threads = num_threads if num_threads is not None else max(1, (os.cpu_count() or 1) // num_workers)
+        self.cancelled = self.ctx.Array("b", self.num_slots, lock=False)
+        self.free_slots = list(range(self.num_slots))
+        # requests waiting for a free worker
+        self.pending: Deque[Tuple[Job, Tuple]] = deque()
+        # worker processes, their job and result pipes and their running requests. Stopped workers are None.
+        self.workers: List[mp.Process] = [None] * num_workers
+        self.job_conns: List[Connection] = [None] * num_workers
+        self.result_conns: List[Connection] = [None] * num_workers
+        self.running: List[Job] = [None] * num_workers
+        self.stopping: Set[int] = set()
+        self.closing = False
+        self.lock = threading.Lock()
+        for idx in range(num_workers):
+            self._start_worker(idx)
+        self._reader = threading.Thread(target=self._read_results, daemon=True)
+        self._reader.start()
+
+    @property
+    def num_requests(self) -> int:
+        """Number of queued and running requests."""
+        return self.num_slots - len(self.free_slots)
+
+    def submit(
+        self,
+        text: str,
+        callback: Callable,
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav: Union[str, List[str]] = None,
+        style_wav=None,
+        stream: bool = False,
+        timeout: float = None,
+    ) -> Job:
+        """Queue a request.
+
+        Args:
+            text (str): input text.
+            callback (Callable): Called with `(kind, payload)` for each message of the request from the pool reader
+                thread. `kind` is `chunk` with the int16 PCM bytes of a sentence for streamed requests, then `done`
+                with the WAV file bytes (None if streamed), `cancelled` or `error` with the error message.
+            speaker_name (str, optional): speaker id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav. Defaults to None.
+            style_wav ([type], optional): style waveform for GST. Defaults to None.
+            stream (bool, optional): send the audio of each sentence as soon as it is synthesized. Defaults to False.
+            timeout (float, optional): time in seconds after which the request is cancelled. Defaults to None.
+
+        Raises:
+            QueueFullError: all the request slots are in use.
+
+        Returns:
+            Job: handle to cancel the request.
+        """
+        kwargs = {
+            "text": text,
+            "speaker_name": speaker_name,
+            "language_name": language_name,
+            "speaker_wav": speaker_wav,
+            "style_wav": style_wav,
+        }
+        deadline = time.time() + timeout if timeout is not None else None
+        with self.lock:
+            if not self.free_slots:
+                raise QueueFullError(f" [!] {self.num_slots} requests are already in flight.")
+            slot = self.free_slots.pop()
+            job = Job(self, slot, callback)
+            self.cancelled[slot] = 0
+            self.pending.append((job, (slot, deadline, stream, kwargs)))
+            self._dispatch()
+        return job
+
+    def tts(self, text: str, timeout: float = None, **kwargs) -> bytes:
+        """Blocking version of `submit()` returning the WAV file bytes.
+
+        Raises:
+            TimeoutError: the request is not done in `timeout` seconds.
+            RuntimeError: the request failed.
+        """
+        messages = queue.Queue()
+        self.submit(text, lambda kind, payload: messages.put((kind, payload)), timeout=timeout, **kwargs)
+        kind, payload = messages.get()
+        if kind == "cancelled":
+            raise TimeoutError(f" [!] Request is not done in {timeout} seconds.")
+        if kind == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def _start_worker(self, idx: int) -> None:
+        jobs, job_conn = self.ctx.Pipe(duplex=False)
+        result_conn, results = self.ctx.Pipe(duplex=False)
+        worker = self.ctx.Process(
+            target=_run_worker,
+            args=(self.synthesizer, jobs, results, self.cancelled, self.num_threads),
+            daemon=True,
+        )
+        worker.start()
+        # only the worker keeps its ends of the pipes, so they are closed when it dies
+        jobs.close()
+        results.close()
+        self.workers[idx] = worker
+        self.job_conns[idx] = job_conn
+        self.result_conns[idx] = result_conn
+
+    def _dispatch(self) -> None:
+        """Send the pending requests to the free workers, and stop the free workers once the pool is closing.
+
+        It must be called with `self.lock` held.
+        """
+        for idx, worker in enumerate(self.workers):
+            if worker is None or self.running[idx] is not None or idx in self.stopping:
+                continue
+            if not self.pending:
+                if not self.closing:
+                    break
+                job, request = None, None
+                self.stopping.add(idx)
+            else:
+                job, request = self.pending.popleft()
+            try:
+                self.job_conns[idx].send(request)
+            except OSError:
+                # the worker is dead and it is restarted by the reader thread
+                if job is not None:
+                    self.pending.appendleft((job, request))
+                continue
+            self.running[idx] = job
+
+    def _finish(self, idx: int) -> Job:
+        """Free the worker and the slot of the request running on a worker and send it the next request."""
+        with self.lock:
+            job = self.running[idx]
+            self.running[idx] = None
+            if job is not None:
+                # free the slot before the callback, so a new request can take it right away
+                job.finished = True
+                self.free_slots.append(job.slot)
+            self._dispatch()
+        return job
+
+    def _restart_worker(self, idx: int) -> None:
+        worker = self.workers[idx]
+        worker.join()
+        # results sent by the worker before it stopped
+        result_conn = self.result_conns[idx]
+        while result_conn.poll():
+            try:
+                self._handle_result(idx, result_conn.recv())
+            except EOFError:
+                break
+        result_conn.close()
+        self.job_conns[idx].close()
+        with self.lock:
+            self.stopping.discard(idx)
+            if self.closing:
+                self.workers[idx] = None
+            else:
+                print(f" > Inference worker {worker.pid} died with the exit code {worker.exitcode}, restarting it.")
+                self._start_worker(idx)
+        job = self._finish(idx)
+        if job is not None:
+            job.callback("error", f" [!] Inference worker died with the exit code {worker.exitcode}.")
+
+    def _handle_result(self, idx: int, message: Tuple) -> None:
+        kind, payload = message
+        if kind == "chunk":
+            job = self.running[idx]
+        else:
+            job = self._finish(idx)
+        job.callback(kind, payload)
+
+    def _read_results(self):
+        while True:
+            with self.lock:
+                workers = [idx for idx, worker in enumerate(self.workers) if worker is not None]
+                result_conns = {self.result_conns[idx]: idx for idx in workers}
+                sentinels = {self.workers[idx].sentinel: idx for idx in workers}
+            if not workers:
+                break
+            ready = wait(list(result_conns) + list(sentinels))
+            for conn in ready:
+                if conn in result_conns:
+                    try:
+                        self._handle_result(result_conns[conn], conn.recv())
+                    except EOFError:
+                        # the worker stopped, it is handled with its sentinel
+                        pass
+            for sentinel in ready:
+                if sentinel in sentinels:
+                    self._restart_worker(sentinels[sentinel])
+        # requests left when all the workers died while closing
+        with self.lock:
+            pending = list(self.pending)
+            self.pending.clear()
+            for job, _ in pending:
+                job.finished = True
+                self.free_slots.append(job.slot)
+        for job, _ in pending:
+            job.callback("error", " [!] InferencePool is closed.")
+
+    def close(self):
+        """Stop the workers after the queued requests are processed."""
+        with self.lock:
+            self.closing = True
+            self._dispatch()
+        self._reader.join()
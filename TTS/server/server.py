@@ -1,16 +1,17 @@
 #!flask/bin/python
 import argparse
 import io
-import json
 import os
 import sys
+import tempfile
 from pathlib import Path
-from typing import Union
 
-from flask import Flask, render_template, request, send_file
+from flask import Flask, Response, render_template, request, send_file, stream_with_context
 
 from TTS.config import load_config
+from TTS.server.async_server import run_async_server, streaming_wav_header, style_wav_uri_to_dict
 from TTS.utils.manage import ModelManager
+from TTS.utils.model_registry import ModelRegistry
 from TTS.utils.synthesizer import Synthesizer
 
 
@@ -51,6 +52,50 @@ def create_argparser():
     )
     parser.add_argument("--vocoder_config_path", type=str, help="Path to vocoder model config file.", default=None)
     parser.add_argument("--speakers_file_path", type=str, help="JSON file for multi-speaker model.", default=None)
+    parser.add_argument(
+        "--d_vector_cache_path",
+        type=str,
+        help="JSON file to persist the cached reference clip d_vectors and the registered voices.",
+        default=None,
+    )
+    parser.add_argument(
+        "--vocoder_latency_budget",
+        type=float,
+        help="Time budget in seconds of a vocoder pass to select the WaveGrad noise schedule.",
+        default=None,
+    )
+    parser.add_argument(
+        "--vocoder_chunk_size",
+        type=int,
+        help="Number of spectrogram frames vocoded at a time by GAN vocoders to stream the audio of long sentences.",
+        default=None,
+    )
+    parser.add_argument(
+        "--max_models_memory_in_mb",
+        type=float,
+        default=4096,
+        help="Memory budget of the models loaded by the `model_name` request parameter. Least recently used models "
+        "are unloaded beyond it.",
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=0,
+        help="Number of inference worker processes of the asyncio server. It serves the default model only. If 0, run "
+        "the Flask server instead.",
+    )
+    parser.add_argument(
+        "--max_queue_size",
+        type=int,
+        default=16,
+        help="Number of requests waiting for a worker. Requests beyond it get 429 Too Many Requests.",
+    )
+    parser.add_argument(
+        "--request_timeout",
+        type=float,
+        default=60.0,
+        help="Largest time in seconds a request of the asyncio server can take before it is cancelled.",
+    )
     parser.add_argument("--port", type=int, default=5002, help="port to listen on.")
     parser.add_argument("--use_cuda", type=convert_boolean, default=False, help="true to use CUDA.")
     parser.add_argument("--debug", type=convert_boolean, default=False, help="true to enable Flask debug mode.")
@@ -109,8 +154,22 @@ synthesizer = Synthesizer(
     encoder_checkpoint="",
     encoder_config="",
     use_cuda=args.use_cuda,
+    d_vector_cache_path=args.d_vector_cache_path,
+    vocoder_latency_budget=args.vocoder_latency_budget,
+    vocoder_chunk_size=args.vocoder_chunk_size,
 )
 
+# other models are loaded at their first request by the `model_name` parameter
+registry = ModelRegistry(
+    manager,
+    max_memory_in_mb=args.max_models_memory_in_mb,
+    use_cuda=args.use_cuda,
+    vocoder_latency_budget=args.vocoder_latency_budget,
+    vocoder_chunk_size=args.vocoder_chunk_size,
+)
+default_model_name = args.model_name if args.model_path is None else "custom"
+registry.add(default_model_name, synthesizer, pin=True)
+
 use_multi_speaker = hasattr(synthesizer.tts_model, "num_speakers") and synthesizer.tts_model.num_speakers > 1
 speaker_manager = getattr(synthesizer.tts_model, "speaker_manager", None)
 # TODO: set this from SpeakerManager
@@ -118,23 +177,17 @@ use_gst = synthesizer.tts_config.get("use_gst", False)
 app = Flask(__name__)
 
 
-def style_wav_uri_to_dict(style_wav: str) -> Union[str, dict]:
-    """Transform an uri style_wav, in either a string (path to wav file to be use for style transfer)
-    or a dict (gst tokens/values to be use for styling)
+def get_synthesizer() -> Synthesizer:
+    """Return the synthesizer of the `model_name` request parameter, the default model if it is not given."""
+    model_name = request.values.get("model_name")
+    if not model_name:
+        return synthesizer
+    return registry.get(model_name)
 
-    Args:
-        style_wav (str): uri
 
-    Returns:
-        Union[str, dict]: path to file (str) or gst style (dict)
-    """
-    if style_wav:
-        if os.path.isfile(style_wav) and style_wav.endswith(".wav"):
-            return style_wav  # style_wav is a .wav file located on the server
-
-        style_wav = json.loads(style_wav)
-        return style_wav  # style_wav is a gst dictionary with {token1_id : token1_weigth, ...}
-    return None
+@app.errorhandler(ValueError)
+def handle_value_error(e):
+    return {"error": str(e)}, 400
 
 
 @app.route("/")
@@ -173,14 +226,69 @@ def tts():
     style_wav = style_wav_uri_to_dict(style_wav)
     print(" > Model input: {}".format(text))
     print(" > Speaker Idx: {}".format(speaker_idx))
-    wavs = synthesizer.tts(text, speaker_name=speaker_idx, style_wav=style_wav)
+    model = get_synthesizer()
+    wavs = model.tts(text, speaker_name=speaker_idx, style_wav=style_wav)
     out = io.BytesIO()
-    synthesizer.save_wav(wavs, out)
+    model.save_wav(wavs, out)
     return send_file(out, mimetype="audio/wav")
 
 
+@app.route("/api/voices", methods=["POST"])
+def register_voice():
+    """Register a reference voice from the uploaded `wav` file. Pass the `voice_id` as `speaker_id` to use it."""
+    voice_id = request.form.get("voice_id")
+    wav_file = request.files.get("wav")
+    if not voice_id or wav_file is None:
+        return {"error": "`voice_id` and `wav` are required."}, 400
+    with tempfile.NamedTemporaryFile(suffix=".wav") as f:
+        wav_file.save(f.name)
+        try:
+            get_synthesizer().register_voice(voice_id, f.name)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+    print(" > Registered voice: {}".format(voice_id))
+    return {"voice_id": voice_id}
+
+
+@app.route("/api/tts-stream", methods=["GET"])
+def tts_stream():
+    """Stream the WAV output with chunked transfer encoding. The header is sent first and the samples of each sentence
+    are sent as soon as it is synthesized."""
+    text = request.args.get("text")
+    speaker_idx = request.args.get("speaker_id", "")
+    style_wav = request.args.get("style_wav", "")
+    style_wav = style_wav_uri_to_dict(style_wav)
+    print(" > Model input: {}".format(text))
+    print(" > Speaker Idx: {}".format(speaker_idx))
+
+    model = get_synthesizer()
+
+    def generate():
+        yield streaming_wav_header(model.output_sample_rate)
+        for chunk in model.tts_stream(text, speaker_name=speaker_idx, style_wav=style_wav):
+            yield chunk.tobytes()
+
+    return Response(stream_with_context(generate()), mimetype="audio/wav")
+
+
+@app.route("/api/models", methods=["GET"])
+def models():
+    """List the loaded models from the least to the most recently used and their memory use."""
+    return {"loaded_models": registry.loaded_models, "memory_in_mb": registry.memory_in_mb}
+
+
 def main():
-    app.run(debug=args.debug, host="::", port=args.port)
+    if args.num_workers > 0:
+        run_async_server(
+            synthesizer,
+            host="::",
+            port=args.port,
+            num_workers=args.num_workers,
+            max_queue_size=args.max_queue_size,
+            request_timeout=args.request_timeout,
+        )
+    else:
+        app.run(debug=args.debug, host="::", port=args.port)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,13 @@
 import random
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
+import soundfile as sf
 import torch
 from torch.utils.data import Dataset
 
-from TTS.speaker_encoder.utils.generic_utils import AugmentWAV, Storage
+from TTS.speaker_encoder.utils.generic_utils import AugmentWAV
+from TTS.utils.shared_cache import SharedArrayCache
 
 
 class SpeakerEncoderDataset(Dataset):
@@ -14,22 +17,33 @@ class SpeakerEncoderDataset(Dataset):
         meta_data,
         voice_len=1.6,
         num_speakers_in_batch=64,
-        storage_size=1,
-        sample_from_storage_p=0.5,
         num_utter_per_speaker=10,
         skip_speakers=False,
+        cache_size_in_sec=0,
         verbose=False,
         augmentation_config=None,
     ):
-        """
+        """Dataset returning a random segment of an utterance and its speaker class id.
+
+        Batches of speakers are drawn by a `SpeakerBatchSampler`, see `get_speaker_ids()`. Each utterance is loaded,
+        cropped, augmented and transformed to a melspectrogram in `__getitem__()`, so the DataLoader workers process
+        the utterances in parallel. Loaded wavs are kept in a `SharedArrayCache` shared by all the workers.
+
+        Utterances shorter than `voice_len` are dropped by the duration in their file header. If an utterance is still
+        shorter after the silence trimming, another utterance of the speaker is drawn.
+
         Args:
             ap (TTS.tts.utils.AudioProcessor): audio processor object.
             meta_data (list): list of dataset instances.
-            seq_len (int): voice segment length in seconds.
+            voice_len (float): voice segment length in seconds.
+            num_speakers_in_batch (int): number of speakers in a batch.
+            num_utter_per_speaker (int): number of utterances of each speaker in a batch.
+            skip_speakers (bool): skip the speakers with less than `num_utter_per_speaker` utterances.
+            cache_size_in_sec (float): duration of the audio kept in the shared cache. If 0, wavs are not cached.
             verbose (bool): print diagnostic information.
+            augmentation_config (dict): audio augmentation parameters.
         """
         super().__init__()
-        self.items = meta_data
         self.sample_rate = ap.sample_rate
         self.seq_len = int(voice_len * self.sample_rate)
         self.num_speakers_in_batch = num_speakers_in_batch
@@ -37,20 +51,20 @@ class SpeakerEncoderDataset(Dataset):
         self.skip_speakers = skip_speakers
         self.ap = ap
         self.verbose = verbose
-        self.__parse_items()
-        storage_max_size = storage_size * num_speakers_in_batch
-        self.storage = Storage(
-            maxsize=storage_max_size, storage_batchs=storage_size, num_speakers_in_batch=num_speakers_in_batch
-        )
-        self.sample_from_storage_p = float(sample_from_storage_p)
+        self.__parse_items(meta_data)
 
         speakers_aux = list(self.speakers)
         speakers_aux.sort()
         self.speakerid_to_classid = {key: i for i, key in enumerate(speakers_aux)}
 
+        self.cache = None
+        if cache_size_in_sec:
+            self.cache = SharedArrayCache(len(self.items), int(cache_size_in_sec * self.sample_rate))
+
         # Augmentation
         self.augmentator = None
         self.gaussian_augmentation_config = None
+        self.data_augmentation_p = 0
         if augmentation_config:
             self.data_augmentation_p = augmentation_config["p"]
             if self.data_augmentation_p and ("additive" in augmentation_config or "rir" in augmentation_config):
@@ -62,8 +76,8 @@ class SpeakerEncoderDataset(Dataset):
         if self.verbose:
             print("\n > DataLoader initialization")
             print(f" | > Speakers per Batch: {num_speakers_in_batch}")
-            print(f" | > Storage Size: {storage_max_size} instances, each with {num_utter_per_speaker} utters")
-            print(f" | > Sample_from_storage_p : {self.sample_from_storage_p}")
+            print(f" | > Utterances per Speaker: {num_utter_per_speaker}")
+            print(f" | > Cache Size: {cache_size_in_sec} seconds")
             print(f" | > Number of instances : {len(self.items)}")
             print(f" | > Sequence length: {self.seq_len}")
             print(f" | > Num speakers: {len(self.speakers)}")
@@ -72,182 +86,101 @@ class SpeakerEncoderDataset(Dataset):
         audio = self.ap.load_wav(filename, sr=self.ap.sample_rate)
         return audio
 
-    def load_data(self, idx):
-        text, wav_file, speaker_name = self.items[idx]
-        wav = np.asarray(self.load_wav(wav_file), dtype=np.float32)
-        mel = self.ap.melspectrogram(wav).astype("float32")
-        # sample seq_len
-
-        assert text.size > 0, self.items[idx]["audio_file"]
-        assert wav.size > 0, self.items[idx]["audio_file"]
-
-        sample = {
-            "mel": mel,
-            "item_idx": self.items[idx]["audio_file"],
-            "speaker_name": speaker_name,
-        }
-        return sample
+    @staticmethod
+    def _probe_duration(audio_file: str) -> float:
+        """Return the duration of an audio file in seconds by reading its header, or None if it is not supported."""
+        try:
+            return sf.info(audio_file).duration
+        except RuntimeError:
+            return None
+
+    def __parse_items(self, meta_data):
+        with ThreadPoolExecutor() as executor:
+            durations = list(executor.map(self._probe_duration, [i["audio_file"] for i in meta_data]))
+        voice_len = self.seq_len / self.sample_rate
+        num_items = len(meta_data)
+        meta_data = [i for i, duration in zip(meta_data, durations) if duration is None or duration >= voice_len]
+        if self.verbose:
+            print(f" | > {num_items - len(meta_data)} utterances shorter than {voice_len} seconds are dropped.")
 
-    def __parse_items(self):
         self.speaker_to_utters = {}
-        for i in self.items:
-            path_ = i["audio_file"]
-            speaker_ = i["speaker_name"]
-            if speaker_ in self.speaker_to_utters.keys():
-                self.speaker_to_utters[speaker_].append(path_)
-            else:
-                self.speaker_to_utters[speaker_] = [
-                    path_,
-                ]
-
-        if self.skip_speakers:
-            self.speaker_to_utters = {
-                k: v for (k, v) in self.speaker_to_utters.items() if len(v) >= self.num_utter_per_speaker
-            }
+        for i in meta_data:
+            self.speaker_to_utters.setdefault(i["speaker_name"], []).append(i["audio_file"])
+
+        # speakers need at least 2 utterances
+        min_utters = self.num_utter_per_speaker if self.skip_speakers else 2
+        self.speaker_to_utters = {k: v for (k, v) in self.speaker_to_utters.items() if len(v) >= min_utters}
 
         self.speakers = [k for (k, v) in self.speaker_to_utters.items()]
+        self.items = [i for i in meta_data if i["speaker_name"] in self.speaker_to_utters]
+        self.speaker_to_items = {}
+        for idx, item in enumerate(self.items):
+            self.speaker_to_items.setdefault(item["speaker_name"], []).append(idx)
 
     def __len__(self):
-        return int(1e10)
+        return len(self.items)
 
     def get_num_speakers(self):
         return len(self.speakers)
 
-    def __sample_speaker(self, ignore_speakers=None):
-        speaker = random.sample(self.speakers, 1)[0]
-        # if list of speakers_id is provide make sure that it's will be ignored
-        if ignore_speakers and self.speakerid_to_classid[speaker] in ignore_speakers:
-            while True:
-                speaker = random.sample(self.speakers, 1)[0]
-                if self.speakerid_to_classid[speaker] not in ignore_speakers:
-                    break
-
-        if self.num_utter_per_speaker > len(self.speaker_to_utters[speaker]):
-            utters = random.choices(self.speaker_to_utters[speaker], k=self.num_utter_per_speaker)
-        else:
-            utters = random.sample(self.speaker_to_utters[speaker], self.num_utter_per_speaker)
-        return speaker, utters
-
-    def __sample_speaker_utterances(self, speaker):
-        """
-        Sample all M utterances for the given speaker.
-        """
-        wavs = []
-        labels = []
-        for _ in range(self.num_utter_per_speaker):
-            # TODO:dummy but works
-            while True:
-                # remove speakers that have num_utter less than 2
-                if len(self.speaker_to_utters[speaker]) > 1:
-                    utter = random.sample(self.speaker_to_utters[speaker], 1)[0]
-                else:
-                    if speaker in self.speakers:
-                        self.speakers.remove(speaker)
-
-                    speaker, _ = self.__sample_speaker()
-                    continue
-
-                wav = self.load_wav(utter)
-                if wav.shape[0] - self.seq_len > 0:
-                    break
-
-                if utter in self.speaker_to_utters[speaker]:
-                    self.speaker_to_utters[speaker].remove(utter)
-
-            if self.augmentator is not None and self.data_augmentation_p:
-                if random.random() < self.data_augmentation_p:
-                    wav = self.augmentator.apply_one(wav)
-
-            wavs.append(wav)
-            labels.append(self.speakerid_to_classid[speaker])
-        return wavs, labels
+    def get_speaker_ids(self):
+        """Return the speaker class id of each item for the `SpeakerBatchSampler`."""
+        return [self.speakerid_to_classid[item["speaker_name"]] for item in self.items]
+
+    def load_utterance(self, idx):
+        """Load the wav of an item from the shared cache or from the disk."""
+        cached = self.cache.get(idx) if self.cache is not None else None
+        if cached is not None:
+            # the cached wav is a view of the shared buffer and the augmentations change the wav in place
+            return cached[0].copy()
+        wav = np.asarray(self.load_wav(self.items[idx]["audio_file"]), dtype=np.float32)
+        if self.cache is not None:
+            self.cache.put(idx, wav)
+        return wav
 
     def __getitem__(self, idx):
-        speaker, _ = self.__sample_speaker()
-        speaker_id = self.speakerid_to_classid[speaker]
-        return speaker, speaker_id
-
-    def __load_from_disk_and_storage(self, speaker):
-        # don't sample from storage, but from HDD
-        wavs_, labels_ = self.__sample_speaker_utterances(speaker)
-        # put the newly loaded item into storage
-        self.storage.append((wavs_, labels_))
-        return wavs_, labels_
+        wav = self.load_utterance(idx)
+        speaker_items = self.speaker_to_items[self.items[idx]["speaker_name"]]
+        num_draws = 0
+        while wav.shape[0] < self.seq_len:
+            # the silence trimming made the utterance shorter than a segment
+            num_draws += 1
+            if num_draws > len(speaker_items):
+                raise ValueError(
+                    f" [!] No utterance of {self.items[idx]['speaker_name']} is long enough for a segment."
+                )
+            wav = self.load_utterance(random.choice(speaker_items))
+        # crop before the augmentation to only process the segment fed to the model
+        offset = random.randint(0, wav.shape[0] - self.seq_len)
+        wav = wav[offset : offset + self.seq_len].copy()
+
+        if self.augmentator is not None and self.data_augmentation_p:
+            if random.random() < self.data_augmentation_p:
+                wav = self.augmentator.apply_one(wav)
+
+        # add random gaussian noise
+        if self.gaussian_augmentation_config and self.gaussian_augmentation_config["p"]:
+            if random.random() < self.gaussian_augmentation_config["p"]:
+                wav += np.random.normal(
+                    self.gaussian_augmentation_config["min_amplitude"],
+                    self.gaussian_augmentation_config["max_amplitude"],
+                    size=len(wav),
+                )
+        mel = self.ap.melspectrogram(wav)
+        return torch.FloatTensor(mel), self.speakerid_to_classid[self.items[idx]["speaker_name"]]
+
+    @staticmethod
+    def worker_init_fn(worker_id):  # pylint: disable=unused-argument
+        # forked workers copy the numpy random state, seed it like the `random` module
+        np.random.seed(torch.initial_seed() % 2**32)
 
     def collate_fn(self, batch):
-        # get the batch speaker_ids
-        batch = np.array(batch)
-        speakers_id_in_batch = set(batch[:, 1].astype(np.int32))
-
-        labels = []
-        feats = []
-        speakers = set()
-
-        for speaker, speaker_id in batch:
-            speaker_id = int(speaker_id)
-
-            # ensure that an speaker appears only once in the batch
-            if speaker_id in speakers:
-
-                # remove current speaker
-                if speaker_id in speakers_id_in_batch:
-                    speakers_id_in_batch.remove(speaker_id)
-
-                speaker, _ = self.__sample_speaker(ignore_speakers=speakers_id_in_batch)
-                speaker_id = self.speakerid_to_classid[speaker]
-                speakers_id_in_batch.add(speaker_id)
-
-            if random.random() < self.sample_from_storage_p and self.storage.full():
-                # sample from storage (if full)
-                wavs_, labels_ = self.storage.get_random_sample_fast()
-
-                # force choose the current speaker or other not in batch
-                # It's necessary for ideal training with AngleProto and GE2E losses
-                if labels_[0] in speakers_id_in_batch and labels_[0] != speaker_id:
-                    attempts = 0
-                    while True:
-                        wavs_, labels_ = self.storage.get_random_sample_fast()
-                        if labels_[0] == speaker_id or labels_[0] not in speakers_id_in_batch:
-                            break
-
-                        attempts += 1
-                        # Try 5 times after that load from disk
-                        if attempts >= 5:
-                            wavs_, labels_ = self.__load_from_disk_and_storage(speaker)
-                            break
-            else:
-                # don't sample from storage, but from HDD
-                wavs_, labels_ = self.__load_from_disk_and_storage(speaker)
-
-            # append speaker for control
-            speakers.add(labels_[0])
-
-            # remove current speaker and append other
-            if speaker_id in speakers_id_in_batch:
-                speakers_id_in_batch.remove(speaker_id)
-
-            speakers_id_in_batch.add(labels_[0])
-
-            # get a random subset of each of the wavs and extract mel spectrograms.
-            feats_ = []
-            for wav in wavs_:
-                offset = random.randint(0, wav.shape[0] - self.seq_len)
-                wav = wav[offset : offset + self.seq_len]
-                # add random gaussian noise
-                if self.gaussian_augmentation_config and self.gaussian_augmentation_config["p"]:
-                    if random.random() < self.gaussian_augmentation_config["p"]:
-                        wav += np.random.normal(
-                            self.gaussian_augmentation_config["min_amplitude"],
-                            self.gaussian_augmentation_config["max_amplitude"],
-                            size=len(wav),
-                        )
-                mel = self.ap.melspectrogram(wav)
-                feats_.append(torch.FloatTensor(mel))
-
-            labels.append(torch.LongTensor(labels_))
-            feats.extend(feats_)
-
-        feats = torch.stack(feats)
-        labels = torch.stack(labels)
+        """Stack the segments of a `SpeakerBatchSampler` batch grouped by speaker.
 
+        Returns:
+            feats (torch.Tensor): melspectrograms `[num_speakers_in_batch * num_utter_per_speaker, C, T]`.
+            labels (torch.Tensor): speaker class ids `[num_speakers_in_batch, num_utter_per_speaker]`.
+        """
+        feats = torch.stack([mel for mel, _ in batch])
+        labels = torch.LongTensor([label for _, label in batch]).view(-1, self.num_utter_per_speaker)
         return feats, labels
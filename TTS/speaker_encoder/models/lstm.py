@@ -1,9 +1,11 @@
+from functools import partial
+
 import numpy as np
 import torch
 import torchaudio
 from torch import nn
 
-from TTS.speaker_encoder.models.resnet import PreEmphasis
+from TTS.speaker_encoder.models.resnet import PreEmphasis, embed_clip_windows
 from TTS.utils.io import load_fsspec
 
 
@@ -131,9 +133,9 @@ class LSTMSpeakerEncoder(nn.Module):
         d = self.forward(x, l2_norm=l2_norm)
         return d
 
-    def compute_embedding(self, x, num_frames=250, num_eval=10, return_mean=True):
+    def get_embedding_windows(self, x, num_frames=250, num_eval=10):
         """
-        Generate embeddings for a batch of utterances
+        Slice the `num_eval` evenly spaced windows averaged by `compute_embedding`
         x: 1xTxD
         """
         max_len = x.shape[1]
@@ -150,7 +152,14 @@ class LSTMSpeakerEncoder(nn.Module):
             frames = x[:, offset:end_offset]
             frames_batch.append(frames)
 
-        frames_batch = torch.cat(frames_batch, dim=0)
+        return torch.cat(frames_batch, dim=0)
+
+    def compute_embedding(self, x, num_frames=250, num_eval=10, return_mean=True):
+        """
+        Generate embeddings for a batch of utterances
+        x: 1xTxD
+        """
+        frames_batch = self.get_embedding_windows(x, num_frames=num_frames, num_eval=num_eval)
         embeddings = self.inference(frames_batch)
 
         if return_mean:
@@ -158,6 +167,36 @@ class LSTMSpeakerEncoder(nn.Module):
 
         return embeddings
 
+    @torch.no_grad()
+    def compute_embeddings(self, x, lengths=None, num_frames=250, num_eval=10, return_mean=True, l2_norm=True):
+        """Generate embeddings for a padded batch of clips in a single forward pass.
+
+        `num_eval` windows of each clip are sliced along the time axis by `embed_clip_windows()`. For a single
+        waveform it gives the same embedding as `compute_embedding()`.
+
+        Args:
+            x (Tensor): Padded waveforms if `use_torch_spec` else padded spectrogram frames.
+            lengths (Tensor): Length of each clip in samples or frames. If None, clips are not padded.
+                Defaults to None.
+            num_frames (int): Window length. Defaults to 250.
+            num_eval (int): Number of windows of each clip. Defaults to 10.
+            return_mean (bool): Average the window embeddings of each clip. Defaults to True.
+            l2_norm (bool): Whether to L2-normalize the window embeddings. Defaults to True.
+
+        Shapes:
+            - x: :math:`(N, T_{in})` or :math:`(N, D_{spec}, T_{in})`
+            - lengths: :math:`(N)`
+            - output: :math:`(N, D_{proj})` or :math:`(N, num_eval, D_{proj})` if not `return_mean`
+        """
+        if lengths is None:
+            lengths = torch.full((x.shape[0],), x.shape[-1], dtype=torch.long)
+        embeddings = embed_clip_windows(
+            partial(self.inference, l2_norm=l2_norm), x, lengths.to(x.device), num_frames, num_eval
+        )
+        if return_mean:
+            embeddings = embeddings.mean(dim=1)
+        return embeddings
+
     def batch_compute_embedding(self, x, seq_lens, num_frames=160, overlap=0.5):
         """
         Generate embeddings for a batch of utterances
@@ -1,3 +1,6 @@
+from functools import partial
+from typing import Callable
+
 import numpy as np
 import torch
 import torchaudio
@@ -20,6 +23,68 @@ class PreEmphasis(nn.Module):
         return torch.nn.functional.conv1d(x, self.filter).squeeze(1)
 
 
+def get_embedding_window_offsets(lengths: torch.Tensor, num_frames: int, num_eval: int) -> torch.Tensor:
+    """Compute the start of `num_eval` evenly spaced windows in each clip like `np.linspace` in `compute_embedding`.
+
+    Shapes:
+        - lengths: :math:`[B]`
+        - output: :math:`[B, num_eval]`
+    """
+    stops = (lengths - num_frames).clamp(min=0).double()
+    if num_eval == 1:
+        return torch.zeros_like(stops, dtype=torch.long).unsqueeze(1)
+    offsets = (
+        torch.arange(num_eval, dtype=torch.float64, device=lengths.device)[None] * (stops / (num_eval - 1))[:, None]
+    )
+    offsets[:, -1] = stops
+    return offsets.long()
+
+
+def unfold_embedding_windows(x: torch.Tensor, lengths: torch.Tensor, num_frames: int, num_eval: int) -> torch.Tensor:
+    """Slice `num_eval` windows of `num_frames` along the last axis of each clip of a padded batch in one gather.
+
+    The windows are shortened to the batch length if needed. Clips shorter than the window give windows covering the
+    whole clip and the padding after it, `embed_clip_windows()` shortens their windows to the clip instead.
+
+    Shapes:
+        - x: :math:`[B, T]` or :math:`[B, D, T]`
+        - lengths: :math:`[B]`
+        - output: :math:`[B * num_eval, T_w]` or :math:`[B * num_eval, D, T_w]`
+    """
+    num_frames = min(num_frames, x.shape[-1])
+    offsets = get_embedding_window_offsets(lengths, num_frames, num_eval)
+    idxs = offsets[:, :, None] + torch.arange(num_frames, device=x.device)
+    if x.dim() == 2:
+        return x.gather(1, idxs.view(x.shape[0], -1)).view(-1, num_frames)
+    idxs = idxs.view(x.shape[0], 1, -1).expand(-1, x.shape[1], -1)
+    windows = x.gather(2, idxs).view(x.shape[0], x.shape[1], num_eval, num_frames)
+    return windows.transpose(1, 2).reshape(-1, x.shape[1], num_frames)
+
+
+def embed_clip_windows(
+    inference: Callable, x: torch.Tensor, lengths: torch.Tensor, num_frames: int, num_eval: int
+) -> torch.Tensor:
+    """Run `inference` on `num_eval` windows of each clip of a padded batch.
+
+    Clips shorter than `num_frames` get windows of their own length like in `compute_embedding()`, so their
+    embeddings do not depend on the padding of the batch. Clips sharing a window length are run in one pass.
+
+    Shapes:
+        - x: :math:`[B, T]` or :math:`[B, D, T]`
+        - lengths: :math:`[B]`
+        - output: :math:`[B, num_eval, D_{proj}]`
+    """
+    window_lengths = lengths.clamp(max=num_frames)
+    embeddings, idxs = [], []
+    for window_length in window_lengths.unique().tolist():
+        group_idxs = (window_lengths == window_length).nonzero(as_tuple=True)[0]
+        group_x = x[group_idxs, ..., : int(lengths[group_idxs].max())]
+        windows = unfold_embedding_windows(group_x, lengths[group_idxs], window_length, num_eval)
+        embeddings.append(inference(windows).view(len(group_idxs), num_eval, -1))
+        idxs.append(group_idxs)
+    return torch.cat(embeddings)[torch.cat(idxs).argsort()]
+
+
 class SELayer(nn.Module):
     def __init__(self, channel, reduction=8):
         super(SELayer, self).__init__()
@@ -243,10 +308,9 @@ class ResNetSpeakerEncoder(nn.Module):
     def inference(self, x, l2_norm=False):
         return self.forward(x, l2_norm)
 
-    @torch.no_grad()
-    def compute_embedding(self, x, num_frames=250, num_eval=10, return_mean=True, l2_norm=True):
+    def get_embedding_windows(self, x, num_frames=250, num_eval=10):
         """
-        Generate embeddings for a batch of utterances
+        Slice the `num_eval` evenly spaced windows averaged by `compute_embedding`
         x: 1xTxD
         """
         # map to the waveform size
@@ -267,13 +331,54 @@ class ResNetSpeakerEncoder(nn.Module):
             frames = x[:, offset:end_offset]
             frames_batch.append(frames)
 
-        frames_batch = torch.cat(frames_batch, dim=0)
+        return torch.cat(frames_batch, dim=0)
+
+    @torch.no_grad()
+    def compute_embedding(self, x, num_frames=250, num_eval=10, return_mean=True, l2_norm=True):
+        """
+        Generate embeddings for a batch of utterances
+        x: 1xTxD
+        """
+        frames_batch = self.get_embedding_windows(x, num_frames=num_frames, num_eval=num_eval)
         embeddings = self.inference(frames_batch, l2_norm=l2_norm)
 
         if return_mean:
             embeddings = torch.mean(embeddings, dim=0, keepdim=True)
         return embeddings
 
+    @torch.no_grad()
+    def compute_embeddings(self, x, lengths=None, num_frames=250, num_eval=10, return_mean=True, l2_norm=True):
+        """Generate embeddings for a padded batch of clips in a single forward pass.
+
+        `num_eval` windows of each clip are sliced along the time axis by `embed_clip_windows()`. For a single
+        waveform it gives the same embedding as `compute_embedding()`.
+
+        Args:
+            x (Tensor): Padded waveforms if `use_torch_spec` else padded spectrogram frames.
+            lengths (Tensor): Length of each clip in samples or frames. If None, clips are not padded.
+                Defaults to None.
+            num_frames (int): Window length in frames. Defaults to 250.
+            num_eval (int): Number of windows of each clip. Defaults to 10.
+            return_mean (bool): Average the window embeddings of each clip. Defaults to True.
+            l2_norm (bool): Whether to L2-normalize the window embeddings. Defaults to True.
+
+        Shapes:
+            - x: :math:`(N, T_{in})` or :math:`(N, D_{spec}, T_{in})`
+            - lengths: :math:`(N)`
+            - output: :math:`(N, D_{proj})` or :math:`(N, num_eval, D_{proj})` if not `return_mean`
+        """
+        # map to the waveform size
+        if self.use_torch_spec:
+            num_frames = num_frames * self.audio_config["hop_length"]
+        if lengths is None:
+            lengths = torch.full((x.shape[0],), x.shape[-1], dtype=torch.long)
+        embeddings = embed_clip_windows(
+            partial(self.inference, l2_norm=l2_norm), x, lengths.to(x.device), num_frames, num_eval
+        )
+        if return_mean:
+            embeddings = embeddings.mean(dim=1)
+        return embeddings
+
     def load_checkpoint(self, config: dict, checkpoint_path: str, eval: bool = False, use_cuda: bool = False):
         state = load_fsspec(checkpoint_path, map_location=torch.device("cpu"))
         self.load_state_dict(state["model"])
@@ -29,8 +29,7 @@ class SpeakerEncoderConfig(BaseTrainingConfig):
 
     storage: Dict = field(
         default_factory=lambda: {
-            "sample_from_storage_p": 0.66,  # the probability with which we'll sample from the DataSet in-memory storage
-            "storage_size": 15,  # the size of the in-memory storage with respect to a single batch
+            "cache_size_in_sec": 600,  # the duration of the loaded audio kept in memory, shared by the loader workers
         }
     )
 
@@ -145,6 +145,25 @@ class BaseTTSConfig(BaseTrainingConfig):
         phoneme_cache_path (str):
             Path to the output folder caching the computed phonemes for each sample.
 
+        phoneme_cache_format (str):
+            Format of the phoneme cache. `files` writes a `.npy` file per sample. `packed` writes the phonemes of all
+            the samples to a single memory-mapped array. Use `TTS/bin/pack_phoneme_cache.py` to convert a `files`
+            cache. Defaults to `files`.
+
+        feature_store_path (str):
+            Path to the output folder storing the pre-computed spectrograms of the samples. Features are computed once
+            and memory-mapped in training. They are recomputed if the audio parameters change. If None, features are
+            computed on the fly. Defaults to None.
+
+        spectrogram_mode (str):
+            How the data loader computes the spectrograms. `item` computes them for each sample in the data loader
+            workers, `batch` computes them for the whole batch at once by a batched STFT in `collate_fn` and `device`
+            computes them for the whole batch on the training device. Defaults to `item`.
+
+        audio_lengths_cache_path (str):
+            Path to a `.npz` file caching the audio lengths read from the audio file headers. If None, the lengths
+            are read at every run. Defaults to None.
+
         characters (CharactersConfig):
             Instance of a CharactersConfig class.
 
@@ -153,6 +172,15 @@ class BaseTTSConfig(BaseTrainingConfig):
             length for a more efficient and stable training. If `batch_group_size > 1` then it performs bucketing to
             prevent using the same batches for each epoch.
 
+        batch_max_frames (int):
+            Maximum number of spectrogram frames in a padded batch. If set, batches are built by `BucketBatchSampler`
+            by grouping samples of similar length and the batch size changes with the sample lengths up to
+            `batch_size`. If None, batches have a fixed size. Defaults to None.
+
+        batch_bucket_size (int):
+            Number of samples sorted together by `BucketBatchSampler`. Larger buckets give less padding but less
+            random batches. Defaults to 1000.
+
         loss_masking (bool):
             enable / disable masking loss values against padded segments of samples in a batch.
 
@@ -232,11 +260,17 @@ class BaseTTSConfig(BaseTrainingConfig):
     enable_eos_bos_chars: bool = False
     test_sentences_file: str = ""
     phoneme_cache_path: str = None
+    phoneme_cache_format: str = "files"
+    feature_store_path: str = None
+    spectrogram_mode: str = "item"
+    audio_lengths_cache_path: str = None
     # vocabulary parameters
     characters: CharactersConfig = None
     add_blank: bool = False
     # training params
     batch_group_size: int = 0
+    batch_max_frames: int = None
+    batch_bucket_size: int = 1000
     loss_masking: bool = None
     # dataloading
     sort_by_audio_len: bool = False
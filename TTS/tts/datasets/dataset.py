@@ -1,6 +1,7 @@
 import collections
+import hashlib
+import json
 import os
-import random
 from typing import Dict, List, Union
 
 import numpy as np
@@ -8,6 +9,7 @@ import torch
 import tqdm
 from torch.utils.data import Dataset
 
+from TTS.tts.datasets.sample_table import SampleTable, probe_audio_length
 from TTS.tts.utils.data import prepare_data, prepare_stop_target, prepare_tensor
 from TTS.utils.audio import AudioProcessor
 
@@ -51,12 +53,16 @@ class TTSDataset(Dataset):
         min_audio_len: int = 0,
         max_audio_len: int = float("inf"),
         phoneme_cache_path: str = None,
+        phoneme_cache_format: str = "files",
         precompute_num_workers: int = 0,
+        feature_store_path: str = None,
+        spectrogram_mode: str = "item",
         speaker_id_mapping: Dict = None,
         d_vector_mapping: Dict = None,
         language_id_mapping: Dict = None,
         use_noise_augment: bool = False,
         start_by_longest: bool = False,
+        audio_lengths_cache_path: str = None,
         verbose: bool = False,
     ):
         """Generic 📂 data loader for `tts` models. It is configurable for different outputs and needs.
@@ -101,8 +107,20 @@ class TTSDataset(Dataset):
             phoneme_cache_path (str): Path to cache computed phonemes. It writes phonemes of each sample to a
                 separate file. Defaults to None.
 
+            phoneme_cache_format (str): `files` to write a file per sample or `packed` to write all the phonemes to
+                a single memory-mapped array. Defaults to `files`.
+
             precompute_num_workers (int): Number of workers to precompute features. Defaults to 0.
 
+            feature_store_path (str): Path to a `FeatureStore` of pre-computed spectrograms. Missing features are
+                computed at init and spectrograms are not computed in `collate_fn`. It is not used with
+                `use_noise_augment`. Defaults to None.
+
+            spectrogram_mode (str): How `collate_fn` computes the spectrograms. `item` computes them for each item
+                by `AudioProcessor`, `batch` pads the waveforms and computes them for the batch at once by
+                `AudioProcessor.batch_spectrograms()` and `device` returns the padded waveforms to compute the
+                spectrograms in `format_batch_on_device()` of the model. Defaults to `item`.
+
             speaker_id_mapping (dict): Mapping of speaker names to IDs used to compute embedding vectors by the
                 embedding layer. Defaults to None.
 
@@ -112,6 +130,9 @@ class TTSDataset(Dataset):
 
             start_by_longest (bool): Start by longest sequence. It is especially useful to check OOM. Defaults to False.
 
+            audio_lengths_cache_path (str): Path to a `.npz` file caching the audio lengths probed from the file
+                headers by `preprocess_samples()`. Defaults to None.
+
             verbose (bool): Print diagnostic information. Defaults to false.
         """
         super().__init__()
@@ -132,7 +153,13 @@ class TTSDataset(Dataset):
         self.d_vector_mapping = d_vector_mapping
         self.language_id_mapping = language_id_mapping
         self.use_noise_augment = use_noise_augment
+        if spectrogram_mode not in ["item", "batch", "device"]:
+            raise ValueError(f" [!] Unknown spectrogram mode: {spectrogram_mode}")
+        self.spectrogram_mode = spectrogram_mode
         self.start_by_longest = start_by_longest
+        self.audio_lengths_cache_path = audio_lengths_cache_path
+        self.precompute_num_workers = precompute_num_workers
+        self.sample_table = None
 
         self.verbose = verbose
         self.rescue_item_idx = 1
@@ -141,9 +168,21 @@ class TTSDataset(Dataset):
 
         if self.tokenizer.use_phonemes:
             self.phoneme_dataset = PhonemeDataset(
-                self.samples, self.tokenizer, phoneme_cache_path, precompute_num_workers=precompute_num_workers
+                self.samples,
+                self.tokenizer,
+                phoneme_cache_path,
+                precompute_num_workers=precompute_num_workers,
+                cache_format=phoneme_cache_format,
             )
 
+        self.feature_store = None
+        if feature_store_path is not None:
+            if use_noise_augment:
+                print(" [!] `feature_store_path` is ignored with `use_noise_augment`.")
+            else:
+                self.feature_store = FeatureStore(feature_store_path, self.ap, compute_linear_spec)
+                self.feature_store.precompute(self.samples, precompute_num_workers)
+
         if compute_f0:
             self.f0_dataset = F0Dataset(
                 self.samples, self.ap, cache_path=f0_cache_path, precompute_num_workers=precompute_num_workers
@@ -154,12 +193,9 @@ class TTSDataset(Dataset):
 
     @property
     def lengths(self):
-        lens = []
-        for item in self.samples:
-            _, wav_file, *_ = _parse_sample(item)
-            audio_len = os.path.getsize(wav_file) / 16 * 8  # assuming 16bit audio
-            lens.append(audio_len)
-        return lens
+        if self.sample_table is not None:
+            return self.sample_table.audio_lengths.tolist()
+        return [probe_audio_length(item["audio_file"]) for item in self.samples]
 
     @property
     def samples(self):
@@ -168,6 +204,7 @@ class TTSDataset(Dataset):
     @samples.setter
     def samples(self, new_samples):
         self._samples = new_samples
+        self.sample_table = None
         if hasattr(self, "f0_dataset"):
             self.f0_dataset.samples = new_samples
         if hasattr(self, "phoneme_dataset"):
@@ -186,6 +223,8 @@ class TTSDataset(Dataset):
         print(f"{indent}| > Tokenizer:")
         self.tokenizer.print_logs(level + 1)
         print(f"{indent}| > Number of instances : {len(self.samples)}")
+        if self.feature_store is not None:
+            self.feature_store.print_logs(level + 1)
 
     def load_wav(self, filename):
         waveform = self.ap.load_wav(filename)
@@ -220,7 +259,14 @@ class TTSDataset(Dataset):
 
         raw_text = item["text"]
 
-        wav = np.asarray(self.load_wav(item["audio_file"]), dtype=np.float32)
+        features = None
+        if self.feature_store is not None:
+            # pre-computed features are enough if the waveform is not returned
+            features = self.feature_store.get(item["audio_file"])
+
+        wav = None
+        if features is None or self.return_wav:
+            wav = np.asarray(self.load_wav(item["audio_file"]), dtype=np.float32)
 
         # apply noise for augmentation
         if self.use_noise_augment:
@@ -237,7 +283,8 @@ class TTSDataset(Dataset):
         # after phonemization the text length may change
         # this is a shareful 🤭 hack to prevent longer phonemes
         # TODO: find a better fix
-        if len(token_ids) > self.max_text_len or len(wav) < self.min_audio_len:
+        wav_length = features["audio_length"] if features is not None else len(wav)
+        if len(token_ids) > self.max_text_len or wav_length < self.min_audio_len:
             self.rescue_item_idx += 1
             return self.load_data(self.rescue_item_idx)
 
@@ -257,96 +304,79 @@ class TTSDataset(Dataset):
             "language_name": item["language"],
             "wav_file_name": os.path.basename(item["audio_file"]),
         }
+        if features is not None:
+            sample["mel"] = features["mel"]
+            sample["linear"] = features["linear"]
         return sample
 
-    @staticmethod
-    def _compute_lengths(samples):
-        new_samples = []
-        for item in samples:
-            audio_length = os.path.getsize(item["audio_file"]) / 16 * 8  # assuming 16bit audio
-            text_lenght = len(item["text"])
-            item["audio_length"] = audio_length
-            item["text_length"] = text_lenght
-            new_samples += [item]
-        return new_samples
-
     @staticmethod
     def filter_by_length(lengths: List[int], min_len: int, max_len: int):
-        idxs = np.argsort(lengths)  # ascending order
-        ignore_idx = []
-        keep_idx = []
-        for idx in idxs:
-            length = lengths[idx]
-            if length < min_len or length > max_len:
-                ignore_idx.append(idx)
-            else:
-                keep_idx.append(idx)
-        return ignore_idx, keep_idx
+        lengths = np.asarray(lengths)
+        idxs = np.argsort(lengths, kind="stable")  # ascending order
+        ignore_mask = (lengths[idxs] < min_len) | (lengths[idxs] > max_len)
+        return idxs[ignore_mask], idxs[~ignore_mask]
 
     @staticmethod
     def sort_by_length(samples: List[List]):
-        audio_lengths = [s["audio_length"] for s in samples]
-        idxs = np.argsort(audio_lengths)  # ascending order
+        audio_lengths = np.array([s["audio_length"] for s in samples])
+        idxs = np.argsort(audio_lengths, kind="stable")  # ascending order
         return idxs
 
     @staticmethod
     def create_buckets(samples, batch_group_size: int):
+        """Shuffle the samples in each group of `batch_group_size` consecutive samples."""
         assert batch_group_size > 0
-        for i in range(len(samples) // batch_group_size):
-            offset = i * batch_group_size
-            end_offset = offset + batch_group_size
-            temp_items = samples[offset:end_offset]
-            random.shuffle(temp_items)
-            samples[offset:end_offset] = temp_items
-        return samples
-
-    @staticmethod
-    def _select_samples_by_idx(idxs, samples):
-        samples_new = []
-        for idx in idxs:
-            samples_new.append(samples[idx])
-        return samples_new
+        num_groups = len(samples) // batch_group_size
+        idxs = np.arange(len(samples))
+        groups = idxs[: num_groups * batch_group_size].reshape(num_groups, batch_group_size)
+        perms = np.argsort(np.random.rand(num_groups, batch_group_size), axis=1)
+        idxs[: num_groups * batch_group_size] = np.take_along_axis(groups, perms, axis=1).reshape(-1)
+        if isinstance(samples, np.ndarray):
+            return samples[idxs]
+        return [samples[idx] for idx in idxs]
 
     def preprocess_samples(self):
         r"""Sort `items` based on text length or audio length in ascending order. Filter out samples out or the length
         range.
+
+        Audio lengths are probed from the file headers and samples are filtered, sorted and bucketed as arrays by a
+        `SampleTable`. The table of the final samples is kept in `self.sample_table`.
         """
-        samples = self._compute_lengths(self.samples)
+        table = SampleTable.from_samples(self.samples, self.precompute_num_workers, self.audio_lengths_cache_path)
 
-        # sort items based on the sequence length in ascending order
-        text_lengths = [i["text_length"] for i in samples]
-        audio_lengths = [i["audio_length"] for i in samples]
-        text_ignore_idx, text_keep_idx = self.filter_by_length(text_lengths, self.min_text_len, self.max_text_len)
-        audio_ignore_idx, audio_keep_idx = self.filter_by_length(audio_lengths, self.min_audio_len, self.max_audio_len)
-        keep_idx = list(set(audio_keep_idx) & set(text_keep_idx))
-        ignore_idx = list(set(audio_ignore_idx) | set(text_ignore_idx))
+        # filter out samples out of the length range
+        keep_mask = table.length_mask(self.min_text_len, self.max_text_len, self.min_audio_len, self.max_audio_len)
+        keep_idxs = np.flatnonzero(keep_mask)
+        num_ignored = len(table) - len(keep_idxs)
 
-        samples = self._select_samples_by_idx(keep_idx, samples)
+        # sort items based on the sequence length in ascending order
+        sorted_idxs = keep_idxs[np.argsort(table.audio_lengths[keep_idxs], kind="stable")]
 
-        sorted_idxs = self.sort_by_length(samples)
+        if len(sorted_idxs) == 0:
+            raise RuntimeError(" [!] No samples left")
 
         if self.start_by_longest:
-            longest_idxs = sorted_idxs[-1]
-            sorted_idxs[-1] = sorted_idxs[0]
-            sorted_idxs[0] = longest_idxs
-
-        samples = self._select_samples_by_idx(sorted_idxs, samples)
-
-        if len(samples) == 0:
-            raise RuntimeError(" [!] No samples left")
+            sorted_idxs[[0, -1]] = sorted_idxs[[-1, 0]]
 
         # shuffle batch groups
         # create batches with similar length items
         # the larger the `batch_group_size`, the higher the length variety in a batch.
         if self.batch_group_size > 0:
-            samples = self.create_buckets(samples, self.batch_group_size)
+            sorted_idxs = self.create_buckets(sorted_idxs, self.batch_group_size)
 
         # update items to the new sorted items
-        audio_lengths = [s["audio_length"] for s in samples]
-        text_lengths = [s["text_length"] for s in samples]
-        self.samples = samples
+        table = table.select(sorted_idxs)
+        for item, audio_length, text_length in zip(
+            table.samples, table.audio_lengths.tolist(), table.text_lengths.tolist()
+        ):
+            item["audio_length"] = audio_length
+            item["text_length"] = text_length
+        self.samples = table.samples
+        self.sample_table = table
 
         if self.verbose:
+            text_lengths = table.text_lengths
+            audio_lengths = table.audio_lengths
             print(" | > Preprocessing samples")
             print(" | > Max text length: {}".format(np.max(text_lengths)))
             print(" | > Min text length: {}".format(np.min(text_lengths)))
@@ -355,7 +385,7 @@ class TTSDataset(Dataset):
             print(" | > Max audio length: {}".format(np.max(audio_lengths)))
             print(" | > Min audio length: {}".format(np.min(audio_lengths)))
             print(" | > Avg audio length: {}".format(np.mean(audio_lengths)))
-            print(f" | > Num. instances discarded samples: {len(ignore_idx)}")
+            print(f" | > Num. instances discarded samples: {num_ignored}")
             print(" | > Batch group size: {}.".format(self.batch_group_size))
 
     @staticmethod
@@ -408,17 +438,26 @@ class TTSDataset(Dataset):
             else:
                 speaker_ids = None
             # compute features
-            mel = [self.ap.melspectrogram(w).astype("float32") for w in batch["wav"]]
-
-            mel_lengths = [m.shape[1] for m in mel]
+            mel = None
+            if "mel" in batch:
+                mel = batch["mel"]
+            elif self.spectrogram_mode == "item":
+                mel = [self.ap.melspectrogram(w).astype("float32") for w in batch["wav"]]
+
+            if mel is not None:
+                mel_lengths = [m.shape[1] for m in mel]
+            else:
+                # number of frames computed by `librosa.stft(center=True)`
+                mel_lengths = [w.shape[0] // self.ap.hop_length + 1 for w in batch["wav"]]
 
             # lengths adjusted by the reduction factor
             mel_lengths_adjusted = [
-                m.shape[1] + (self.outputs_per_step - (m.shape[1] % self.outputs_per_step))
-                if m.shape[1] % self.outputs_per_step
-                else m.shape[1]
-                for m in mel
+                mel_len + (self.outputs_per_step - (mel_len % self.outputs_per_step))
+                if mel_len % self.outputs_per_step
+                else mel_len
+                for mel_len in mel_lengths
             ]
+            max_mel_len = max(mel_lengths_adjusted)
 
             # compute 'stop token' targets
             stop_targets = [np.array([0.0] * (mel_len - 1) + [1.0]) for mel_len in mel_lengths]
@@ -429,16 +468,43 @@ class TTSDataset(Dataset):
             # PAD sequences with longest instance in the batch
             token_ids = prepare_data(batch["token_ids"]).astype(np.int32)
 
-            # PAD features with longest instance
-            mel = prepare_tensor(mel, self.outputs_per_step)
-
-            # B x D x T --> B x T x D
-            mel = mel.transpose(0, 2, 1)
+            # format spectrograms
+            linear = None
+            spec_waveform = None
+            spec_waveform_lengths = None
+            if mel is not None:
+                # PAD features with longest instance
+                mel = prepare_tensor(mel, self.outputs_per_step)
+                # B x D x T --> B x T x D
+                mel = mel.transpose(0, 2, 1)
+                mel = torch.FloatTensor(mel).contiguous()
+
+                if self.compute_linear_spec:
+                    if "linear" in batch:
+                        linear = batch["linear"]
+                    else:
+                        linear = [self.ap.spectrogram(w).astype("float32") for w in batch["wav"]]
+                    linear = prepare_tensor(linear, self.outputs_per_step)
+                    linear = linear.transpose(0, 2, 1)
+                    assert mel.shape[1] == linear.shape[1]
+                    linear = torch.FloatTensor(linear).contiguous()
+            else:
+                # PAD waveforms once and compute the features of the batch together
+                spec_waveform = torch.FloatTensor(prepare_data(batch["wav"]).astype(np.float32))
+                spec_waveform_lengths = torch.LongTensor([w.shape[0] for w in batch["wav"]])
+                if self.spectrogram_mode == "batch":
+                    mel, linear, _ = self.ap.batch_spectrograms(
+                        spec_waveform, spec_waveform_lengths, self.compute_linear_spec
+                    )
+                    mel = pad_spectrogram(mel, max_mel_len)
+                    if linear is not None:
+                        linear = pad_spectrogram(linear, max_mel_len)
+                    spec_waveform = None
+                    spec_waveform_lengths = None
 
             # convert things to pytorch
             token_ids_lengths = torch.LongTensor(token_ids_lengths)
             token_ids = torch.LongTensor(token_ids)
-            mel = torch.FloatTensor(mel).contiguous()
             mel_lengths = torch.LongTensor(mel_lengths)
             stop_targets = torch.FloatTensor(stop_targets)
 
@@ -452,20 +518,11 @@ class TTSDataset(Dataset):
             if language_ids is not None:
                 language_ids = torch.LongTensor(language_ids)
 
-            # compute linear spectrogram
-            linear = None
-            if self.compute_linear_spec:
-                linear = [self.ap.spectrogram(w).astype("float32") for w in batch["wav"]]
-                linear = prepare_tensor(linear, self.outputs_per_step)
-                linear = linear.transpose(0, 2, 1)
-                assert mel.shape[1] == linear.shape[1]
-                linear = torch.FloatTensor(linear).contiguous()
-
             # format waveforms
             wav_padded = None
             if self.return_wav:
                 wav_lengths = [w.shape[0] for w in batch["wav"]]
-                max_wav_len = max(mel_lengths_adjusted) * self.ap.hop_length
+                max_wav_len = max_mel_len * self.ap.hop_length
                 wav_lengths = torch.LongTensor(wav_lengths)
                 wav_padded = torch.zeros(len(batch["wav"]), 1, max_wav_len)
                 for i, w in enumerate(batch["wav"]):
@@ -478,7 +535,7 @@ class TTSDataset(Dataset):
             # format F0
             if self.compute_f0:
                 pitch = prepare_data(batch["pitch"])
-                assert mel.shape[1] == pitch.shape[1], f"[!] {mel.shape} vs {pitch.shape}"
+                assert max_mel_len == pitch.shape[1], f"[!] {max_mel_len} vs {pitch.shape}"
                 pitch = torch.FloatTensor(pitch)[:, None, :].contiguous()  # B x 1 xT
             else:
                 pitch = None
@@ -488,7 +545,7 @@ class TTSDataset(Dataset):
             if batch["attn"][0] is not None:
                 attns = [batch["attn"][idx].T for idx in ids_sorted_decreasing]
                 for idx, attn in enumerate(attns):
-                    pad2 = mel.shape[1] - attn.shape[1]
+                    pad2 = max_mel_len - attn.shape[1]
                     pad1 = token_ids.shape[1] - attn.shape[0]
                     assert pad1 >= 0 and pad2 >= 0, f"[!] Negative padding - {pad1} and {pad2}"
                     attn = np.pad(attn, [[0, pad1], [0, pad2]])
@@ -512,6 +569,8 @@ class TTSDataset(Dataset):
                 "raw_text": batch["raw_text"],
                 "pitch": pitch,
                 "language_ids": language_ids,
+                "spec_waveform": spec_waveform,
+                "spec_waveform_lengths": spec_waveform_lengths,
             }
 
         raise TypeError(
@@ -524,12 +583,321 @@ class TTSDataset(Dataset):
         )
 
 
+def pad_spectrogram(spec: torch.Tensor, max_len: int) -> torch.Tensor:
+    """Zero pad `[B, C, T]` spectrograms to `max_len` frames and return them as `[B, T, C]`."""
+    spec = torch.nn.functional.pad(spec, (0, max_len - spec.shape[2]))
+    return spec.transpose(1, 2).contiguous()
+
+
+def get_audio_processor_hash(ap: AudioProcessor, compute_linear_spec: bool = False) -> str:
+    """Return a hash of the `AudioProcessor` parameters, normalization stats and filters."""
+    md5 = hashlib.md5()
+    for key, value in sorted(ap.__dict__.items()):
+        if isinstance(value, np.ndarray):
+            md5.update(key.encode("utf-8") + value.tobytes())
+        elif value is None or isinstance(value, (str, int, float, bool)):
+            md5.update(f"{key}:{value}".encode("utf-8"))
+    # the stats loaded from `stats_path`, so the store is rebuilt if the stats file changes at the same path
+    for key in ("mel_scaler", "linear_scaler"):
+        scaler = getattr(ap, key, None)
+        if scaler is not None:
+            md5.update(key.encode("utf-8") + np.asarray(scaler.mean_).tobytes() + np.asarray(scaler.scale_).tobytes())
+    md5.update(f"compute_linear_spec:{compute_linear_spec}".encode("utf-8"))
+    return md5.hexdigest()
+
+
+class FeatureStore:
+    """Store of pre-computed spectrograms in memory-mapped shards.
+
+    Each shard has a `<shard>_mel.npy` and optionally a `<shard>_linear.npy` array keeping the frames of its samples
+    concatenated on the time axis as `[T, C]`. `index.json` keeps the `AudioProcessor` hash and the shard, the frame
+    offset, the number of frames and the number of audio samples of each audio file. Features are returned as `[C, T]`
+    views of the memory-mapped arrays without copying.
+
+    The store is rebuilt if the `AudioProcessor` hash changes. New samples are written to new shards.
+
+    Args:
+        cache_path (str): Path to the store folder.
+        ap (AudioProcessor): Audio processor to compute the features.
+        compute_linear_spec (bool): Store linear spectrograms too. Defaults to False.
+        shard_size (int): Number of samples in a shard. Defaults to 1000.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_path: str, ap: AudioProcessor, compute_linear_spec: bool = False, shard_size: int = 1000):
+        self.cache_path = cache_path
+        self.ap = ap
+        self.compute_linear_spec = compute_linear_spec
+        self.shard_size = shard_size
+        self.ap_hash = get_audio_processor_hash(ap, compute_linear_spec)
+        self.index = {}
+        self.shards = []
+        self._arrays = {}
+        self.load_index()
+
+    def load_index(self):
+        self.index = {}
+        self.shards = []
+        self._arrays = {}
+        index_path = os.path.join(self.cache_path, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index["ap_hash"] != self.ap_hash:
+            print(" > Audio parameters have changed. The feature store is invalidated.")
+            return
+        self.index = index["entries"]
+        self.shards = index["shards"]
+
+    def _write_index(self):
+        index = {"ap_hash": self.ap_hash, "shards": self.shards, "entries": self.index}
+        tmp_path = os.path.join(self.cache_path, self.INDEX_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, os.path.join(self.cache_path, self.INDEX_FILE))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getstate__(self):
+        # reopen the memory-maps in the dataloader workers instead of copying the arrays
+        state = self.__dict__.copy()
+        state["_arrays"] = {}
+        return state
+
+    def _get_array(self, shard: str, feature: str) -> np.ndarray:
+        key = f"{shard}_{feature}"
+        if key not in self._arrays:
+            self._arrays[key] = np.load(os.path.join(self.cache_path, key + ".npy"), mmap_mode="r")
+        return self._arrays[key]
+
+    def contains(self, audio_file: str) -> bool:
+        return audio_file in self.index
+
+    def get(self, audio_file: str) -> Dict:
+        """Return the `mel`, `linear` and `audio_length` of the audio file or None if it is not in the store."""
+        if audio_file not in self.index:
+            return None
+        shard, offset, num_frames, audio_length = self.index[audio_file]
+        mel = self._get_array(shard, "mel")[offset : offset + num_frames].T
+        linear = None
+        if self.compute_linear_spec:
+            linear = self._get_array(shard, "linear")[offset : offset + num_frames].T
+        return {"mel": mel, "linear": linear, "audio_length": audio_length}
+
+    def compute_shard(self, shard: str, audio_files: List[str]) -> Dict:
+        """Compute the features of the audio files and write them to a new shard. Return the index entries."""
+        entries = {}
+        mels = []
+        linears = []
+        offset = 0
+        for audio_file in audio_files:
+            wav = np.asarray(self.ap.load_wav(audio_file), dtype=np.float32)
+            mel = self.ap.melspectrogram(wav).astype("float32")
+            mels.append(mel.T)
+            if self.compute_linear_spec:
+                linears.append(self.ap.spectrogram(wav).astype("float32").T)
+            entries[audio_file] = [shard, offset, mel.shape[1], len(wav)]
+            offset += mel.shape[1]
+        np.save(os.path.join(self.cache_path, f"{shard}_mel.npy"), np.concatenate(mels, axis=0))
+        if self.compute_linear_spec:
+            np.save(os.path.join(self.cache_path, f"{shard}_linear.npy"), np.concatenate(linears, axis=0))
+        return entries
+
+    def precompute(self, samples: List[Dict], num_workers: int = 0):
+        """Compute the features of the samples missing in the store. Each dataloader worker writes separate shards."""
+        audio_files = list(
+            dict.fromkeys(item["audio_file"] for item in samples if not self.contains(item["audio_file"]))
+        )
+        if not audio_files:
+            return
+        if not self.index:
+            # remove the outdated shards
+            if os.path.exists(self.cache_path):
+                for file_name in os.listdir(self.cache_path):
+                    if file_name.startswith("shard_"):
+                        os.remove(os.path.join(self.cache_path, file_name))
+            self.shards = []
+        os.makedirs(self.cache_path, exist_ok=True)
+        print(f"[*] Pre-computing features of {len(audio_files)} samples...")
+        shards = [f"shard_{len(self.shards) + i:05d}" for i in range(0, (len(audio_files) - 1) // self.shard_size + 1)]
+        dataset = _FeatureShardDataset(self, shards, audio_files)
+        dataloader = torch.utils.data.DataLoader(dataset, batch_size=None, shuffle=False, num_workers=num_workers)
+        for entries in tqdm.tqdm(dataloader, total=len(shards)):
+            self.index.update(entries)
+        self.shards += shards
+        self._write_index()
+
+    def print_logs(self, level: int = 0) -> None:
+        indent = "\t" * level
+        print(f"{indent}> FeatureStore ")
+        print(f"{indent}| > Number of instances : {len(self)}")
+        print(f"{indent}| > Number of shards : {len(self.shards)}")
+
+
+class _FeatureShardDataset(Dataset):
+    """Compute a shard of the `FeatureStore` per item."""
+
+    def __init__(self, store: FeatureStore, shards: List[str], audio_files: List[str]):
+        self.store = store
+        self.shards = shards
+        self.audio_files = audio_files
+
+    def __len__(self):
+        return len(self.shards)
+
+    def __getitem__(self, idx):
+        shard_size = self.store.shard_size
+        return self.store.compute_shard(self.shards[idx], self.audio_files[idx * shard_size : (idx + 1) * shard_size])
+
+
+def get_tokenizer_hash(tokenizer: "TTSTokenizer") -> str:
+    """Return a hash of the tokenizer settings that change the computed token IDs."""
+    tokenizer_config = {
+        "use_phonemes": tokenizer.use_phonemes,
+        "add_blank": tokenizer.add_blank,
+        "use_eos_bos": tokenizer.use_eos_bos,
+        "text_cleaner": tokenizer.text_cleaner.__name__ if tokenizer.text_cleaner is not None else None,
+        "phonemizer": tokenizer.phonemizer.name() if tokenizer.phonemizer is not None else None,
+        "language": tokenizer.phonemizer.language if tokenizer.phonemizer is not None else None,
+        "vocab": list(tokenizer.characters.vocab),
+    }
+    return hashlib.md5(json.dumps(tokenizer_config, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class PackedPhonemeCache:
+    """Phoneme cache keeping the token IDs of all the samples in a single file.
+
+    The cache folder has 3 files:
+        - `phonemes.npy`: The token IDs of all the samples concatenated into a single `int32` array.
+        - `offsets.npy`: The start offset of each sample in `phonemes.npy`, followed by the total length.
+        - `index.json`: The tokenizer hash and the position and the text hash of each sample.
+
+    The arrays are memory-mapped at load. Samples are keyed by the audio file name as in the per-file cache. An entry
+    is invalid if the text of the sample changes and the whole cache is invalid if the tokenizer hash changes.
+
+    Args:
+        cache_path (str): Path to the cache folder.
+        tokenizer_hash (str): Hash of the tokenizer settings. See `get_tokenizer_hash()`.
+    """
+
+    INDEX_FILE = "index.json"
+    PHONEMES_FILE = "phonemes.npy"
+    OFFSETS_FILE = "offsets.npy"
+
+    def __init__(self, cache_path: str, tokenizer_hash: str):
+        self.cache_path = cache_path
+        self.tokenizer_hash = tokenizer_hash
+        self.index = {}
+        self._phonemes = None
+        self._offsets = None
+        self.load_index()
+
+    @staticmethod
+    def get_key(wav_file: str) -> str:
+        return os.path.splitext(os.path.basename(wav_file))[0]
+
+    @staticmethod
+    def get_text_hash(text: str) -> str:
+        return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+    def load_index(self):
+        self.index = {}
+        self._phonemes = None
+        self._offsets = None
+        index_path = os.path.join(self.cache_path, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index["tokenizer_hash"] != self.tokenizer_hash:
+            print(" > Tokenizer has changed. The packed phoneme cache is invalidated.")
+            return
+        self.index = {key: (idx, text_hash) for idx, (key, text_hash) in enumerate(index["entries"])}
+
+    @property
+    def phonemes(self):
+        if self._phonemes is None:
+            self._phonemes = np.load(os.path.join(self.cache_path, self.PHONEMES_FILE), mmap_mode="r")
+        return self._phonemes
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._offsets = np.load(os.path.join(self.cache_path, self.OFFSETS_FILE), mmap_mode="r")
+        return self._offsets
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getstate__(self):
+        # reopen the memory-maps in the dataloader workers instead of copying the arrays
+        state = self.__dict__.copy()
+        state["_phonemes"] = None
+        state["_offsets"] = None
+        return state
+
+    def contains(self, wav_file: str, text: str) -> bool:
+        entry = self.index.get(self.get_key(wav_file))
+        return entry is not None and entry[1] == self.get_text_hash(text)
+
+    def get(self, wav_file: str, text: str) -> np.ndarray:
+        """Return the cached token IDs or None if the sample is not cached or its text has changed."""
+        if not self.contains(wav_file, text):
+            return None
+        idx = self.index[self.get_key(wav_file)][0]
+        return np.array(self.phonemes[self.offsets[idx] : self.offsets[idx + 1]])
+
+    def write(self, entries: List[Dict]):
+        """Add new entries to the cache and rewrite the cache files.
+
+        Args:
+            entries (List[Dict]): List of `{"audio_file", "text", "token_ids"}` dicts. They override the existing
+                entries with the same key.
+        """
+        new_entries = collections.OrderedDict()
+        for key, (idx, text_hash) in self.index.items():
+            new_entries[key] = (text_hash, self.phonemes[self.offsets[idx] : self.offsets[idx + 1]])
+        for entry in entries:
+            key = self.get_key(entry["audio_file"])
+            new_entries[key] = (self.get_text_hash(entry["text"]), np.asarray(entry["token_ids"], dtype=np.int32))
+        lengths = [len(token_ids) for _, token_ids in new_entries.values()]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        phonemes = np.zeros(offsets[-1], dtype=np.int32)
+        for idx, (_, token_ids) in enumerate(new_entries.values()):
+            phonemes[offsets[idx] : offsets[idx + 1]] = token_ids
+        index = {
+            "tokenizer_hash": self.tokenizer_hash,
+            "entries": [[key, text_hash] for key, (text_hash, _) in new_entries.items()],
+        }
+        # write to temporary files and rename them to not leave a broken cache behind
+        os.makedirs(self.cache_path, exist_ok=True)
+        self._phonemes = None
+        self._offsets = None
+        for file_name, array in [(self.PHONEMES_FILE, phonemes), (self.OFFSETS_FILE, offsets)]:
+            tmp_path = os.path.join(self.cache_path, file_name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, os.path.join(self.cache_path, file_name))
+        tmp_path = os.path.join(self.cache_path, self.INDEX_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, os.path.join(self.cache_path, self.INDEX_FILE))
+        self.load_index()
+
+
 class PhonemeDataset(Dataset):
     """Phoneme Dataset for converting input text to phonemes and then token IDs
 
     At initialization, it pre-computes the phonemes under `cache_path` and loads them in training to reduce data
     loading latency. If `cache_path` is already present, it skips the pre-computation.
 
+    With the `packed` cache format, phonemes are stored in a single `PackedPhonemeCache` and only the missing or
+    outdated samples are pre-computed.
+
     Args:
         samples (Union[List[List], List[Dict]]):
             List of samples. Each sample is a list or a dict.
@@ -542,6 +910,9 @@ class PhonemeDataset(Dataset):
 
         precompute_num_workers (int):
             Number of workers used for pre-computing the phonemes. Defaults to 0.
+
+        cache_format (str):
+            `files` to write a `.npy` file per sample or `packed` to use a `PackedPhonemeCache`. Defaults to `files`.
     """
 
     def __init__(
@@ -550,11 +921,19 @@ class PhonemeDataset(Dataset):
         tokenizer: "TTSTokenizer",
         cache_path: str,
         precompute_num_workers=0,
+        cache_format: str = "files",
     ):
+        if cache_format not in ["files", "packed"]:
+            raise ValueError(f" [!] Unknown phoneme cache format: {cache_format}")
         self.samples = samples
         self.tokenizer = tokenizer
         self.cache_path = cache_path
-        if cache_path is not None and not os.path.exists(cache_path):
+        self.cache_format = cache_format
+        self.packed_cache = None
+        if cache_path is not None and cache_format == "packed":
+            self.packed_cache = PackedPhonemeCache(cache_path, get_tokenizer_hash(tokenizer))
+            self.precompute_packed(precompute_num_workers)
+        elif cache_path is not None and not os.path.exists(cache_path):
             os.makedirs(cache_path)
             self.precompute(precompute_num_workers)
 
@@ -572,6 +951,12 @@ class PhonemeDataset(Dataset):
 
         If the phonemes are already cached, load them from cache.
         """
+        if self.packed_cache is not None:
+            ids = self.packed_cache.get(wav_file, text)
+            if ids is None:
+                # the packed cache is only written by `precompute_packed()`
+                ids = self.tokenizer.text_to_ids(text)
+            return ids
         file_name = os.path.splitext(os.path.basename(wav_file))[0]
         file_ext = "_phoneme.npy"
         cache_path = os.path.join(self.cache_path, file_name + file_ext)
@@ -600,6 +985,35 @@ class PhonemeDataset(Dataset):
             for _ in dataloder:
                 pbar.update(batch_size)
 
+    def precompute_packed(self, num_workers=1):
+        """Precompute phonemes of the samples missing in the packed cache and rewrite the cache."""
+        missing_idxs = [
+            idx
+            for idx, item in enumerate(self.samples)
+            if not self.packed_cache.contains(item["audio_file"], item["text"])
+        ]
+        if not missing_idxs:
+            return
+        print(f"[*] Pre-computing phonemes of {len(missing_idxs)} samples...")
+        entries = []
+        with tqdm.tqdm(total=len(missing_idxs)) as pbar:
+            batch_size = num_workers if num_workers > 0 else 1
+            dataloder = torch.utils.data.DataLoader(
+                batch_size=batch_size,
+                dataset=torch.utils.data.Subset(self, missing_idxs),
+                shuffle=False,
+                num_workers=num_workers,
+                collate_fn=list,
+            )
+            for batch in dataloder:
+                for item in batch:
+                    sample = self.samples[missing_idxs[len(entries)]]
+                    entries.append(
+                        {"audio_file": sample["audio_file"], "text": item["text"], "token_ids": item["token_ids"]}
+                    )
+                pbar.update(len(batch))
+        self.packed_cache.write(entries)
+
     def collate_fn(self, batch):
         ids = [item["token_ids"] for item in batch]
         ids_lens = [item["token_ids_len"] for item in batch]
@@ -618,6 +1032,8 @@ class PhonemeDataset(Dataset):
         print(f"{indent}| > Tokenizer:")
         self.tokenizer.print_logs(level + 1)
         print(f"{indent}| > Number of instances : {len(self.samples)}")
+        if self.packed_cache is not None:
+            print(f"{indent}| > Number of cached instances : {len(self.packed_cache)}")
 
 
 class F0Dataset:
@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import soundfile as sf
+
+
+def probe_audio_length(audio_file: str) -> int:
+    """Return the number of samples of an audio file by only reading its header.
+
+    Falls back to estimating the length by the file size, assuming 16-bit audio, if the format is not supported by
+    `soundfile`.
+    """
+    try:
+        return sf.info(audio_file).frames
+    except RuntimeError:
+        return int(os.path.getsize(audio_file) / 16 * 8)
+
+
+def load_audio_lengths(cache_path: str) -> Dict[str, int]:
+    """Load audio lengths saved by `save_audio_lengths()`."""
+    if cache_path is None or not os.path.exists(cache_path):
+        return {}
+    cache = np.load(cache_path)
+    return dict(zip(cache["audio_files"].tolist(), cache["audio_lengths"].tolist()))
+
+
+def save_audio_lengths(cache_path: str, audio_lengths: Dict[str, int]):
+    """Save audio lengths to a `.npz` file. The file is replaced atomically."""
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    tmp_path = cache_path + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        audio_files=np.array(list(audio_lengths.keys())),
+        audio_lengths=np.array(list(audio_lengths.values()), dtype=np.int64),
+    )
+    os.replace(tmp_path, cache_path)
+
+
+def compute_audio_lengths(audio_files: List[str], num_workers: int = 0, cache_path: str = None) -> np.ndarray:
+    """Compute the audio lengths in samples by probing the file headers in parallel.
+
+    Lengths are cached by the file path in the `cache_path` sidecar file, so only the new files are probed in the
+    next runs. Remove the file if the audio files are changed in place.
+
+    Args:
+        audio_files (List[str]): Paths of the audio files.
+        num_workers (int): Number of threads probing the files. If 0, use the `ThreadPoolExecutor` default.
+            Defaults to 0.
+        cache_path (str): Path to the `.npz` sidecar file. If None, lengths are not cached. Defaults to None.
+
+    Returns:
+        np.ndarray: Audio lengths.
+    """
+    audio_lengths = load_audio_lengths(cache_path)
+    missing_files = [audio_file for audio_file in dict.fromkeys(audio_files) if audio_file not in audio_lengths]
+    if missing_files:
+        with ThreadPoolExecutor(max_workers=num_workers or None) as executor:
+            audio_lengths.update(zip(missing_files, executor.map(probe_audio_length, missing_files)))
+        if cache_path is not None:
+            save_audio_lengths(cache_path, audio_lengths)
+    return np.fromiter(
+        (audio_lengths[audio_file] for audio_file in audio_files), dtype=np.int64, count=len(audio_files)
+    )
+
+
+class SampleTable:
+    """Columnar view of the dataset samples to filter, sort and group them with array operations.
+
+    Args:
+        samples (List[Dict]): Dataset samples.
+        audio_lengths (np.ndarray): Number of audio samples of each sample.
+
+    Attributes:
+        text_lengths (np.ndarray): Number of characters of the sample texts.
+        speaker_names (np.ndarray): Unique speaker names. `speaker_names[speaker_ids]` gives the sample speakers.
+        speaker_ids (np.ndarray): Speaker index of each sample.
+        language_names (np.ndarray): Unique language names.
+        language_ids (np.ndarray): Language index of each sample.
+    """
+
+    def __init__(self, samples: List[Dict], audio_lengths: np.ndarray):
+        self.samples = samples
+        self.audio_lengths = np.asarray(audio_lengths, dtype=np.int64)
+        self.text_lengths = np.fromiter((len(item["text"]) for item in samples), dtype=np.int64, count=len(samples))
+        self.speaker_names, self.speaker_ids = self._to_ids([item.get("speaker_name") for item in samples])
+        self.language_names, self.language_ids = self._to_ids([item.get("language") for item in samples])
+
+    @classmethod
+    def from_samples(cls, samples: List[Dict], num_workers: int = 0, cache_path: str = None) -> "SampleTable":
+        """Create a table probing the audio lengths. See `compute_audio_lengths()`."""
+        audio_lengths = compute_audio_lengths([item["audio_file"] for item in samples], num_workers, cache_path)
+        return cls(samples, audio_lengths)
+
+    @staticmethod
+    def _to_ids(names: List[str]):
+        names = np.array(["" if name is None else str(name) for name in names])
+        if len(names) == 0:
+            return names, np.zeros(0, dtype=np.int64)
+        return np.unique(names, return_inverse=True)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def length_mask(
+        self,
+        min_text_len: int = 0,
+        max_text_len: int = float("inf"),
+        min_audio_len: int = 0,
+        max_audio_len: int = float("inf"),
+    ) -> np.ndarray:
+        """Return a boolean mask of the samples in the given length ranges."""
+        return (
+            (self.text_lengths >= min_text_len)
+            & (self.text_lengths <= max_text_len)
+            & (self.audio_lengths >= min_audio_len)
+            & (self.audio_lengths <= max_audio_len)
+        )
+
+    def select(self, idxs: np.ndarray) -> "SampleTable":
+        """Return a new table with the samples at the given indices."""
+        idxs = np.asarray(idxs, dtype=np.int64)
+        table = SampleTable.__new__(SampleTable)
+        table.samples = [self.samples[idx] for idx in idxs.tolist()]
+        table.audio_lengths = self.audio_lengths[idxs]
+        table.text_lengths = self.text_lengths[idxs]
+        table.speaker_names = self.speaker_names
+        table.speaker_ids = self.speaker_ids[idxs]
+        table.language_names = self.language_names
+        table.language_ids = self.language_ids[idxs]
+        return table
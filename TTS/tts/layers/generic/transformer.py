@@ -26,7 +26,9 @@ class FFTransformer(nn.Module):
         src = self.norm1(src + src2)
         # T x B x D -> B x D x T
         src = src.permute(1, 2, 0)
-        src2 = self.conv2(F.relu(self.conv1(src)))
+        # zero the padding frames not to leak them into the valid frames by the convolutions.
+        conv_mask = 1 if src_key_padding_mask is None else (~src_key_padding_mask).unsqueeze(1).to(src.dtype)
+        src2 = self.conv2(F.relu(self.conv1(src * conv_mask)) * conv_mask)
         src2 = self.dropout2(src2)
         src = src + src2
         src = src.transpose(1, 2)
@@ -196,14 +196,10 @@ class RelativePositionMultiHeadAttention(nn.Module):
 
     def _get_relative_embeddings(self, relative_embeddings, length):
         """Convert embedding vestors to a tensor of embeddings"""
-        # Pad first before slice to avoid using cond ops.
-        pad_length = max(length - (self.rel_attn_window_size + 1), 0)
-        slice_start_position = max((self.rel_attn_window_size + 1) - length, 0)
+        # Pad by `length` on both sides to cover any length without cond ops, which tracing would freeze.
+        padded_relative_embeddings = F.pad(relative_embeddings, [0, 0, length, length, 0, 0])
+        slice_start_position = self.rel_attn_window_size + 1
         slice_end_position = slice_start_position + 2 * length - 1
-        if pad_length > 0:
-            padded_relative_embeddings = F.pad(relative_embeddings, [0, 0, pad_length, pad_length, 0, 0])
-        else:
-            padded_relative_embeddings = relative_embeddings
         used_relative_embeddings = padded_relative_embeddings[:, slice_start_position:slice_end_position]
         return used_relative_embeddings
 
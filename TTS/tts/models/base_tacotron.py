@@ -111,6 +111,11 @@ class BaseTacotron(BaseTTS):
             print(f" > Model's reduction rate `r` is set to: {self.decoder.r}")
             assert not self.training
 
+    def load_inference_state(self, config, state):
+        super().load_inference_state(config, state)
+        self.decoder.set_r(state.get("r", config.r))
+        print(f" > Model's reduction rate `r` is set to: {self.decoder.r}")
+
     def get_criterion(self) -> nn.Module:
         """Get the model criterion used in training."""
         return TacotronLoss(self.config)
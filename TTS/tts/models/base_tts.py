@@ -6,15 +6,16 @@ import torch
 import torch.distributed as dist
 from coqpit import Coqpit
 from torch import nn
-from torch.utils.data import DataLoader
+from torch.utils.data import DataLoader, Sampler
 from torch.utils.data.distributed import DistributedSampler
 
 from TTS.model import BaseTrainerModel
-from TTS.tts.datasets.dataset import TTSDataset
+from TTS.tts.datasets.dataset import TTSDataset, pad_spectrogram
 from TTS.tts.utils.languages import LanguageManager, get_language_weighted_sampler
 from TTS.tts.utils.speakers import SpeakerManager, get_speaker_weighted_sampler
 from TTS.tts.utils.synthesis import synthesis
 from TTS.tts.utils.visual import plot_alignment, plot_spectrogram
+from TTS.utils.samplers import BucketBatchSampler
 
 # pylint: skip-file
 
@@ -230,8 +231,50 @@ class BaseTTS(BaseTrainerModel):
             "waveform": waveform,
             "pitch": pitch,
             "language_ids": language_ids,
+            "spec_waveform": batch.get("spec_waveform"),
+            "spec_waveform_lengths": batch.get("spec_waveform_lengths"),
         }
 
+    def format_batch_on_device(self, batch: Dict) -> Dict:
+        """Compute the spectrograms on the device if the data loader returns the padded waveforms.
+
+        See `spectrogram_mode` in `BaseTTSConfig`.
+        """
+        if batch.get("spec_waveform") is None:
+            return batch
+        compute_linear_spec = self.config.model.lower() == "tacotron" or self.config.compute_linear_spec
+        mel, linear, _ = self.ap.batch_spectrograms(
+            batch["spec_waveform"], batch["spec_waveform_lengths"], compute_linear_spec
+        )
+        # spectrogram length padded wrt the reduction factor
+        max_len = batch["stop_targets"].shape[1] * self.config.r
+        batch["mel_input"] = pad_spectrogram(mel, max_len)
+        if linear is not None:
+            batch["linear_input"] = pad_spectrogram(linear, max_len)
+        return batch
+
+    def get_bucket_batch_sampler(
+        self, config: Coqpit, dataset: TTSDataset, sampler: Sampler, is_eval: bool, num_gpus: int, rank: int = None
+    ) -> BucketBatchSampler:
+        """Return a batch sampler limiting the padded batches to `config.batch_max_frames` spectrogram frames.
+
+        `sampler` must draw from the whole dataset since the batch sampler splits the batches among the DDP processes.
+        """
+        print(" > Using bucket batch sampler")
+        lengths = dataset.sample_table.audio_lengths // config.audio.hop_length + 1
+        return BucketBatchSampler(
+            sampler,
+            lengths,
+            max_frames=config.batch_max_frames,
+            max_batch_size=config.eval_batch_size if is_eval else config.batch_size,
+            bucket_size=config.batch_bucket_size,
+            shuffle=not is_eval,
+            num_replicas=max(num_gpus, 1),
+            rank=rank or 0,
+            seed=getattr(config, "training_seed", 0),
+            verbose=dataset.verbose,
+        )
+
     def get_data_loader(
         self,
         config: Coqpit,
@@ -283,13 +326,17 @@ class BaseTTS(BaseTrainerModel):
                 min_audio_len=config.min_audio_len,
                 max_audio_len=config.max_audio_len,
                 phoneme_cache_path=config.phoneme_cache_path,
+                phoneme_cache_format=config.phoneme_cache_format,
                 precompute_num_workers=config.precompute_num_workers,
+                feature_store_path=config.feature_store_path,
+                spectrogram_mode=config.spectrogram_mode,
                 use_noise_augment=False if is_eval else config.use_noise_augment,
                 verbose=verbose,
                 speaker_id_mapping=speaker_id_mapping,
                 d_vector_mapping=d_vector_mapping if config.use_d_vector_file else None,
                 tokenizer=self.tokenizer,
                 start_by_longest=config.start_by_longest,
+                audio_lengths_cache_path=config.audio_lengths_cache_path,
                 language_id_mapping=language_id_mapping,
             )
 
@@ -304,32 +351,42 @@ class BaseTTS(BaseTrainerModel):
             sampler = DistributedSampler(dataset) if num_gpus > 1 else None
 
             # Weighted samplers
-            # TODO: make this DDP amenable
-            assert not (
-                num_gpus > 1 and getattr(config, "use_language_weighted_sampler", False)
-            ), "language_weighted_sampler is not supported with DistributedSampler"
-            assert not (
-                num_gpus > 1 and getattr(config, "use_speaker_weighted_sampler", False)
-            ), "speaker_weighted_sampler is not supported with DistributedSampler"
-
-            if sampler is None:
-                if getattr(config, "use_language_weighted_sampler", False):
-                    print(" > Using Language weighted sampler")
-                    sampler = get_language_weighted_sampler(dataset.samples)
-                elif getattr(config, "use_speaker_weighted_sampler", False):
-                    print(" > Using Language weighted sampler")
-                    sampler = get_speaker_weighted_sampler(dataset.samples)
-
-            loader = DataLoader(
-                dataset,
-                batch_size=config.eval_batch_size if is_eval else config.batch_size,
-                shuffle=False,  # shuffle is done in the dataset.
-                collate_fn=dataset.collate_fn,
-                drop_last=False,  # setting this False might cause issues in AMP training.
-                sampler=sampler,
-                num_workers=config.num_eval_loader_workers if is_eval else config.num_loader_workers,
-                pin_memory=False,
-            )
+            # the bucket batch sampler splits the batches among the DDP processes, so it takes the draws of all of them
+            num_replicas = num_gpus if num_gpus > 1 and config.batch_max_frames is None else 1
+            if getattr(config, "use_language_weighted_sampler", False):
+                print(" > Using Language weighted sampler")
+                sampler = get_language_weighted_sampler(
+                    dataset.samples, num_replicas, rank or 0, getattr(config, "training_seed", 0)
+                )
+            elif getattr(config, "use_speaker_weighted_sampler", False):
+                print(" > Using Speaker weighted sampler")
+                sampler = get_speaker_weighted_sampler(
+                    dataset.samples, num_replicas, rank or 0, getattr(config, "training_seed", 0)
+                )
+
+            if config.batch_max_frames is not None:
+                # batches are split among the DDP processes by the batch sampler
+                if isinstance(sampler, DistributedSampler):
+                    sampler = None
+                batch_sampler = self.get_bucket_batch_sampler(config, dataset, sampler, is_eval, num_gpus, rank)
+                loader = DataLoader(
+                    dataset,
+                    batch_sampler=batch_sampler,
+                    collate_fn=dataset.collate_fn,
+                    num_workers=config.num_eval_loader_workers if is_eval else config.num_loader_workers,
+                    pin_memory=False,
+                )
+            else:
+                loader = DataLoader(
+                    dataset,
+                    batch_size=config.eval_batch_size if is_eval else config.batch_size,
+                    shuffle=False,  # shuffle is done in the dataset.
+                    collate_fn=dataset.collate_fn,
+                    drop_last=False,  # setting this False might cause issues in AMP training.
+                    sampler=sampler,
+                    num_workers=config.num_eval_loader_workers if is_eval else config.num_loader_workers,
+                    pin_memory=False,
+                )
         return loader
 
     def _get_test_aux_input(
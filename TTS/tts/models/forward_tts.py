@@ -314,6 +314,7 @@ class ForwardTTS(BaseTTS):
         3. Apply masking.
         4. Cast 0 durations to 1.
         5. Round the duration values.
+        6. Zero the durations of the padding characters.
 
         Args:
             o_dr_log: Log scale durations.
@@ -325,7 +326,7 @@ class ForwardTTS(BaseTTS):
         """
         o_dr = (torch.exp(o_dr_log) - 1) * x_mask * self.length_scale
         o_dr[o_dr < 1] = 1.0
-        o_dr = torch.round(o_dr)
+        o_dr = torch.round(o_dr) * x_mask
         return o_dr
 
     def _forward_encoder(
@@ -580,6 +581,9 @@ class ForwardTTS(BaseTTS):
     def inference(self, x, aux_input={"d_vectors": None, "speaker_ids": None}):  # pylint: disable=unused-argument
         """Model's inference pass.
 
+        Note:
+            To run in batch mode, provide `x_lengths` in `aux_input` else model assumes that the batch size is 1.
+
         Args:
             x (torch.LongTensor): Input character sequence.
             aux_input (Dict): Auxiliary model inputs. Defaults to `{"d_vectors": None, "speaker_ids": None}`.
@@ -590,7 +594,10 @@ class ForwardTTS(BaseTTS):
             - g: [B, C]
         """
         g = self._set_speaker_input(aux_input)
-        x_lengths = torch.tensor(x.shape[1:2]).to(x.device)
+        if aux_input.get("x_lengths", None) is not None:
+            x_lengths = aux_input["x_lengths"]
+        else:
+            x_lengths = torch.tensor(x.shape[1:2]).to(x.device)
         x_mask = torch.unsqueeze(sequence_mask(x_lengths, x.shape[1]), 1).to(x.dtype).float()
         # encoder pass
         o_en, x_mask, g, _ = self._forward_encoder(x, x_mask, g)
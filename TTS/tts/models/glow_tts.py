@@ -349,7 +349,8 @@ class GlowTTS(BaseTTS):
         o_mean, o_log_scale, o_dur_log, x_mask = self.encoder(x, x_lengths, g=g)
         # compute output durations
         w = (torch.exp(o_dur_log) - 1) * x_mask * self.length_scale
-        w_ceil = torch.clamp_min(torch.ceil(w), 1)
+        # padding tokens get no frames, so the outputs of a batch item do not depend on the batch padding
+        w_ceil = torch.clamp_min(torch.ceil(w), 1) * x_mask
         y_lengths = torch.clamp_min(torch.sum(w_ceil, [1, 2]), 1).long()
         y_max_length = None
         # compute masks
@@ -530,6 +531,11 @@ class GlowTTS(BaseTTS):
             self.store_inverse()
             assert not self.training
 
+    def load_inference_state(self, config, state):
+        # the inverse weights are saved in the checkpoint, create them to load their values
+        self.store_inverse()
+        super().load_inference_state(config, state)
+
     @staticmethod
     def get_criterion():
         from TTS.tts.layers.losses import GlowTTSLoss  # pylint: disable=import-outside-toplevel
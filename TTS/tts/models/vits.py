@@ -1341,10 +1341,12 @@ class Vits(BaseTTS):
                 min_audio_len=config.min_audio_len,
                 max_audio_len=config.max_audio_len,
                 phoneme_cache_path=config.phoneme_cache_path,
+                phoneme_cache_format=config.phoneme_cache_format,
                 precompute_num_workers=config.precompute_num_workers,
                 verbose=verbose,
                 tokenizer=self.tokenizer,
                 start_by_longest=config.start_by_longest,
+                audio_lengths_cache_path=config.audio_lengths_cache_path,
             )
 
             # wait all the DDP process to be ready
@@ -1358,31 +1360,42 @@ class Vits(BaseTTS):
             sampler = DistributedSampler(dataset) if num_gpus > 1 else None
 
             # Weighted samplers
-            # TODO: make this DDP amenable
-            assert not (
-                num_gpus > 1 and getattr(config, "use_language_weighted_sampler", False)
-            ), "language_weighted_sampler is not supported with DistributedSampler"
-            assert not (
-                num_gpus > 1 and getattr(config, "use_speaker_weighted_sampler", False)
-            ), "speaker_weighted_sampler is not supported with DistributedSampler"
-
-            if sampler is None:
-                if getattr(config, "use_language_weighted_sampler", False):
-                    print(" > Using Language weighted sampler")
-                    sampler = get_language_weighted_sampler(dataset.samples)
-                elif getattr(config, "use_speaker_weighted_sampler", False):
-                    print(" > Using Language weighted sampler")
-                    sampler = get_speaker_weighted_sampler(dataset.samples)
-
-            loader = DataLoader(
-                dataset,
-                batch_size=config.eval_batch_size if is_eval else config.batch_size,
-                shuffle=False,  # shuffle is done in the dataset.
-                drop_last=False,  # setting this False might cause issues in AMP training.
-                collate_fn=dataset.collate_fn,
-                num_workers=config.num_eval_loader_workers if is_eval else config.num_loader_workers,
-                pin_memory=False,
-            )
+            # the bucket batch sampler splits the batches among the DDP processes, so it takes the draws of all of them
+            num_replicas = num_gpus if num_gpus > 1 and config.batch_max_frames is None else 1
+            if getattr(config, "use_language_weighted_sampler", False):
+                print(" > Using Language weighted sampler")
+                sampler = get_language_weighted_sampler(
+                    dataset.samples, num_replicas, rank or 0, getattr(config, "training_seed", 0)
+                )
+            elif getattr(config, "use_speaker_weighted_sampler", False):
+                print(" > Using Speaker weighted sampler")
+                sampler = get_speaker_weighted_sampler(
+                    dataset.samples, num_replicas, rank or 0, getattr(config, "training_seed", 0)
+                )
+
+            if config.batch_max_frames is not None:
+                # batches are split among the DDP processes by the batch sampler
+                if isinstance(sampler, DistributedSampler):
+                    sampler = None
+                batch_sampler = self.get_bucket_batch_sampler(config, dataset, sampler, is_eval, num_gpus, rank)
+                loader = DataLoader(
+                    dataset,
+                    batch_sampler=batch_sampler,
+                    collate_fn=dataset.collate_fn,
+                    num_workers=config.num_eval_loader_workers if is_eval else config.num_loader_workers,
+                    pin_memory=False,
+                )
+            else:
+                loader = DataLoader(
+                    dataset,
+                    batch_size=config.eval_batch_size if is_eval else config.batch_size,
+                    shuffle=False,  # shuffle is done in the dataset.
+                    drop_last=False,  # setting this False might cause issues in AMP training.
+                    collate_fn=dataset.collate_fn,
+                    sampler=sampler,
+                    num_workers=config.num_eval_loader_workers if is_eval else config.num_loader_workers,
+                    pin_memory=False,
+                )
         return loader
 
     def get_optimizer(self) -> List:
@@ -0,0 +1,244 @@
+import json
+import os
+from collections.abc import Mapping
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+def get_index_path(file_path: str) -> str:
+    return os.path.splitext(file_path)[0] + ".index.json"
+
+
+def get_means_path(file_path: str) -> str:
+    return os.path.splitext(file_path)[0] + ".means.npy"
+
+
+class EmbeddingStore:
+    """Embedding matrix with clip and speaker indexes for fast d_vector lookups.
+
+    The store is saved to 3 files sharing the same stem:
+
+    - `<stem>.npy`: float32 embedding matrix `[num_clips, dim]`, memory-mapped at load.
+    - `<stem>.means.npy`: float32 speaker mean embeddings `[num_speakers, dim]`.
+    - `<stem>.index.json`: clip names, speaker names and the speaker index of each clip.
+
+    Args:
+        embeddings (np.ndarray): Embedding matrix `[num_clips, dim]`.
+        clips (List[str]): Clip name of each row.
+        speaker_names (List[str]): Unique speaker names.
+        clip_speaker_ids (np.ndarray): Index in `speaker_names` of each row.
+        speaker_means (np.ndarray): Mean embedding of each speaker. Computed if None. Defaults to None.
+        file_path (str): Path of the saved embedding matrix. Used to reload the memory map in other processes.
+            Defaults to None.
+
+    Examples:
+        >>> store = EmbeddingStore.from_dict(SpeakerManager._load_json("speakers.json"))
+        >>> store.save("speakers.npy")
+        >>> store = EmbeddingStore.load("speakers.npy")
+        >>> store.search_speakers(store.get_embedding("clip.wav"), k=3)
+        [('speaker_a', 0.98), ('speaker_b', 0.61), ('speaker_c', 0.59)]
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        clips: List[str],
+        speaker_names: List[str],
+        clip_speaker_ids: np.ndarray,
+        speaker_means: np.ndarray = None,
+        file_path: str = None,
+    ):
+        self.embeddings = embeddings
+        self.clips = list(clips)
+        self.speaker_names = list(speaker_names)
+        self.clip_speaker_ids = np.asarray(clip_speaker_ids, dtype=np.int64)
+        self.file_path = file_path
+        self.clip_index = {clip: idx for idx, clip in enumerate(self.clips)}
+        self.speaker_index = {name: idx for idx, name in enumerate(self.speaker_names)}
+        # rows of each speaker in the clip order
+        order = np.argsort(self.clip_speaker_ids, kind="stable")
+        splits = np.cumsum(np.bincount(self.clip_speaker_ids, minlength=len(self.speaker_names)))[:-1]
+        self.speaker_rows = np.split(order, splits)
+        self.speaker_means = self.compute_speaker_means() if speaker_means is None else speaker_means
+        self._normalized_means = None
+        self._search_index = None
+
+    @classmethod
+    def from_dict(cls, d_vectors: Dict) -> "EmbeddingStore":
+        """Create a store from the `speakers.json` format `{clip: {"name": speaker, "embedding": [...]}}`."""
+        clips = list(d_vectors.keys())
+        names = [str(d_vectors[clip]["name"]) for clip in clips]
+        speaker_names, clip_speaker_ids = np.unique(np.array(names, dtype=str), return_inverse=True)
+        if clips:
+            embeddings = np.array([d_vectors[clip]["embedding"] for clip in clips], dtype=np.float32)
+        else:
+            embeddings = np.zeros((0, 0), dtype=np.float32)
+        return cls(embeddings, clips, speaker_names.tolist(), clip_speaker_ids)
+
+    @classmethod
+    def load(cls, file_path: str, mmap: bool = True) -> "EmbeddingStore":
+        """Load a store saved by `save()`. The embedding matrix is memory-mapped if `mmap`."""
+        with open(get_index_path(file_path), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        embeddings = np.load(file_path, mmap_mode="r" if mmap else None)
+        speaker_means = np.load(get_means_path(file_path))
+        return cls(
+            embeddings,
+            index["clips"],
+            index["speaker_names"],
+            index["clip_speaker_ids"],
+            speaker_means=speaker_means,
+            file_path=file_path,
+        )
+
+    def save(self, file_path: str):
+        """Save the store. Files are replaced atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        index = {
+            "clips": self.clips,
+            "speaker_names": self.speaker_names,
+            "clip_speaker_ids": self.clip_speaker_ids.tolist(),
+        }
+        for path, array in [(file_path, self.embeddings), (get_means_path(file_path), self.speaker_means)]:
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, np.asarray(array, dtype=np.float32))
+            os.replace(path + ".tmp", path)
+        with open(get_index_path(file_path) + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(get_index_path(file_path) + ".tmp", get_index_path(file_path))
+
+    def __getstate__(self):
+        # do not pickle the memory map, reload it in the new process
+        state = self.__dict__.copy()
+        if self.file_path is not None and isinstance(self.embeddings, np.memmap):
+            state["embeddings"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.embeddings is None:
+            self.embeddings = np.load(self.file_path, mmap_mode="r")
+
+    def to_dict(self) -> Dict:
+        """Return the embeddings in the `speakers.json` format."""
+        return {clip: self[clip] for clip in self.clips}
+
+    def __len__(self):
+        return len(self.clips)
+
+    def __contains__(self, clip: str):
+        return clip in self.clip_index
+
+    def __getitem__(self, clip: str) -> Dict:
+        row = self.clip_index[clip]
+        return {
+            "name": self.speaker_names[self.clip_speaker_ids[row]],
+            "embedding": self.embeddings[row].tolist(),
+        }
+
+    @property
+    def dim(self) -> int:
+        return self.embeddings.shape[1] if len(self) > 0 else 0
+
+    def compute_speaker_means(self) -> np.ndarray:
+        if not self.speaker_names:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self.embeddings[rows].mean(0) for rows in self.speaker_rows]).astype(np.float32)
+
+    def get_embedding(self, clip: str) -> np.ndarray:
+        return np.asarray(self.embeddings[self.clip_index[clip]])
+
+    def get_embeddings_by_speaker(self, speaker_name: str) -> np.ndarray:
+        """Return the embeddings of a speaker `[num_clips, dim]` in the clip order."""
+        if speaker_name not in self.speaker_index:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.asarray(self.embeddings[self.speaker_rows[self.speaker_index[speaker_name]]])
+
+    def get_speaker_mean(self, speaker_name: str) -> np.ndarray:
+        return self.speaker_means[self.speaker_index[speaker_name]]
+
+    @staticmethod
+    def _normalize(x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float32)
+        return x / np.maximum(np.linalg.norm(x, axis=-1, keepdims=True), 1e-8)
+
+    @property
+    def normalized_means(self) -> np.ndarray:
+        if self._normalized_means is None:
+            self._normalized_means = self._normalize(self.speaker_means)
+        return self._normalized_means
+
+    def build_search_index(self, num_clusters: int = None, num_iters: int = 10, seed: int = 0):
+        """Cluster the speaker means by spherical k-means for the approximate search.
+
+        Args:
+            num_clusters (int): Number of clusters. Defaults to `sqrt(num_speakers)`.
+            num_iters (int): Number of k-means iterations. Defaults to 10.
+            seed (int): Random seed of the initial centroids. Defaults to 0.
+        """
+        vectors = self.normalized_means
+        num_clusters = min(num_clusters or max(int(np.sqrt(len(vectors))), 1), len(vectors))
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), num_clusters, replace=False)]
+        for _ in range(num_iters):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            # keep the old centroid of the empty clusters
+            empty = np.bincount(assignments, minlength=num_clusters) == 0
+            sums[empty] = centroids[empty]
+            centroids = self._normalize(sums)
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        self._search_index = (centroids, [np.where(assignments == c)[0] for c in range(num_clusters)])
+
+    def search_speakers(
+        self, query: np.ndarray, k: int = 1, approximate: bool = False, num_probes: int = 4
+    ) -> List[Tuple[str, float]]:
+        """Find the speakers with the closest mean embeddings to the query by the cosine similarity.
+
+        Args:
+            query (np.ndarray): Query embedding `[dim]`.
+            k (int): Number of speakers to return. Defaults to 1.
+            approximate (bool): Only compare the speakers in the `num_probes` closest clusters of the search index.
+                The index is built by `build_search_index()` at the first approximate search. Defaults to False.
+            num_probes (int): Number of clusters searched by the approximate search. Defaults to 4.
+
+        Returns:
+            List[Tuple[str, float]]: Speaker names and similarities from the most similar.
+        """
+        query = self._normalize(query)
+        candidates = np.arange(len(self.speaker_names))
+        if approximate:
+            if self._search_index is None:
+                self.build_search_index()
+            centroids, members = self._search_index
+            probes = np.argsort(-(centroids @ query))[:num_probes]
+            candidates = np.concatenate([members[c] for c in probes])
+        scores = self.normalized_means[candidates] @ query
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(candidates) else np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.speaker_names[candidates[i]], float(scores[i])) for i in top]
+
+
+class EmbeddingStoreMapping(Mapping):
+    """Read-only `{clip: {"name": speaker, "embedding": [...]}}` view of an `EmbeddingStore`.
+
+    It is used as `SpeakerManager.d_vectors` to keep the `speakers.json` interface without building the dictionary.
+    """
+
+    def __init__(self, store: EmbeddingStore):
+        self.store = store
+
+    def __getitem__(self, clip: str) -> Dict:
+        return self.store[clip]
+
+    def __contains__(self, clip):
+        return clip in self.store
+
+    def __iter__(self):
+        return iter(self.store.clips)
+
+    def __len__(self):
+        return len(self.store)
@@ -9,6 +9,7 @@ from coqpit import Coqpit
 from torch.utils.data.sampler import WeightedRandomSampler
 
 from TTS.config import check_config_and_model_args
+from TTS.utils.samplers import DistributedWeightedSampler
 
 
 class LanguageManager:
@@ -128,11 +129,18 @@ def _set_file_path(path):
     return None
 
 
-def get_language_weighted_sampler(items: list):
+def get_language_weighted_sampler(items: list, num_replicas: int = 1, rank: int = 0, seed: int = 0):
+    """Return a sampler drawing each language with the same probability.
+
+    If `num_replicas > 1`, return a `DistributedWeightedSampler` giving each DDP process a disjoint share of the
+    weighted draws. All the processes must use the same `seed`.
+    """
     language_names = np.array([item["language"] for item in items])
     unique_language_names = np.unique(language_names).tolist()
     language_ids = [unique_language_names.index(l) for l in language_names]
     language_count = np.array([len(np.where(language_names == l)[0]) for l in unique_language_names])
     weight_language = 1.0 / language_count
     dataset_samples_weight = torch.from_numpy(np.array([weight_language[l] for l in language_ids])).double()
+    if num_replicas > 1:
+        return DistributedWeightedSampler(dataset_samples_weight, num_replicas=num_replicas, rank=rank, seed=seed)
     return WeightedRandomSampler(dataset_samples_weight, len(dataset_samples_weight))
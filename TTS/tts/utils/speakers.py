@@ -1,7 +1,9 @@
+import hashlib
 import json
 import os
 import random
-from typing import Any, Dict, List, Tuple, Union
+import tempfile
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
 import fsspec
 import numpy as np
@@ -11,7 +13,149 @@ from torch.utils.data.sampler import WeightedRandomSampler
 
 from TTS.config import get_from_config_or_model_args_with_default, load_config
 from TTS.speaker_encoder.utils.generic_utils import setup_speaker_encoder_model
+from TTS.tts.datasets.sample_table import compute_audio_lengths
+from TTS.tts.utils.embedding_store import EmbeddingStore, EmbeddingStoreMapping
+from TTS.tts.utils.text.cache import LRUCache
 from TTS.utils.audio import AudioProcessor
+from TTS.utils.samplers import DistributedWeightedSampler
+
+
+class ClipFeatureDataset(torch.utils.data.Dataset):
+    """Load audio clips and compute the speaker encoder input features, so that `DataLoader` workers can do it in
+    parallel.
+
+    Args:
+        wav_files (List[str]): Audio file paths.
+        ap (AudioProcessor): Audio processor of the speaker encoder.
+        use_torch_spec (bool): Return the waveform since the encoder computes the spectrogram. Defaults to False.
+    """
+
+    def __init__(self, wav_files: List[str], ap: AudioProcessor, use_torch_spec: bool = False):
+        self.wav_files = wav_files
+        self.ap = ap
+        self.use_torch_spec = use_torch_spec
+
+    def __len__(self):
+        return len(self.wav_files)
+
+    def __getitem__(self, idx):
+        return idx, self.load_features(self.wav_files[idx], self.ap, self.use_torch_spec)
+
+    @staticmethod
+    def load_features(wav_file: str, ap: AudioProcessor, use_torch_spec: bool = False) -> torch.Tensor:
+        waveform = ap.load_wav(wav_file, sr=ap.sample_rate)
+        if not use_torch_spec:
+            return torch.from_numpy(ap.melspectrogram(waveform))
+        return torch.from_numpy(waveform)
+
+
+class DVectorCache:
+    """LRU cache of the d_vectors computed from reference clips, keyed by the hash of the clip content.
+
+    It also keeps the d_vectors of the voices registered by `SpeakerManager.register_voice()`. Registered voices are
+    never evicted. Keys are prefixed by the speaker encoder ID, so a cache can be shared by different encoders.
+
+    With a `cache_path`, the cache is saved at each new d_vector or voice. The saved file is merged with the
+    entries saved by the other processes using it, e.g. the `InferencePool` workers or several servers, and a voice
+    missing in the cache is looked up again in the file if it has changed. So the voices registered by a process are
+    used by the others. Saves are not serialized between processes, an entry saved by another process between the read
+    and the write of a save is lost.
+
+    Args:
+        max_size (int): Maximum number of cached clips. Defaults to 1000.
+        cache_path (str): JSON file to persist the cache. It is loaded at init if it exists. Defaults to None.
+
+    Example:
+        >>> manager = SpeakerManager(encoder_model_path=model_path, encoder_config_path=config_path)
+        >>> manager.set_d_vector_cache(DVectorCache(cache_path="d_vector_cache.json"))
+        >>> d_vector = manager.compute_d_vector_from_clip("reference.wav")  # miss
+        >>> d_vector = manager.compute_d_vector_from_clip("reference.wav")  # hit
+        >>> manager.register_voice("alice", "reference.wav")
+        >>> d_vector = manager.get_voice_d_vector("alice")
+    """
+
+    def __init__(self, max_size: int = 1000, cache_path: str = None):
+        self.d_vectors = LRUCache(max_size)
+        self.voices = {}
+        self.cache_path = cache_path
+        # modification time of the cache file at the last load or save
+        self.file_mtime = None
+        if cache_path is not None and os.path.exists(cache_path):
+            self.load(cache_path)
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        sha1 = hashlib.sha1()
+        with fsspec.open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    def get(self, key: str) -> List:
+        return self.d_vectors.get(key)
+
+    def put(self, key: str, d_vector: List):
+        self.d_vectors.put(key, d_vector)
+        if self.cache_path is not None:
+            self.save()
+
+    def get_voice(self, key: str) -> List:
+        """Return the d_vector of a registered voice. Reload the cache file if the voice is missing and the file has
+        changed since the last load or save."""
+        if key not in self.voices and self.cache_path is not None and os.path.exists(self.cache_path):
+            if os.path.getmtime(self.cache_path) != self.file_mtime:
+                self.load()
+        return self.voices.get(key)
+
+    def put_voice(self, key: str, d_vector: List):
+        self.voices[key] = d_vector
+        if self.cache_path is not None:
+            self.save()
+
+    def stats(self) -> Dict:
+        return {**self.d_vectors.stats(), "voices": len(self.voices)}
+
+    @staticmethod
+    def _read(cache_path: str) -> Tuple[Dict, Dict]:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        return dict(state.get("d_vectors", [])), state.get("voices", {})
+
+    def save(self, cache_path: str = None):
+        """Write the cached d_vectors and the registered voices to a JSON file, merged with the entries already in it.
+
+        The voices of the file are added to the cache. The file is replaced atomically by a temporary file unique to
+        the process.
+        """
+        cache_path = cache_path or self.cache_path
+        if cache_path is None:
+            raise ValueError(" [!] `cache_path` is not defined.")
+        d_vectors, voices = self._read(cache_path) if os.path.exists(cache_path) else ({}, {})
+        self.voices = {**voices, **self.voices}
+        # the entries of this cache are the most recent
+        for key, d_vector in self.d_vectors.items():
+            d_vectors.pop(key, None)
+            d_vectors[key] = d_vector
+        state = {"d_vectors": list(d_vectors.items())[-self.d_vectors.max_size :], "voices": self.voices}
+        cache_dir = os.path.dirname(os.path.abspath(cache_path))
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(cache_path) + ".", suffix=".tmp", dir=cache_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, cache_path)
+        if cache_path == self.cache_path:
+            self.file_mtime = os.path.getmtime(cache_path)
+
+    def load(self, cache_path: str = None):
+        """Load the d_vectors and the voices saved by `save()`."""
+        cache_path = cache_path or self.cache_path
+        d_vectors, voices = self._read(cache_path)
+        for key, d_vector in d_vectors.items():
+            if key not in self.d_vectors:
+                self.d_vectors.put(key, d_vector)
+        self.voices.update(voices)
+        if cache_path == self.cache_path:
+            self.file_mtime = os.path.getmtime(cache_path)
 
 
 class SpeakerManager:
@@ -33,12 +177,14 @@ class SpeakerManager:
             ...
         }
 
+    The datafile can also be a `.npy` file saved by `save_d_vectors_to_file()` or `EmbeddingStore.save()`. It is
+    memory-mapped at load and `d_vectors` is a read-only view in the same format.
 
     3. Computing the d-vectors by the speaker encoder. It loads the speaker encoder model and
     computes the d-vectors for a given clip or speaker.
 
     Args:
-        d_vectors_file_path (str, optional): Path to the metafile including x vectors. Defaults to "".
+        d_vectors_file_path (str, optional): Path to the metafile including x vectors. `.json` or `.npy`. Defaults to "".
         speaker_id_file_path (str, optional): Path to the metafile that maps speaker names to ids used by
         TTS models. Defaults to "".
         encoder_model_path (str, optional): Path to the speaker encoder model file. Defaults to "".
@@ -65,10 +211,13 @@ class SpeakerManager:
     ):
 
         self.d_vectors = {}
+        self.embedding_store = None
         self.speaker_ids = {}
         self.clip_ids = []
         self.speaker_encoder = None
         self.speaker_encoder_ap = None
+        self.speaker_encoder_id = None
+        self.d_vector_cache = None
         self.use_cuda = use_cuda
 
         if data_items:
@@ -104,6 +253,8 @@ class SpeakerManager:
     @property
     def d_vector_dim(self):
         """Dimensionality of d_vectors. If d_vectors are not loaded, returns zero."""
+        if self.embedding_store is not None:
+            return self.embedding_store.dim
         if self.d_vectors:
             return len(self.d_vectors[list(self.d_vectors.keys())[0]]["embedding"])
         return 0
@@ -148,26 +299,40 @@ class SpeakerManager:
         self._save_json(file_path, self.speaker_ids)
 
     def save_d_vectors_to_file(self, file_path: str) -> None:
-        """Save d_vectors to a json file.
+        """Save d_vectors to a json file or to an `EmbeddingStore` if the path ends with `.npy`.
 
         Args:
             file_path (str): Path to the output file.
         """
-        self._save_json(file_path, self.d_vectors)
+        if file_path.endswith(".npy"):
+            self._get_embedding_store().save(file_path)
+        else:
+            self._save_json(file_path, dict(self.d_vectors))
 
     def set_d_vectors_from_file(self, file_path: str) -> None:
-        """Load d_vectors from a json file.
+        """Load d_vectors from a json file or from an `EmbeddingStore` `.npy` file.
 
         Args:
-            file_path (str): Path to the target json file.
+            file_path (str): Path to the target json or npy file.
         """
-        self.d_vectors = self._load_json(file_path)
-
-        speakers = sorted({x["name"] for x in self.d_vectors.values()})
+        if file_path.endswith(".npy"):
+            self.embedding_store = EmbeddingStore.load(file_path)
+            self.d_vectors = EmbeddingStoreMapping(self.embedding_store)
+            speakers = self.embedding_store.speaker_names
+        else:
+            self.d_vectors = self._load_json(file_path)
+            self.embedding_store = None
+            speakers = sorted({x["name"] for x in self.d_vectors.values()})
         self.speaker_ids = {name: i for i, name in enumerate(speakers)}
 
         self.clip_ids = list(set(sorted(clip_name for clip_name in self.d_vectors.keys())))
 
+    def _get_embedding_store(self) -> EmbeddingStore:
+        """Return the embedding store of the d_vectors. It is built at the first call for the json d_vectors."""
+        if self.embedding_store is None:
+            self.embedding_store = EmbeddingStore.from_dict(self.d_vectors)
+        return self.embedding_store
+
     def get_d_vector_by_clip(self, clip_idx: str) -> List:
         """Get d_vector by clip ID.
 
@@ -188,7 +353,7 @@ class SpeakerManager:
         Returns:
             List[List]: all the d_vectors of the given speaker.
         """
-        return [x["embedding"] for x in self.d_vectors.values() if x["name"] == speaker_idx]
+        return self._get_embedding_store().get_embeddings_by_speaker(speaker_idx).tolist()
 
     def get_mean_d_vector(self, speaker_idx: str, num_samples: int = None, randomize: bool = False) -> np.ndarray:
         """Get mean d_vector of a speaker ID.
@@ -201,16 +366,28 @@ class SpeakerManager:
         Returns:
             np.ndarray: Mean d_vector.
         """
-        d_vectors = self.get_d_vectors_by_speaker(speaker_idx)
         if num_samples is None:
-            d_vectors = np.stack(d_vectors).mean(0)
-        else:
-            assert len(d_vectors) >= num_samples, f" [!] speaker {speaker_idx} has number of samples < {num_samples}"
-            if randomize:
-                d_vectors = np.stack(random.choices(d_vectors, k=num_samples)).mean(0)
-            else:
-                d_vectors = np.stack(d_vectors[:num_samples]).mean(0)
-        return d_vectors
+            return self._get_embedding_store().get_speaker_mean(speaker_idx)
+        d_vectors = self._get_embedding_store().get_embeddings_by_speaker(speaker_idx)
+        assert len(d_vectors) >= num_samples, f" [!] speaker {speaker_idx} has number of samples < {num_samples}"
+        if randomize:
+            return np.stack(random.choices(d_vectors, k=num_samples)).mean(0)
+        return d_vectors[:num_samples].mean(0)
+
+    def find_nearest_speakers(
+        self, d_vector: Union[List, np.ndarray], k: int = 1, approximate: bool = False
+    ) -> List[Tuple[str, float]]:
+        """Find the speakers with the closest mean d_vectors to the given d_vector by the cosine similarity.
+
+        Args:
+            d_vector (Union[List, np.ndarray]): Query d_vector.
+            k (int, optional): Number of speakers to return. Defaults to 1.
+            approximate (bool, optional): Only search the closest clusters of speakers. Defaults to False.
+
+        Returns:
+            List[Tuple[str, float]]: Speaker names and similarities from the most similar.
+        """
+        return self._get_embedding_store().search_speakers(np.asarray(d_vector), k=k, approximate=approximate)
 
     def get_random_speaker_id(self) -> Any:
         """Get a random d_vector.
@@ -255,6 +432,44 @@ class SpeakerManager:
         self.speaker_encoder = setup_speaker_encoder_model(self.speaker_encoder_config)
         self.speaker_encoder.load_checkpoint(config_path, model_path, eval=True, use_cuda=self.use_cuda)
         self.speaker_encoder_ap = AudioProcessor(**self.speaker_encoder_config.audio)
+        # identify the encoder in the shared d_vector caches by its weights, since fine-tuned checkpoints often share
+        # the file name and size
+        self.speaker_encoder_id = DVectorCache.hash_file(model_path)
+
+    def set_d_vector_cache(self, d_vector_cache: DVectorCache) -> None:
+        """Cache the d_vectors computed by `compute_d_vector_from_clip()`.
+
+        Args:
+            d_vector_cache (DVectorCache): Cache instance. It can be shared by different speaker managers.
+        """
+        self.d_vector_cache = d_vector_cache
+
+    def register_voice(self, voice_id: str, wav_file: Union[str, List[str]]) -> list:
+        """Compute the d_vector of a reference voice once and keep it to refer to it by `voice_id` afterwards.
+
+        Voices are kept in the d_vector cache and persisted with it. A cache is created if it is not set.
+
+        Args:
+            voice_id (str): ID of the voice.
+            wav_file (Union[str, List[str]]): Reference clip or clips of the voice.
+
+        Returns:
+            list: d_vector of the voice.
+        """
+        if self.d_vector_cache is None:
+            self.d_vector_cache = DVectorCache()
+        d_vector = self.compute_d_vector_from_clip(wav_file)
+        self.d_vector_cache.put_voice(f"{self.speaker_encoder_id}:{voice_id}", d_vector)
+        return d_vector
+
+    def get_voice_d_vector(self, voice_id: str) -> list:
+        """Get the d_vector of a voice registered by `register_voice()`. Return None if the voice is not registered.
+
+        Voices registered by other processes sharing the d_vector cache file are found too.
+        """
+        if self.d_vector_cache is None:
+            return None
+        return self.d_vector_cache.get_voice(f"{self.speaker_encoder_id}:{voice_id}")
 
     def compute_d_vector_from_clip(self, wav_file: Union[str, List[str]]) -> list:
         """Compute a d_vector from a given audio file.
@@ -267,13 +482,21 @@ class SpeakerManager:
         """
 
         def _compute(wav_file: str):
-            waveform = self.speaker_encoder_ap.load_wav(wav_file, sr=self.speaker_encoder_ap.sample_rate)
-            if not self.speaker_encoder_config.model_params.get("use_torch_spec", False):
-                m_input = self.speaker_encoder_ap.melspectrogram(waveform)
-                m_input = torch.from_numpy(m_input)
-            else:
-                m_input = torch.from_numpy(waveform)
-
+            if self.d_vector_cache is not None:
+                key = f"{self.speaker_encoder_id}:{DVectorCache.hash_file(wav_file)}"
+                d_vector = self.d_vector_cache.get(key)
+                if d_vector is None:
+                    d_vector = _compute_d_vector(wav_file)[0].tolist()
+                    self.d_vector_cache.put(key, d_vector)
+                return torch.FloatTensor([d_vector])
+            return _compute_d_vector(wav_file)
+
+        def _compute_d_vector(wav_file: str):
+            m_input = ClipFeatureDataset.load_features(
+                wav_file,
+                self.speaker_encoder_ap,
+                self.speaker_encoder_config.model_params.get("use_torch_spec", False),
+            )
             if self.use_cuda:
                 m_input = m_input.cuda()
             m_input = m_input.unsqueeze(0)
@@ -293,6 +516,68 @@ class SpeakerManager:
         d_vector = _compute(wav_file)
         return d_vector[0].tolist()
 
+    def compute_d_vectors_from_clips(
+        self, wav_files: List[str], batch_size: int = 32, num_workers: int = 0, max_pending_clips: int = None
+    ) -> Iterator[Tuple[int, List]]:
+        """Compute the d_vectors of many audio files in batches.
+
+        Clips are loaded and their features are computed by `num_workers` DataLoader workers. Clips are read in the
+        order of their length and the encoder windows of the clips with the same window shape are batched together.
+        Batches are never padded, so the d_vectors are the same as the ones of `compute_d_vector_from_clip()`.
+
+        Args:
+            wav_files (List[str]): Audio file paths.
+            batch_size (int): Number of clips in an encoder batch. Defaults to 32.
+            num_workers (int): Number of DataLoader workers. Defaults to 0.
+            max_pending_clips (int): Maximum number of clips waiting for a full batch. If exceeded, the largest
+                group is computed in a smaller batch. Defaults to `4 * batch_size`.
+
+        Yields:
+            Tuple[int, List]: Index of the clip in `wav_files` and its d_vector, in the order of computation.
+        """
+        max_pending_clips = max_pending_clips or 4 * batch_size
+        audio_lengths = compute_audio_lengths(wav_files, num_workers)
+        order = np.argsort(audio_lengths, kind="stable").tolist()
+        dataset = ClipFeatureDataset(
+            [wav_files[idx] for idx in order],
+            self.speaker_encoder_ap,
+            self.speaker_encoder_config.model_params.get("use_torch_spec", False),
+        )
+        loader = torch.utils.data.DataLoader(dataset, batch_size=None, num_workers=num_workers)
+
+        pending = {}
+        num_pending = 0
+        for idx, m_input in loader:
+            m_input = m_input.unsqueeze(0)
+            windows = self.speaker_encoder.get_embedding_windows(m_input)
+            if windows.shape[1:] == m_input.shape[1:]:
+                # the window covers the whole clip, so all the windows are the same
+                windows = windows[:1]
+            group = pending.setdefault(windows.shape[1:], [])
+            group.append((order[idx], windows))
+            num_pending += 1
+            if len(group) >= batch_size:
+                num_pending -= len(group)
+                yield from self._compute_d_vectors_from_windows(pending.pop(windows.shape[1:]))
+            elif num_pending > max_pending_clips:
+                key = max(pending, key=lambda k: len(pending[k]))
+                num_pending -= len(pending[key])
+                yield from self._compute_d_vectors_from_windows(pending.pop(key))
+        for group in pending.values():
+            yield from self._compute_d_vectors_from_windows(group)
+
+    def _compute_d_vectors_from_windows(self, group: List[Tuple[int, torch.Tensor]]) -> Iterator[Tuple[int, List]]:
+        windows = torch.cat([clip_windows for _, clip_windows in group], dim=0)
+        if self.use_cuda:
+            windows = windows.cuda()
+        with torch.no_grad():
+            embeddings = self.speaker_encoder.inference(windows, l2_norm=True)
+        offset = 0
+        for idx, clip_windows in group:
+            d_vector = embeddings[offset : offset + len(clip_windows)].mean(dim=0)
+            offset += len(clip_windows)
+            yield idx, d_vector.tolist()
+
     def compute_d_vector(self, feats: Union[torch.Tensor, np.ndarray]) -> List:
         """Compute d_vector from features.
 
@@ -449,11 +734,18 @@ def get_speaker_manager(c: Coqpit, data: List = None, restore_path: str = None,
     return speaker_manager
 
 
-def get_speaker_weighted_sampler(items: list):
+def get_speaker_weighted_sampler(items: list, num_replicas: int = 1, rank: int = 0, seed: int = 0):
+    """Return a sampler drawing each speaker with the same probability.
+
+    If `num_replicas > 1`, return a `DistributedWeightedSampler` giving each DDP process a disjoint share of the
+    weighted draws. All the processes must use the same `seed`.
+    """
     speaker_names = np.array([item["speaker_name"] for item in items])
     unique_speaker_names = np.unique(speaker_names).tolist()
     speaker_ids = [unique_speaker_names.index(l) for l in speaker_names]
     speaker_count = np.array([len(np.where(speaker_names == l)[0]) for l in unique_speaker_names])
     weight_speaker = 1.0 / speaker_count
     dataset_samples_weight = torch.from_numpy(np.array([weight_speaker[l] for l in speaker_ids])).double()
+    if num_replicas > 1:
+        return DistributedWeightedSampler(dataset_samples_weight, num_replicas=num_replicas, rank=rank, seed=seed)
     return WeightedRandomSampler(dataset_samples_weight, len(dataset_samples_weight))
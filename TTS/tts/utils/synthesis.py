@@ -1,9 +1,12 @@
-from typing import Dict
+from typing import Dict, List, Union
 
 import numpy as np
 import torch
 from torch import nn
 
+# models that use `x_lengths` in inference and return hard alignments.
+BATCH_INFERENCE_MODELS = ["glow_tts", "vits", "forward_tts", "fast_pitch", "fast_speech", "speedy_speech"]
+
 
 def numpy_to_torch(np_array, dtype, cuda=False):
     if np_array is None:
@@ -28,8 +31,10 @@ def run_model_torch(
     style_mel: torch.Tensor = None,
     d_vector: torch.Tensor = None,
     language_id: torch.Tensor = None,
+    input_lengths: torch.Tensor = None,
 ) -> Dict:
-    """Run a torch model for inference. It does not support batch inference.
+    """Run a torch model for inference. Batch inference is only supported by the models that respect
+    `x_lengths` (see `BATCH_INFERENCE_MODELS`).
 
     Args:
         model (nn.Module): The model to run inference.
@@ -37,11 +42,14 @@ def run_model_torch(
         speaker_id (int, optional): Input speaker ids for multi-speaker models. Defaults to None.
         style_mel (torch.Tensor, optional): Spectrograms used for voice styling . Defaults to None.
         d_vector (torch.Tensor, optional): d-vector for multi-speaker models    . Defaults to None.
+        input_lengths (torch.Tensor, optional): Lengths of the padded input sequences. If None, batch size is
+            assumed to be 1. Defaults to None.
 
     Returns:
         Dict: model outputs.
     """
-    input_lengths = torch.tensor(inputs.shape[1:2]).to(inputs.device)
+    if input_lengths is None:
+        input_lengths = torch.tensor(inputs.shape[1:2]).to(inputs.device)
     if hasattr(model, "module"):
         _func = model.module.inference
     else:
@@ -59,6 +67,40 @@ def run_model_torch(
     return outputs
 
 
+def run_graph(
+    graph: torch.jit.ScriptModule, inputs: torch.Tensor, speaker_id: torch.Tensor = None, d_vector: torch.Tensor = None
+) -> Dict:
+    """Run a TTS graph exported by `TTS.utils.export.export_tts()` on a single input.
+
+    The graph takes the speaker id or the d-vector after the inputs and their lengths for multi-speaker models. It
+    returns no alignments.
+    """
+    inputs = [inputs, torch.tensor(inputs.shape[1:2]).to(inputs.device)]
+    if speaker_id is not None:
+        inputs.append(speaker_id.view(1))
+    elif d_vector is not None:
+        inputs.append(d_vector)
+    with torch.no_grad():
+        return {"model_outputs": graph(*inputs), "alignments": None}
+
+
+def supports_batch_inference(CONFIG) -> bool:
+    """Check if the model defined by the config can run inference on a padded batch of inputs."""
+    model_name = CONFIG.base_model if CONFIG.has("base_model") and CONFIG.base_model else CONFIG.model
+    return model_name.lower() in BATCH_INFERENCE_MODELS
+
+
+def compute_output_lengths(outputs: Dict) -> torch.Tensor:
+    """Compute the number of valid output frames of each item in a batch from the hard alignments returned by the
+    duration based models.
+
+    Shapes:
+        - outputs["alignments"]: :math:`[B, T_{de}, T_{en}]` or :math:`[B, T_{en}, T_{de}]`
+        - Return: :math:`[B]`
+    """
+    return outputs["alignments"].sum([1, 2]).round().long()
+
+
 def trim_silence(wav, ap):
     return wav[: ap.find_endpoint(wav)]
 
@@ -119,6 +161,7 @@ def synthesis(
     do_trim_silence=False,
     d_vector=None,
     language_id=None,
+    graph=None,
 ):
     """Synthesize voice for the given text using Griffin-Lim vocoder or just compute output features to be passed to
     the vocoder model.
@@ -153,6 +196,10 @@ def synthesis(
 
         language_id (int):
             Language ID passed to the language embedding layer in multi-langual model. Defaults to None.
+
+        graph (torch.jit.ScriptModule):
+            Graph exported by `TTS.utils.export.export_tts()` run instead of the model inference. The model is only
+            used for the tokenizer and the audio processor. Defaults to None.
     """
     # GST processing
     style_mel = None
@@ -181,7 +228,10 @@ def synthesis(
     text_inputs = numpy_to_torch(text_inputs, torch.long, cuda=use_cuda)
     text_inputs = text_inputs.unsqueeze(0)
     # synthesize voice
-    outputs = run_model_torch(model, text_inputs, speaker_id, style_mel, d_vector=d_vector, language_id=language_id)
+    if graph is not None:
+        outputs = run_graph(graph, text_inputs, speaker_id, d_vector)
+    else:
+        outputs = run_model_torch(model, text_inputs, speaker_id, style_mel, d_vector=d_vector, language_id=language_id)
     model_outputs = outputs["model_outputs"]
     model_outputs = model_outputs[0].data.cpu().numpy()
     alignments = outputs["alignments"]
@@ -205,3 +255,95 @@ def synthesis(
         "outputs": outputs,
     }
     return return_dict
+
+
+def batch_synthesis(
+    model,
+    texts: List[Union[str, List[int]]],
+    CONFIG,
+    use_cuda,
+    speaker_id=None,
+    d_vector=None,
+    language_id=None,
+    use_griffin_lim=False,
+):
+    """Synthesize a batch of sentences in a single forward pass of the model.
+
+    The input sequences are padded to the longest one and the model outputs are split back by their true lengths.
+    Only the models listed in `BATCH_INFERENCE_MODELS` are supported.
+
+    Args:
+        model (TTS.tts.models):
+            The TTS model to synthesize audio with.
+
+        texts (List[Union[str, List[int]]]):
+            The input sentences to convert to speech or their token IDs.
+
+        CONFIG (Coqpit):
+            Model configuration.
+
+        use_cuda (bool):
+            Enable/disable CUDA.
+
+        speaker_id (int):
+            Speaker ID shared by all the sentences. Defaults to None.
+
+        d_vector (torch.Tensor):
+            d-vector shared by all the sentences in shape :math:`[1, D]`. Defaults to None.
+
+        language_id (int):
+            Language ID shared by all the sentences. Defaults to None.
+
+        use_griffin_lim (bool):
+            Convert the spectrograms to waveforms with Griffin-Lim. Defaults to False.
+
+    Returns:
+        Dict: `model_outputs` and `wavs` are lists with an entry per input sentence. `model_outputs` are `[T, C]`
+        spectrograms or `[T,]` waveforms for end-to-end models. `wavs` are None if no waveform is computed.
+    """
+    assert supports_batch_inference(CONFIG), f" [!] Batch inference is not supported by {CONFIG.model}."
+    batch_size = len(texts)
+    # convert text to sequence of token IDs and pad them
+    token_ids = [
+        model.tokenizer.text_to_ids(text, language=language_id) if isinstance(text, str) else text for text in texts
+    ]
+    input_lengths = torch.LongTensor([len(ids) for ids in token_ids])
+    text_inputs = torch.zeros(batch_size, int(input_lengths.max()), dtype=torch.long)
+    for idx, ids in enumerate(token_ids):
+        text_inputs[idx, : len(ids)] = torch.LongTensor(ids)
+
+    # expand conditioning inputs to the batch
+    if speaker_id is not None:
+        speaker_id = id_to_torch([speaker_id] * batch_size, cuda=use_cuda)
+    if d_vector is not None:
+        d_vector = embedding_to_torch(d_vector, cuda=use_cuda).expand(batch_size, -1)
+    if language_id is not None:
+        language_id = id_to_torch([language_id] * batch_size, cuda=use_cuda)
+    if use_cuda:
+        text_inputs = text_inputs.cuda()
+        input_lengths = input_lengths.cuda()
+
+    # synthesize voice
+    outputs = run_model_torch(
+        model, text_inputs, speaker_id, d_vector=d_vector, language_id=language_id, input_lengths=input_lengths
+    )
+    output_lengths = compute_output_lengths(outputs).cpu().numpy()
+    model_outputs = outputs["model_outputs"].data.cpu().numpy()
+
+    # split the outputs by their true lengths
+    wavs = None
+    if model_outputs.ndim == 3 and model_outputs.shape[1] == 1:  # [B, 1, T_wav]
+        wav_lengths = np.minimum(output_lengths * model.ap.hop_length, model_outputs.shape[2])
+        model_outputs = [model_outputs[idx, 0, : wav_lengths[idx]] for idx in range(batch_size)]
+        wavs = model_outputs
+    else:  # [B, T, C_spec]
+        model_outputs = [model_outputs[idx, : output_lengths[idx]] for idx in range(batch_size)]
+        if use_griffin_lim:
+            wavs = [inv_spectrogram(spec, model.ap, CONFIG) for spec in model_outputs]
+    return {
+        "wavs": wavs,
+        "model_outputs": model_outputs,
+        "output_lengths": output_lengths,
+        "text_inputs": text_inputs,
+        "outputs": outputs,
+    }
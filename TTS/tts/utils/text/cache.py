@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+
+
+class LRUCache:
+    """A thread-safe bounded dictionary that drops the least recently used entries.
+
+    Args:
+        max_size (int): Maximum number of entries. Defaults to 10000.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable):
+        return key in self._data
+
+    def get(self, key: Hashable, default=None):
+        """Return the cached value and mark it as recently used. Update the hit statistics."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def stats(self) -> Dict:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate}
+
+
+class TextCache:
+    """Sentence and word level cache for `TTSTokenizer.text_to_ids()`.
+
+    Sentence entries map `(cleaner, phonemizer, language, text)` to the cleaned and phonemized text. Word entries map
+    `(phonemizer, language, word)` to the phonemes of a single word and they are only used when `use_word_cache` is
+    set, since phonemizing words one by one loses the cross word context (e.g. stress) of some backends.
+
+    Token IDs are not cached since they depend on the model vocabulary. Converting the cached text to IDs is cheap,
+    and a persisted cache can be shared by models with different character sets.
+
+    Args:
+        max_sentences (int): Maximum number of cached sentences. Defaults to 10000.
+        max_words (int): Maximum number of cached words. Defaults to 100000.
+        use_word_cache (bool): Phonemize sentence misses word by word and cache the words. Defaults to False.
+        cache_path (str): JSON file to persist the cache. It is loaded at init if it exists. Defaults to None.
+
+    Example:
+        >>> cache = TextCache(cache_path="text_cache.json")
+        >>> tokenizer = TTSTokenizer(True, characters=IPAPhonemes(), phonemizer=ESpeak("en-us"), cache=cache)
+        >>> ids = tokenizer.text_to_ids("Hello world!")  # miss
+        >>> ids = tokenizer.text_to_ids("Hello world!")  # hit
+        >>> cache.stats()["sentences"]["hit_rate"]
+        0.5
+        >>> cache.save()
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = 10000,
+        max_words: int = 100000,
+        use_word_cache: bool = False,
+        cache_path: str = None,
+    ):
+        self.sentences = LRUCache(max_sentences)
+        self.words = LRUCache(max_words)
+        self.use_word_cache = use_word_cache
+        self.cache_path = cache_path
+        if cache_path is not None and os.path.exists(cache_path):
+            self.load(cache_path)
+
+    @staticmethod
+    def sentence_key(cleaner: str, phonemizer: str, language: str, text: str) -> Tuple:
+        return (cleaner, phonemizer, language, text)
+
+    @staticmethod
+    def word_key(phonemizer: str, language: str, word: str) -> Tuple:
+        return (phonemizer, language, word)
+
+    def get_sentence(self, key: Tuple) -> str:
+        return self.sentences.get(key)
+
+    def put_sentence(self, key: Tuple, text: str):
+        self.sentences.put(key, text)
+
+    def get_word(self, key: Tuple) -> str:
+        return self.words.get(key)
+
+    def put_word(self, key: Tuple, phonemes: str):
+        self.words.put(key, phonemes)
+
+    def clear(self):
+        self.sentences.clear()
+        self.words.clear()
+
+    def stats(self) -> Dict:
+        """Return the size and the hit statistics of both cache levels."""
+        return {"sentences": self.sentences.stats(), "words": self.words.stats()}
+
+    def save(self, cache_path: str = None):
+        """Write the cached entries to a JSON file. The file is replaced atomically."""
+        cache_path = cache_path or self.cache_path
+        if cache_path is None:
+            raise ValueError(" [!] `cache_path` is not defined.")
+        state = {
+            "sentences": [list(key) + [value] for key, value in self.sentences.items()],
+            "words": [list(key) + [value] for key, value in self.words.items()],
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+    def load(self, cache_path: str = None):
+        """Load entries saved by `save()`. Loaded entries do not change the hit statistics."""
+        cache_path = cache_path or self.cache_path
+        with open(cache_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        for entry in state.get("sentences", []):
+            self.sentences.put(tuple(entry[:-1]), entry[-1])
+        for entry in state.get("words", []):
+            self.words.put(tuple(entry[:-1]), entry[-1])
+
+    def print_logs(self, level: int = 0):
+        indent = "\t" * level
+        for name, stats in self.stats().items():
+            print(
+                f"{indent}| > {name} cache: {stats['size']} entries - hits: {stats['hits']} - "
+                f"misses: {stats['misses']} - hit rate: {stats['hit_rate']:.2f}"
+            )
@@ -1,35 +1,100 @@
+import importlib
+from collections.abc import MutableMapping
+from typing import Callable, Dict
+
 from TTS.tts.utils.text.phonemizers.base import BasePhonemizer
-from TTS.tts.utils.text.phonemizers.espeak_wrapper import ESpeak
-from TTS.tts.utils.text.phonemizers.gruut_wrapper import Gruut
-from TTS.tts.utils.text.phonemizers.ja_jp_phonemizer import JA_JP_Phonemizer
-from TTS.tts.utils.text.phonemizers.zh_cn_phonemizer import ZH_CN_Phonemizer
 
-PHONEMIZERS = {b.name(): b for b in (ESpeak, Gruut, JA_JP_Phonemizer)}
+# Phonemizer modules import heavy optional dependencies (gruut, pypinyin, MeCab) and listing the languages of ESpeak
+# spawns `espeak --voices`. So the modules are imported and the languages are listed at their first use.
+_PHONEMIZER_CLASSES = {
+    "espeak": ("espeak_wrapper", "ESpeak"),
+    "espeak_lib": ("espeak_lib_wrapper", "ESpeakLib"),
+    "gruut": ("gruut_wrapper", "Gruut"),
+    "ja_jp_phonemizer": ("ja_jp_phonemizer", "JA_JP_Phonemizer"),
+    "zh_cn_phonemizer": ("zh_cn_phonemizer", "ZH_CN_Phonemizer"),
+}
+_CLASS_TO_PHONEMIZER = {class_name: name for name, (_, class_name) in _PHONEMIZER_CLASSES.items()}
 
 
-ESPEAK_LANGS = list(ESpeak.supported_languages().keys())
-GRUUT_LANGS = list(Gruut.supported_languages())
+def _import_phonemizer(name: str) -> type:
+    module_name, class_name = _PHONEMIZER_CLASSES[name]
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    return getattr(module, class_name)
 
 
-# Dict setting default phonemizers for each language
-DEF_LANG_TO_PHONEMIZER = {
-    "ja-jp": JA_JP_Phonemizer.name(),
-    "zh-cn": ZH_CN_Phonemizer.name(),
-}
+class LazyDict(MutableMapping):
+    """Dictionary built by `builder` at its first lookup.
+
+    Args:
+        builder (Callable): Function returning the dictionary.
+    """
+
+    def __init__(self, builder: Callable[[], Dict]):
+        self._builder = builder
+        self._dict = None
+
+    @property
+    def resolved(self) -> bool:
+        return self._dict is not None
+
+    def _resolve(self) -> Dict:
+        if self._dict is None:
+            self._dict = self._builder()
+        return self._dict
+
+    def __getitem__(self, key):
+        return self._resolve()[key]
+
+    def __setitem__(self, key, value):
+        self._resolve()[key] = value
+
+    def __delitem__(self, key):
+        del self._resolve()[key]
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __repr__(self):
+        return repr(self._resolve())
+
+
+def _build_phonemizers() -> Dict:
+    return {name: _import_phonemizer(name) for name in ("espeak", "espeak_lib", "gruut", "ja_jp_phonemizer")}
+
 
+def _build_lang_to_phonemizer() -> Dict:
+    # Dict setting default phonemizers for each language
+    lang_to_phonemizer = {
+        "ja-jp": "ja_jp_phonemizer",
+        "zh-cn": "zh_cn_phonemizer",
+    }
+    # Add Gruut languages
+    lang_to_phonemizer.update({lang: "gruut" for lang in __getattr__("GRUUT_LANGS")})
+    # Add ESpeak languages and override any existing ones
+    lang_to_phonemizer.update({lang: "espeak" for lang in __getattr__("ESPEAK_LANGS")})
+    lang_to_phonemizer["en"] = lang_to_phonemizer["en-us"]
+    return lang_to_phonemizer
 
-# Add Gruut languages
-_ = [Gruut.name()] * len(GRUUT_LANGS)
-_new_dict = dict(list(zip(GRUUT_LANGS, _)))
-DEF_LANG_TO_PHONEMIZER.update(_new_dict)
 
+PHONEMIZERS = LazyDict(_build_phonemizers)
+DEF_LANG_TO_PHONEMIZER = LazyDict(_build_lang_to_phonemizer)
 
-# Add ESpeak languages and override any existing ones
-_ = [ESpeak.name()] * len(ESPEAK_LANGS)
-_new_dict = dict(list(zip(list(ESPEAK_LANGS), _)))
-DEF_LANG_TO_PHONEMIZER.update(_new_dict)
 
-DEF_LANG_TO_PHONEMIZER["en"] = DEF_LANG_TO_PHONEMIZER["en-us"]
+def __getattr__(name: str):
+    """Import the phonemizer classes and list their languages at the first access."""
+    if name in _CLASS_TO_PHONEMIZER:
+        value = _import_phonemizer(_CLASS_TO_PHONEMIZER[name])
+    elif name == "ESPEAK_LANGS":
+        value = list(_import_phonemizer("espeak").supported_languages().keys())
+    elif name == "GRUUT_LANGS":
+        value = list(_import_phonemizer("gruut").supported_languages())
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
 
 def get_phonemizer_by_name(name: str, **kwargs) -> BasePhonemizer:
@@ -42,15 +107,9 @@ def get_phonemizer_by_name(name: str, **kwargs) -> BasePhonemizer:
         kwargs (dict):
             Extra keyword arguments that should be passed to the phonemizer.
     """
-    if name == "espeak":
-        return ESpeak(**kwargs)
-    if name == "gruut":
-        return Gruut(**kwargs)
-    if name == "zh_cn_phonemizer":
-        return ZH_CN_Phonemizer(**kwargs)
-    if name == "ja_jp_phonemizer":
-        return JA_JP_Phonemizer(**kwargs)
-    raise ValueError(f"Phonemizer {name} not found")
+    if name not in _PHONEMIZER_CLASSES:
+        raise ValueError(f"Phonemizer {name} not found")
+    return _import_phonemizer(name)(**kwargs)
 
 
 if __name__ == "__main__":
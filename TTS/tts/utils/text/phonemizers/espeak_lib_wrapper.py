@@ -0,0 +1,366 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+from TTS.tts.utils.text.phonemizers.espeak_wrapper import ESpeak
+from TTS.tts.utils.text.punctuation import Punctuation
+
+# constants from `speak_lib.h`
+_AUDIO_OUTPUT_SYNCHRONOUS = 0x02
+_ESPEAK_CHARS_UTF8 = 1
+_ESPEAK_PHONEMES_IPA = 0x02
+_ESPEAK_PHONEMES_TIE = 0x80
+
+
+class _ESpeakVoice(ctypes.Structure):
+    """`espeak_VOICE` struct from `speak_lib.h`"""
+
+    _fields_ = [
+        ("name", ctypes.c_char_p),
+        ("languages", ctypes.c_void_p),
+        ("identifier", ctypes.c_char_p),
+        ("gender", ctypes.c_ubyte),
+        ("age", ctypes.c_ubyte),
+        ("variant", ctypes.c_ubyte),
+        ("xx1", ctypes.c_ubyte),
+        ("score", ctypes.c_int),
+        ("spare", ctypes.c_void_p),
+    ]
+
+
+def _lib_backend(lib_path: str) -> str:
+    """Return the backend name, `espeak-ng` or `espeak`, of an espeak library path or name."""
+    return "espeak-ng" if "espeak-ng" in os.path.basename(lib_path) else "espeak"
+
+
+def _find_espeak_lib() -> Tuple[str, str]:
+    """Find the espeak shared library. `ESPEAK_LIBRARY` environment variable overrides the search.
+
+    Returns:
+        Tuple[str, str]: backend name (`espeak-ng` or `espeak`) and the library path or name.
+    """
+    lib_path = os.environ.get("ESPEAK_LIBRARY", None)
+    if lib_path is not None:
+        return _lib_backend(lib_path), lib_path
+    # priority: espeakng > espeak
+    for backend in ["espeak-ng", "espeak"]:
+        lib_path = ctypes.util.find_library(backend)
+        if lib_path is not None:
+            return backend, lib_path
+    return None, None
+
+
+_DEF_ESPEAK_BACKEND, _DEF_ESPEAK_LIB_PATH = _find_espeak_lib()
+
+
+def _resolve_lib_path(lib_path: str) -> str:
+    """Find the absolute path of a loaded library from its name. Returns None if it is not resolved."""
+    if os.path.isfile(lib_path):
+        return lib_path
+    ctypes.CDLL(lib_path)
+    try:
+        with open("/proc/self/maps", "r", encoding="utf8") as f:
+            for line in f:
+                path = line.split()[-1]
+                if os.path.basename(path).startswith(os.path.basename(lib_path)):
+                    return path
+    except OSError:
+        pass
+    return None
+
+
+class ESpeakLibrary:
+    """Handle to a private copy of the espeak shared library.
+
+    espeak keeps its state in global variables and it is not thread-safe. Each handle loads its own copy of the
+    library so that different handles can run in parallel and calls on the same handle are serialized by a lock.
+
+    Args:
+        lib_path (str): Path or name of the espeak shared library.
+
+        private_copy (bool): Load a private copy of the library. If False, the library is shared by all the handles
+            created without a private copy. Defaults to True.
+    """
+
+    def __init__(self, lib_path: str = _DEF_ESPEAK_LIB_PATH, private_copy: bool = True):
+        if lib_path is None:
+            raise RuntimeError(" [!] No espeak library found. Install espeak-ng or espeak to your system.")
+        self.lock = threading.Lock()
+        self.voice = None
+        if private_copy:
+            tmp_dir = tempfile.mkdtemp(prefix="tts_espeak_")
+            weakref.finalize(self, shutil.rmtree, tmp_dir, ignore_errors=True)
+            copy_path = os.path.join(tmp_dir, os.path.basename(lib_path))
+            shutil.copy(lib_path, copy_path)
+            lib_path = copy_path
+        self._lib = ctypes.CDLL(lib_path)
+        self._lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        self._lib.espeak_Initialize.restype = ctypes.c_int
+        self._lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        self._lib.espeak_SetVoiceByName.restype = ctypes.c_int
+        self._lib.espeak_TextToPhonemes.argtypes = [ctypes.POINTER(ctypes.c_char_p), ctypes.c_int, ctypes.c_int]
+        self._lib.espeak_TextToPhonemes.restype = ctypes.c_char_p
+        self._lib.espeak_ListVoices.argtypes = [ctypes.c_void_p]
+        self._lib.espeak_ListVoices.restype = ctypes.POINTER(ctypes.POINTER(_ESpeakVoice))
+        self._lib.espeak_Info.argtypes = [ctypes.POINTER(ctypes.c_char_p)]
+        self._lib.espeak_Info.restype = ctypes.c_char_p
+        if self._lib.espeak_Initialize(_AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0) <= 0:
+            raise RuntimeError(" [!] Failed to initialize the espeak library.")
+
+    def set_voice(self, voice: str) -> None:
+        """Set the voice if it is different than the current one. Loading a voice is expensive."""
+        if voice != self.voice:
+            if self._lib.espeak_SetVoiceByName(voice.encode("utf8")) != 0:
+                raise RuntimeError(f" [!] Failed to set espeak voice {voice}.")
+            self.voice = voice
+
+    def text_to_phonemes(self, text: str, voice: str, phonemes_mode: int) -> List[str]:
+        """Convert text to phonemes with `espeak_TextToPhonemes`.
+
+        espeak translates one clause per call and moves the text pointer to the next clause.
+
+        Returns:
+            List[str]: phonemes of each clause.
+        """
+        with self.lock:
+            self.set_voice(voice)
+            text_ptr = ctypes.pointer(ctypes.c_char_p(text.encode("utf8")))
+            clauses = []
+            while text_ptr.contents.value is not None:
+                phonemes = self._lib.espeak_TextToPhonemes(text_ptr, _ESPEAK_CHARS_UTF8, phonemes_mode)
+                if phonemes:
+                    clauses.append(phonemes.decode("utf8"))
+            return clauses
+
+    def list_voices(self) -> Dict:
+        """Return a dictionary of supported language codes to voice names like `espeak --voices`."""
+        with self.lock:
+            voices = self._lib.espeak_ListVoices(None)
+            langs = {}
+            idx = 0
+            while voices[idx]:
+                voice = voices[idx].contents
+                # `languages` starts with a priority byte followed by the language code.
+                lang_code = ctypes.string_at(voice.languages + 1).decode("utf8")
+                langs[lang_code] = voice.name.decode("utf8")
+                idx += 1
+            return langs
+
+    def version(self) -> str:
+        with self.lock:
+            return self._lib.espeak_Info(None).decode("utf8").split()[0]
+
+
+class ESpeakLibraryPool:
+    """Thread-safe pool of `ESpeakLibrary` handles.
+
+    Handles are created lazily up to `pool_size` and each handle is used by one thread at a time. If the library path
+    cannot be resolved to a file to make private copies, the pool falls back to a single shared handle.
+
+    Args:
+        lib_path (str): Path or name of the espeak shared library.
+
+        pool_size (int): Maximum number of library handles. Defaults to the number of CPUs.
+    """
+
+    def __init__(self, lib_path: str = _DEF_ESPEAK_LIB_PATH, pool_size: int = None):
+        self.lib_path = _resolve_lib_path(lib_path) if lib_path is not None else None
+        if self.lib_path is None:
+            self.lib_path = lib_path
+            pool_size = 1
+        self.pool_size = pool_size if pool_size is not None else (os.cpu_count() or 1)
+        self._handles = queue.Queue()
+        self._num_handles = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self) -> ESpeakLibrary:
+        """Borrow a library handle. Blocks if all the handles are in use."""
+        handle = None
+        with self._lock:
+            if self._handles.empty() and self._num_handles < self.pool_size:
+                handle = ESpeakLibrary(self.lib_path, private_copy=self.pool_size > 1)
+                self._num_handles += 1
+        if handle is None:
+            handle = self._handles.get()
+        try:
+            yield handle
+        finally:
+            self._handles.put(handle)
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_espeak_pool(lib_path: str = _DEF_ESPEAK_LIB_PATH, pool_size: int = None) -> ESpeakLibraryPool:
+    """Return the process wide pool for the given library. Espeak data is loaded once per handle, so the phonemizers
+    share the pools."""
+    with _POOLS_LOCK:
+        if lib_path not in _POOLS:
+            _POOLS[lib_path] = ESpeakLibraryPool(lib_path, pool_size)
+        return _POOLS[lib_path]
+
+
+class ESpeakLib(ESpeak):
+    """ESpeak wrapper calling the `espeak-ng` or `espeak` shared library through ctypes to perform G2P.
+
+    It avoids starting a new `espeak` process for each call of `ESpeak`. The library is kept loaded with its voice
+    data and calls are distributed over a pool of library copies, so it is safe to use from multiple threads. Its
+    outputs are the same as `ESpeak` since the espeak CLI uses the same library functions.
+
+    Args:
+        language (str):
+            Valid language code for the used backend.
+
+        backend (str):
+            Name of the backend library to use. `espeak` or `espeak-ng`. If None, set automatically
+            prefering `espeak-ng` over `espeak`. It must match the library given by `lib_path`. Defaults to None.
+
+        punctuations (str):
+            Characters to be treated as punctuation. Defaults to Punctuation.default_puncs().
+
+        keep_puncs (bool):
+            If True, keep the punctuations after phonemization. Defaults to True.
+
+        lib_path (str):
+            Path to the espeak shared library. If None, it is found automatically or read from the `ESPEAK_LIBRARY`
+            environment variable. Defaults to None.
+
+        pool_size (int):
+            Maximum number of library copies used in parallel by the process. Defaults to the number of CPUs.
+
+    Example:
+
+        >>> from TTS.tts.utils.text.phonemizers import ESpeakLib
+        >>> phonemizer = ESpeakLib("tr")
+        >>> phonemizer.phonemize("Bu Türkçe, bir örnektir.", separator="|")
+        'b|ʊ t|ˈø|r|k|tʃ|ɛ, b|ɪ|r œ|r|n|ˈɛ|c|t|ɪ|r.'
+    """
+
+    _ESPEAK_LIB = _DEF_ESPEAK_BACKEND
+
+    def __init__(
+        self,
+        language: str,
+        backend=None,
+        punctuations=Punctuation.default_puncs(),
+        keep_puncs=True,
+        lib_path: str = None,
+        pool_size: int = None,
+    ):  # pylint: disable=super-init-not-called
+        if lib_path is None and backend is not None and backend != _DEF_ESPEAK_BACKEND:
+            lib_path = ctypes.util.find_library(backend)
+        elif lib_path is None:
+            lib_path = _DEF_ESPEAK_LIB_PATH
+        if lib_path is None:
+            raise Exception(" [!] No espeak library found. Install espeak-ng or espeak to your system.")
+        # the output format depends on the loaded library, so the backend is always the library's
+        backend_name = _lib_backend(lib_path)
+        if backend is not None and backend != backend_name:
+            raise ValueError(f" [!] Backend {backend} does not match the espeak library {lib_path}.")
+        self.pool = get_espeak_pool(lib_path, pool_size)
+        self.backend = backend_name
+
+        # band-aid for backwards compatibility
+        if language == "en":
+            language = "en-us"
+
+        super(ESpeak, self).__init__(  # pylint: disable=bad-super-call
+            language, punctuations=punctuations, keep_puncs=keep_puncs
+        )
+
+    @staticmethod
+    def name():
+        return "espeak_lib"
+
+    def phonemize_espeak(self, text: str, separator: str = "|", tie=False) -> str:
+        """Convert input text to phonemes.
+
+        Args:
+            text (str):
+                Text to be converted to phonemes.
+
+            tie (bool, optional) : When True use a '͡' character between
+                consecutive characters of a single phoneme. Else separate phoneme
+                with '_'. This option requires espeak>=1.49. Default to False.
+        """
+        if tie:
+            phonemes_mode = _ESPEAK_PHONEMES_IPA | _ESPEAK_PHONEMES_TIE | (ord("͡") << 8)
+        else:
+            phonemes_mode = _ESPEAK_PHONEMES_IPA | (ord("_") << 8)
+        # match the input of the CLI wrapper
+        text = '"' + text + '"'
+        with self.pool.acquire() as lib:
+            clauses = lib.text_to_phonemes(text, self._language, phonemes_mode)
+        # compute phonemes
+        phonemes = ""
+        for clause in clauses:
+            logging.debug("line: %s", repr(clause))
+            phonemes += clause.strip()[self.num_skip_chars :]  # skip initial redundant characters
+        return phonemes.replace("_", separator)
+
+    @staticmethod
+    def supported_languages() -> Dict:
+        """Get a dictionary of supported languages.
+
+        Returns:
+            Dict: Dictionary of language codes.
+        """
+        if _DEF_ESPEAK_LIB_PATH is None:
+            return {}
+        with get_espeak_pool().acquire() as lib:
+            return lib.list_voices()
+
+    def is_supported_language(self, language):
+        """Returns True if `language` is supported by the library used by the phonemizer"""
+        with self.pool.acquire() as lib:
+            return language in lib.list_voices()
+
+    def version(self) -> str:
+        """Get the version of the used backend.
+
+        Returns:
+            str: Version of the used backend.
+        """
+        with self.pool.acquire() as lib:
+            return lib.version()
+
+    @classmethod
+    def is_available(cls):
+        """Return true if the espeak library is available else false"""
+        return _DEF_ESPEAK_LIB_PATH is not None
+
+
+if __name__ == "__main__":
+    # micro-benchmark of the CLI and the library backends.
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    texts = [
+        "Recent research at Harvard has shown meditating",
+        "for as little as 8 weeks can actually increase, the grey matter",
+        "in the parts of the brain responsible",
+        "for emotional regulation and learning!",
+    ] * 25
+
+    def _benchmark(phonemizer, num_threads=1):
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            outputs = list(executor.map(phonemizer.phonemize, texts))
+        return time.time() - start, outputs
+
+    cli_time, cli_outputs = _benchmark(ESpeak("en-us"))
+    print(f" > ESpeak (CLI): {cli_time:.3f} secs for {len(texts)} texts.")
+    for num_threads in [1, 4]:
+        lib_time, lib_outputs = _benchmark(ESpeakLib("en-us"), num_threads)
+        print(f" > ESpeakLib ({num_threads} threads): {lib_time:.3f} secs for {len(texts)} texts.")
+        print(f" > Speed-up: {cli_time / lib_time:.2f}x - Same outputs: {cli_outputs == lib_outputs}")
@@ -1,6 +1,7 @@
 from typing import Callable, Dict, List, Union
 
 from TTS.tts.utils.text import cleaners
+from TTS.tts.utils.text.cache import TextCache
 from TTS.tts.utils.text.characters import Graphemes, IPAPhonemes
 from TTS.tts.utils.text.phonemizers import DEF_LANG_TO_PHONEMIZER, get_phonemizer_by_name
 from TTS.utils.generic_utils import get_import_path, import_class
@@ -24,6 +25,9 @@ class TTSTokenizer:
         phonemizer (Phonemizer):
             A phonemizer object or a dict that maps language codes to phonemizer objects. Defaults to None.
 
+        cache (TextCache):
+            A cache for the cleaned and phonemized sentences and words. Defaults to None.
+
     Example:
 
         >>> from TTS.tts.utils.text.tokenizer import TTSTokenizer
@@ -42,6 +46,7 @@ class TTSTokenizer:
         phonemizer: Union["Phonemizer", Dict] = None,
         add_blank: bool = False,
         use_eos_bos=False,
+        cache: TextCache = None,
     ):
         self.text_cleaner = text_cleaner
         self.use_phonemes = use_phonemes
@@ -50,6 +55,7 @@ class TTSTokenizer:
         self.characters = characters
         self.not_found_characters = []
         self.phonemizer = phonemizer
+        self.cache = cache
 
     @property
     def characters(self):
@@ -102,17 +108,63 @@ class TTSTokenizer:
         4. Add BOS and EOS characters
         5. Text to token IDs
         """
-        # TODO: text cleaner should pick the right routine based on the language
-        if self.text_cleaner is not None:
-            text = self.text_cleaner(text)
-        if self.use_phonemes:
-            text = self.phonemizer.phonemize(text, separator="")
+        if self.cache is not None:
+            text = self._clean_and_phonemize_cached(text, language)
+        else:
+            text = self._clean_and_phonemize(text)
         if self.add_blank:
             text = self.intersperse_blank_char(text, True)
         if self.use_eos_bos:
             text = self.pad_with_bos_eos(text)
         return self.encode(text)
 
+    def _clean_and_phonemize(self, text: str) -> str:
+        # TODO: text cleaner should pick the right routine based on the language
+        if self.text_cleaner is not None:
+            text = self.text_cleaner(text)
+        if self.use_phonemes:
+            if self.cache is not None and self.cache.use_word_cache:
+                text = self._phonemize_by_words(text)
+            else:
+                text = self.phonemizer.phonemize(text, separator="")
+        return text
+
+    def _cache_prefix(self, language: str = None):
+        """Return the cleaner, phonemizer and language parts of the cache keys."""
+        cleaner = self.text_cleaner.__name__ if self.text_cleaner is not None else None
+        if not self.use_phonemes:
+            return cleaner, None, language
+        return cleaner, self.phonemizer.name(), self.phonemizer.language
+
+    def _clean_and_phonemize_cached(self, text: str, language: str = None) -> str:
+        key = self.cache.sentence_key(*self._cache_prefix(language), text)
+        output = self.cache.get_sentence(key)
+        if output is None:
+            output = self._clean_and_phonemize(text)
+            self.cache.put_sentence(key, output)
+        return output
+
+    def _phonemize_by_words(self, text: str) -> str:
+        """Phonemize the text word by word reusing the cached words.
+
+        Punctuations are split and restored by the phonemizer the same way as in `BasePhonemizer.phonemize()`, so
+        the cached words do not carry punctuations.
+        """
+        _, phonemizer_name, language = self._cache_prefix()
+        segments, punctuations = self.phonemizer._phonemize_preprocess(text)  # pylint: disable=protected-access
+        phonemized = []
+        for segment in segments:
+            words = []
+            for word in segment.split():
+                key = self.cache.word_key(phonemizer_name, language, word)
+                phonemes = self.cache.get_word(key)
+                if phonemes is None:
+                    phonemes = self.phonemizer._phonemize(word, "")  # pylint: disable=protected-access
+                    self.cache.put_word(key, phonemes)
+                words.append(phonemes)
+            phonemized.append(" ".join(words))
+        return self.phonemizer._phonemize_postprocess(phonemized, punctuations)  # pylint: disable=protected-access
+
     def ids_to_text(self, id_sequence: List[int]) -> str:
         """Converts a sequence of token IDs to a string of text."""
         return self.decode(id_sequence)
@@ -139,6 +191,9 @@ class TTSTokenizer:
         if self.use_phonemes:
             print(f"{indent}| > phonemizer:")
             self.phonemizer.print_logs(level + 1)
+        if self.cache is not None:
+            print(f"{indent}| > text cache:")
+            self.cache.print_logs(level + 1)
         if len(self.not_found_characters) > 0:
             print(f"{indent}| > {len(self.not_found_characters)} not found characters:")
             for char in self.not_found_characters:
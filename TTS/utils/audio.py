@@ -70,6 +70,12 @@ class TorchSTFT(nn.Module):  # pylint: disable=abstract-method
             (including `+-np.inf`).
 
             Otherwise, leave all the triangles aiming for a peak value of 1.0. Defaults to "slaney".
+
+        center (bool, optional):
+            If True reflect pad the input by `n_fft // 2` on both sides to center the frames. Defaults to True.
+
+        eps (float, optional):
+            Lower bound of the squared magnitudes to keep `sqrt` differentiable. Defaults to 1e-8.
     """
 
     def __init__(
@@ -89,6 +95,8 @@ class TorchSTFT(nn.Module):  # pylint: disable=abstract-method
         power=None,
         use_htk=False,
         mel_norm="slaney",
+        center=True,
+        eps=1e-8,
     ):
         super().__init__()
         self.n_fft = n_fft
@@ -105,6 +113,8 @@ class TorchSTFT(nn.Module):  # pylint: disable=abstract-method
         self.power = power
         self.use_htk = use_htk
         self.mel_norm = mel_norm
+        self.center = center
+        self.eps = eps
         self.window = nn.Parameter(getattr(torch, window)(win_length), requires_grad=False)
         self.mel_basis = None
         if use_mel:
@@ -134,7 +144,7 @@ class TorchSTFT(nn.Module):  # pylint: disable=abstract-method
             self.hop_length,
             self.win_length,
             self.window,
-            center=True,
+            center=self.center,
             pad_mode="reflect",  # compatible with audio.py
             normalized=False,
             onesided=True,
@@ -142,7 +152,7 @@ class TorchSTFT(nn.Module):  # pylint: disable=abstract-method
         )
         M = o[:, :, :, 0]
         P = o[:, :, :, 1]
-        S = torch.sqrt(torch.clamp(M**2 + P**2, min=1e-8))
+        S = torch.sqrt(torch.clamp(M**2 + P**2, min=self.eps))
 
         if self.power is not None:
             S = S**self.power
@@ -644,6 +654,95 @@ class AudioProcessor(object):
             S = self._linear_to_mel(np.abs(D))
         return self.normalize(S).astype(np.float32)
 
+    ### Batched spectrograms ###
+    def _normalize_torch(self, S: torch.Tensor, scaler: StandardScaler = None) -> torch.Tensor:
+        """Torch version of `normalize()` for `[B, C, T]` spectrograms."""
+        if not self.signal_norm:
+            return S
+        if scaler is not None:
+            mean = torch.as_tensor(scaler.mean_, dtype=S.dtype, device=S.device)
+            scale = torch.as_tensor(scaler.scale_, dtype=S.dtype, device=S.device)
+            return (S - mean[:, None]) / scale[:, None]
+        S = S - self.ref_level_db
+        S_norm = (S - self.min_level_db) / (-self.min_level_db)
+        if self.symmetric_norm:
+            S_norm = ((2 * self.max_norm) * S_norm) - self.max_norm
+            if self.clip_norm:
+                S_norm = torch.clamp(S_norm, -self.max_norm, self.max_norm)
+            return S_norm
+        S_norm = self.max_norm * S_norm
+        if self.clip_norm:
+            S_norm = torch.clamp(S_norm, 0, self.max_norm)
+        return S_norm
+
+    def _amp_to_db_torch(self, x: torch.Tensor) -> torch.Tensor:
+        x = torch.log(torch.clamp(x, min=1e-5))
+        if self.base == 10:
+            x = x / np.log(10)
+        return self.spec_gain * x
+
+    def batch_spectrograms(
+        self, wavs: torch.Tensor, wav_lengths: torch.Tensor, compute_linear_spec: bool = False
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Compute melspectrograms and optionally spectrograms of a batch of padded waveforms with a single
+        `TorchSTFT` call.
+
+        Each waveform is padded at its own boundaries as in `librosa.stft()`, so the outputs match
+        `melspectrogram()` and `spectrogram()` of the individual waveforms. Frames after the end of a waveform are
+        zero.
+
+        Args:
+            wavs (torch.Tensor): Zero padded waveforms.
+            wav_lengths (torch.Tensor): Lengths of the waveforms.
+            compute_linear_spec (bool): Compute the spectrograms too. Defaults to False.
+
+        Returns:
+            Tuple[torch.Tensor, torch.Tensor, torch.Tensor]: Melspectrograms, spectrograms or None and the number
+                of frames of each waveform.
+
+        Shapes:
+            - wavs: :math:`[B, T]`
+            - wav_lengths: :math:`[B]`
+            - mel: :math:`[B, C_mel, T_spec]`
+            - linear: :math:`[B, C_linear, T_spec]`
+            - spec_lengths: :math:`[B]`
+        """
+        if not hasattr(self, "torch_stft"):
+            # no magnitude clamping to match `np.abs()`
+            self.torch_stft = TorchSTFT(self.fft_size, self.hop_length, self.win_length, center=False, eps=0.0)
+        self.torch_stft.to(wavs.device)
+        wavs = wavs.float()
+        wav_lengths = wav_lengths.long().to(wavs.device)
+        if self.preemphasis != 0:
+            # causal filter, so the zero padding does not change the waveforms
+            wavs = torch.cat([wavs[:, :1], wavs[:, 1:] - self.preemphasis * wavs[:, :-1]], dim=1)
+        # pad each waveform at its own end
+        pad = self.fft_size // 2
+        idxs = torch.arange(-pad, wavs.shape[1] + pad, device=wavs.device).unsqueeze(0)
+        lengths = wav_lengths.unsqueeze(1)
+        if self.stft_pad_mode == "reflect":
+            idxs = idxs.abs()
+            idxs = torch.where(idxs >= lengths, 2 * (lengths - 1) - idxs, idxs)
+        elif self.stft_pad_mode == "constant":
+            idxs = idxs.expand(len(wavs), -1)
+        else:
+            raise ValueError(f" [!] Unsupported `stft_pad_mode` for batched spectrograms: {self.stft_pad_mode}")
+        valid = (idxs >= 0) & (idxs < lengths)
+        wavs = torch.gather(wavs, 1, idxs.clamp(0, wavs.shape[1] - 1)) * valid
+        S = self.torch_stft(wavs)
+        spec_lengths = wav_lengths // self.hop_length + 1
+        mask = torch.arange(S.shape[2], device=S.device)[None, None, :] < spec_lengths[:, None, None]
+        mel_basis = torch.as_tensor(self.mel_basis, dtype=S.dtype, device=S.device)
+        mel = torch.matmul(mel_basis, S)
+        if self.do_amp_to_db_mel:
+            mel = self._amp_to_db_torch(mel)
+        mel = self._normalize_torch(mel, getattr(self, "mel_scaler", None)) * mask
+        linear = None
+        if compute_linear_spec:
+            linear = self._amp_to_db_torch(S) if self.do_amp_to_db_linear else S
+            linear = self._normalize_torch(linear, getattr(self, "linear_scaler", None)) * mask
+        return mel, linear, spec_lengths
+
     def inv_spectrogram(self, spectrogram: np.ndarray) -> np.ndarray:
         """Convert a spectrogram to a waveform using Griffi-Lim vocoder."""
         S = self.denormalize(spectrogram)
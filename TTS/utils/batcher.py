@@ -0,0 +1,117 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Union
+
+
+class DynamicBatcher:
+    """Collect concurrent TTS requests and synthesize them together with `Synthesizer.tts_batch()`.
+
+    A background thread waits for the first request, then keeps collecting requests until `max_batch_size` requests
+    are pending or `max_wait_time` seconds are passed. Pending requests are grouped by their speaker and language and
+    each group is synthesized with a single `tts_batch()` call. Sentences of the group are bucketed by their token
+    lengths by the `Synthesizer`.
+
+    Args:
+        synthesizer (Synthesizer): Synthesizer used to run the models.
+        max_batch_size (int): Maximum number of requests collected for a batch. Defaults to 16.
+        max_wait_time (float): Maximum time in seconds to wait for more requests before running a batch.
+            Defaults to 0.01.
+        max_sentences_per_batch (int): Maximum number of sentences in a single model forward pass. Defaults to 32.
+
+    Examples:
+        >>> batcher = DynamicBatcher(synthesizer)
+        >>> wav = batcher.tts("Hello world!")
+        >>> future = batcher.submit("Hello again!")
+        >>> wav = future.result()
+        >>> batcher.close()
+    """
+
+    def __init__(
+        self,
+        synthesizer: "Synthesizer",
+        max_batch_size: int = 16,
+        max_wait_time: float = 0.01,
+        max_sentences_per_batch: int = 32,
+    ):
+        self.synthesizer = synthesizer
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self.max_sentences_per_batch = max_sentences_per_batch
+        self.requests = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(
+        self, text: str, speaker_name: str = "", language_name: str = "", speaker_wav: Union[str, List[str]] = None
+    ) -> Future:
+        """Queue a request and return a future resolved with the output waveform."""
+        if self._closed:
+            raise RuntimeError(" [!] DynamicBatcher is closed.")
+        future = Future()
+        self.requests.put((text, speaker_name, language_name, speaker_wav, future))
+        return future
+
+    def tts(
+        self, text: str, speaker_name: str = "", language_name: str = "", speaker_wav: Union[str, List[str]] = None
+    ) -> List[int]:
+        """Blocking version of `submit()` with the same interface as `Synthesizer.tts()`."""
+        return self.submit(text, speaker_name, language_name, speaker_wav).result()
+
+    def close(self):
+        """Stop the background thread after the pending requests are processed."""
+        self._closed = True
+        self.requests.put(None)
+        self._thread.join()
+
+    def _collect(self) -> List:
+        """Block for the first request and collect more until the batch is full or the wait time is over."""
+        item = self.requests.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.time() + self.max_wait_time
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                item = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                # process what we have and stop afterwards
+                self.requests.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            # requests with the same conditioning are synthesized together
+            groups = {}
+            for text, speaker_name, language_name, speaker_wav, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                key = (speaker_name, language_name, str(speaker_wav))
+                groups.setdefault(key, []).append((text, speaker_wav, future))
+            for (speaker_name, language_name, _), requests in groups.items():
+                try:
+                    wavs = self.synthesizer.tts_batch(
+                        [text for text, _, _ in requests],
+                        speaker_name=speaker_name,
+                        language_name=language_name,
+                        speaker_wav=requests[0][1],
+                        max_batch_size=self.max_sentences_per_batch,
+                    )
+                except Exception as e:  # pylint: disable=broad-except
+                    for _, _, future in requests:
+                        future.set_exception(e)
+                    continue
+                for (_, _, future), wav in zip(requests, wavs):
+                    future.set_result(wav)
@@ -0,0 +1,173 @@
+import importlib.util
+
+import torch
+from torch import nn
+
+from TTS.tts.models.forward_tts import ForwardTTS
+from TTS.tts.models.glow_tts import GlowTTS
+from TTS.tts.models.vits import Vits
+from TTS.utils.io import remove_weight_norm
+from TTS.vocoder.models.gan import GAN
+
+# TTS models whose inference graph has no data dependent control flow and is traced for any input length.
+EXPORT_TTS_MODELS = (ForwardTTS, GlowTTS, Vits)
+
+
+def get_speaker_input(model: nn.Module) -> str:
+    """Return the `aux_input` key of the speaker conditioning of a TTS model, or None for single speaker models."""
+    args = getattr(model, "args", model)
+    if getattr(args, "use_d_vector_file", False):
+        return "d_vectors"
+    if getattr(args, "use_speaker_embedding", False):
+        return "speaker_ids"
+    return None
+
+
+class TTSGraph(nn.Module):
+    """Run the inference pass of a TTS model on tensor inputs, so it can be traced.
+
+    The traced graph takes the token ids and their lengths, plus the speaker ids or the d-vectors for multi-speaker
+    models, and returns the `model_outputs` of the model.
+
+    Args:
+        model (nn.Module): TTS model in eval mode.
+        speaker_input (str): `aux_input` key of the speaker conditioning, `speaker_ids` or `d_vectors`. Defaults to
+            None.
+
+    Shapes:
+        - x: :math:`[B, T]`
+        - x_lengths: :math:`[B]`
+        - speaker: :math:`[B]` for `speaker_ids` or :math:`[B, D]` for `d_vectors`
+        - Return: :math:`[B, T_out, C]` spectrogram or :math:`[B, 1, T_wav]` waveform for VITS.
+    """
+
+    def __init__(self, model: nn.Module, speaker_input: str = None):
+        super().__init__()
+        self.model = model
+        self.speaker_input = speaker_input
+
+    def forward(self, x: torch.Tensor, x_lengths: torch.Tensor, *speaker: torch.Tensor) -> torch.Tensor:
+        aux_input = {"x_lengths": x_lengths, "speaker_ids": None, "d_vectors": None, "language_ids": None}
+        if self.speaker_input is not None:
+            aux_input[self.speaker_input] = speaker[0]
+        return self.model.inference(x, aux_input=aux_input)["model_outputs"]
+
+
+class VocoderGraph(nn.Module):
+    """Run the `inference()` method of a vocoder generator as `forward()` for the ONNX export."""
+
+    def __init__(self, generator: nn.Module):
+        super().__init__()
+        self.generator = generator
+
+    def forward(self, c: torch.Tensor) -> torch.Tensor:
+        return self.generator.inference(c)
+
+
+def _check_onnx() -> None:
+    if importlib.util.find_spec("onnx") is None:
+        raise ImportError(" [!] ONNX export needs the `onnx` package. Install it by `pip install onnx`.")
+
+
+def export_tts(
+    model: nn.Module, path: str = None, example_length: int = 32, onnx: bool = False
+) -> torch.jit.ScriptModule:
+    """Trace the inference pass of a TTS model into a graph taking inputs of any length.
+
+    `ForwardTTS` (FastPitch, FastSpeech), `GlowTTS` and `Vits` are supported. The graph returns the same outputs as
+    `model.inference()["model_outputs"]`. The random sampling of GlowTTS and VITS stays in the graph.
+
+    Args:
+        model (nn.Module): TTS model in eval mode. Multi-lingual models are not supported.
+        path (str): If given, the graph is saved to this path. Defaults to None.
+        example_length (int): Length of the example input used for tracing. Defaults to 32.
+        onnx (bool): Export an ONNX graph to `path` instead of a TorchScript graph. It needs the `onnx` package.
+            Defaults to False.
+
+    Returns:
+        torch.jit.ScriptModule: traced graph, or None for the ONNX export.
+    """
+    if not isinstance(model, EXPORT_TTS_MODELS):
+        raise ValueError(f" [!] {type(model).__name__} cannot be exported, only ForwardTTS, GlowTTS and Vits can.")
+    if getattr(getattr(model, "args", model), "use_language_embedding", False):
+        raise ValueError(" [!] Multi-lingual models cannot be exported.")
+    model.eval()
+    speaker_input = get_speaker_input(model)
+    device = next(model.parameters()).device
+    # token values do not change the traced operations
+    x = torch.ones(1, example_length, dtype=torch.long, device=device)
+    example_inputs = [x, torch.tensor([example_length], device=device)]
+    input_names = ["x", "x_lengths"]
+    dynamic_axes = {"x": {0: "batch", 1: "time"}, "x_lengths": {0: "batch"}}
+    if speaker_input == "speaker_ids":
+        example_inputs.append(torch.zeros(1, dtype=torch.long, device=device))
+    elif speaker_input == "d_vectors":
+        example_inputs.append(torch.zeros(1, model.embedded_speaker_dim, device=device))
+    if speaker_input is not None:
+        input_names.append(speaker_input)
+        dynamic_axes[speaker_input] = {0: "batch"}
+    graph = TTSGraph(model, speaker_input)
+    if onnx:
+        _check_onnx()
+        with torch.no_grad():
+            torch.onnx.export(
+                graph,
+                tuple(example_inputs),
+                path,
+                input_names=input_names,
+                output_names=["model_outputs"],
+                dynamic_axes={**dynamic_axes, "model_outputs": {0: "batch", 1: "time"}},
+                dynamo=False,
+            )
+        return None
+    with torch.no_grad():
+        # the trace check reruns the graph and fails on the random sampling of GlowTTS and VITS
+        traced = torch.jit.trace(graph, tuple(example_inputs), check_trace=False)
+    if path is not None:
+        torch.jit.save(traced, path)
+    return traced
+
+
+def export_vocoder(
+    model: nn.Module, num_channels: int, path: str = None, example_length: int = 32, onnx: bool = False
+) -> torch.jit.ScriptModule:
+    """Trace the `inference()` method of a GAN vocoder generator into a graph taking spectrograms of any length.
+
+    The weight normalization of the generator is removed in place before tracing. The TorchScript graph keeps the
+    method name, so it is run by `graph.inference(c)` like the eager model.
+
+    Args:
+        model (nn.Module): GAN vocoder model or its generator in eval mode.
+        num_channels (int): Number of spectrogram channels.
+        path (str): If given, the graph is saved to this path. Defaults to None.
+        example_length (int): Number of spectrogram frames of the example input used for tracing. Defaults to 32.
+        onnx (bool): Export an ONNX graph to `path` instead of a TorchScript graph. It needs the `onnx` package.
+            Defaults to False.
+
+    Returns:
+        torch.jit.ScriptModule: traced graph, or None for the ONNX export.
+    """
+    if isinstance(model, GAN):
+        model = model.model_g
+    if not hasattr(model, "inference"):
+        raise ValueError(f" [!] {type(model).__name__} is not a GAN vocoder generator and cannot be exported.")
+    generator = remove_weight_norm(model).eval()
+    c = torch.randn(1, num_channels, example_length, device=next(generator.parameters()).device)
+    if onnx:
+        _check_onnx()
+        with torch.no_grad():
+            torch.onnx.export(
+                VocoderGraph(generator),
+                (c,),
+                path,
+                input_names=["c"],
+                output_names=["waveform"],
+                dynamic_axes={"c": {0: "batch", 2: "time"}, "waveform": {0: "batch", 2: "time"}},
+                dynamo=False,
+            )
+        return None
+    with torch.no_grad():
+        traced = torch.jit.trace_module(generator, {"inference": (c,)}, check_trace=False)
+    if path is not None:
+        torch.jit.save(traced, path)
+    return traced
@@ -3,11 +3,17 @@ import json
 import os
 import pickle as pickle_tts
 import shutil
+import zipfile
+from distutils.version import LooseVersion
 from typing import Any, Callable, Dict, Union
 
 import fsspec
 import torch
 from coqpit import Coqpit
+from torch.nn.utils.weight_norm import WeightNorm
+
+# memory mapped loading and assigning the loaded tensors to the model need torch>=2.1
+TORCH_MMAP = LooseVersion(torch.__version__) >= LooseVersion("2.1")
 
 
 class RenamingUnpickler(pickle_tts.Unpickler):
@@ -130,6 +136,82 @@ def save_model(config, model, optimizer, scaler, current_step, epoch, output_pat
     save_fsspec(state, output_path)
 
 
+def remove_weight_norm(model: torch.nn.Module, state_dict: Dict = None) -> torch.nn.Module:
+    """Remove the weight normalization of the model layers in place.
+
+    Args:
+        model (torch.nn.Module): Model to update.
+        state_dict (Dict, optional): If given, only the layers whose weights are saved without the weight
+            normalization in `state_dict` are updated. Defaults to None.
+
+    Returns:
+        torch.nn.Module: the updated model.
+    """
+    for module_name, module in model.named_modules():
+        for hook in list(module._forward_pre_hooks.values()):  # pylint: disable=protected-access
+            if not isinstance(hook, WeightNorm):
+                continue
+            prefix = f"{module_name}.{hook.name}" if module_name else hook.name
+            if state_dict is None or (prefix in state_dict and f"{prefix}_g" not in state_dict):
+                torch.nn.utils.remove_weight_norm(module, hook.name)
+    return model
+
+
+def save_inference_checkpoint(model: torch.nn.Module, output_path: str, fp16: bool = False, **kwargs) -> None:
+    """Save only the model weights needed for inference.
+
+    The weight normalization is removed and no training state is saved, so the checkpoint is smaller and faster to
+    load than the training checkpoints. It is saved in the zip format of `torch.save()`, which
+    `load_inference_state()` maps into memory.
+
+    Args:
+        model (torch.nn.Module): Model loaded for inference. Its weight normalization is removed in place.
+        output_path (str): Output checkpoint path.
+        fp16 (bool, optional): Save the floating point weights in half precision. They are cast back to the model
+            precision at loading, so they are not memory mapped. Defaults to False.
+        **kwargs: Additional entries of the checkpoint.
+    """
+    model_state = remove_weight_norm(model).state_dict()
+    if fp16:
+        model_state = {k: v.half() if v.is_floating_point() else v for k, v in model_state.items()}
+    state = {"model": {k: v.detach().cpu().contiguous() for k, v in model_state.items()}, "inference_only": True}
+    state.update(kwargs)
+    save_fsspec(state, output_path)
+
+
+def is_inference_checkpoint(checkpoint_path: str) -> bool:
+    """Check if a checkpoint is a local checkpoint saved by `save_inference_checkpoint()` without loading it.
+
+    Only the pickled record of the zip file is read and searched for the `inference_only` key, the tensor records
+    are not read.
+    """
+    if not os.path.isfile(checkpoint_path) or not zipfile.is_zipfile(checkpoint_path):
+        return False
+    with zipfile.ZipFile(checkpoint_path) as archive:
+        records = [name for name in archive.namelist() if name.endswith("/data.pkl")]
+        return len(records) == 1 and b"inference_only" in archive.read(records[0])
+
+
+def load_inference_state(checkpoint_path: str) -> Dict:
+    """Load a checkpoint saved by `save_inference_checkpoint()` with its tensors mapped into memory.
+
+    Tensors are read from the file at their first use and the processes loading the same file share the memory
+    pages of the weights. With torch<2.1 the tensors are loaded without memory mapping.
+
+    Returns:
+        Dict: checkpoint state or None if the checkpoint is not a local inference checkpoint.
+    """
+    if not is_inference_checkpoint(checkpoint_path):
+        return None
+    if TORCH_MMAP:
+        state = torch.load(checkpoint_path, map_location="cpu", mmap=True, weights_only=True)
+    else:
+        state = torch.load(checkpoint_path, map_location="cpu")
+    if not isinstance(state, dict) or not state.get("inference_only", False):
+        return None
+    return state
+
+
 def save_checkpoint(
     config,
     model,
@@ -0,0 +1,229 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+
+import torch
+
+from TTS.utils.manage import ModelManager
+from TTS.utils.synthesizer import Synthesizer
+
+
+def model_size_in_mb(model: torch.nn.Module) -> float:
+    """Return the memory used by the parameters and the buffers of a model in MB."""
+    num_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+    num_bytes += sum(b.numel() * b.element_size() for b in model.buffers())
+    return num_bytes / 1024**2
+
+
+class ModelRegistry:
+    """Load TTS models on their first request and keep the most recently used ones in memory.
+
+    Models are referred by their `ModelManager` name, e.g. `tts_models/en/ljspeech/tacotron2-DDC`, or by the name
+    given to `register()` for the custom models. A model is downloaded and loaded with its default vocoder the first
+    time it is requested by `get()`. Loaded models are kept until their memory goes beyond `max_memory_in_mb`, then the
+    least recently used ones are unloaded.
+
+    TTS models using the same vocoder checkpoint and config share a single vocoder instance. A vocoder is unloaded
+    with the last TTS model using it.
+
+    Args:
+        manager (ModelManager): Manager to download the released models. Defaults to None, the default `ModelManager`.
+        max_memory_in_mb (float): Memory budget of the loaded model weights in MB. The last requested model is kept even
+            if it does not fit in the budget alone. Defaults to 4096.
+        use_cuda (bool): Load the models on the GPU. Defaults to False.
+        vocoder_name (str): Vocoder model used by all the released models instead of their default vocoders.
+            Defaults to None.
+        **synthesizer_kwargs: Additional arguments of the `Synthesizer` of each model.
+
+    Examples:
+        >>> registry = ModelRegistry(max_memory_in_mb=2048)
+        >>> synthesizer = registry.get("tts_models/en/ljspeech/glow-tts")
+        >>> wav = synthesizer.tts("Hello world!")
+    """
+
+    def __init__(
+        self,
+        manager: ModelManager = None,
+        max_memory_in_mb: float = 4096,
+        use_cuda: bool = False,
+        vocoder_name: str = None,
+        **synthesizer_kwargs,
+    ):
+        self._manager = manager
+        self.max_memory_in_mb = max_memory_in_mb
+        self.use_cuda = use_cuda
+        self.vocoder_name = vocoder_name
+        self.synthesizer_kwargs = synthesizer_kwargs
+        self.custom_models: Dict[str, Dict] = {}
+        self.pinned: Set[str] = set()
+        # model name -> synthesizer, from the least to the most recently used
+        self.synthesizers: "OrderedDict[str, Synthesizer]" = OrderedDict()
+        self.model_sizes: Dict[str, float] = {}
+        # vocoder key -> (vocoder model, config, audio processor) and the names of the models using it
+        self.vocoders: Dict[Tuple[str, str], Tuple] = {}
+        self.vocoder_sizes: Dict[Tuple[str, str], float] = {}
+        self.vocoder_users: Dict[Tuple[str, str], Set[str]] = {}
+        self.model_vocoders: Dict[str, Tuple[str, str]] = {}
+        # guards the state above, models are loaded without holding it
+        self.lock = threading.RLock()
+        # model name -> lock held while the model is loaded, so concurrent requests wait for a single load
+        self.loading: Dict[str, threading.Lock] = {}
+
+    @property
+    def manager(self) -> ModelManager:
+        if self._manager is None:
+            self._manager = ModelManager()
+        return self._manager
+
+    @property
+    def loaded_models(self) -> List[str]:
+        """Names of the loaded models from the least to the most recently used."""
+        return list(self.synthesizers.keys())
+
+    @property
+    def memory_in_mb(self) -> float:
+        """Memory used by the loaded TTS and vocoder model weights in MB."""
+        return sum(self.model_sizes.values()) + sum(self.vocoder_sizes.values())
+
+    def register(
+        self,
+        model_name: str,
+        model_path: str,
+        config_path: str,
+        vocoder_path: str = None,
+        vocoder_config_path: str = None,
+        speakers_file_path: str = None,
+    ) -> None:
+        """Register a custom model under `model_name`. It is loaded at its first request like the released models."""
+        self.custom_models[model_name] = {
+            "model_path": model_path,
+            "config_path": config_path,
+            "vocoder_path": vocoder_path,
+            "vocoder_config_path": vocoder_config_path,
+            "speakers_file_path": speakers_file_path,
+        }
+
+    def add(self, model_name: str, synthesizer: Synthesizer, pin: bool = False) -> None:
+        """Add an already loaded synthesizer under `model_name`. Pinned models are never unloaded.
+
+        Its vocoder is shared with the models loaded later with the same vocoder checkpoint and config. If the same
+        vocoder is already loaded, the synthesizer uses the loaded one instead.
+        """
+        with self.lock:
+            if pin:
+                self.pinned.add(model_name)
+            if synthesizer.vocoder_model is not None:
+                key = self._vocoder_key(synthesizer.vocoder_checkpoint, synthesizer.vocoder_config_path)
+                if key not in self.vocoders:
+                    self.vocoders[key] = (synthesizer.vocoder_model, synthesizer.vocoder_config, synthesizer.vocoder_ap)
+                    self.vocoder_sizes[key] = model_size_in_mb(synthesizer.vocoder_model)
+                    self.vocoder_users[key] = set()
+                elif synthesizer.vocoder_model is not self.vocoders[key][0]:
+                    # the vocoder was loaded by a concurrent request
+                    synthesizer.set_vocoder(*self.vocoders[key])
+                self.vocoder_users[key].add(model_name)
+                self.model_vocoders[model_name] = key
+            self.synthesizers[model_name] = synthesizer
+            self.model_sizes[model_name] = model_size_in_mb(synthesizer.tts_model)
+            self._evict(keep=model_name)
+
+    def get(self, model_name: str) -> Synthesizer:
+        """Return the synthesizer of a model, loading it if it is not loaded.
+
+        The loaded models are served while another model is loaded. Concurrent requests of the same model wait for a
+        single load.
+
+        Raises:
+            ValueError: `model_name` is neither registered nor a released model.
+        """
+        synthesizer = self._get_loaded(model_name)
+        if synthesizer is not None:
+            return synthesizer
+        with self.lock:
+            loading = self.loading.setdefault(model_name, threading.Lock())
+        with loading:
+            # loaded by a concurrent request while waiting
+            synthesizer = self._get_loaded(model_name)
+            if synthesizer is not None:
+                return synthesizer
+            try:
+                return self._load(model_name)
+            finally:
+                with self.lock:
+                    self.loading.pop(model_name, None)
+
+    def unload(self, model_name: str) -> None:
+        """Unload a model and its vocoder if no other loaded model uses it."""
+        with self.lock:
+            if model_name not in self.synthesizers:
+                return
+            print(f" > Unloading {model_name}")
+            del self.synthesizers[model_name]
+            del self.model_sizes[model_name]
+            self.pinned.discard(model_name)
+            key = self.model_vocoders.pop(model_name, None)
+            if key is not None:
+                self.vocoder_users[key].discard(model_name)
+                if not self.vocoder_users[key]:
+                    del self.vocoders[key], self.vocoder_sizes[key], self.vocoder_users[key]
+            if self.use_cuda:
+                torch.cuda.empty_cache()
+
+    def _get_loaded(self, model_name: str) -> Synthesizer:
+        with self.lock:
+            if model_name not in self.synthesizers:
+                return None
+            self.synthesizers.move_to_end(model_name)
+            return self.synthesizers[model_name]
+
+    @staticmethod
+    def _vocoder_key(vocoder_path: str, vocoder_config_path: str) -> Tuple[str, str]:
+        return os.path.realpath(vocoder_path), os.path.realpath(vocoder_config_path)
+
+    def _get_paths(self, model_name: str) -> Dict:
+        if model_name in self.custom_models:
+            return self.custom_models[model_name]
+        try:
+            model_type, lang, dataset, model = model_name.split("/")
+            self.manager.models_dict[model_type][lang][dataset][model]  # pylint: disable=pointless-statement
+        except (KeyError, ValueError) as e:
+            raise ValueError(f" [!] Unknown model name: {model_name}") from e
+        model_path, config_path, model_item = self.manager.download_model(model_name)
+        paths = {"model_path": model_path, "config_path": config_path, "speakers_file_path": None}
+        vocoder_name = self.vocoder_name if self.vocoder_name is not None else model_item.get("default_vocoder")
+        paths["vocoder_path"], paths["vocoder_config_path"] = None, None
+        if vocoder_name is not None:
+            paths["vocoder_path"], paths["vocoder_config_path"], _ = self.manager.download_model(vocoder_name)
+        return paths
+
+    def _load(self, model_name: str) -> Synthesizer:
+        paths = self._get_paths(model_name)
+        print(f" > Loading {model_name}")
+        vocoder = None
+        if paths["vocoder_path"]:
+            with self.lock:
+                vocoder = self.vocoders.get(self._vocoder_key(paths["vocoder_path"], paths["vocoder_config_path"]))
+        synthesizer = Synthesizer(
+            tts_checkpoint=paths["model_path"],
+            tts_config_path=paths["config_path"],
+            tts_speakers_file=paths["speakers_file_path"],
+            vocoder_checkpoint=paths["vocoder_path"],
+            vocoder_config=paths["vocoder_config_path"],
+            use_cuda=self.use_cuda,
+            load_vocoder=vocoder is None,
+            **self.synthesizer_kwargs,
+        )
+        if vocoder is not None:
+            print(f" > Sharing the loaded vocoder {paths['vocoder_path']}")
+            synthesizer.set_vocoder(*vocoder)
+        self.add(model_name, synthesizer)
+        return synthesizer
+
+    def _evict(self, keep: str) -> None:
+        """Unload the least recently used models until the loaded models fit in the memory budget."""
+        for model_name in list(self.synthesizers.keys()):
+            if self.memory_in_mb <= self.max_memory_in_mb:
+                break
+            if model_name != keep and model_name not in self.pinned:
+                self.unload(model_name)
@@ -0,0 +1,336 @@
+import math
+from typing import Iterator, List
+
+import numpy as np
+import torch
+import torch.distributed as dist
+from torch.utils.data import Sampler
+
+
+class DistributedWeightedSampler(Sampler):
+    """Weighted random sampler that shards the draws among the DDP processes.
+
+    Every process draws the same `num_replicas * num_samples` indices with a generator seeded by `seed + epoch` and
+    keeps every `num_replicas`th draw starting at its `rank`. The processes get disjoint shares of the draws and each
+    share follows the given weights, so the balance of a `WeightedRandomSampler` is kept on every process.
+
+    The epoch is advanced automatically at each iteration or set explicitly by `set_epoch()`.
+
+    Args:
+        weights (torch.Tensor): Sampling weight of each sample.
+        num_samples (int): Total number of draws shared by all the processes. If None, the number of weights.
+            Defaults to None.
+        replacement (bool): Draw with replacement. Defaults to True.
+        num_replicas (int): Number of processes. If None, the world size of the default process group.
+            Defaults to None.
+        rank (int): Rank of the current process. If None, the rank in the default process group. Defaults to None.
+        seed (int): Random seed shared by all the processes. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        weights: torch.Tensor,
+        num_samples: int = None,
+        replacement: bool = True,
+        num_replicas: int = None,
+        rank: int = None,
+        seed: int = 0,
+    ):
+        if num_replicas is None:
+            num_replicas = dist.get_world_size() if dist.is_available() and dist.is_initialized() else 1
+        if rank is None:
+            rank = dist.get_rank() if dist.is_available() and dist.is_initialized() else 0
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f" [!] Invalid rank {rank} for {num_replicas} replicas.")
+        self.weights = torch.as_tensor(weights, dtype=torch.double)
+        num_samples = len(self.weights) if num_samples is None else num_samples
+        if not replacement and num_samples > len(self.weights):
+            raise ValueError(" [!] `num_samples` cannot be larger than the number of weights without replacement.")
+        self.replacement = replacement
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed
+        self.epoch = 0
+        # draws are rounded down without replacement to not run out of samples
+        if replacement:
+            self.num_samples = math.ceil(num_samples / num_replicas)
+        else:
+            self.num_samples = num_samples // num_replicas
+        self.total_size = self.num_samples * num_replicas
+
+    def set_epoch(self, epoch: int):
+        self.epoch = epoch
+
+    def __iter__(self) -> Iterator[int]:
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + self.epoch)
+        indices = torch.multinomial(self.weights, self.total_size, self.replacement, generator=generator)
+        self.epoch += 1
+        return iter(indices[self.rank : self.total_size : self.num_replicas].tolist())
+
+    def __len__(self):
+        return self.num_samples
+
+
+class BucketBatchSampler(Sampler):
+    """Batch sampler that groups samples of similar length and sizes the batches by a frame budget.
+
+    Indices drawn from the inner `sampler` are collected in buckets of `bucket_size` samples. Each bucket is sorted by
+    length and split into batches so that `batch_size * max_length_in_batch <= max_frames`. Short samples are batched
+    together in larger batches and long samples in smaller ones which reduces the padding and keeps the memory use of
+    each step about the same. Batches are shuffled at the end so the lengths do not increase over the epoch.
+
+    All the randomness is seeded by `seed + epoch`. The epoch is advanced automatically at each iteration or set
+    explicitly by `set_epoch()`.
+
+    In distributed training, each process must use the same `seed` and the same inner `sampler` with the full dataset
+    (e.g. a weighted sampler, not a `DistributedSampler`). All the processes build the same batches and each takes
+    every `num_replicas`th batch. Batches are repeated to give each process the same number of batches.
+
+    Args:
+        sampler (Sampler): Inner sampler providing the dataset indices. If None, all the indices are drawn in a random
+            permutation if `shuffle` else in order. Defaults to None.
+        lengths (List[int]): Length of each sample in frames.
+        max_frames (int): Maximum number of frames in a padded batch.
+        max_batch_size (int): Maximum number of samples in a batch. If None, only `max_frames` limits the batch size.
+            Defaults to None.
+        bucket_size (int): Number of samples sorted together. Larger buckets give less padding but less randomness.
+            Defaults to 1000.
+        shuffle (bool): Shuffle the indices and the batches. Defaults to True.
+        drop_last (bool): Drop the last batches instead of repeating batches to divide them evenly among the
+            processes. Defaults to False.
+        num_replicas (int): Number of processes in distributed training. Defaults to 1.
+        rank (int): Rank of the current process. Defaults to 0.
+        seed (int): Random seed shared by all the processes. Defaults to 0.
+        verbose (bool): Print the number of batches and the padding efficiency at each epoch. Defaults to True.
+
+    Example:
+        >>> lengths = dataset.sample_table.audio_lengths // ap.hop_length + 1
+        >>> batch_sampler = BucketBatchSampler(None, lengths, max_frames=20000, max_batch_size=64)
+        >>> loader = DataLoader(dataset, batch_sampler=batch_sampler, collate_fn=dataset.collate_fn)
+    """
+
+    def __init__(
+        self,
+        sampler: Sampler,
+        lengths: List[int],
+        max_frames: int,
+        max_batch_size: int = None,
+        bucket_size: int = 1000,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        num_replicas: int = 1,
+        rank: int = 0,
+        seed: int = 0,
+        verbose: bool = True,
+    ):
+        if max_frames <= 0:
+            raise ValueError(f" [!] `max_frames` must be positive, got {max_frames}.")
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f" [!] Invalid rank {rank} for {num_replicas} replicas.")
+        self.sampler = sampler
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.max_frames = max_frames
+        self.max_batch_size = max_batch_size
+        self.bucket_size = bucket_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed
+        self.verbose = verbose
+        self.epoch = 0
+        self.padding_efficiency = None
+        self._batches = None
+        self._batches_epoch = None
+
+    def set_epoch(self, epoch: int):
+        """Set the epoch used to seed the sampling. It is forwarded to the inner sampler."""
+        self.epoch = epoch
+        if hasattr(self.sampler, "set_epoch"):
+            self.sampler.set_epoch(epoch)
+
+    def _get_indices(self) -> np.ndarray:
+        if self.sampler is not None:
+            # seed the inner sampler too, so that all the processes draw the same indices
+            if hasattr(self.sampler, "generator"):
+                if self.sampler.generator is None:
+                    self.sampler.generator = torch.Generator()
+                self.sampler.generator.manual_seed(self.seed + self.epoch)
+            return np.fromiter(iter(self.sampler), dtype=np.int64)
+        if self.shuffle:
+            return np.random.default_rng(self.seed + self.epoch).permutation(len(self.lengths))
+        return np.arange(len(self.lengths))
+
+    def _make_batches(self, indices: np.ndarray) -> List[List[int]]:
+        batches = []
+        for start in range(0, len(indices), self.bucket_size):
+            bucket = indices[start : start + self.bucket_size]
+            bucket = bucket[np.argsort(self.lengths[bucket], kind="stable")]
+            batch = []
+            for idx, length in zip(bucket.tolist(), self.lengths[bucket].tolist()):
+                # the bucket is sorted, so the new sample is the longest of the batch
+                too_many = self.max_batch_size is not None and len(batch) >= self.max_batch_size
+                if batch and (too_many or (len(batch) + 1) * length > self.max_frames):
+                    batches.append(batch)
+                    batch = []
+                batch.append(idx)
+            if batch:
+                batches.append(batch)
+        return batches
+
+    def _split_batches(self, batches: List[List[int]]) -> List[List[int]]:
+        if self.num_replicas == 1:
+            return batches
+        if self.drop_last:
+            num_batches = len(batches) // self.num_replicas
+        else:
+            num_batches = math.ceil(len(batches) / self.num_replicas)
+            padding = num_batches * self.num_replicas - len(batches)
+            batches = batches + (batches * math.ceil(padding / max(len(batches), 1)))[:padding]
+        return batches[self.rank : num_batches * self.num_replicas : self.num_replicas]
+
+    def compute_padding_efficiency(self, batches: List[List[int]]) -> float:
+        """Return the ratio of the real frames to the padded frames of the given batches."""
+        real_frames = 0
+        padded_frames = 0
+        for batch in batches:
+            lengths = self.lengths[batch]
+            real_frames += lengths.sum()
+            padded_frames += lengths.max() * len(batch)
+        return float(real_frames / padded_frames) if padded_frames > 0 else 1.0
+
+    def get_batches(self) -> List[List[int]]:
+        """Return the batches of the current process for the current epoch."""
+        if self._batches is None or self._batches_epoch != self.epoch:
+            batches = self._make_batches(self._get_indices())
+            if self.shuffle:
+                order = np.random.default_rng(self.seed + self.epoch).permutation(len(batches))
+                batches = [batches[i] for i in order]
+            self._batches = self._split_batches(batches)
+            self._batches_epoch = self.epoch
+            self.padding_efficiency = self.compute_padding_efficiency(self._batches)
+        return self._batches
+
+    def __iter__(self) -> Iterator[List[int]]:
+        batches = self.get_batches()
+        if self.verbose and self.rank == 0:
+            print(
+                f" > Bucket batch sampler - epoch: {self.epoch} - {len(batches)} batches - "
+                f"padding efficiency: {self.padding_efficiency:.3f}"
+            )
+        yield from batches
+        # advance to the next epoch unless the trainer sets it
+        self.epoch = self._batches_epoch + 1
+
+    def __len__(self):
+        return len(self.get_batches())
+
+
+class SpeakerBatchSampler(Sampler):
+    """Batch sampler drawing `num_speakers_in_batch` speakers with `num_utters_per_speaker` utterances each.
+
+    It is used to train the speaker encoders with the GE2E and AngleProto losses. Each batch is a list of
+    `num_speakers_in_batch * num_utters_per_speaker` dataset indices grouped by speaker. The speakers of a batch are
+    distinct and the utterances of a speaker are drawn without replacement unless the speaker has fewer utterances.
+
+    All the draws of an epoch are planned up front from a generator seeded by `seed + epoch`, so the DataLoader
+    workers only load the planned utterances. The epoch is advanced automatically at each iteration or set explicitly
+    by `set_epoch()`.
+
+    In distributed training, the speakers are shuffled at each epoch and split among the processes, so each process
+    draws its batches from a disjoint set of speakers. Each process must use the same `seed`.
+
+    Args:
+        speaker_ids (List[int]): Speaker index of each sample.
+        num_speakers_in_batch (int): Number of speakers in a batch.
+        num_utters_per_speaker (int): Number of utterances of each speaker in a batch.
+        num_batches (int): Number of batches of each process in an epoch. If None, the number of batches to draw
+            about every sample once per epoch. Defaults to None.
+        num_replicas (int): Number of processes. If None, the world size of the default process group.
+            Defaults to None.
+        rank (int): Rank of the current process. If None, the rank in the default process group. Defaults to None.
+        seed (int): Random seed shared by all the processes. Defaults to 0.
+
+    Example:
+        >>> batch_sampler = SpeakerBatchSampler(dataset.get_speaker_ids(), 64, 10)
+        >>> loader = DataLoader(dataset, batch_sampler=batch_sampler, collate_fn=dataset.collate_fn)
+    """
+
+    def __init__(
+        self,
+        speaker_ids: List[int],
+        num_speakers_in_batch: int,
+        num_utters_per_speaker: int,
+        num_batches: int = None,
+        num_replicas: int = None,
+        rank: int = None,
+        seed: int = 0,
+    ):
+        if num_replicas is None:
+            num_replicas = dist.get_world_size() if dist.is_available() and dist.is_initialized() else 1
+        if rank is None:
+            rank = dist.get_rank() if dist.is_available() and dist.is_initialized() else 0
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f" [!] Invalid rank {rank} for {num_replicas} replicas.")
+        self.speaker_ids = np.asarray(speaker_ids, dtype=np.int64)
+        self.speakers = np.unique(self.speaker_ids)
+        if len(self.speakers) // num_replicas < num_speakers_in_batch:
+            raise ValueError(
+                f" [!] {len(self.speakers)} speakers are not enough for {num_replicas} processes with "
+                f"{num_speakers_in_batch} speakers in batch."
+            )
+        # samples of each speaker
+        order = np.argsort(self.speaker_ids, kind="stable")
+        splits = np.cumsum(np.bincount(self.speaker_ids))[:-1]
+        self.speaker_samples = np.split(order, splits)
+        self.num_speakers_in_batch = num_speakers_in_batch
+        self.num_utters_per_speaker = num_utters_per_speaker
+        self.batch_size = num_speakers_in_batch * num_utters_per_speaker
+        if num_batches is None:
+            num_batches = max(len(self.speaker_ids) // (self.batch_size * num_replicas), 1)
+        self.num_batches = num_batches
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed
+        self.epoch = 0
+        self._batches = None
+        self._batches_epoch = None
+
+    def set_epoch(self, epoch: int):
+        self.epoch = epoch
+
+    def get_speakers(self) -> np.ndarray:
+        """Return the speakers of the current process for the current epoch."""
+        if self.num_replicas == 1:
+            return self.speakers
+        speakers = np.random.default_rng(self.seed + self.epoch).permutation(self.speakers)
+        return speakers[self.rank :: self.num_replicas]
+
+    def get_batches(self) -> np.ndarray:
+        """Return the batches `[num_batches, batch_size]` of the current process for the current epoch."""
+        if self._batches is None or self._batches_epoch != self.epoch:
+            speakers = self.get_speakers()
+            # the processes draw different batches from their own speakers
+            rng = np.random.default_rng([self.seed, self.epoch, self.rank])
+            batches = np.empty((self.num_batches, self.batch_size), dtype=np.int64)
+            for batch_idx in range(self.num_batches):
+                batch_speakers = rng.choice(speakers, self.num_speakers_in_batch, replace=False)
+                for speaker_idx, speaker in enumerate(batch_speakers):
+                    samples = self.speaker_samples[speaker]
+                    start = speaker_idx * self.num_utters_per_speaker
+                    batches[batch_idx, start : start + self.num_utters_per_speaker] = rng.choice(
+                        samples, self.num_utters_per_speaker, replace=len(samples) < self.num_utters_per_speaker
+                    )
+            self._batches = batches
+            self._batches_epoch = self.epoch
+        return self._batches
+
+    def __iter__(self) -> Iterator[List[int]]:
+        batches = self.get_batches()
+        yield from batches.tolist()
+        # advance to the next epoch unless the trainer sets it
+        self.epoch = self._batches_epoch + 1
+
+    def __len__(self):
+        return self.num_batches
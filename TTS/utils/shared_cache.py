@@ -0,0 +1,78 @@
+from typing import Tuple
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+
+class SharedArrayCache:
+    """Append-only cache of float32 arrays in shared memory, shared by all the DataLoader workers.
+
+    The arrays of each item are packed in a single buffer of `max_values` values. The workers add the items they load
+    until the buffer is full and cached items are never evicted, so with a buffer large enough for the dataset every
+    item is loaded only once. Cached arrays are returned as views of the buffer without copying, so they must not be
+    modified in place. The cache must be created before the workers are started.
+
+    Args:
+        num_items (int): Number of dataset items. Arrays are cached by the item index.
+        max_values (int): Size of the buffer in float32 values.
+        ndims (Tuple[int]): Number of dimensions of each array cached for an item. Defaults to `(1,)`, a single
+            1D array.
+
+    Examples:
+        >>> cache = SharedArrayCache(num_items=100, max_values=2**20, ndims=(1, 2))
+        >>> cache.put(0, audio, mel)
+        >>> audio, mel = cache.get(0)
+    """
+
+    def __init__(self, num_items: int, max_values: int, ndims: Tuple[int] = (1,)):
+        self.ndims = tuple(ndims)
+        self.buffer = torch.zeros(max_values, dtype=torch.float32).share_memory_()
+        self.offsets = torch.full((num_items,), -1, dtype=torch.int64).share_memory_()
+        # dimensions of the arrays of each item
+        self.shapes = torch.zeros((num_items, sum(self.ndims)), dtype=torch.int64).share_memory_()
+        self.cursor = torch.zeros(1, dtype=torch.int64).share_memory_()
+        self.lock = mp.Lock()
+
+    def __len__(self):
+        return int((self.offsets >= 0).sum())
+
+    def __contains__(self, idx: int):
+        return self.offsets[idx] >= 0
+
+    def get(self, idx: int) -> Tuple[np.ndarray, ...]:
+        """Return views of the cached arrays of the given item or None if it is not cached."""
+        offset = int(self.offsets[idx])
+        if offset < 0:
+            return None
+        dims = self.shapes[idx].tolist()
+        buffer = self.buffer.numpy()
+        arrays = []
+        for ndim in self.ndims:
+            shape, dims = dims[:ndim], dims[ndim:]
+            size = int(np.prod(shape))
+            arrays.append(buffer[offset : offset + size].reshape(shape))
+            offset += size
+        return tuple(arrays)
+
+    def put(self, idx: int, *arrays: np.ndarray) -> bool:
+        """Cache the arrays of the given item. Return False if the buffer is full."""
+        if tuple(array.ndim for array in arrays) != self.ndims:
+            raise ValueError(f" [!] Expected arrays with {self.ndims} dimensions.")
+        size = sum(array.size for array in arrays)
+        with self.lock:
+            if self.offsets[idx] >= 0:
+                return True
+            offset = int(self.cursor[0])
+            if offset + size > len(self.buffer):
+                return False
+            buffer = self.buffer.numpy()
+            start = offset
+            for array in arrays:
+                buffer[start : start + array.size] = array.reshape(-1)
+                start += array.size
+            self.cursor[0] = offset + size
+            self.shapes[idx] = torch.tensor([dim for array in arrays for dim in array.shape])
+            # set the offset last, readers only check the offset
+            self.offsets[idx] = offset
+        return True
@@ -1,18 +1,24 @@
 import time
-from typing import List, Union
+from typing import Dict, Generator, List, Union
 
 import numpy as np
 import pysbd
 import torch
+from coqpit import Coqpit
 
 from TTS.config import load_config
 from TTS.tts.models import setup_model as setup_tts_model
 
 # pylint: disable=unused-wildcard-import
 # pylint: disable=wildcard-import
-from TTS.tts.utils.synthesis import synthesis, trim_silence
+from TTS.tts.utils.speakers import DVectorCache
+from TTS.tts.utils.synthesis import batch_synthesis, supports_batch_inference, synthesis, trim_silence
 from TTS.utils.audio import AudioProcessor
+from TTS.utils.export import export_tts, export_vocoder
+from TTS.utils.io import load_inference_state
 from TTS.vocoder.models import setup_model as setup_vocoder_model
+from TTS.vocoder.models.gan import GAN
+from TTS.vocoder.utils.chunked_vocoder import ChunkedVocoder
 from TTS.vocoder.utils.generic_utils import interpolate_vocoder_input
 
 
@@ -28,6 +34,14 @@ class Synthesizer(object):
         encoder_checkpoint: str = "",
         encoder_config: str = "",
         use_cuda: bool = False,
+        d_vector_cache_size: int = 100,
+        d_vector_cache_path: str = None,
+        vocoder_latency_budget: float = None,
+        vocoder_chunk_size: int = None,
+        load_vocoder: bool = True,
+        use_torchscript: bool = False,
+        tts_graph_path: str = None,
+        vocoder_graph_path: str = None,
     ) -> None:
         """General 🐸 TTS interface for inference. It takes a tts and a vocoder
         model and synthesize speech from the provided text.
@@ -41,13 +55,36 @@ class Synthesizer(object):
         TODO: set the segmenter based on the source language
 
         Args:
-            tts_checkpoint (str): path to the tts model file.
+            tts_checkpoint (str): path to the tts model file. Inference checkpoints exported by
+                `TTS/bin/export_inference_checkpoint.py` are memory mapped, for the tts and the vocoder models.
             tts_config_path (str): path to the tts config file.
             vocoder_checkpoint (str, optional): path to the vocoder model file. Defaults to None.
             vocoder_config (str, optional): path to the vocoder config file. Defaults to None.
             encoder_checkpoint (str, optional): path to the speaker encoder model file. Defaults to `""`,
             encoder_config (str, optional): path to the speaker encoder config file. Defaults to `""`,
             use_cuda (bool, optional): enable/disable cuda. Defaults to False.
+            d_vector_cache_size (int, optional): number of `speaker_wav` d_vectors cached by the clip content.
+                Defaults to 100.
+            d_vector_cache_path (str, optional): JSON file to persist the d_vector cache and the registered voices.
+                It can be shared by several processes, each one uses the voices registered by the others. Defaults to
+                None.
+            vocoder_latency_budget (float, optional): time budget in seconds of a vocoder pass. Vocoders with multiple
+                inference schedules, i.e. WaveGrad with tuned `inference_noise_schedules` in its config, run the
+                longest schedule estimated to fit in the budget. If None, the default schedule is used. Defaults to
+                None.
+            vocoder_chunk_size (int, optional): number of spectrogram frames vocoded at a time by GAN vocoders. The
+                chunks are crossfaded back and `tts_stream()` yields the audio of each chunk as soon as it is ready.
+                If None, the whole spectrogram of a sentence is vocoded at once. Defaults to None.
+            load_vocoder (bool, optional): if False, the vocoder is not loaded and it is set later by `set_vocoder()`.
+                Defaults to True.
+            use_torchscript (bool, optional): run the TTS model and the GAN vocoder as TorchScript graphs. The graphs
+                are traced from the loaded models, or loaded from `tts_graph_path` and `vocoder_graph_path` if given.
+                Only ForwardTTS, GlowTTS and VITS TTS models and GAN vocoders can be run as graphs. `tts_batch()`
+                runs the eager TTS model. Defaults to False.
+            tts_graph_path (str, optional): path to the TTS graph exported by `TTS/bin/export_torchscript.py`.
+                Defaults to None.
+            vocoder_graph_path (str, optional): path to the vocoder graph exported by `TTS/bin/export_torchscript.py`.
+                Defaults to None.
         """
         self.tts_checkpoint = tts_checkpoint
         self.tts_config_path = tts_config_path
@@ -55,6 +92,7 @@ class Synthesizer(object):
         self.tts_languages_file = tts_languages_file
         self.vocoder_checkpoint = vocoder_checkpoint
         self.vocoder_config = vocoder_config
+        self.vocoder_config_path = vocoder_config
         self.encoder_checkpoint = encoder_checkpoint
         self.encoder_config = encoder_config
         self.use_cuda = use_cuda
@@ -68,17 +106,27 @@ class Synthesizer(object):
         self.num_languages = 0
         self.tts_languages = {}
         self.d_vector_dim = 0
+        self.d_vector_cache = DVectorCache(d_vector_cache_size, d_vector_cache_path)
+        self.vocoder_latency_budget = vocoder_latency_budget
+        self.vocoder_chunk_size = vocoder_chunk_size
+        self.chunked_vocoder = None
+        self.use_torchscript = use_torchscript
+        self.tts_graph_path = tts_graph_path
+        self.vocoder_graph_path = vocoder_graph_path
+        self.tts_graph = None
+        self.vocoder_graph = None
         self.seg = self._get_segmenter("en")
         self.use_cuda = use_cuda
+        # number of silent samples appended after each sentence.
+        self.sentence_pause_length = 10000
 
         if self.use_cuda:
             assert torch.cuda.is_available(), "CUDA is not availabe on this machine."
         self._load_tts(tts_checkpoint, tts_config_path, use_cuda)
         self.output_sample_rate = self.tts_config.audio["sample_rate"]
-        if vocoder_checkpoint:
+        if vocoder_checkpoint and load_vocoder:
             self._load_vocoder(vocoder_checkpoint, vocoder_config, use_cuda)
-            self.output_sample_rate = self.vocoder_config.audio["sample_rate"]
-        else:
+        elif load_vocoder:
             print(" > Using Griffin-Lim as no vocoder model defined")
 
     @staticmethod
@@ -114,9 +162,26 @@ class Synthesizer(object):
 
         if not self.encoder_checkpoint:
             self._set_speaker_encoder_paths_from_tts_config()
-        self.tts_model.load_checkpoint(self.tts_config, tts_checkpoint, eval=True)
+        state = load_inference_state(tts_checkpoint)
+        if state is not None:
+            # memory mapped inference weights
+            self.tts_model.load_inference_state(self.tts_config, state)
+        else:
+            self.tts_model.load_checkpoint(self.tts_config, tts_checkpoint, eval=True)
         if use_cuda:
             self.tts_model.cuda()
+        if getattr(self.tts_model, "speaker_manager", None) is not None:
+            self.tts_model.speaker_manager.set_d_vector_cache(self.d_vector_cache)
+        if self.use_torchscript:
+            self.tts_graph = self._load_graph(self.tts_graph_path)
+            if self.tts_graph is None:
+                self.tts_graph = export_tts(self.tts_model)
+
+    def _load_graph(self, graph_path: str) -> torch.jit.ScriptModule:
+        """Load an exported TorchScript graph on the synthesizer device. Return None if `graph_path` is not given."""
+        if not graph_path:
+            return None
+        return torch.jit.load(graph_path, map_location="cuda" if self.use_cuda else "cpu")
 
     def _set_speaker_encoder_paths_from_tts_config(self):
         """Set the encoder paths from the tts model config for models with speaker encoders."""
@@ -126,6 +191,34 @@ class Synthesizer(object):
             self.encoder_checkpoint = self.tts_config.model_args.speaker_encoder_model_path
             self.encoder_config = self.tts_config.model_args.speaker_encoder_config_path
 
+    def _init_speaker_encoder(self) -> None:
+        """Load the speaker encoder of the speaker manager at the first use of a reference clip."""
+        speaker_manager = getattr(self.tts_model, "speaker_manager", None)
+        if speaker_manager is None:
+            raise ValueError(" [!] The model is not a multi-speaker model and does not accept a `speaker_wav`.")
+        if speaker_manager.speaker_encoder is None:
+            if not self.encoder_checkpoint:
+                raise ValueError(" [!] A speaker encoder is needed to compute the d_vector of a `speaker_wav`.")
+            speaker_manager.use_cuda = self.use_cuda
+            speaker_manager.init_speaker_encoder(self.encoder_checkpoint, self.encoder_config)
+
+    def register_voice(self, voice_id: str, speaker_wav: Union[str, List[str]]) -> None:
+        """Compute the d_vector of a reference voice once. Then, pass `voice_id` as `speaker_name` to use it.
+
+        Args:
+            voice_id (str): ID of the voice.
+            speaker_wav (Union[str, List[str]]): path to the speaker wav or wavs.
+        """
+        self._init_speaker_encoder()
+        self.tts_model.speaker_manager.register_voice(voice_id, speaker_wav)
+
+    def get_voice_d_vector(self, voice_id: str) -> List[float]:
+        """Get the d_vector of a voice registered by `register_voice()`. Return None if it is not registered."""
+        speaker_manager = getattr(self.tts_model, "speaker_manager", None)
+        if speaker_manager is None:
+            return None
+        return speaker_manager.get_voice_d_vector(voice_id)
+
     def _load_vocoder(self, model_file: str, model_config: str, use_cuda: bool) -> None:
         """Load the vocoder model.
 
@@ -139,12 +232,48 @@ class Synthesizer(object):
             model_config (str): path to the model config file.
             use_cuda (bool): enable/disable CUDA use.
         """
-        self.vocoder_config = load_config(model_config)
-        self.vocoder_ap = AudioProcessor(verbose=False, **self.vocoder_config.audio)
-        self.vocoder_model = setup_vocoder_model(self.vocoder_config)
-        self.vocoder_model.load_checkpoint(self.vocoder_config, model_file, eval=True)
+        vocoder_config = load_config(model_config)
+        vocoder_ap = AudioProcessor(verbose=False, **vocoder_config.audio)
+        vocoder_model = setup_vocoder_model(vocoder_config)
+        state = load_inference_state(model_file)
+        if state is not None:
+            vocoder_model.load_inference_state(vocoder_config, state)
+        else:
+            vocoder_model.load_checkpoint(vocoder_config, model_file, eval=True)
         if use_cuda:
-            self.vocoder_model.cuda()
+            vocoder_model.cuda()
+        if hasattr(vocoder_model, "precompute_noise_schedules"):
+            # place the noise schedules on the model device
+            vocoder_model.precompute_noise_schedules()
+        self.set_vocoder(vocoder_model, vocoder_config, vocoder_ap)
+
+    def set_vocoder(self, vocoder_model: torch.nn.Module, vocoder_config: Coqpit, vocoder_ap: AudioProcessor) -> None:
+        """Use an already loaded vocoder model. It lets multiple synthesizers share a single vocoder instance.
+
+        Args:
+            vocoder_model (torch.nn.Module): vocoder model in eval mode on the synthesizer device.
+            vocoder_config (Coqpit): vocoder model config.
+            vocoder_ap (AudioProcessor): audio processor of the vocoder.
+        """
+        self.vocoder_model = vocoder_model
+        self.vocoder_config = vocoder_config
+        self.vocoder_ap = vocoder_ap
+        self.output_sample_rate = vocoder_config.audio["sample_rate"]
+        self.chunked_vocoder = None
+        self.vocoder_graph = None
+        if self.use_torchscript:
+            if not isinstance(self.vocoder_model, GAN):
+                raise ValueError(f" [!] {vocoder_config.model} cannot be run as a TorchScript graph.")
+            self.vocoder_graph = self._load_graph(self.vocoder_graph_path)
+            if self.vocoder_graph is None:
+                self.vocoder_graph = export_vocoder(self.vocoder_model, vocoder_config.audio["num_mels"])
+        if self.vocoder_chunk_size is not None and isinstance(self.vocoder_model, GAN):
+            self.chunked_vocoder = ChunkedVocoder(
+                self.vocoder_model if self.vocoder_graph is None else self.vocoder_graph,
+                num_channels=self.vocoder_config.audio["num_mels"],
+                hop_length=self.vocoder_ap.hop_length,
+                chunk_size=self.vocoder_chunk_size,
+            )
 
     def split_into_sentences(self, text) -> List[str]:
         """Split give text into sentences.
@@ -167,36 +296,25 @@ class Synthesizer(object):
         wav = np.array(wav)
         self.tts_model.ap.save_wav(wav, path, self.output_sample_rate)
 
-    def tts(
-        self,
-        text: str,
-        speaker_name: str = "",
-        language_name: str = "",
-        speaker_wav: Union[str, List[str]] = None,
-        style_wav=None,
-    ) -> List[int]:
-        """🐸 TTS magic. Run all the models and generate speech.
+    def _get_conditioning_inputs(self, speaker_name: str, language_name: str, speaker_wav: Union[str, List[str]]):
+        """Find the speaker and language inputs of the model for the given speaker and language names.
 
         Args:
-            text (str): input text.
-            speaker_name (str, optional): spekaer id for multi-speaker models. Defaults to "".
-            language_name (str, optional): language id for multi-language models. Defaults to "".
-            speaker_wav (Union[str, List[str]], optional): path to the speaker wav. Defaults to None.
-            style_wav ([type], optional): style waveform for GST. Defaults to None.
+            speaker_name (str): spekaer id for multi-speaker models or the id of a voice registered by
+                `register_voice()`.
+            language_name (str): language id for multi-language models.
+            speaker_wav (Union[str, List[str]]): path to the speaker wav.
 
         Returns:
-            List[int]: [description]
+            Tuple[int, np.ndarray, int]: speaker id, speaker embedding and language id.
         """
-        start_time = time.time()
-        wavs = []
-        sens = self.split_into_sentences(text)
-        print(" > Text splitted to sentences.")
-        print(sens)
-
         # handle multi-speaker
         speaker_embedding = None
         speaker_id = None
-        if self.tts_speakers_file or hasattr(self.tts_model.speaker_manager, "speaker_ids"):
+        voice_d_vector = self.get_voice_d_vector(speaker_name) if speaker_name else None
+        if voice_d_vector is not None:
+            speaker_embedding = voice_d_vector
+        elif self.tts_speakers_file or hasattr(self.tts_model.speaker_manager, "speaker_ids"):
             if speaker_name and isinstance(speaker_name, str):
                 if self.tts_config.use_d_vector_file:
                     # get the speaker embedding from the saved d_vectors.
@@ -242,60 +360,346 @@ class Synthesizer(object):
 
         # compute a new d_vector from the given clip.
         if speaker_wav is not None:
+            self._init_speaker_encoder()
             speaker_embedding = self.tts_model.speaker_manager.compute_d_vector_from_clip(speaker_wav)
+        return speaker_id, speaker_embedding, language_id
+
+    def _prepare_vocoder_input(self, mel_postnet_spec: np.ndarray) -> torch.Tensor:
+        """Renormalize a TTS model output for the vocoder and interpolate it for possible sample rate mismatch.
+
+        Shapes:
+            - mel_postnet_spec: :math:`[T, C]`
+            - Return: :math:`[1, C, T']`
+        """
+        # denormalize tts output based on tts audio config
+        mel_postnet_spec = self.tts_model.ap.denormalize(mel_postnet_spec.T).T
+        # renormalize spectrogram based on vocoder config
+        vocoder_input = self.vocoder_ap.normalize(mel_postnet_spec.T)
+        # compute scale factor for possible sample rate mismatch
+        scale_factor = [
+            1,
+            self.vocoder_config["audio"]["sample_rate"] / self.tts_model.ap.sample_rate,
+        ]
+        if scale_factor[1] != 1:
+            print(" > interpolating tts model output.")
+            vocoder_input = interpolate_vocoder_input(scale_factor, vocoder_input)
+        else:
+            vocoder_input = torch.tensor(vocoder_input).unsqueeze(0)  # pylint: disable=not-callable
+        return vocoder_input
+
+    def _postprocess_waveform(self, waveform: np.ndarray) -> np.ndarray:
+        """Squeeze the waveform and trim its trailing silence if it is enabled by the TTS audio config."""
+        waveform = waveform.squeeze()
+        if self.tts_config.audio["do_trim_silence"] is True:
+            waveform = trim_silence(waveform, self.tts_model.ap)
+        return waveform
+
+    def _synthesize_sentence(
+        self, sen: str, speaker_id: int, speaker_embedding: np.ndarray, language_id: int, style_wav=None
+    ) -> Dict:
+        """Run the TTS model on a single sentence. The waveform is computed by Griffin-Lim if there is no vocoder."""
+        return synthesis(
+            model=self.tts_model,
+            text=sen,
+            CONFIG=self.tts_config,
+            use_cuda=self.use_cuda,
+            speaker_id=speaker_id,
+            language_id=language_id,
+            style_wav=style_wav,
+            use_griffin_lim=self.vocoder_model is None,
+            d_vector=speaker_embedding,
+            graph=self.tts_graph,
+        )
+
+    def _tts_sentence(
+        self, sen: str, speaker_id: int, speaker_embedding: np.ndarray, language_id: int, style_wav=None
+    ) -> np.ndarray:
+        """Run the TTS model and the vocoder on a single sentence.
 
+        Args:
+            sen (str): input sentence.
+            speaker_id (int): speaker id for multi-speaker models.
+            speaker_embedding (np.ndarray): speaker embedding for multi-speaker models.
+            language_id (int): language id for multi-language models.
+            style_wav ([type], optional): style waveform for GST. Defaults to None.
+
+        Returns:
+            np.ndarray: waveform.
+        """
         use_gl = self.vocoder_model is None
+        # synthesize voice
+        outputs = self._synthesize_sentence(sen, speaker_id, speaker_embedding, language_id, style_wav)
+        waveform = outputs["wav"]
+        mel_postnet_spec = outputs["outputs"]["model_outputs"][0].detach().cpu().numpy()
+        if not use_gl:
+            device_type = "cuda" if self.use_cuda else "cpu"
+            vocoder_input = self._prepare_vocoder_input(mel_postnet_spec)
+            # run vocoder model
+            # [1, T, C]
+            if self.chunked_vocoder is not None:
+                # vocode in overlapping chunks to bound the memory use
+                waveform = torch.from_numpy(self.chunked_vocoder.inference(vocoder_input.to(device_type)))
+            elif self.vocoder_config.model.lower() == "wavernn":
+                # folded inference with the compiled sampling loop
+                waveform = torch.from_numpy(self.vocoder_model.inference_fast(vocoder_input.to(device_type)))
+            elif self.vocoder_graph is not None:
+                with torch.no_grad():
+                    waveform = self.vocoder_graph.inference(vocoder_input.to(device_type))
+            else:
+                waveform = self.vocoder_model.inference(
+                    vocoder_input.to(device_type),
+                    **self._get_vocoder_kwargs(vocoder_input.shape[-1] * self.vocoder_ap.hop_length),
+                )
+        if self.use_cuda and not use_gl:
+            waveform = waveform.cpu()
+        if not use_gl:
+            waveform = waveform.numpy()
+
+        # trim silence
+        return self._postprocess_waveform(waveform)
+
+    def tts(
+        self,
+        text: str,
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav: Union[str, List[str]] = None,
+        style_wav=None,
+    ) -> List[int]:
+        """🐸 TTS magic. Run all the models and generate speech.
+
+        Args:
+            text (str): input text.
+            speaker_name (str, optional): spekaer id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav. Defaults to None.
+            style_wav ([type], optional): style waveform for GST. Defaults to None.
+
+        Returns:
+            List[int]: [description]
+        """
+        start_time = time.time()
+        wavs = []
+        for waveform in self.tts_sentences(text, speaker_name, language_name, speaker_wav, style_wav):
+            wavs += list(waveform)
+            wavs += [0] * self.sentence_pause_length
+
+        # compute stats
+        process_time = time.time() - start_time
+        audio_time = len(wavs) / self.tts_config.audio["sample_rate"]
+        print(f" > Processing time: {process_time}")
+        print(f" > Real-time factor: {process_time / audio_time}")
+        return wavs
+
+    def tts_sentences(
+        self,
+        text: str,
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav: Union[str, List[str]] = None,
+        style_wav=None,
+    ) -> Generator[np.ndarray, None, None]:
+        """Same as `tts()` but yields the waveform of each sentence. The next sentence is synthesized only when it is
+        requested, so the caller can stop the synthesis between sentences.
+
+        Args:
+            text (str): input text.
+            speaker_name (str, optional): spekaer id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav. Defaults to None.
+            style_wav ([type], optional): style waveform for GST. Defaults to None.
+
+        Yields:
+            np.ndarray: waveform of a sentence without the pause between sentences.
+        """
+        sens = self.split_into_sentences(text)
+        print(" > Text splitted to sentences.")
+        print(sens)
+
+        speaker_id, speaker_embedding, language_id = self._get_conditioning_inputs(
+            speaker_name, language_name, speaker_wav
+        )
 
         for sen in sens:
-            # synthesize voice
-            outputs = synthesis(
+            yield self._tts_sentence(sen, speaker_id, speaker_embedding, language_id, style_wav)
+
+    @staticmethod
+    def wav_to_pcm16(wav: np.ndarray, peak: float = None) -> np.ndarray:
+        """Convert a float waveform to 16-bit PCM with the same peak normalization as `AudioProcessor.save_wav()`.
+
+        If `peak` is given, the waveform is scaled by it instead of its own peak and clipped.
+        """
+        wav = np.asarray(wav)
+        if peak is not None:
+            return (np.clip(wav / peak, -1.0, 1.0) * 32767).astype(np.int16)
+        return (wav * (32767 / max(0.01, np.max(np.abs(wav))))).astype(np.int16)
+
+    def tts_stream(
+        self,
+        text: str,
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav: Union[str, List[str]] = None,
+        style_wav=None,
+    ) -> Generator[np.ndarray, None, None]:
+        """Same as `tts()` but yields the audio of each sentence as 16-bit PCM as soon as it is synthesized.
+
+        Each chunk is peak normalized on its own since the loudest part of the whole text is not known in advance.
+
+        If the Synthesizer is created with `vocoder_chunk_size`, the audio of each vocoder chunk is yielded as soon as
+        it is ready. These chunks are not peak normalized nor trimmed, since the rest of the sentence is not known yet.
+
+        Args:
+            text (str): input text.
+            speaker_name (str, optional): spekaer id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav. Defaults to None.
+            style_wav ([type], optional): style waveform for GST. Defaults to None.
+
+        Yields:
+            np.ndarray: int16 PCM samples of a sentence followed by the pause between sentences.
+        """
+        sens = self.split_into_sentences(text)
+        speaker_id, speaker_embedding, language_id = self._get_conditioning_inputs(
+            speaker_name, language_name, speaker_wav
+        )
+        for sen in sens:
+            if self.chunked_vocoder is not None:
+                outputs = self._synthesize_sentence(sen, speaker_id, speaker_embedding, language_id, style_wav)
+                vocoder_input = self._prepare_vocoder_input(
+                    outputs["outputs"]["model_outputs"][0].detach().cpu().numpy()
+                )
+                for waveform in self.chunked_vocoder.stream(vocoder_input.to("cuda" if self.use_cuda else "cpu")):
+                    yield self.wav_to_pcm16(waveform, peak=1.0)
+                yield np.zeros(self.sentence_pause_length, dtype=np.int16)
+                continue
+            waveform = self._tts_sentence(sen, speaker_id, speaker_embedding, language_id, style_wav)
+            pcm = self.wav_to_pcm16(waveform)
+            yield np.concatenate([pcm, np.zeros(self.sentence_pause_length, dtype=np.int16)])
+
+    def _get_vocoder_kwargs(self, num_samples: int) -> Dict:
+        """Return the extra vocoder inference arguments for an output of `num_samples` samples.
+
+        It selects the WaveGrad noise schedule fitting in `vocoder_latency_budget`.
+        """
+        if self.vocoder_latency_budget is None or not hasattr(self.vocoder_model, "select_noise_schedule"):
+            return {}
+        return {"noise_schedule": self.vocoder_model.select_noise_schedule(num_samples, self.vocoder_latency_budget)}
+
+    def _vocode_batch(self, specs: List[np.ndarray]) -> List[np.ndarray]:
+        """Run the vocoder on a batch of TTS model outputs in a single forward pass.
+
+        Spectrograms are padded to the longest one with their minimum value (silence) and the output waveforms are
+        cut back to the length the vocoder produces for each spectrogram alone.
+
+        Args:
+            specs (List[np.ndarray]): TTS model outputs in shape :math:`[T, C]`.
+
+        Returns:
+            List[np.ndarray]: waveforms.
+        """
+        device_type = "cuda" if self.use_cuda else "cpu"
+        vocoder_inputs = [self._prepare_vocoder_input(spec)[0] for spec in specs]
+        if self.vocoder_config.model.lower() == "wavernn":
+            # WaveRNN folds the inputs and runs the folds of all the inputs in a batch.
+            return self.vocoder_model.inference_fast(
+                [vocoder_input.to(device_type) for vocoder_input in vocoder_inputs]
+            )
+        input_lengths = [vocoder_input.shape[1] for vocoder_input in vocoder_inputs]
+        max_length = max(input_lengths)
+        batch = torch.stack(
+            [
+                torch.nn.functional.pad(
+                    vocoder_input, (0, max_length - vocoder_input.shape[1]), value=float(vocoder_input.min())
+                )
+                for vocoder_input in vocoder_inputs
+            ]
+        )
+        if self.vocoder_graph is not None:
+            with torch.no_grad():
+                waveforms = self.vocoder_graph.inference(batch.to(device_type)).cpu().numpy()  # [B, 1, T_wav]
+        else:
+            vocoder_kwargs = self._get_vocoder_kwargs(len(specs) * max_length * self.vocoder_ap.hop_length)
+            waveforms = self.vocoder_model.inference(batch.to(device_type), **vocoder_kwargs).cpu().numpy()
+        # the vocoder might pad its input, so keep the extra samples of each item.
+        extra_samples = waveforms.shape[-1] - max_length * self.vocoder_ap.hop_length
+        return [
+            waveforms[idx, ..., : input_lengths[idx] * self.vocoder_ap.hop_length + extra_samples]
+            for idx in range(len(specs))
+        ]
+
+    def tts_batch(
+        self,
+        texts: List[str],
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav: Union[str, List[str]] = None,
+        max_batch_size: int = 32,
+    ) -> List[List[int]]:
+        """Synthesize speech for multiple texts with batched model and vocoder passes.
+
+        All the texts are split into sentences and the sentences are sorted by their number of tokens. Then, they are
+        grouped into batches of similar lengths to reduce padding. Each batch is run with one TTS model and one
+        vocoder forward pass and the waveforms are split back to their texts by their true lengths.
+
+        Models that do not support batch inference fall back to `tts()` for each text.
+
+        Args:
+            texts (List[str]): input texts.
+            speaker_name (str, optional): spekaer id shared by all the texts. Defaults to "".
+            language_name (str, optional): language id shared by all the texts. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav. Defaults to None.
+            max_batch_size (int, optional): maximum number of sentences in a batch. Defaults to 32.
+
+        Returns:
+            List[List[int]]: waveform of each input text.
+        """
+        if not supports_batch_inference(self.tts_config):
+            return [self.tts(text, speaker_name, language_name, speaker_wav) for text in texts]
+
+        start_time = time.time()
+        speaker_id, speaker_embedding, language_id = self._get_conditioning_inputs(
+            speaker_name, language_name, speaker_wav
+        )
+        use_gl = self.vocoder_model is None
+
+        # split texts into sentences and sort them by the number of tokens
+        sens = []  # (text index, sentence index, token ids)
+        for text_idx, text in enumerate(texts):
+            for sen_idx, sen in enumerate(self.split_into_sentences(text)):
+                sens.append((text_idx, sen_idx, self.tts_model.tokenizer.text_to_ids(sen, language=language_id)))
+        sens = sorted(sens, key=lambda x: len(x[2]))
+
+        # synthesize each group of sentences
+        waveforms = {}
+        for offset in range(0, len(sens), max_batch_size):
+            group = sens[offset : offset + max_batch_size]
+            outputs = batch_synthesis(
                 model=self.tts_model,
-                text=sen,
+                texts=[token_ids for _, _, token_ids in group],
                 CONFIG=self.tts_config,
                 use_cuda=self.use_cuda,
                 speaker_id=speaker_id,
+                d_vector=speaker_embedding,
                 language_id=language_id,
-                style_wav=style_wav,
                 use_griffin_lim=use_gl,
-                d_vector=speaker_embedding,
             )
-            waveform = outputs["wav"]
-            mel_postnet_spec = outputs["outputs"]["model_outputs"][0].detach().cpu().numpy()
-            if not use_gl:
-                # denormalize tts output based on tts audio config
-                mel_postnet_spec = self.tts_model.ap.denormalize(mel_postnet_spec.T).T
-                device_type = "cuda" if self.use_cuda else "cpu"
-                # renormalize spectrogram based on vocoder config
-                vocoder_input = self.vocoder_ap.normalize(mel_postnet_spec.T)
-                # compute scale factor for possible sample rate mismatch
-                scale_factor = [
-                    1,
-                    self.vocoder_config["audio"]["sample_rate"] / self.tts_model.ap.sample_rate,
-                ]
-                if scale_factor[1] != 1:
-                    print(" > interpolating tts model output.")
-                    vocoder_input = interpolate_vocoder_input(scale_factor, vocoder_input)
-                else:
-                    vocoder_input = torch.tensor(vocoder_input).unsqueeze(0)  # pylint: disable=not-callable
-                # run vocoder model
-                # [1, T, C]
-                waveform = self.vocoder_model.inference(vocoder_input.to(device_type))
-            if self.use_cuda and not use_gl:
-                waveform = waveform.cpu()
-            if not use_gl:
-                waveform = waveform.numpy()
-            waveform = waveform.squeeze()
-
-            # trim silence
-            if self.tts_config.audio["do_trim_silence"] is True:
-                waveform = trim_silence(waveform, self.tts_model.ap)
+            if outputs["wavs"] is not None:
+                group_wavs = outputs["wavs"]
+            else:
+                group_wavs = self._vocode_batch(outputs["model_outputs"])
+            for (text_idx, sen_idx, _), waveform in zip(group, group_wavs):
+                waveforms[(text_idx, sen_idx)] = self._postprocess_waveform(waveform)
 
-            wavs += list(waveform)
-            wavs += [0] * 10000
+        # merge the sentences back in order
+        wavs = [[] for _ in texts]
+        for text_idx, sen_idx in sorted(waveforms.keys()):
+            wavs[text_idx] += list(waveforms[(text_idx, sen_idx)])
+            wavs[text_idx] += [0] * self.sentence_pause_length
 
         # compute stats
         process_time = time.time() - start_time
-        audio_time = len(wavs) / self.tts_config.audio["sample_rate"]
+        audio_time = sum(len(wav) for wav in wavs) / self.tts_config.audio["sample_rate"]
         print(f" > Processing time: {process_time}")
-        print(f" > Real-time factor: {process_time / audio_time}")
+        print(f" > Real-time factor: {process_time / max(audio_time, 1e-8)}")
         return wavs
@@ -28,6 +28,9 @@ class BaseVocoderConfig(BaseTrainingConfig):
         use_cache (bool):
             enable / disable in memory caching of the computed features. If the RAM is not enough, if may cause OOM.
             Defaults to False.
+        cache_size_in_mb (int):
+            Shared memory budget of the feature cache of the GAN vocoder datasets in megabytes. It is allocated when
+            the dataset is created, up to the estimated size of the dataset. Defaults to 1024.
         epochs (int):
             Number of training epochs to. Defaults to 10000.
         wd (float):
@@ -49,6 +52,7 @@ class BaseVocoderConfig(BaseTrainingConfig):
     pad_short: int = 0  # additional padding for short wavs
     conv_pad: int = 0  # additional padding against convolutions applied to spectrograms
     use_cache: bool = False  # use in memory cache to keep the computed features. This might cause OOM.
+    cache_size_in_mb: int = 1024  # shared memory budget of the feature cache.
     # OPTIMIZER
     epochs: int = 10000  # total number of epochs to train.
     wd: float = 0.0  # Weight decay weight.
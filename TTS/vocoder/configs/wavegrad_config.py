@@ -46,6 +46,11 @@ class WavegradConfig(BaseVocoderConfig):
                 "num_steps": 50,
             }
             `
+        inference_noise_schedules (dict):
+            Named inference noise schedules selected by `Wavegrad.inference(noise_schedule=name)`. A schedule is
+            defined by its `beta` values, e.g. found by `bin/tune_wavegrad.py`, or by `min_val`, `max_val` and
+            `num_steps` with a `linear` or `log` `scale`. Schedules with few steps must be tuned for each checkpoint,
+            generic ones lower the quality. Defaults to no schedules.
         grad_clip (float):
             Gradient clipping threshold. If <= 0.0, no clipping is applied. Defaults to 1.0
         lr (float):
@@ -81,6 +86,9 @@ class WavegradConfig(BaseVocoderConfig):
         }
     )
 
+    # tuned for each checkpoint, e.g. by `bin/tune_wavegrad.py`
+    inference_noise_schedules: dict = field(default_factory=dict)
+
     # optimizer overrides
     grad_clip: float = 1.0
     lr: float = 1e-4  # Initial learning rate.
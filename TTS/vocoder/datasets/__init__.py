@@ -25,6 +25,7 @@ def setup_dataset(config: Coqpit, ap: AudioProcessor, is_eval: bool, data_items:
             use_noise_augment=config.use_noise_augment,
             use_cache=config.use_cache,
             verbose=verbose,
+            cache_size_in_mb=config.cache_size_in_mb,
         )
         dataset.shuffle_mapping()
     elif config.model.lower() == "wavegrad":
@@ -1,18 +1,23 @@
 import glob
 import os
 import random
-from multiprocessing import Manager
 
 import numpy as np
 import torch
 from torch.utils.data import Dataset
 
+from TTS.utils.shared_cache import SharedArrayCache
+
 
 class GANDataset(Dataset):
     """
     GAN Dataset searchs for all the wav files under root path
     and converts them to acoustic features on the fly and returns
     random segments of (audio, feature) couples.
+
+    If `use_cache` is True, the loaded `(audio, feature)` couples are kept in a `SharedArrayCache` shared by all the
+    loader workers. The cache is filled lazily and takes at most `cache_size_in_mb` megabytes, less if the dataset is
+    estimated to be smaller.
     """
 
     def __init__(
@@ -29,6 +34,7 @@ class GANDataset(Dataset):
         use_noise_augment=False,
         use_cache=False,
         verbose=False,
+        cache_size_in_mb=1024,
     ):
         super().__init__()
         self.ap = ap
@@ -42,6 +48,7 @@ class GANDataset(Dataset):
         self.is_training = is_training
         self.return_segments = return_segments
         self.use_cache = use_cache
+        self.cache_size_in_mb = cache_size_in_mb
         self.use_noise_augment = use_noise_augment
         self.verbose = verbose
 
@@ -56,10 +63,23 @@ class GANDataset(Dataset):
         if use_cache:
             self.create_feature_cache()
 
+    def estimate_cache_size(self) -> int:
+        """Estimate the number of float32 values to cache all the couples by the file sizes, assuming 16-bit wavs."""
+        size = 0
+        for item in self.item_list:
+            wav_path = item if self.compute_feat else item[0]
+            num_samples = max(os.path.getsize(wav_path) // 2, self.seq_len) + self.hop_len
+            if self.compute_feat:
+                size += num_samples + self.ap.num_mels * (num_samples // self.hop_len + 1)
+            else:
+                size += num_samples + os.path.getsize(item[1]) // 4
+        return size
+
     def create_feature_cache(self):
-        self.manager = Manager()
-        self.cache = self.manager.list()
-        self.cache += [None for _ in range(len(self.item_list))]
+        max_values = min(self.cache_size_in_mb * 2**20 // 4, self.estimate_cache_size())
+        self.cache = SharedArrayCache(len(self.item_list), max_values, ndims=(1, 2))
+        if self.verbose:
+            print(f" | > Feature cache size: {max_values * 4 / 2 ** 20:.1f} MB")
 
     @staticmethod
     def find_wav_files(path):
@@ -104,30 +124,28 @@ class GANDataset(Dataset):
     def shuffle_mapping(self):
         random.shuffle(self.G_to_D_mappings)
 
-    def load_item(self, idx):
-        """load (audio, feat) couple"""
+    def load_features(self, idx):
+        """Load the (audio, feat) couple of an item with the audio length aligned to the feature frames.
+
+        Couples are read from and added to the feature cache if `use_cache` is True.
+        """
+        if self.use_cache:
+            cached = self.cache.get(idx)
+            if cached is not None:
+                return cached
+
         if self.compute_feat:
             # compute features from wav
             wavpath = self.item_list[idx]
-            # print(wavpath)
-
-            if self.use_cache and self.cache[idx] is not None:
-                audio, mel = self.cache[idx]
-            else:
-                audio = self.ap.load_wav(wavpath)
-                audio, _ = self._pad_short_samples(audio)
-                mel = self.ap.melspectrogram(audio)
+            audio = self.ap.load_wav(wavpath)
+            audio, _ = self._pad_short_samples(audio)
+            mel = self.ap.melspectrogram(audio)
         else:
-
             # load precomputed features
             wavpath, feat_path = self.item_list[idx]
-
-            if self.use_cache and self.cache[idx] is not None:
-                audio, mel = self.cache[idx]
-            else:
-                audio = self.ap.load_wav(wavpath)
-                mel = np.load(feat_path)
-                audio, mel = self._pad_short_samples(audio, mel)
+            audio = self.ap.load_wav(wavpath)
+            mel = np.load(feat_path)
+            audio, mel = self._pad_short_samples(audio, mel)
 
         # correct the audio length wrt padding applied in stft
         audio = np.pad(audio, (0, self.hop_len), mode="edge")
@@ -136,6 +154,14 @@ class GANDataset(Dataset):
             mel.shape[-1] * self.hop_len == audio.shape[-1]
         ), f" [!] {mel.shape[-1] * self.hop_len} vs {audio.shape[-1]}"
 
+        if self.use_cache:
+            self.cache.put(idx, audio, mel.reshape(-1, mel.shape[-1]))
+        return audio, mel
+
+    def load_item(self, idx):
+        """load (audio, feat) couple"""
+        audio, mel = self.load_features(idx)
+
         audio = torch.from_numpy(audio).float().unsqueeze(0)
         mel = torch.from_numpy(mel).float().squeeze(0)
 
@@ -1,19 +1,62 @@
+from typing import List, Tuple
+
 import numpy as np
 import torch
 import torch.nn.functional as F
 from scipy import signal as sig
 
 
+def get_polyphase_filters(filters: torch.Tensor, N: int, offsets: List[int]) -> Tuple[torch.Tensor, int, int]:
+    """Split FIR filters into polyphase components.
+
+    Component `p` keeps the taps `d * N + offsets[p]` for all integers `d`. A filter running over a signal with a
+    stride of `N` then becomes a stride 1 convolution over the signal phases.
+
+    Args:
+        filters (torch.Tensor): Filters in shape `[C, L]`.
+        N (int): Number of phases.
+        offsets (List[int]): Tap index of `d = 0` in each component.
+
+    Returns:
+        Tuple[torch.Tensor, int, int]: polyphase filters in shape `[C, len(offsets), K]` and the left and right
+        zero padding of the phase signals, so `K` taps cover all the `d` values.
+    """
+    num_taps = filters.shape[-1]
+    d_min = min(-(offset // N) for offset in offsets)
+    d_max = max((num_taps - 1 - offset) // N for offset in offsets)
+    polyphase = torch.zeros(filters.shape[0], len(offsets), d_max - d_min + 1, dtype=filters.dtype)
+    for p, offset in enumerate(offsets):
+        for d in range(d_min, d_max + 1):
+            if 0 <= d * N + offset < num_taps:
+                polyphase[:, p, d - d_min] = filters[:, d * N + offset]
+    return polyphase, -d_min, d_max
+
+
 # adapted from
 # https://github.com/kan-bayashi/ParallelWaveGAN/tree/master/parallel_wavegan
 class PQMF(torch.nn.Module):
-    def __init__(self, N=4, taps=62, cutoff=0.15, beta=9.0):
+    """Pseudo Quadrature Mirror Filter bank.
+
+    By default, the analysis and synthesis run on the polyphase components of the filters. Synthesis skips the zero
+    stuffed upsampling and filters the `N` output phases in one convolution on the subband signals. The outputs are the
+    same as the direct implementation (`polyphase=False`) up to the floating point error.
+
+    Args:
+        N (int): Number of subbands. Defaults to 4.
+        taps (int): Filter order. Defaults to 62.
+        cutoff (float): Cutoff frequency of the prototype filter. Defaults to 0.15.
+        beta (float): Kaiser window parameter of the prototype filter. Defaults to 9.0.
+        polyphase (bool): Use the polyphase implementation. Defaults to True.
+    """
+
+    def __init__(self, N=4, taps=62, cutoff=0.15, beta=9.0, polyphase=True):
         super().__init__()
 
         self.N = N
         self.taps = taps
         self.cutoff = cutoff
         self.beta = beta
+        self.polyphase = polyphase
 
         QMF = sig.firwin(taps + 1, cutoff, window=("kaiser", beta))
         H = np.zeros((N, len(QMF)))
@@ -41,13 +84,39 @@ class PQMF(torch.nn.Module):
 
         self.pad_fn = torch.nn.ConstantPad1d(taps // 2, 0.0)
 
+        # polyphase filters are derived from H and G, so they are not saved in the checkpoints.
+        # analysis: subband k at step m sums H[k, d * N + s + taps // 2] * x[(m + d) * N + s] over phases s.
+        H_poly, self.analysis_pad_left, self.analysis_pad_right = get_polyphase_filters(
+            H[:, 0], N, [taps // 2 + s for s in range(N)]
+        )
+        self.register_buffer("H_poly", H_poly, persistent=False)
+        # synthesis: output phase r at step m sums N * G[k, d * N + taps // 2 - r] * x[k, m + d] over subbands k.
+        G_poly, self.synthesis_pad_left, self.synthesis_pad_right = get_polyphase_filters(
+            G[0], N, [taps // 2 - r for r in range(N)]
+        )
+        self.register_buffer("G_poly", G_poly.transpose(0, 1).contiguous() * N, persistent=False)
+
     def forward(self, x):
         return self.analysis(x)
 
     def analysis(self, x):
-        return F.conv1d(x, self.H, padding=self.taps // 2, stride=self.N)
+        if not self.polyphase:
+            return F.conv1d(x, self.H, padding=self.taps // 2, stride=self.N)
+        # [B, 1, T * N] -> [B, N, T] phases, the signal is zero padded to a multiple of N.
+        num_samples = x.shape[-1]
+        num_steps = (num_samples + self.N - 1) // self.N
+        x = F.pad(x, (0, num_steps * self.N - num_samples))
+        x = x.reshape(x.shape[0], num_steps, self.N).transpose(1, 2)
+        x = F.pad(x, (self.analysis_pad_left, self.analysis_pad_right))
+        # odd `taps` drop the last step like the strided convolution
+        return F.conv1d(x, self.H_poly)[..., : (num_samples + 2 * (self.taps // 2) - self.taps - 1) // self.N + 1]
 
     def synthesis(self, x):
-        x = F.conv_transpose1d(x, self.updown_filter * self.N, stride=self.N)
-        x = F.conv1d(x, self.G, padding=self.taps // 2)
-        return x
+        if not self.polyphase:
+            x = F.conv_transpose1d(x, self.updown_filter * self.N, stride=self.N)
+            x = F.conv1d(x, self.G, padding=self.taps // 2)
+            return x
+        # [B, N, T] -> [B, N, T] output phases -> [B, 1, T * N]
+        num_samples = x.shape[-1] * self.N + 2 * (self.taps // 2) - self.taps
+        x = F.conv1d(F.pad(x, (self.synthesis_pad_left, self.synthesis_pad_right)), self.G_poly)
+        return x.transpose(1, 2).reshape(x.shape[0], 1, -1)[..., :num_samples]
@@ -244,6 +244,11 @@ class GAN(BaseVocoder):
                 if hasattr(self.model_g, "remove_weight_norm"):
                     self.model_g.remove_weight_norm()
 
+    def load_inference_state(self, config: Coqpit, state: Dict) -> None:
+        """Drop the discriminator and load the generator weights of an inference checkpoint."""
+        self.model_d = None
+        super().load_inference_state(config, state)
+
     def on_train_step_start(self, trainer) -> None:
         """Enable the discriminator training based on `steps_to_start_discriminator`
 
@@ -343,6 +348,7 @@ class GAN(BaseVocoder):
             use_noise_augment=config.use_noise_augment,
             use_cache=config.use_cache,
             verbose=verbose,
+            cache_size_in_mb=config.cache_size_in_mb,
         )
         dataset.shuffle_mapping()
         sampler = DistributedSampler(dataset, shuffle=True) if num_gpus > 1 else None
@@ -71,6 +71,7 @@ class MelganGenerator(nn.Module):
     def forward(self, c):
         return self.layers(c)
 
+    @torch.no_grad()
     def inference(self, c):
         c = c.to(self.layers[1].weight.device)
         c = torch.nn.functional.pad(c, (self.inference_padding, self.inference_padding), "replicate")
@@ -4,6 +4,26 @@ from TTS.vocoder.layers.pqmf import PQMF
 from TTS.vocoder.models.melgan_generator import MelganGenerator
 
 
+class MultibandMelganInference(torch.nn.Module):
+    """Generator layers and PQMF synthesis of a `MultibandMelganGenerator` in a single module for TorchScript.
+
+    It runs the same computation as `MultibandMelganGenerator.inference()` without moving the input to the model
+    device.
+    """
+
+    def __init__(self, generator: "MultibandMelganGenerator"):
+        super().__init__()
+        self.layers = generator.layers
+        self.pqmf_layer = generator.pqmf_layer
+        self.inference_padding = generator.inference_padding
+
+    def forward(self, cond_features: torch.Tensor) -> torch.Tensor:
+        cond_features = torch.nn.functional.pad(
+            cond_features, (self.inference_padding, self.inference_padding), "replicate"
+        )
+        return self.pqmf_layer.synthesis(self.layers(cond_features))
+
+
 class MultibandMelganGenerator(MelganGenerator):
     def __init__(
         self,
@@ -39,3 +59,22 @@ class MultibandMelganGenerator(MelganGenerator):
             cond_features, (self.inference_padding, self.inference_padding), "replicate"
         )
         return self.pqmf_synthesis(self.layers(cond_features))
+
+    def export_torchscript(self, path: str = None) -> torch.jit.ScriptModule:
+        """Compile the generator and the PQMF filterbank into a single TorchScript module.
+
+        The weight norm is removed from the generator if it is not yet removed by `load_checkpoint(eval=True)`.
+
+        Args:
+            path (str, optional): Path to save the compiled module. Defaults to None.
+
+        Returns:
+            torch.jit.ScriptModule: module mapping a spectrogram `[B, C, T]` to a waveform `[B, 1, T']`.
+        """
+        self.eval()
+        if hasattr(self.layers[1], "weight_g"):
+            self.remove_weight_norm()
+        module = torch.jit.script(MultibandMelganInference(self))
+        if path is not None:
+            module.save(path)
+        return module
@@ -150,7 +150,7 @@ class ParallelWaveganGenerator(torch.nn.Module):
 
     @property
     def receptive_field_size(self):
-        return self._get_receptive_field_size(self.layers, self.stacks, self.kernel_size)
+        return self._get_receptive_field_size(self.num_res_blocks, self.stacks, self.kernel_size)
 
     def load_checkpoint(
         self, config, checkpoint_path, eval=False
@@ -1,3 +1,4 @@
+import time
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
 
@@ -69,6 +70,10 @@ class Wavegrad(BaseVocoder):
         self.c1 = None
         self.c2 = None
         self.sigma = None
+        # named inference schedules cached by the name and the device
+        self.noise_schedules = {}
+        # seconds per denoising step and output sample measured at inference
+        self.step_time = None
 
         # dblocks
         self.y_conv = Conv1d(1, config.model_params.y_conv_channels, 5, padding=2)
@@ -123,26 +128,128 @@ class Wavegrad(BaseVocoder):
         self.compute_noise_level(beta)
 
     @torch.no_grad()
-    def inference(self, x, y_n=None):
+    def inference(self, x, y_n=None, noise_schedule=None):
         """
+        Args:
+            x (torch.Tensor): Spectrograms.
+            y_n (np.ndarray): Initial noise. Defaults to None.
+            noise_schedule (str): Name of a schedule in `config.inference_noise_schedules`. If None, the schedule set
+                by `compute_noise_level()` is used. Defaults to None.
+
         Shapes:
             x: :math:`[B, C , T]`
             y_n: :math:`[B, 1, T]`
         """
+        start_time = time.time()
         if y_n is None:
             y_n = torch.randn(x.shape[0], 1, self.hop_len * x.shape[-1])
         else:
             y_n = torch.FloatTensor(y_n).unsqueeze(0).unsqueeze(0)
         y_n = y_n.type_as(x)
-        sqrt_alpha_hat = self.noise_level.to(x)
-        for n in range(len(self.alpha) - 1, -1, -1):
-            y_n = self.c1[n] * (y_n - self.c2[n] * self.forward(y_n, x, sqrt_alpha_hat[n].repeat(x.shape[0])))
+        if noise_schedule is None:
+            c1, c2, sigma = self.c1, self.c2, self.sigma
+            sqrt_alpha_hat = self.noise_level.to(x)
+        else:
+            schedule = self.get_noise_schedule(noise_schedule, x.device)
+            c1, c2, sigma, sqrt_alpha_hat = schedule["c1"], schedule["c2"], schedule["sigma"], schedule["noise_level"]
+        num_steps = len(c1)
+        for n in range(num_steps - 1, -1, -1):
+            y_n = c1[n] * (y_n - c2[n] * self.forward(y_n, x, sqrt_alpha_hat[n].repeat(x.shape[0])))
             if n > 0:
                 z = torch.randn_like(y_n)
-                y_n += self.sigma[n - 1] * z
+                y_n += sigma[n - 1] * z
             y_n.clamp_(-1.0, 1.0)
+        if y_n.is_cuda:
+            torch.cuda.synchronize(y_n.device)
+        self.update_step_time(time.time() - start_time, num_steps, y_n.numel())
         return y_n
 
+    @torch.no_grad()
+    def inference_batch(self, xs: List[torch.Tensor], noise_schedule: str = None) -> List[torch.Tensor]:
+        """Vocode spectrograms of different lengths in a single denoising loop.
+
+        Spectrograms are padded to the longest one with their minimum value and the outputs are cut back to the
+        length of each spectrogram.
+
+        Args:
+            xs (List[torch.Tensor]): Spectrograms `[C, T]`.
+            noise_schedule (str): Name of a schedule in `config.inference_noise_schedules`. Defaults to None.
+
+        Returns:
+            List[torch.Tensor]: Waveforms `[1, T * hop_len]`.
+        """
+        lengths = [x.shape[-1] for x in xs]
+        max_length = max(lengths)
+        batch = torch.stack(
+            [torch.nn.functional.pad(x, (0, max_length - x.shape[-1]), value=float(x.min())) for x in xs]
+        )
+        y = self.inference(batch, noise_schedule=noise_schedule)
+        return [y[idx, :, : length * self.hop_len] for idx, length in enumerate(lengths)]
+
+    def update_step_time(self, duration: float, num_steps: int, num_samples: int):
+        """Update the moving average of the time of a denoising step per output sample."""
+        step_time = duration / max(num_steps * num_samples, 1)
+        self.step_time = step_time if self.step_time is None else 0.9 * self.step_time + 0.1 * step_time
+
+    @staticmethod
+    def get_betas(noise_schedule: Dict) -> np.ndarray:
+        """Return the betas of a schedule defined by `beta` values or by `min_val`, `max_val` and `num_steps`.
+
+        Betas are spaced linearly or, if `scale` is `log`, geometrically.
+        """
+        if "beta" in noise_schedule:
+            return np.asarray(noise_schedule["beta"], dtype=np.float64)
+        space = np.geomspace if noise_schedule.get("scale", "linear") == "log" else np.linspace
+        return space(noise_schedule["min_val"], noise_schedule["max_val"], noise_schedule["num_steps"])
+
+    def get_noise_schedule(self, name: str, device: torch.device = None) -> Dict[str, torch.Tensor]:
+        """Return the `c1`, `c2`, `sigma` and `noise_level` tensors of a named schedule on the given device.
+
+        Tensors are computed at the first call and cached for each device.
+        """
+        device = next(self.parameters()).device if device is None else torch.device(device)
+        key = (name, str(device))
+        if key not in self.noise_schedules:
+            if name not in self.config.inference_noise_schedules:
+                raise ValueError(
+                    f" [!] Unknown noise schedule {name}. Available: {list(self.config.inference_noise_schedules)}"
+                )
+            schedule = self.compute_noise_schedule(self.get_betas(self.config.inference_noise_schedules[name]))
+            self.noise_schedules[key] = {k: v.to(device) for k, v in schedule.items()}
+        return self.noise_schedules[key]
+
+    def precompute_noise_schedules(self, device: torch.device = None):
+        """Compute the tensors of all the named schedules and place them on the device."""
+        for name in self.config.inference_noise_schedules:
+            self.get_noise_schedule(name, device)
+
+    def select_noise_schedule(self, num_samples: int, latency_budget: float) -> str:
+        """Select the named schedule with the most steps estimated to generate `num_samples` in `latency_budget`.
+
+        The time is estimated by the step time measured in the previous inference calls. The schedule with the
+        fewest steps is returned before the first measurement or if no schedule fits in the budget. None is returned
+        if `config.inference_noise_schedules` is empty, so the default schedule is used.
+
+        Args:
+            num_samples (int): Number of output samples of the batch.
+            latency_budget (float): Time budget in seconds.
+
+        Returns:
+            str: Schedule name.
+        """
+        if not self.config.inference_noise_schedules:
+            return None
+        num_steps = {
+            name: len(self.get_betas(schedule)) for name, schedule in self.config.inference_noise_schedules.items()
+        }
+        names = sorted(num_steps, key=num_steps.get)
+        selected = names[0]
+        if self.step_time is not None:
+            for name in names:
+                if num_steps[name] * num_samples * self.step_time <= latency_budget:
+                    selected = name
+        return selected
+
     def compute_y_n(self, y_0):
         """Compute noisy audio based on noise schedule"""
         self.noise_level = self.noise_level.to(y_0)
@@ -156,23 +263,38 @@ class Wavegrad(BaseVocoder):
         noisy_audio = noise_scale * y_0 + (1.0 - noise_scale**2) ** 0.5 * noise
         return noise.unsqueeze(1), noisy_audio.unsqueeze(1), noise_scale[:, 0]
 
-    def compute_noise_level(self, beta):
-        """Compute noise schedule parameters"""
-        self.num_steps = len(beta)
+    @staticmethod
+    def compute_noise_schedule(beta: np.ndarray) -> Dict[str, torch.Tensor]:
+        """Compute the noise schedule tensors for the given betas."""
         alpha = 1 - beta
         alpha_hat = np.cumprod(alpha)
-        noise_level = np.concatenate([[1.0], alpha_hat**0.5], axis=0)
         noise_level = alpha_hat**0.5
 
         # pylint: disable=not-callable
-        self.beta = torch.tensor(beta.astype(np.float32))
-        self.alpha = torch.tensor(alpha.astype(np.float32))
-        self.alpha_hat = torch.tensor(alpha_hat.astype(np.float32))
-        self.noise_level = torch.tensor(noise_level.astype(np.float32))
+        schedule = {
+            "beta": torch.tensor(beta.astype(np.float32)),
+            "alpha": torch.tensor(alpha.astype(np.float32)),
+            "alpha_hat": torch.tensor(alpha_hat.astype(np.float32)),
+            "noise_level": torch.tensor(noise_level.astype(np.float32)),
+        }
+        schedule["c1"] = 1 / schedule["alpha"] ** 0.5
+        schedule["c2"] = (1 - schedule["alpha"]) / (1 - schedule["alpha_hat"]) ** 0.5
+        schedule["sigma"] = (
+            (1.0 - schedule["alpha_hat"][:-1]) / (1.0 - schedule["alpha_hat"][1:]) * schedule["beta"][1:]
+        ) ** 0.5
+        return schedule
 
-        self.c1 = 1 / self.alpha**0.5
-        self.c2 = (1 - self.alpha) / (1 - self.alpha_hat) ** 0.5
-        self.sigma = ((1.0 - self.alpha_hat[:-1]) / (1.0 - self.alpha_hat[1:]) * self.beta[1:]) ** 0.5
+    def compute_noise_level(self, beta):
+        """Compute noise schedule parameters"""
+        self.num_steps = len(beta)
+        schedule = self.compute_noise_schedule(beta)
+        self.beta = schedule["beta"]
+        self.alpha = schedule["alpha"]
+        self.alpha_hat = schedule["alpha_hat"]
+        self.noise_level = schedule["noise_level"]
+        self.c1 = schedule["c1"]
+        self.c2 = schedule["c2"]
+        self.sigma = schedule["sigma"]
 
     def remove_weight_norm(self):
         for _, layer in enumerate(self.dblocks):
@@ -233,6 +355,7 @@ class Wavegrad(BaseVocoder):
                 config["test_noise_schedule"]["num_steps"],
             )
             self.compute_noise_level(betas)
+            self.precompute_noise_schedules()
         else:
             betas = np.linspace(
                 config["train_noise_schedule"]["min_val"],
@@ -241,6 +364,11 @@ class Wavegrad(BaseVocoder):
             )
             self.compute_noise_level(betas)
 
+    def load_inference_state(self, config, state):
+        super().load_inference_state(config, state)
+        self.compute_noise_level(self.get_betas(config["test_noise_schedule"]))
+        self.precompute_noise_schedules()
+
     def train_step(self, batch: Dict, criterion: Dict) -> Tuple[Dict, Dict]:
         # format data
         x = batch["input"]
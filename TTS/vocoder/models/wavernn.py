@@ -1,3 +1,5 @@
+import functools
+import math
 import sys
 import time
 from dataclasses import dataclass, field
@@ -144,6 +146,101 @@ class Upsample(nn.Module):
         return m.transpose(1, 2), aux
 
 
+def sample_loop(
+    mels: torch.Tensor, aux: torch.Tensor, weights: List[torch.Tensor], mode: str, n_classes: int, chunk_size: int = 256
+) -> torch.Tensor:
+    """Autoregressive sampling loop of `Wavernn.inference_fast()`. It is compiled by TorchScript.
+
+    The projections of the conditioning features are computed for `chunk_size` steps at a time, so each step only
+    multiplies the previous sample and the hidden states. The GRU cells are computed with the weights of the
+    `nn.GRU` layers and the samples are drawn like in `Wavernn.inference()`.
+
+    Args:
+        mels (torch.Tensor): Upsampled features `[B, T, feat_dims]`.
+        aux (torch.Tensor): Auxiliary features `[B, T, 4 * aux_dims]`. `aux_dims` is 0 without the aux network.
+        weights (List[torch.Tensor]): Weights and biases of `I`, `rnn1`, `rnn2`, `fc1`, `fc2` and `fc3`.
+        mode (str): `mold`, `gauss` or `bits`.
+        n_classes (int): Number of outputs of `fc3`.
+        chunk_size (int): Number of steps of the precomputed projections. Defaults to 256.
+
+    Returns:
+        torch.Tensor: Samples `[B, T]`.
+    """
+    I_w, I_b, w_ih1, w_hh1, b_ih1, b_hh1, w_ih2, w_hh2, b_ih2, b_hh2, fc1_w, fc1_b, fc2_w, fc2_b, fc3_w, fc3_b = weights
+    b_size, seq_len, _ = mels.shape
+    rnn_dims = w_hh1.shape[1]
+    fc_dims = fc1_w.shape[0]
+    aux_dims = aux.shape[2] // 4
+    # split the input weights between the recurrent inputs and the conditioning features
+    I_w_x = I_w[:, 0]
+    I_w_cond = I_w[:, 1:]
+    w_ih2_x = w_ih2[:, :rnn_dims]
+    w_ih2_cond = w_ih2[:, rnn_dims:]
+    fc1_w_x = fc1_w[:, :rnn_dims]
+    fc1_w_cond = fc1_w[:, rnn_dims:]
+    fc2_w_x = fc2_w[:, :fc_dims]
+    fc2_w_cond = fc2_w[:, fc_dims:]
+    log_scale_min = math.log(1e-14)
+
+    h1 = torch.zeros(b_size, rnn_dims, dtype=mels.dtype, device=mels.device)
+    h2 = torch.zeros(b_size, rnn_dims, dtype=mels.dtype, device=mels.device)
+    x = torch.zeros(b_size, 1, dtype=mels.dtype, device=mels.device)
+    output = torch.zeros(b_size, seq_len, dtype=mels.dtype, device=mels.device)
+    for start in range(0, seq_len, chunk_size):
+        end = min(start + chunk_size, seq_len)
+        a = aux[:, start:end]
+        cond_I = F.linear(torch.cat([mels[:, start:end], a[:, :, :aux_dims]], dim=2), I_w_cond, I_b)
+        cond_rnn2 = F.linear(a[:, :, aux_dims : 2 * aux_dims], w_ih2_cond, b_ih2)
+        cond_fc1 = F.linear(a[:, :, 2 * aux_dims : 3 * aux_dims], fc1_w_cond, fc1_b)
+        cond_fc2 = F.linear(a[:, :, 3 * aux_dims : 4 * aux_dims], fc2_w_cond, fc2_b)
+        for i in range(end - start):
+            x = cond_I[:, i] + x * I_w_x
+
+            gi = F.linear(x, w_ih1, b_ih1).chunk(3, 1)
+            gh = F.linear(h1, w_hh1, b_hh1).chunk(3, 1)
+            r = torch.sigmoid(gi[0] + gh[0])
+            z = torch.sigmoid(gi[1] + gh[1])
+            h1 = (1 - z) * torch.tanh(gi[2] + r * gh[2]) + z * h1
+
+            x = x + h1
+            gi = (F.linear(x, w_ih2_x) + cond_rnn2[:, i]).chunk(3, 1)
+            gh = F.linear(h2, w_hh2, b_hh2).chunk(3, 1)
+            r = torch.sigmoid(gi[0] + gh[0])
+            z = torch.sigmoid(gi[1] + gh[1])
+            h2 = (1 - z) * torch.tanh(gi[2] + r * gh[2]) + z * h2
+
+            x = x + h2
+            x = F.relu(F.linear(x, fc1_w_x) + cond_fc1[:, i])
+            x = F.relu(F.linear(x, fc2_w_x) + cond_fc2[:, i])
+            logits = F.linear(x, fc3_w, fc3_b)
+
+            # draw the samples with the same random calls as the samplers of `Wavernn.inference()`
+            if mode == "mold":
+                nr_mix = n_classes // 3
+                temp = torch.empty_like(logits[:, :nr_mix]).uniform_(1e-5, 1.0 - 1e-5)
+                argmax = (logits[:, :nr_mix] - torch.log(-torch.log(temp))).argmax(dim=1, keepdim=True)
+                means = logits[:, nr_mix : 2 * nr_mix].gather(1, argmax).squeeze(1)
+                log_scales = torch.clamp(logits[:, 2 * nr_mix :].gather(1, argmax).squeeze(1), min=log_scale_min)
+                u = torch.empty_like(means).uniform_(1e-5, 1.0 - 1e-5)
+                sample = torch.clamp(means + torch.exp(log_scales) * (torch.log(u) - torch.log(1.0 - u)), -1.0, 1.0)
+            elif mode == "gauss":
+                std = torch.exp(torch.clamp(logits[:, 1], min=-7.0))
+                sample = torch.clamp(torch.normal(logits[:, 0], std), -1.0, 1.0)
+            else:
+                posterior = F.softmax(logits, dim=1)
+                posterior = posterior / posterior.sum(1, keepdim=True)
+                sample = 2 * torch.multinomial(posterior, 1, True).squeeze(1).to(mels.dtype) / (n_classes - 1.0) - 1.0
+            output[:, start + i] = sample
+            x = sample.unsqueeze(1)
+    return output
+
+
+@functools.lru_cache(maxsize=None)
+def get_scripted_sample_loop():
+    """Compile `sample_loop()` at the first call."""
+    return torch.jit.script(sample_loop)
+
+
 @dataclass
 class WavernnArgs(Coqpit):
     """🐸 WaveRNN model arguments.
@@ -399,6 +496,12 @@ class Wavernn(BaseVocoder):
         else:
             output = output[0]
 
+        output = self.decode_output(output, wave_len)
+        self.train()
+        return output
+
+    def decode_output(self, output, wave_len):
+        """Decode the mulaw samples and fade out the end of the unfolded output."""
         if self.args.mulaw and isinstance(self.args.mode, int):
             output = AudioProcessor.mulaw_decode(output, self.args.mode)
 
@@ -408,10 +511,81 @@ class Wavernn(BaseVocoder):
 
         if wave_len > len(fade_out):
             output[-20 * self.config.audio.hop_length :] *= fade_out
-
-        self.train()
         return output
 
+    def get_sample_loop_weights(self) -> List[torch.Tensor]:
+        """Return the weights of the layers used by `sample_loop()`."""
+        weights = [self.I.weight, self.I.bias]
+        for rnn in [self.rnn1, self.rnn2]:
+            weights += [rnn.weight_ih_l0, rnn.weight_hh_l0, rnn.bias_ih_l0, rnn.bias_hh_l0]
+        for fc in [self.fc1, self.fc2, self.fc3]:
+            weights += [fc.weight, fc.bias]
+        return weights
+
+    @torch.no_grad()
+    def inference_fast(self, mels, batched=None, target=None, overlap=None, use_jit=True):
+        """High throughput inference running the folds of all the inputs in a single compiled sampling loop.
+
+        Inputs are upsampled one by one, folded by `fold_with_overlap()` and their folds are stacked in a batch for
+        `sample_loop()`. Outputs are unfolded by `xfade_and_unfold()` like in `inference()`. If `batched` is False,
+        each input is a single fold padded to the longest input.
+
+        Args:
+            mels (Union[torch.Tensor, np.ndarray, List]): Spectrogram `[C, T]` or `[1, C, T]` or a list of them.
+            batched (bool): Fold the inputs. Defaults to `config.batched`.
+            target (int): Target timesteps of each fold. Defaults to `config.target_samples`.
+            overlap (int): Timesteps of the crossfade and the rnn warmup. Defaults to `config.overlap_samples`.
+            use_jit (bool): Run the loop compiled by TorchScript. Defaults to True.
+
+        Returns:
+            Union[np.ndarray, List[np.ndarray]]: Waveform of each input.
+        """
+        batched = self.config.batched if batched is None else batched
+        target = self.config.target_samples if target is None else target
+        overlap = self.config.overlap_samples if overlap is None else overlap
+        is_list = isinstance(mels, (list, tuple))
+        mels = mels if is_list else [mels]
+        device = next(self.parameters()).device
+
+        was_training = self.training
+        self.eval()
+        feats = []
+        wave_lens = []
+        for mel in mels:
+            mel = torch.as_tensor(mel, dtype=torch.float32, device=device)
+            if mel.ndim == 2:
+                mel = mel.unsqueeze(0)
+            wave_lens.append((mel.size(-1) - 1) * self.config.audio.hop_length)
+            mel = self.pad_tensor(mel.transpose(1, 2), pad=self.args.pad, side="both")
+            mel, aux = self.upsample(mel.transpose(1, 2))
+            if aux is None:
+                aux = mel.new_zeros(1, mel.size(1), 0)
+            feats.append(torch.cat([mel, aux], dim=2))
+
+        if batched:
+            folds = [self.fold_with_overlap(feat, target, overlap) for feat in feats]
+        else:
+            max_len = max(feat.size(1) for feat in feats)
+            folds = [self.pad_tensor(feat, max_len - feat.size(1), side="after") for feat in feats]
+        num_folds = [fold.size(0) for fold in folds]
+        folds = torch.cat(folds, dim=0)
+
+        mode = "bits" if isinstance(self.args.mode, int) else self.args.mode
+        loop = get_scripted_sample_loop() if use_jit else sample_loop
+        feat_dims = self.args.feat_dims
+        output = loop(
+            folds[:, :, :feat_dims], folds[:, :, feat_dims:], self.get_sample_loop_weights(), mode, self.n_classes
+        )
+        output = output.cpu().numpy().astype(np.float64)
+
+        wavs = []
+        for fold_output, wave_len in zip(np.split(output, np.cumsum(num_folds)[:-1]), wave_lens):
+            wav = self.xfade_and_unfold(fold_output, target, overlap) if batched else fold_output[0]
+            wavs.append(self.decode_output(wav, wave_len))
+        if was_training:
+            self.train()
+        return wavs if is_list else wavs[0]
+
     def gen_display(self, i, seq_len, b_size, start):
         gen_rate = (i + 1) / (time.time() - start) * b_size / 1000
         realtime_ratio = gen_rate * 1000 / self.config.audio.sample_rate
@@ -452,15 +626,9 @@ class Wavernn(BaseVocoder):
             padding = target + 2 * overlap - remaining
             x = self.pad_tensor(x, padding, side="after")
 
-        folded = torch.zeros(num_folds, target + 2 * overlap, features).to(x.device)
-
-        # Get the values for the folded tensor
-        for i in range(num_folds):
-            start = i * (target + overlap)
-            end = start + target + 2 * overlap
-            folded[i] = x[:, start:end, :]
-
-        return folded
+        # strided view of the overlapping folds
+        folded = x[0, : num_folds * (target + overlap) + overlap].unfold(0, target + 2 * overlap, target + overlap)
+        return folded.transpose(1, 2).contiguous()
 
     @staticmethod
     def get_gru_cell(gru):
@@ -532,11 +700,13 @@ class Wavernn(BaseVocoder):
 
         unfolded = np.zeros((total_len), dtype=np.float64)
 
-        # Loop to add up all the samples
-        for i in range(num_folds):
-            start = i * (target + overlap)
-            end = start + target + 2 * overlap
-            unfolded[start:end] += y[i]
+        # Add up the folds at the stride of `target + overlap`. Only the last `overlap` samples of a fold overlap the
+        # next fold, so add the fold heads and then the fold tails shifted by one stride.
+        stride = target + overlap
+        unfolded[: num_folds * stride] += y[:, :stride].reshape(-1)
+        tails = np.zeros((num_folds, stride), dtype=np.float64)
+        tails[:, :overlap] = y[:, stride:]
+        unfolded[stride:] += tails.reshape(-1)[: total_len - stride]
 
         return unfolded
 
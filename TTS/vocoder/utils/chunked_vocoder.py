@@ -0,0 +1,193 @@
+import math
+from typing import Callable, Generator, List, Tuple
+
+import numpy as np
+import torch
+
+
+@torch.no_grad()
+def measure_receptive_field(
+    inference_fn: Callable, num_channels: int, hop_length: int, num_frames: int = 64, max_frames: int = 1024
+) -> int:
+    """Measure how many input frames on each side of a frame change the output of a vocoder.
+
+    The vocoder is run twice on a random spectrogram with the same random seed, once with an impulse added to the
+    center frame. The output samples that differ give the extent of the receptive field. The spectrogram is doubled
+    until the receptive field fits in it.
+
+    Args:
+        inference_fn (Callable): Vocoder inference function `[B, C, T] -> [B, 1, T * hop_length (+ padding)]`.
+        num_channels (int): Number of spectrogram channels.
+        hop_length (int): Number of output samples of each frame.
+        num_frames (int): Number of frames on each side of the impulse in the first try. Defaults to 64.
+        max_frames (int): Largest number of frames on each side of the impulse. Defaults to 1024.
+
+    Returns:
+        int: number of frames on each side.
+    """
+    while True:
+        x = torch.randn(1, num_channels, 2 * num_frames + 1, generator=torch.Generator().manual_seed(0))
+        x_impulse = x.clone()
+        x_impulse[:, :, num_frames] += 1.0
+        outputs = []
+        for inputs in [x, x_impulse]:
+            # noise driven generators must draw the same noise in both runs
+            with torch.random.fork_rng(devices=[]):
+                torch.manual_seed(0)
+                outputs.append(inference_fn(inputs).reshape(-1))
+        # the vocoder might pad its input, assume the padding is symmetric
+        left = (outputs[0].shape[0] - x.shape[-1] * hop_length) // 2
+        changed = torch.nonzero(outputs[0] != outputs[1]).reshape(-1)
+        if changed.numel() == 0:
+            return 0
+        frames = torch.div(changed - left, hop_length, rounding_mode="floor")
+        extent = int((frames - num_frames).abs().max())
+        if extent < num_frames or num_frames >= max_frames:
+            return extent
+        num_frames *= 2
+
+
+def get_receptive_field_frames(generator: torch.nn.Module, num_channels: int, hop_length: int) -> int:
+    """Return the number of context frames a generator needs on each side of a frame.
+
+    It uses `receptive_field_size` in samples if the generator defines it, covering it from each side, and measures
+    it by `measure_receptive_field()` otherwise. Generators conditioned by an upsampling network, i.e. ParallelWaveGAN,
+    are measured too, since their `receptive_field_size` misses the context of the upsampling network and its
+    `aux_context_window`.
+    """
+    try:
+        receptive_field_size = generator.receptive_field_size
+    except AttributeError:
+        receptive_field_size = None
+    if receptive_field_size is not None and getattr(generator, "upsample_net", None) is None:
+        return int(math.ceil(receptive_field_size / hop_length))
+    return measure_receptive_field(generator.inference, num_channels, hop_length)
+
+
+class ChunkedVocoder:
+    """Run a GAN vocoder on overlapping windows of a spectrogram and crossfade the outputs into one waveform.
+
+    The spectrogram is split into chunks of `chunk_size` frames. Each chunk is vocoded with `pad` frames of context on
+    each side, then the context samples are cut off. Consecutive chunks overlap by `overlap` frames and the overlapping
+    samples are linearly crossfaded. Memory is bounded by the chunk size and the audio of each chunk is available
+    before the rest of the spectrogram is vocoded.
+
+    If `pad` covers the receptive field of the generator, the output is the same as the full `inference()` output
+    up to the floating point error. Generators driven by random noise (ParallelWaveGAN, UnivNet) draw a different
+    noise for each chunk, so their output only matches statistically.
+
+    Args:
+        model (torch.nn.Module): Vocoder model or generator. It is run by `model.inference(x)` with `x` in
+            shape `[B, C, T]`.
+        num_channels (int): Number of spectrogram channels.
+        hop_length (int): Number of output samples of each frame.
+        chunk_size (int): Number of frames of each chunk. Defaults to 64.
+        pad (int): Number of context frames on each side of a chunk. Defaults to None, the receptive field of the
+            generator.
+        overlap (int): Number of crossfaded frames between consecutive chunks. Defaults to 2.
+        batch_size (int): Number of chunks vocoded in a single forward pass. Defaults to 1.
+
+    Examples:
+        >>> vocoder = ChunkedVocoder(model, num_channels=80, hop_length=256, chunk_size=32, batch_size=4)
+        >>> for wav_chunk in vocoder.stream(mel):
+        ...     play(wav_chunk)
+    """
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        num_channels: int,
+        hop_length: int,
+        chunk_size: int = 64,
+        pad: int = None,
+        overlap: int = 2,
+        batch_size: int = 1,
+    ):
+        if chunk_size < 1:
+            raise ValueError(f" [!] `chunk_size` must be positive, got {chunk_size}.")
+        self.model = model
+        self.num_channels = num_channels
+        self.hop_length = hop_length
+        self.chunk_size = chunk_size
+        if pad is None:
+            pad = get_receptive_field_frames(getattr(model, "model_g", model), num_channels, hop_length)
+        self.pad = pad
+        self.overlap = overlap
+        self.batch_size = batch_size
+
+    def get_windows(self, num_frames: int) -> List[Tuple[int, int, int, int]]:
+        """Split `num_frames` frames into chunks.
+
+        Returns:
+            List[Tuple[int, int, int, int]]: first and end frames of each chunk including its crossfade with the next
+            chunk, and the first and end frames of its padded vocoder input.
+        """
+        windows = []
+        for start in range(0, num_frames, self.chunk_size):
+            end = min(start + self.chunk_size + self.overlap, num_frames)
+            windows.append((start, end, max(0, start - self.pad), min(num_frames, end + self.pad)))
+        return windows
+
+    @torch.no_grad()
+    def _vocode_windows(self, x: torch.Tensor, windows: List[Tuple[int, int, int, int]]) -> List[np.ndarray]:
+        """Vocode the chunks and cut off their context samples. Chunks of the same input length run in a batch."""
+        num_frames = x.shape[-1]
+        outputs = [None] * len(windows)
+        groups = {}
+        for idx, (_, _, win_start, win_end) in enumerate(windows):
+            groups.setdefault(win_end - win_start, []).append(idx)
+        for length, idxs in groups.items():
+            batch = torch.cat([x[:, :, windows[idx][2] : windows[idx][3]] for idx in idxs])
+            waveforms = self.model.inference(batch).reshape(len(idxs), -1).cpu().numpy()
+            # the vocoder might pad its input, assume the padding is symmetric
+            left = (waveforms.shape[-1] - length * self.hop_length) // 2
+            for waveform, idx in zip(waveforms, idxs):
+                start, end, win_start, _ = windows[idx]
+                # keep the samples of the vocoder padding at the ends of the spectrogram
+                first = 0 if start == 0 else (start - win_start) * self.hop_length + left
+                last = (
+                    len(waveform)
+                    if start + self.chunk_size >= num_frames
+                    else (end - win_start) * self.hop_length + left
+                )
+                outputs[idx] = waveform[first:last]
+        return outputs
+
+    def stream(self, x: torch.Tensor) -> Generator[np.ndarray, None, None]:
+        """Vocode a spectrogram chunk by chunk.
+
+        Args:
+            x (torch.Tensor): Spectrogram in shape `[C, T]` or `[1, C, T]`.
+
+        Yields:
+            np.ndarray: consecutive waveform samples. The last `overlap` frames of each chunk are held back until they
+            are crossfaded with the next chunk.
+        """
+        if x.dim() == 2:
+            x = x.unsqueeze(0)
+        windows = self.get_windows(x.shape[-1])
+        tail = None
+        for batch_start in range(0, len(windows), self.batch_size):
+            batch_windows = windows[batch_start : batch_start + self.batch_size]
+            for (start, end, _, _), waveform in zip(batch_windows, self._vocode_windows(x, batch_windows)):
+                if tail is not None:
+                    fade_in = (np.arange(len(tail), dtype=waveform.dtype) + 0.5) / len(tail)
+                    waveform = waveform.copy()
+                    waveform[: len(tail)] = tail * (1.0 - fade_in) + waveform[: len(tail)] * fade_in
+                if start + self.chunk_size >= x.shape[-1]:
+                    yield waveform
+                    return
+                num_tail_samples = (end - start - self.chunk_size) * self.hop_length
+                tail = waveform[len(waveform) - num_tail_samples :] if num_tail_samples > 0 else None
+                yield waveform[: len(waveform) - num_tail_samples]
+
+    def inference(self, x: torch.Tensor) -> np.ndarray:
+        """Vocode a spectrogram chunk by chunk and return the whole waveform.
+
+        Args:
+            x (torch.Tensor): Spectrogram in shape `[C, T]` or `[1, C, T]`.
+
+        Returns:
+            np.ndarray: waveform.
+        """
+        return np.concatenate(list(self.stream(x)))
@@ -1,6 +1,9 @@
 import os
 import unittest
 
+import numpy as np
+import torch
+
 from tests import get_tests_input_path, get_tests_output_path, get_tests_path
 from TTS.config import BaseAudioConfig
 from TTS.utils.audio import AudioProcessor
@@ -182,6 +185,33 @@ class TestAudio(unittest.TestCase):
         mel_denorm = ap.denormalize(mel_norm)
         assert abs(mel_reference - mel_denorm).max() < 1e-4
 
+    def test_batch_spectrograms(self):  # pylint: disable=no-self-use
+        scaler_stats_path = os.path.join(get_tests_input_path(), "scale_stats.npy")
+        for kwargs in [
+            {},
+            {"preemphasis": 0.97},
+            {"symmetric_norm": False},
+            {"signal_norm": False, "log_func": "np.log"},
+            {"stats_path": scaler_stats_path, "preemphasis": 0.0, "signal_norm": True},
+        ]:
+            ap = AudioProcessor(**BaseAudioConfig(mel_fmax=8000, **kwargs))
+            wav = ap.load_wav(WAV_FILE).astype(np.float32)
+            wavs = [wav, wav[: len(wav) // 3], wav[len(wav) // 2 :]]
+            wav_lengths = torch.LongTensor([len(w) for w in wavs])
+            wavs_padded = torch.zeros(len(wavs), len(wav))
+            for idx, w in enumerate(wavs):
+                wavs_padded[idx, : len(w)] = torch.from_numpy(w)
+            compute_linear_spec = "stats_path" not in kwargs
+            mel, linear, spec_lengths = ap.batch_spectrograms(wavs_padded, wav_lengths, compute_linear_spec)
+            for idx, w in enumerate(wavs):
+                mel_ref = ap.melspectrogram(w)
+                assert spec_lengths[idx] == mel_ref.shape[1]
+                assert abs(mel[idx, :, : spec_lengths[idx]].numpy() - mel_ref).mean() < 1e-3
+                assert mel[idx, :, spec_lengths[idx] :].abs().sum() == 0
+                if compute_linear_spec:
+                    linear_ref = ap.spectrogram(w)
+                    assert abs(linear[idx, :, : spec_lengths[idx]].numpy() - linear_ref).mean() < 1e-3
+
     def test_compute_f0(self):  # pylint: disable=no-self-use
         ap = AudioProcessor(**conf)
         wav = ap.load_wav(WAV_FILE)
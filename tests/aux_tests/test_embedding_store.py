@@ -0,0 +1,49 @@
+import os
+import pickle
+import unittest
+
+import numpy as np
+
+from tests import get_tests_output_path
+from TTS.tts.utils.embedding_store import EmbeddingStore, EmbeddingStoreMapping
+
+
+class EmbeddingStoreTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.centers = rng.normal(size=(20, 16))
+        self.d_vectors = {}
+        for idx in range(200):
+            speaker = idx % 20
+            embedding = self.centers[speaker] + 0.05 * rng.normal(size=16)
+            self.d_vectors[f"clip_{idx}.wav"] = {"name": f"speaker_{speaker}", "embedding": embedding.tolist()}
+        self.store_path = os.path.join(get_tests_output_path(), "embedding_store_tests", "speakers.npy")
+
+    def test_save_load(self):
+        store = EmbeddingStore.from_dict(self.d_vectors)
+        store.save(self.store_path)
+        loaded = EmbeddingStore.load(self.store_path)
+        self.assertIsInstance(loaded.embeddings, np.memmap)
+        self.assertEqual(len(loaded), 200)
+        self.assertEqual(loaded.dim, 16)
+        self.assertEqual(loaded["clip_3.wav"]["name"], "speaker_3")
+        self.assertTrue(np.allclose(loaded["clip_3.wav"]["embedding"], self.d_vectors["clip_3.wav"]["embedding"]))
+
+        embeddings = [x["embedding"] for x in self.d_vectors.values() if x["name"] == "speaker_7"]
+        self.assertTrue(np.allclose(loaded.get_embeddings_by_speaker("speaker_7"), embeddings, atol=1e-6))
+        self.assertTrue(np.allclose(loaded.get_speaker_mean("speaker_7"), np.mean(embeddings, 0), atol=1e-6))
+
+        mapping = EmbeddingStoreMapping(pickle.loads(pickle.dumps(loaded)))
+        self.assertEqual(len(mapping), 200)
+        self.assertEqual(list(mapping), list(self.d_vectors))
+        self.assertTrue(np.allclose(mapping["clip_5.wav"]["embedding"], self.d_vectors["clip_5.wav"]["embedding"]))
+
+    def test_search_speakers(self):
+        store = EmbeddingStore.from_dict(self.d_vectors)
+        for speaker in range(20):
+            results = store.search_speakers(self.centers[speaker], k=3)
+            self.assertEqual(len(results), 3)
+            self.assertEqual(results[0][0], f"speaker_{speaker}")
+            self.assertGreaterEqual(results[0][1], results[1][1])
+            approx_results = store.search_speakers(self.centers[speaker], k=1, approximate=True, num_probes=2)
+            self.assertEqual(approx_results[0][0], f"speaker_{speaker}")
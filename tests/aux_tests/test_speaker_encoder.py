@@ -1,11 +1,52 @@
 import unittest
 
+import numpy as np
 import torch as T
 
 from tests import get_tests_input_path
 from TTS.speaker_encoder.losses import AngleProtoLoss, GE2ELoss, SoftmaxAngleProtoLoss
 from TTS.speaker_encoder.models.lstm import LSTMSpeakerEncoder
-from TTS.speaker_encoder.models.resnet import ResNetSpeakerEncoder
+from TTS.speaker_encoder.models.resnet import ResNetSpeakerEncoder, get_embedding_window_offsets
+
+audio_config = {
+    "fft_size": 512,
+    "win_length": 400,
+    "hop_length": 160,
+    "sample_rate": 16000,
+    "num_mels": 64,
+    "preemphasis": 0.97,
+}
+
+
+def check_compute_embeddings(model, inputs, num_frames, num_eval):
+    """Check that the batched embeddings of padded clips match the embeddings of the single clips."""
+    model.eval()
+    lengths = T.LongTensor([x.shape[-1] for x in inputs])
+    batch = T.zeros(len(inputs), *inputs[0].shape[:-1], int(lengths.max()))
+    for idx, x in enumerate(inputs):
+        batch[idx, ..., : x.shape[-1]] = x
+    outputs = model.compute_embeddings(batch, lengths, num_frames=num_frames, num_eval=num_eval)
+    assert outputs.shape == (len(inputs), 256)
+    for idx, x in enumerate(inputs):
+        output = model.compute_embeddings(x.unsqueeze(0), num_frames=num_frames, num_eval=num_eval)
+        assert T.allclose(outputs[idx], output[0], atol=1e-5)
+        if x.dim() == 1:
+            # waveforms are sliced like in the single clip API
+            output = model.compute_embedding(x.unsqueeze(0), num_frames=num_frames, num_eval=num_eval)
+            assert T.allclose(outputs[idx], output[0], atol=1e-5)
+    outputs = model.compute_embeddings(batch, lengths, num_frames=num_frames, num_eval=num_eval, return_mean=False)
+    assert outputs.shape == (len(inputs), num_eval, 256)
+
+
+class EmbeddingWindowTests(unittest.TestCase):
+    # pylint: disable=R0201
+    def test_window_offsets(self):
+        lengths = T.arange(100, 2000, 7)
+        for num_eval in [1, 3, 10]:
+            offsets = get_embedding_window_offsets(lengths, 100, num_eval)
+            expected = [[int(offset) for offset in np.linspace(0, l - 100, num=num_eval)] for l in lengths.tolist()]
+            assert offsets.tolist() == expected
+
 
 file_path = get_tests_input_path()
 
@@ -39,6 +80,12 @@ class LSTMSpeakerEncoderTests(unittest.TestCase):
         assert output.shape[0] == 1
         assert output.shape[1] == 256
         assert len(output.shape) == 2
+        # compute d for a padded batch of clips
+        check_compute_embeddings(model, [T.rand(80, 200), T.rand(80, 163), T.rand(80, 331)], 160, 5)
+        model = LSTMSpeakerEncoder(64, 256, 128, 2, use_torch_spec=True, audio_config=audio_config)
+        check_compute_embeddings(model, [T.rand(32000), T.rand(12000), T.rand(20000)], 8000, 3)
+        # clips shorter than the window
+        check_compute_embeddings(model, [T.rand(32000), T.rand(6000), T.rand(5000), T.rand(6000)], 8000, 3)
 
 
 class ResNetSpeakerEncoderTests(unittest.TestCase):
@@ -66,6 +113,12 @@ class ResNetSpeakerEncoderTests(unittest.TestCase):
         assert output.shape[0] == 1
         assert output.shape[1] == 256
         assert len(output.shape) == 2
+        # compute d for a padded batch of clips
+        check_compute_embeddings(model, [T.rand(80, 200), T.rand(80, 163), T.rand(80, 331)], 160, 5)
+        model = ResNetSpeakerEncoder(input_dim=64, proj_dim=256, use_torch_spec=True, audio_config=audio_config)
+        check_compute_embeddings(model, [T.rand(32000), T.rand(24000), T.rand(20000)], 100, 3)
+        # clips shorter than the window
+        check_compute_embeddings(model, [T.rand(32000), T.rand(9000), T.rand(12000)], 100, 3)
 
 
 class GE2ELossTests(unittest.TestCase):
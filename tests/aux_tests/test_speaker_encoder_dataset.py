@@ -0,0 +1,131 @@
+import glob
+import os
+import unittest
+
+import numpy as np
+import soundfile as sf
+import torch
+from torch.utils.data import DataLoader
+
+from tests import get_tests_data_path
+from TTS.config.shared_configs import BaseAudioConfig
+from TTS.speaker_encoder.dataset import SpeakerEncoderDataset
+from TTS.utils.audio import AudioProcessor
+from TTS.utils.samplers import SpeakerBatchSampler
+from TTS.utils.shared_cache import SharedArrayCache
+
+
+class TestSpeakerBatchSampler(unittest.TestCase):
+    def setUp(self):
+        # 12 speakers with 1 to 12 utterances
+        self.speaker_ids = np.repeat(np.arange(12), np.arange(1, 13))
+
+    def check_batches(self, batches, num_speakers, num_utters):
+        for batch in batches:
+            self.assertEqual(len(batch), num_speakers * num_utters)
+            speakers = self.speaker_ids[batch].reshape(num_speakers, num_utters)
+            # each speaker is in a single group of the batch
+            self.assertTrue((speakers == speakers[:, :1]).all())
+            self.assertEqual(len(set(speakers[:, 0])), num_speakers)
+            for group in np.array(batch).reshape(num_speakers, num_utters):
+                if (self.speaker_ids == self.speaker_ids[group[0]]).sum() >= num_utters:
+                    self.assertEqual(len(set(group)), num_utters)
+
+    def test_batches(self):
+        sampler = SpeakerBatchSampler(self.speaker_ids, 4, 5, num_batches=20)
+        batches = list(sampler)
+        self.assertEqual(len(batches), len(sampler))
+        self.check_batches(batches, 4, 5)
+
+    def test_deterministic_epochs(self):
+        sampler = SpeakerBatchSampler(self.speaker_ids, 4, 5, seed=1)
+        epoch_0 = list(sampler)
+        epoch_1 = list(sampler)
+        self.assertNotEqual(epoch_0, epoch_1)
+        sampler.set_epoch(0)
+        self.assertEqual(list(sampler), epoch_0)
+
+    def test_distributed(self):
+        num_replicas = 3
+        samplers = [
+            SpeakerBatchSampler(self.speaker_ids, 4, 2, num_batches=10, num_replicas=num_replicas, rank=rank, seed=1)
+            for rank in range(num_replicas)
+        ]
+        for epoch in range(2):
+            rank_speakers = []
+            for sampler in samplers:
+                sampler.set_epoch(epoch)
+                batches = sampler.get_batches()
+                self.check_batches(batches.tolist(), 4, 2)
+                rank_speakers.append(set(self.speaker_ids[batches.flatten()]))
+            # the processes draw from disjoint speakers
+            self.assertEqual(len(set.union(*rank_speakers)), sum(len(speakers) for speakers in rank_speakers))
+        with self.assertRaises(ValueError):
+            SpeakerBatchSampler(self.speaker_ids, 5, 2, num_replicas=num_replicas, rank=0)
+
+
+class TestSpeakerEncoderDataset(unittest.TestCase):
+    def setUp(self):
+        wav_files = sorted(glob.glob(os.path.join(get_tests_data_path(), "ljspeech", "wavs", "*.wav")))
+        self.samples = [
+            {"audio_file": wav_file, "speaker_name": f"speaker_{idx % 3}", "text": ""}
+            for idx, wav_file in enumerate(wav_files)
+        ]
+        self.ap = AudioProcessor(**BaseAudioConfig(num_mels=80))
+
+    def test_shared_array_cache(self):
+        cache = SharedArrayCache(3, 10)
+        self.assertIsNone(cache.get(0))
+        self.assertTrue(cache.put(0, np.arange(6, dtype=np.float32)))
+        self.assertFalse(cache.put(1, np.arange(6, dtype=np.float32)))
+        self.assertTrue(cache.put(2, np.ones(4, dtype=np.float32)))
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(1, cache)
+        np.testing.assert_array_equal(cache.get(0)[0], np.arange(6))
+        np.testing.assert_array_equal(cache.get(2)[0], np.ones(4))
+
+        cache = SharedArrayCache(2, 20, ndims=(1, 2))
+        self.assertTrue(cache.put(1, np.arange(4, dtype=np.float32), np.ones((2, 3), dtype=np.float32)))
+        audio, mel = cache.get(1)
+        np.testing.assert_array_equal(audio, np.arange(4))
+        np.testing.assert_array_equal(mel, np.ones((2, 3)))
+        with self.assertRaises(ValueError):
+            cache.put(0, np.arange(4, dtype=np.float32))
+
+    def test_loader(self):
+        dataset = SpeakerEncoderDataset(
+            self.ap, self.samples, voice_len=0.5, num_speakers_in_batch=2, num_utter_per_speaker=3, cache_size_in_sec=60
+        )
+        self.assertEqual(dataset.get_num_speakers(), 3)
+        batch_sampler = SpeakerBatchSampler(dataset.get_speaker_ids(), 2, 3, num_batches=4)
+        loader = DataLoader(
+            dataset,
+            batch_sampler=batch_sampler,
+            num_workers=2,
+            collate_fn=dataset.collate_fn,
+            worker_init_fn=dataset.worker_init_fn,
+        )
+        for feats, labels in loader:
+            self.assertEqual(feats.shape[:2], (6, 80))
+            self.assertEqual(labels.shape, (2, 3))
+            self.assertTrue((labels == labels[:, :1]).all())
+        # the wavs loaded by the workers are cached in the main process
+        self.assertGreater(len(dataset.cache), 0)
+        for idx in range(len(dataset)):
+            if idx in dataset.cache:
+                wav = self.ap.load_wav(dataset.items[idx]["audio_file"], sr=self.ap.sample_rate)
+                np.testing.assert_allclose(dataset.cache.get(idx)[0], wav)
+        self.assertIsInstance(dataset[0][0], torch.FloatTensor)
+
+    def test_short_utterances(self):
+        voice_len = 3.0
+        dataset = SpeakerEncoderDataset(
+            self.ap, self.samples, voice_len=voice_len, num_speakers_in_batch=2, num_utter_per_speaker=3
+        )
+        # the utterances shorter than a segment are dropped instead of being repeated
+        self.assertEqual(len(dataset), 29)
+        for item in dataset.items:
+            self.assertGreaterEqual(sf.info(item["audio_file"]).duration, voice_len)
+        for idx in range(3):
+            mel, _ = dataset[idx]
+            self.assertEqual(mel.shape[1], self.ap.melspectrogram(np.zeros(dataset.seq_len)).shape[1])
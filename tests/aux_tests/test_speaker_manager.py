@@ -1,14 +1,15 @@
 import os
+import shutil
 import unittest
 
 import numpy as np
 import torch
 
-from tests import get_tests_input_path
+from tests import get_tests_input_path, get_tests_output_path
 from TTS.config import load_config
 from TTS.speaker_encoder.utils.generic_utils import setup_speaker_encoder_model
 from TTS.speaker_encoder.utils.io import save_checkpoint
-from TTS.tts.utils.speakers import SpeakerManager
+from TTS.tts.utils.speakers import DVectorCache, SpeakerManager
 from TTS.utils.audio import AudioProcessor
 
 encoder_config_path = os.path.join(get_tests_input_path(), "test_speaker_encoder_config.json")
@@ -58,6 +59,87 @@ class SpeakerManagerTest(unittest.TestCase):
         # remove dummy model
         os.remove(encoder_model_path)
 
+    @staticmethod
+    def test_compute_d_vectors_from_clips():
+        config = load_config(encoder_config_path)
+        model = setup_speaker_encoder_model(config)
+        save_checkpoint(model, None, None, get_tests_input_path(), 0)
+        manager = SpeakerManager(encoder_model_path=encoder_model_path, encoder_config_path=encoder_config_path)
+
+        wav_dir = os.path.dirname(sample_wav_path)
+        wav_files = sorted(
+            os.path.join(wav_dir, wav_file) for wav_file in os.listdir(wav_dir) if wav_file.endswith(".wav")
+        )
+        d_vectors = dict(manager.compute_d_vectors_from_clips(wav_files, batch_size=3, max_pending_clips=4))
+        assert sorted(d_vectors.keys()) == list(range(len(wav_files)))
+        for idx, wav_file in enumerate(wav_files):
+            d_vector = manager.compute_d_vector_from_clip(wav_file)
+            assert np.allclose(d_vectors[idx], d_vector, atol=1e-5)
+
+        os.remove(encoder_model_path)
+
+    @staticmethod
+    def test_d_vector_cache():
+        config = load_config(encoder_config_path)
+        model = setup_speaker_encoder_model(config)
+        save_checkpoint(model, None, None, get_tests_input_path(), 0)
+        manager = SpeakerManager(encoder_model_path=encoder_model_path, encoder_config_path=encoder_config_path)
+        d_vector = manager.compute_d_vector_from_clip(sample_wav_path)
+
+        cache_path = os.path.join(get_tests_output_path(), "d_vector_cache.json")
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        manager.set_d_vector_cache(DVectorCache(max_size=2, cache_path=cache_path))
+        assert np.allclose(manager.compute_d_vector_from_clip(sample_wav_path), d_vector)
+        # the same content under another name is a hit
+        copy_wav_path = os.path.join(get_tests_output_path(), "d_vector_cache_copy.wav")
+        shutil.copy(sample_wav_path, copy_wav_path)
+        assert np.allclose(manager.compute_d_vector_from_clip(copy_wav_path), d_vector)
+        assert manager.d_vector_cache.stats()["hits"] == 1
+        mean_d_vector = manager.compute_d_vector_from_clip([sample_wav_path, sample_wav_path2])
+        assert manager.d_vector_cache.stats()["hits"] == 2
+
+        # registered voices are persisted with the cache
+        assert manager.get_voice_d_vector("voice") is None
+        manager.register_voice("voice", [sample_wav_path, sample_wav_path2])
+        assert np.allclose(manager.get_voice_d_vector("voice"), mean_d_vector)
+        manager.set_d_vector_cache(DVectorCache(cache_path=cache_path))
+        assert np.allclose(manager.get_voice_d_vector("voice"), mean_d_vector)
+        assert len(manager.d_vector_cache.d_vectors) == 2
+
+        # another checkpoint of the same encoder saved under the same file name does not share the cached d_vectors
+        save_checkpoint(setup_speaker_encoder_model(config), None, None, get_tests_input_path(), 0)
+        other_manager = SpeakerManager(encoder_model_path=encoder_model_path, encoder_config_path=encoder_config_path)
+        other_manager.set_d_vector_cache(manager.d_vector_cache)
+        assert other_manager.speaker_encoder_id != manager.speaker_encoder_id
+        assert other_manager.get_voice_d_vector("voice") is None
+
+        os.remove(encoder_model_path)
+
+    @staticmethod
+    def test_shared_d_vector_cache_file():
+        cache_dir = os.path.join(get_tests_output_path(), "d_vector_cache_tests")
+        if os.path.exists(cache_dir):
+            shutil.rmtree(cache_dir)
+        cache_path = os.path.join(cache_dir, "d_vector_cache.json")
+        # caches of two processes sharing the file
+        cache = DVectorCache(cache_path=cache_path)
+        other_cache = DVectorCache(cache_path=cache_path)
+        cache.put("encoder:clip", [0.0, 1.0])
+        other_cache.put("encoder:other_clip", [1.0, 0.0])
+        cache.put_voice("encoder:voice", [0.5, 0.5])
+        other_cache.put_voice("encoder:other_voice", [0.0, 0.0])
+        # the voices registered by the other process are read from the file
+        assert other_cache.get_voice("encoder:voice") == [0.5, 0.5]
+        assert cache.get_voice("encoder:other_voice") == [0.0, 0.0]
+        assert cache.get_voice("encoder:unknown") is None
+        # the clip d_vectors are saved without registering a voice
+        loaded_cache = DVectorCache(cache_path=cache_path)
+        assert loaded_cache.get("encoder:clip") == [0.0, 1.0]
+        assert loaded_cache.get("encoder:other_clip") == [1.0, 0.0]
+        assert len(loaded_cache.voices) == 2
+        assert os.listdir(cache_dir) == ["d_vector_cache.json"]
+
     @staticmethod
     def test_speakers_file_processing():
         manager = SpeakerManager(d_vectors_file_path=d_vectors_file_path)
@@ -73,3 +155,22 @@ class SpeakerManagerTest(unittest.TestCase):
         d_vector2 = manager.get_mean_d_vector(manager.speaker_names[0], num_samples=2, randomize=False)
         assert len(d_vector2) == 256
         assert np.sum(np.array(d_vector1) - np.array(d_vector2)) != 0
+
+    @staticmethod
+    def test_speakers_store_file_processing():
+        manager = SpeakerManager(d_vectors_file_path=d_vectors_file_path)
+        store_path = os.path.join(get_tests_output_path(), "dummy_speakers.npy")
+        manager.save_d_vectors_to_file(store_path)
+        store_manager = SpeakerManager(d_vectors_file_path=store_path)
+        assert store_manager.speaker_ids == manager.speaker_ids
+        assert sorted(store_manager.clip_ids) == sorted(manager.clip_ids)
+        assert store_manager.d_vector_dim == manager.d_vector_dim
+        speaker_name = manager.speaker_names[0]
+        assert np.allclose(store_manager.get_mean_d_vector(speaker_name), manager.get_mean_d_vector(speaker_name))
+        assert np.allclose(
+            store_manager.get_d_vectors_by_speaker(speaker_name), manager.get_d_vectors_by_speaker(speaker_name)
+        )
+        d_vector = manager.get_d_vector_by_clip(manager.clip_ids[0])
+        assert np.allclose(store_manager.get_d_vector_by_clip(manager.clip_ids[0]), d_vector)
+        nearest_speaker, _ = store_manager.find_nearest_speakers(store_manager.get_mean_d_vector(speaker_name))[0]
+        assert nearest_speaker == speaker_name
@@ -10,6 +10,9 @@ sleep 30
 curl -o /tmp/audio.wav "http://localhost:5002/api/tts?text=synthesis%20schmynthesis"
 python -c 'import sys; import wave; print(wave.open(sys.argv[1]).getnframes())' /tmp/audio.wav
 
+curl -o /tmp/audio_stream.wav "http://localhost:5002/api/tts-stream?text=synthesis%20schmynthesis.%20Second%20sentence."
+python -c 'import os, sys; assert os.path.getsize(sys.argv[1]) > 44' /tmp/audio_stream.wav
+
 kill $SERVER_PID
 
-rm /tmp/audio.wav
+rm /tmp/audio.wav /tmp/audio_stream.wav
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import torch
+
+from TTS.utils.samplers import BucketBatchSampler
+
+
+class TestBucketBatchSampler(unittest.TestCase):
+    def setUp(self):
+        self.lengths = np.random.RandomState(0).randint(10, 200, size=500)
+
+    def test_frame_budget(self):
+        sampler = BucketBatchSampler(None, self.lengths, max_frames=800, max_batch_size=16, bucket_size=100)
+        batches = list(sampler)
+        self.assertEqual(len(batches), len(sampler))
+        self.assertEqual(sorted(idx for batch in batches for idx in batch), list(range(len(self.lengths))))
+        for batch in batches:
+            self.assertLessEqual(len(batch), 16)
+            self.assertLessEqual(len(batch) * self.lengths[batch].max(), 800)
+        # bucketing pads less than random batches of the mean batch size
+        random_batches = np.array_split(np.random.RandomState(1).permutation(len(self.lengths)), len(batches))
+        self.assertGreater(sampler.padding_efficiency, sampler.compute_padding_efficiency(random_batches))
+
+    def test_long_samples(self):
+        sampler = BucketBatchSampler(None, [10, 1000, 20], max_frames=100, shuffle=False)
+        self.assertEqual(list(sampler), [[0, 2], [1]])
+
+    def test_deterministic_epochs(self):
+        sampler = BucketBatchSampler(None, self.lengths, max_frames=800, seed=1)
+        epoch_0 = list(sampler)
+        epoch_1 = list(sampler)
+        self.assertNotEqual(epoch_0, epoch_1)
+        sampler.set_epoch(0)
+        self.assertEqual(list(sampler), epoch_0)
+        other = BucketBatchSampler(None, self.lengths, max_frames=800, seed=1)
+        other.set_epoch(1)
+        self.assertEqual(list(other), epoch_1)
+
+    def test_distributed(self):
+        num_replicas = 3
+        samplers = [
+            BucketBatchSampler(None, self.lengths, max_frames=800, num_replicas=num_replicas, rank=rank, seed=1)
+            for rank in range(num_replicas)
+        ]
+        rank_batches = [list(sampler) for sampler in samplers]
+        self.assertEqual(len({len(batches) for batches in rank_batches}), 1)
+        indices = [idx for batches in rank_batches for batch in batches for idx in batch]
+        self.assertEqual(set(indices), set(range(len(self.lengths))))
+        all_batches = BucketBatchSampler(None, self.lengths, max_frames=800, seed=1).get_batches()
+        self.assertLess(len(indices) - len(self.lengths), max(len(batch) for batch in all_batches) * num_replicas)
+
+    def test_weighted_sampler(self):
+        weights = torch.ones(len(self.lengths))
+        weights[:10] = 1000
+        inner = torch.utils.data.WeightedRandomSampler(weights, len(self.lengths))
+        samplers = [
+            BucketBatchSampler(inner, self.lengths, max_frames=800, num_replicas=2, rank=rank, seed=1)
+            for rank in range(2)
+        ]
+        rank_batches = [sampler.get_batches() for sampler in samplers]
+        self.assertEqual(len(rank_batches[0]), len(rank_batches[1]))
+        indices = [idx for batches in rank_batches for batch in batches for idx in batch]
+        self.assertGreater(np.mean(np.array(indices) < 10), 0.5)
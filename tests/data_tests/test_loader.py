@@ -9,6 +9,13 @@ from torch.utils.data import DataLoader
 from tests import get_tests_output_path
 from TTS.tts.configs.shared_configs import BaseDatasetConfig, BaseTTSConfig
 from TTS.tts.datasets import TTSDataset, load_tts_samples
+from TTS.tts.datasets.dataset import (
+    FeatureStore,
+    PackedPhonemeCache,
+    PhonemeDataset,
+    get_tokenizer_hash,
+    pad_spectrogram,
+)
 from TTS.tts.utils.text.tokenizer import TTSTokenizer
 from TTS.utils.audio import AudioProcessor
 
@@ -44,7 +51,9 @@ class TestTTSDataset(unittest.TestCase):
         self.max_loader_iter = 4
         self.ap = AudioProcessor(**c.audio)
 
-    def _create_dataloader(self, batch_size, r, bgs, start_by_longest=False):
+    def _create_dataloader(
+        self, batch_size, r, bgs, start_by_longest=False, feature_store_path=None, spectrogram_mode="item"
+    ):
 
         # load dataset
         meta_data_train, meta_data_eval = load_tts_samples(dataset_config, eval_split=True, eval_split_size=0.2)
@@ -64,6 +73,8 @@ class TestTTSDataset(unittest.TestCase):
             min_audio_len=c.min_audio_len,
             max_audio_len=c.max_audio_len,
             start_by_longest=start_by_longest,
+            feature_store_path=feature_store_path,
+            spectrogram_mode=spectrogram_mode,
         )
         dataloader = DataLoader(
             dataset,
@@ -241,3 +252,123 @@ class TestTTSDataset(unittest.TestCase):
                 # check batch zero-frame conditions (zero-frame disabled)
                 # assert (linear_input * stop_target.unsqueeze(2)).sum() == 0
                 # assert (mel_input * stop_target.unsqueeze(2)).sum() == 0
+
+    def test_feature_store(self):
+        if ok_ljspeech:
+            feature_store_path = os.path.join(OUTPATH, "feature_store")
+            if os.path.exists(feature_store_path):
+                shutil.rmtree(feature_store_path)
+            dataloader, _ = self._create_dataloader(2, 1, 0)
+            dataloader_fs, dataset_fs = self._create_dataloader(2, 1, 0, feature_store_path=feature_store_path)
+            self.assertEqual(len(dataset_fs.feature_store), len(dataset_fs.samples))
+            for i, (data, data_fs) in enumerate(zip(dataloader, dataloader_fs)):
+                if i == self.max_loader_iter:
+                    break
+                self.assertTrue(torch.equal(data["mel"], data_fs["mel"]))
+                self.assertTrue(torch.equal(data["linear"], data_fs["linear"]))
+                self.assertTrue(torch.equal(data["mel_lengths"], data_fs["mel_lengths"]))
+                self.assertTrue(torch.equal(data["waveform"], data_fs["waveform"]))
+
+            # changing the audio parameters invalidates the store
+            ap = AudioProcessor(**{**c.audio, "num_mels": 40})
+            store = FeatureStore(feature_store_path, ap, compute_linear_spec=True)
+            self.assertEqual(len(store), 0)
+            store.precompute(dataset_fs.samples[:3])
+            self.assertEqual(store.get(dataset_fs.samples[0]["audio_file"])["mel"].shape[0], 40)
+
+    def test_feature_store_stats(self):
+        if ok_ljspeech:
+            feature_store_path = os.path.join(OUTPATH, "feature_store_stats")
+            if os.path.exists(feature_store_path):
+                shutil.rmtree(feature_store_path)
+            samples, _ = load_tts_samples(dataset_config, eval_split=True, eval_split_size=0.2)
+            stats_path = os.path.join(OUTPATH, "feature_store_stats.npy")
+
+            def create_store(mel_mean):
+                stats = {
+                    "mel_mean": np.full(c.audio["num_mels"], mel_mean),
+                    "mel_std": np.ones(c.audio["num_mels"]),
+                    "linear_mean": np.zeros(c.audio["fft_size"] // 2 + 1),
+                    "linear_std": np.ones(c.audio["fft_size"] // 2 + 1),
+                    "audio_config": {},
+                }
+                np.save(stats_path, stats, allow_pickle=True)
+                ap = AudioProcessor(**{**c.audio, "signal_norm": True, "stats_path": stats_path})
+                return FeatureStore(feature_store_path, ap)
+
+            store = create_store(0.0)
+            store.precompute(samples[:2])
+            self.assertEqual(len(create_store(0.0)), 2)
+            # new stats at the same path invalidate the store
+            store = create_store(1.0)
+            self.assertEqual(len(store), 0)
+            store.precompute(samples[:2])
+            mel = store.get(samples[0]["audio_file"])["mel"]
+            np.testing.assert_allclose(
+                mel, store.ap.melspectrogram(store.ap.load_wav(samples[0]["audio_file"])), atol=1e-5
+            )
+
+    def test_spectrogram_modes(self):
+        if ok_ljspeech:
+            dataloader, _ = self._create_dataloader(2, 2, 0)
+            dataloader_batch, _ = self._create_dataloader(2, 2, 0, spectrogram_mode="batch")
+            dataloader_device, dataset = self._create_dataloader(2, 2, 0, spectrogram_mode="device")
+            for i, (data, data_batch, data_device) in enumerate(zip(dataloader, dataloader_batch, dataloader_device)):
+                if i == self.max_loader_iter:
+                    break
+                self.assertEqual(data["mel"].shape, data_batch["mel"].shape)
+                self.assertEqual(data["linear"].shape, data_batch["linear"].shape)
+                self.assertLess((data["mel"] - data_batch["mel"]).abs().mean(), 1e-3)
+                self.assertLess((data["linear"] - data_batch["linear"]).abs().mean(), 1e-3)
+                self.assertTrue(torch.equal(data["mel_lengths"], data_batch["mel_lengths"]))
+                self.assertTrue(torch.equal(data["stop_targets"], data_batch["stop_targets"]))
+                self.assertTrue(torch.equal(data["waveform"], data_batch["waveform"]))
+                self.assertIsNone(data["spec_waveform"])
+
+                # spectrograms are computed later from the padded waveforms
+                self.assertIsNone(data_device["mel"])
+                self.assertTrue(torch.equal(data["mel_lengths"], data_device["mel_lengths"]))
+                mel, _, spec_lengths = dataset.ap.batch_spectrograms(
+                    data_device["spec_waveform"], data_device["spec_waveform_lengths"]
+                )
+                self.assertTrue(torch.equal(spec_lengths, data_device["mel_lengths"]))
+                self.assertTrue(torch.equal(pad_spectrogram(mel, data_batch["mel"].shape[1]), data_batch["mel"]))
+
+
+class TestPackedPhonemeCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_path = os.path.join(OUTPATH, "packed_phoneme_cache")
+        if os.path.exists(self.cache_path):
+            shutil.rmtree(self.cache_path)
+        self.samples = [
+            {"text": "Hello world.", "audio_file": "wavs/sample_1.wav"},
+            {"text": "Another sample!", "audio_file": "wavs/sample_2.wav"},
+            {"text": "And the last one?", "audio_file": "wavs/sample_3.wav"},
+        ]
+        self.tokenizer, _ = TTSTokenizer.init_from_config(c)
+
+    def test_packed_cache(self):
+        dataset = PhonemeDataset(self.samples, self.tokenizer, self.cache_path, cache_format="packed")
+        self.assertEqual(len(dataset.packed_cache), 3)
+        for idx, sample in enumerate(self.samples):
+            token_ids = dataset[idx]["token_ids"]
+            self.assertIsInstance(token_ids, np.ndarray)
+            self.assertEqual(token_ids.tolist(), self.tokenizer.text_to_ids(sample["text"]))
+
+        # only the changed and the new samples are recomputed
+        self.samples[1]["text"] = "A changed sample!"
+        self.samples.append({"text": "A new sample.", "audio_file": "wavs/sample_4.wav"})
+        cache = PackedPhonemeCache(self.cache_path, get_tokenizer_hash(self.tokenizer))
+        self.assertFalse(cache.contains(self.samples[1]["audio_file"], self.samples[1]["text"]))
+        self.assertIsNone(cache.get(self.samples[3]["audio_file"], self.samples[3]["text"]))
+        dataset = PhonemeDataset(self.samples, self.tokenizer, self.cache_path, cache_format="packed")
+        self.assertEqual(len(dataset.packed_cache), 4)
+        for idx, sample in enumerate(self.samples):
+            self.assertEqual(dataset[idx]["token_ids"].tolist(), self.tokenizer.text_to_ids(sample["text"]))
+
+        # changing the tokenizer invalidates the cache
+        self.tokenizer.add_blank = True
+        cache = PackedPhonemeCache(self.cache_path, get_tokenizer_hash(self.tokenizer))
+        self.assertEqual(len(cache), 0)
+        dataset = PhonemeDataset(self.samples, self.tokenizer, self.cache_path, cache_format="packed")
+        self.assertEqual(dataset[0]["token_ids"].tolist(), self.tokenizer.text_to_ids(self.samples[0]["text"]))
@@ -0,0 +1,54 @@
+import glob
+import os
+import unittest
+
+import numpy as np
+import soundfile as sf
+
+from tests import get_tests_data_path, get_tests_output_path
+from TTS.tts.datasets.sample_table import SampleTable, compute_audio_lengths, load_audio_lengths
+
+OUTPATH = os.path.join(get_tests_output_path(), "sample_table_tests/")
+os.makedirs(OUTPATH, exist_ok=True)
+
+WAV_FILES = sorted(glob.glob(os.path.join(get_tests_data_path(), "ljspeech", "wavs", "*.wav")))[:10]
+
+
+class TestSampleTable(unittest.TestCase):
+    def test_compute_audio_lengths(self):
+        cache_path = os.path.join(OUTPATH, "audio_lengths.npz")
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        self.assertEqual(len(WAV_FILES), 10)
+        audio_lengths = compute_audio_lengths(WAV_FILES, num_workers=2, cache_path=cache_path)
+        for wav_file, audio_length in zip(WAV_FILES, audio_lengths):
+            self.assertEqual(audio_length, len(sf.read(wav_file)[0]))
+        self.assertEqual(load_audio_lengths(cache_path), dict(zip(WAV_FILES, audio_lengths.tolist())))
+
+        # cached lengths are not probed again
+        np.savez(cache_path, audio_files=np.array(WAV_FILES), audio_lengths=np.arange(len(WAV_FILES)))
+        self.assertEqual(compute_audio_lengths(WAV_FILES, cache_path=cache_path).tolist(), list(range(len(WAV_FILES))))
+
+    def test_length_mask_and_select(self):
+        samples = [
+            {
+                "text": "a" * (idx + 1),
+                "audio_file": f"{idx}.wav",
+                "speaker_name": f"speaker_{idx % 3}",
+                "language": "en",
+            }
+            for idx in range(10)
+        ]
+        table = SampleTable(samples, np.arange(10) * 100)
+        self.assertEqual(table.speaker_names.tolist(), ["speaker_0", "speaker_1", "speaker_2"])
+        self.assertEqual(table.speaker_ids.tolist(), [idx % 3 for idx in range(10)])
+        self.assertEqual(table.language_ids.tolist(), [0] * 10)
+
+        mask = table.length_mask(min_text_len=2, max_text_len=9, min_audio_len=200, max_audio_len=800)
+        self.assertEqual(np.flatnonzero(mask).tolist(), [2, 3, 4, 5, 6, 7, 8])
+
+        new_table = table.select([8, 2])
+        self.assertEqual(new_table.samples, [samples[8], samples[2]])
+        self.assertEqual(new_table.audio_lengths.tolist(), [800, 200])
+        self.assertEqual(new_table.text_lengths.tolist(), [9, 3])
+        self.assertEqual(new_table.speaker_names[new_table.speaker_ids].tolist(), ["speaker_2", "speaker_2"])
@@ -56,3 +56,27 @@ for index in ids:
         pt += 1
 
 assert is_balanced(en, pt), "Weighted sampler is supposed to be balanced"
+
+# Distributed weighted samplers give disjoint shares of the same draws to each rank
+num_replicas = 2
+ddp_samplers = [
+    get_language_weighted_sampler(train_samples, num_replicas=num_replicas, rank=rank, seed=1)
+    for rank in range(num_replicas)
+]
+assert len({len(sampler) for sampler in ddp_samplers}) == 1, "Ranks are supposed to get the same number of samples"
+draws = torch.multinomial(ddp_samplers[0].weights, ddp_samplers[0].total_size, True, generator=torch.manual_seed(1))
+rank_ids = [list(sampler) for sampler in ddp_samplers]
+assert rank_ids[0] == draws[0::2].tolist() and rank_ids[1] == draws[1::2].tolist(), "Ranks must share the draws"
+assert rank_ids[0] != list(ddp_samplers[0]), "Draws are supposed to change at each epoch"
+
+for sampler in ddp_samplers:
+    sampler.set_epoch(0)
+    ids = functools.reduce(lambda a, b: a + b, [list(sampler) for i in range(100)])
+    en, pt = 0, 0
+    for index in ids:
+        if train_samples[index]["language"] == "en":
+            en += 1
+        else:
+            pt += 1
+
+    assert is_balanced(en, pt), "Distributed weighted sampler is supposed to be balanced on each rank"
@@ -0,0 +1,122 @@
+import asyncio
+import http.client
+import json
+import os
+import queue
+import signal
+import threading
+import time
+import unittest
+
+from tests import get_tests_output_path
+from TTS.server.async_server import AsyncTTSServer
+from TTS.server.inference_pool import InferencePool, QueueFullError
+from TTS.tts.configs.glow_tts_config import GlowTTSConfig
+from TTS.tts.models import setup_model
+from TTS.utils.io import save_checkpoint
+from TTS.utils.synthesizer import Synthesizer
+
+
+class AsyncServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        config = GlowTTSConfig(num_chars=32, use_phonemes=False)
+        model = setup_model(config)
+        output_path = os.path.join(get_tests_output_path(), "async_server")
+        os.makedirs(output_path, exist_ok=True)
+        config.save_json(os.path.join(output_path, "config.json"))
+        save_checkpoint(config, model, None, None, 10, 1, output_path)
+        synthesizer = Synthesizer(
+            os.path.join(output_path, "checkpoint_10.pth.tar"), os.path.join(output_path, "config.json")
+        )
+        cls.pool = InferencePool(synthesizer, num_workers=1, max_queue_size=1)
+        cls.loop = asyncio.new_event_loop()
+        server = AsyncTTSServer(cls.pool, synthesizer.output_sample_rate, request_timeout=60)
+        cls.server = cls.loop.run_until_complete(asyncio.start_server(server.handle, "127.0.0.1", 0))
+        cls.port = cls.server.sockets[0].getsockname()[1]
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.pool.close()
+
+    def _get(self, path):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.getheaders(), response.read()
+
+    def test_tts(self):
+        status, headers, body = self._get("/api/tts?text=Better%20this%20test%20works!!")
+        self.assertEqual(status, 200)
+        self.assertEqual(dict(headers)["Content-Type"], "audio/wav")
+        self.assertEqual(body[:4], b"RIFF")
+
+    def test_tts_stream(self):
+        status, headers, body = self._get("/api/tts-stream?text=Better%20this%20test%20works!!%20Two%20sentences.")
+        self.assertEqual(status, 200)
+        self.assertEqual(dict(headers)["Transfer-Encoding"], "chunked")
+        self.assertEqual(body[:4], b"RIFF")
+        self.assertGreater(len(body), 44)
+
+    def test_errors(self):
+        self.assertEqual(self._get("/api/tts")[0], 400)
+        self.assertEqual(self._get("/api/unknown")[0], 404)
+        status, _, body = self._get("/api/tts?text=Better%20this%20test%20works!!&timeout=0")
+        self.assertEqual(status, 504)
+        self.assertIn("error", json.loads(body))
+
+    def test_queue_full(self):
+        jobs = []
+        with self.assertRaises(QueueFullError):
+            for _ in range(self.pool.num_slots + 1):
+                jobs.append(self.pool.submit("Better this test works!!", lambda kind, payload: None))
+        status, headers, _ = self._get("/api/tts?text=Better%20this%20test%20works!!")
+        self.assertEqual(status, 429)
+        self.assertEqual(dict(headers)["Retry-After"], "1")
+        for job in jobs:
+            job.cancel()
+        # cancelled requests free their slots once the worker is done with the running sentence
+        for _ in range(600):
+            status, _, body = self._get("/health")
+            if json.loads(body)["num_requests"] == 0:
+                break
+            time.sleep(0.1)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["max_requests"], 2)
+        self.assertEqual(json.loads(body)["num_requests"], 0)
+        self.assertEqual(self._get("/api/tts?text=Better%20this%20test%20works!!")[0], 200)
+
+    def test_cancel_finished_job(self):
+        messages = queue.Queue()
+        job = self.pool.submit("Better this test works!!", lambda kind, payload: messages.put(kind))
+        self.assertEqual(messages.get(timeout=60), "done")
+        new_messages = queue.Queue()
+        new_job = self.pool.submit("Better this test works!!", lambda kind, payload: new_messages.put(kind))
+        # the slot of the finished request is reused by the new one
+        self.assertEqual(new_job.slot, job.slot)
+        job.cancel()
+        self.assertEqual(self.pool.cancelled[new_job.slot], 0)
+        self.assertEqual(new_messages.get(timeout=60), "done")
+
+    def test_worker_restart(self):
+        messages = queue.Queue()
+        pid = self.pool.workers[0].pid
+        self.pool.submit("Better this test works!! " * 10, lambda kind, payload: messages.put((kind, payload)))
+        queued_messages = queue.Queue()
+        self.pool.submit("Better this test works!!", lambda kind, payload: queued_messages.put((kind, payload)))
+        # the worker dies while running the first request
+        os.kill(pid, signal.SIGKILL)
+        kind, payload = messages.get(timeout=60)
+        self.assertEqual(kind, "error")
+        self.assertIn("died", payload)
+        # the queued request runs on the new worker
+        kind, payload = queued_messages.get(timeout=60)
+        self.assertEqual(kind, "done")
+        self.assertEqual(payload[:4], b"RIFF")
+        self.assertNotEqual(self.pool.workers[0].pid, pid)
+        self.assertEqual(self.pool.num_requests, 0)
+        self.assertEqual(self._get("/api/tts?text=Better%20this%20test%20works!!")[0], 200)
@@ -0,0 +1,133 @@
+import os
+import unittest
+
+import numpy as np
+import torch
+
+from tests import get_tests_output_path
+from TTS.tts.configs.glow_tts_config import GlowTTSConfig
+from TTS.tts.configs.vits_config import VitsConfig
+from TTS.tts.models import setup_model
+from TTS.tts.models.forward_tts import ForwardTTS, ForwardTTSArgs
+from TTS.tts.models.vits import Vits
+from TTS.utils.export import export_tts, export_vocoder
+from TTS.utils.io import save_checkpoint
+from TTS.utils.synthesizer import Synthesizer
+from TTS.vocoder.configs import HifiganConfig, MelganConfig
+from TTS.vocoder.models.gan import GAN
+
+OUTPUT_PATH = os.path.join(get_tests_output_path(), "export_tests")
+os.makedirs(OUTPUT_PATH, exist_ok=True)
+
+
+def _run_tts(model, x, *speaker):
+    aux_input = {"x_lengths": torch.tensor([x.shape[1]]), "speaker_ids": None, "d_vectors": None}
+    if speaker:
+        aux_input["speaker_ids"] = speaker[0]
+    torch.manual_seed(0)
+    with torch.no_grad():
+        return model.inference(x, aux_input=aux_input)["model_outputs"]
+
+
+class ExportTTSTest(unittest.TestCase):
+    def _check_parity(self, model, *speaker):
+        graph = export_tts(model.eval(), example_length=16)
+        for length in (16, 5, 41):
+            x = torch.randint(1, 32, (1, length))
+            expected = _run_tts(model, x, *speaker)
+            torch.manual_seed(0)
+            with torch.no_grad():
+                outputs = graph(x, torch.tensor([length]), *speaker)
+            self.assertEqual(outputs.shape, expected.shape)
+            torch.testing.assert_close(outputs, expected)
+        return graph
+
+    def test_glow_tts(self):
+        graph = self._check_parity(setup_model(GlowTTSConfig(num_chars=32, use_phonemes=False)))
+        path = os.path.join(OUTPUT_PATH, "glow_tts.ts")
+        torch.jit.save(graph, path)
+        x = torch.randint(1, 32, (1, 23))
+        torch.manual_seed(0)
+        expected = graph(x, torch.tensor([23]))
+        torch.manual_seed(0)
+        torch.testing.assert_close(torch.jit.load(path)(x, torch.tensor([23])), expected)
+
+    def test_glow_tts_multi_speaker(self):
+        config = GlowTTSConfig(num_chars=32, use_phonemes=False, use_speaker_embedding=True, num_speakers=4)
+        model = setup_model(config)
+        # the graph is traced with the speaker id 0
+        self._check_parity(model, torch.tensor([3]))
+
+    def test_forward_tts(self):
+        model = ForwardTTS(ForwardTTSArgs(num_chars=32, use_pitch=True))
+        # longer durations than the untrained duration predictor gives, so the output lengths change with the inputs
+        model.length_scale = 3.0
+        self._check_parity(model)
+
+    def test_vits(self):
+        config = VitsConfig(use_phonemes=False)
+        config.model_args.num_chars = 32
+        self._check_parity(Vits.init_from_config(config))
+
+
+class ExportVocoderTest(unittest.TestCase):
+    def _check_parity(self, config):
+        model = GAN(config).eval()
+        inputs = [torch.randn(1, config.audio["num_mels"], length) for length in (16, 7, 30)]
+        with torch.no_grad():
+            expected = [model.inference(c) for c in inputs]
+        graph = export_vocoder(model, config.audio["num_mels"], example_length=16)
+        self.assertFalse(any(name.endswith("weight_g") for name, _ in model.model_g.named_parameters()))
+        for c, expected in zip(inputs, expected):
+            with torch.no_grad():
+                outputs = graph.inference(c)
+            self.assertEqual(outputs.shape, expected.shape)
+            torch.testing.assert_close(outputs, expected, rtol=1e-4, atol=1e-5)
+
+    def test_melgan(self):
+        self._check_parity(MelganConfig(generator_model_params={"upsample_factors": [8, 8, 2, 2], "num_res_blocks": 1}))
+
+    def test_hifigan(self):
+        self._check_parity(HifiganConfig())
+
+
+class SynthesizerTorchScriptTest(unittest.TestCase):
+    @staticmethod
+    def _save_model(config, model, name):
+        output_path = os.path.join(OUTPUT_PATH, name)
+        os.makedirs(output_path, exist_ok=True)
+        config.save_json(os.path.join(output_path, "config.json"))
+        save_checkpoint(config, model, None, None, 10, 1, output_path)
+        return os.path.join(output_path, "checkpoint_10.pth.tar"), os.path.join(output_path, "config.json")
+
+    @staticmethod
+    def _tts(synthesizer):
+        torch.manual_seed(0)
+        return np.array(synthesizer.tts("Better this test works!!"))
+
+    def test_synthesizer(self):
+        config = GlowTTSConfig(num_chars=32, use_phonemes=False)
+        tts_paths = self._save_model(config, setup_model(config), "glow_tts")
+        config = MelganConfig(generator_model_params={"upsample_factors": [8, 8, 2, 2], "num_res_blocks": 1})
+        vocoder_paths = self._save_model(config, GAN(config), "melgan")
+        kwargs = {"vocoder_checkpoint": vocoder_paths[0], "vocoder_config": vocoder_paths[1]}
+
+        synthesizer = Synthesizer(*tts_paths, **kwargs)
+        graph_synthesizer = Synthesizer(*tts_paths, use_torchscript=True, **kwargs)
+        self.assertIsNotNone(graph_synthesizer.tts_graph)
+        self.assertIsNotNone(graph_synthesizer.vocoder_graph)
+        wav = self._tts(synthesizer)
+        np.testing.assert_allclose(self._tts(graph_synthesizer), wav, atol=1e-4)
+
+        tts_graph_path = os.path.join(OUTPUT_PATH, "synthesizer_glow_tts.ts")
+        vocoder_graph_path = os.path.join(OUTPUT_PATH, "synthesizer_melgan.ts")
+        torch.jit.save(graph_synthesizer.tts_graph, tts_graph_path)
+        torch.jit.save(graph_synthesizer.vocoder_graph, vocoder_graph_path)
+        loaded_synthesizer = Synthesizer(
+            *tts_paths,
+            use_torchscript=True,
+            tts_graph_path=tts_graph_path,
+            vocoder_graph_path=vocoder_graph_path,
+            **kwargs,
+        )
+        np.testing.assert_allclose(self._tts(loaded_synthesizer), wav, atol=1e-4)
@@ -0,0 +1,105 @@
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+import torch
+
+from tests import get_tests_output_path
+from TTS.config import load_config
+from TTS.tts.configs.glow_tts_config import GlowTTSConfig
+from TTS.tts.models import setup_model
+from TTS.utils.io import is_inference_checkpoint, load_inference_state, save_checkpoint, save_inference_checkpoint
+from TTS.utils.synthesizer import Synthesizer
+from TTS.vocoder.configs import MelganConfig
+from TTS.vocoder.models.gan import GAN
+
+OUTPUT_PATH = os.path.join(get_tests_output_path(), "inference_checkpoint_tests")
+
+
+def _save_model(config, model, name):
+    output_path = os.path.join(OUTPUT_PATH, name)
+    os.makedirs(output_path, exist_ok=True)
+    config.save_json(os.path.join(output_path, "config.json"))
+    save_checkpoint(config, model, None, None, 10, 1, output_path)
+    return os.path.join(output_path, "checkpoint_10.pth.tar"), os.path.join(output_path, "config.json")
+
+
+class InferenceCheckpointTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        config = GlowTTSConfig(num_chars=32, use_phonemes=False)
+        cls.tts_paths = _save_model(config, setup_model(config), "glow_tts")
+        config = MelganConfig(generator_model_params={"upsample_factors": [8, 8, 2, 2], "num_res_blocks": 1})
+        cls.vocoder_paths = _save_model(config, GAN(config), "melgan")
+
+    @staticmethod
+    def _tts(synthesizer):
+        torch.manual_seed(0)
+        return np.array(synthesizer.tts("Better this test works!!"))
+
+    def test_synthesizer(self):
+        synthesizer = Synthesizer(
+            *self.tts_paths, vocoder_checkpoint=self.vocoder_paths[0], vocoder_config=self.vocoder_paths[1]
+        )
+        self.assertIsNone(load_inference_state(self.tts_paths[0]))
+        tts_path = os.path.join(OUTPUT_PATH, "glow_tts.pth")
+        vocoder_path = os.path.join(OUTPUT_PATH, "melgan.pth")
+        save_inference_checkpoint(synthesizer.tts_model, tts_path)
+        save_inference_checkpoint(synthesizer.vocoder_model, vocoder_path)
+        state = load_inference_state(vocoder_path)
+        self.assertFalse(any(key.endswith("weight_g") for key in state["model"]))
+        self.assertFalse(any(key.startswith("model_d.") for key in state["model"]))
+        self.assertLess(os.path.getsize(vocoder_path), os.path.getsize(self.vocoder_paths[0]))
+
+        fast_synthesizer = Synthesizer(
+            tts_path, self.tts_paths[1], vocoder_checkpoint=vocoder_path, vocoder_config=self.vocoder_paths[1]
+        )
+        self.assertIsNone(fast_synthesizer.vocoder_model.model_d)
+        np.testing.assert_allclose(self._tts(fast_synthesizer), self._tts(synthesizer), atol=1e-6)
+
+    def test_training_checkpoint(self):
+        self.assertFalse(is_inference_checkpoint(self.tts_paths[0]))
+        self.assertFalse(is_inference_checkpoint(self.tts_paths[1]))
+        # training checkpoints are not loaded twice
+        with mock.patch("torch.load") as load:
+            self.assertIsNone(load_inference_state(self.tts_paths[0]))
+        load.assert_not_called()
+
+    def test_without_mmap(self):
+        synthesizer = Synthesizer(
+            *self.tts_paths, vocoder_checkpoint=self.vocoder_paths[0], vocoder_config=self.vocoder_paths[1]
+        )
+        vocoder_path = os.path.join(OUTPUT_PATH, "melgan_no_mmap.pth")
+        save_inference_checkpoint(synthesizer.vocoder_model, vocoder_path)
+        # torch<2.1 has no memory mapped loading
+        with mock.patch("TTS.utils.io.TORCH_MMAP", False), mock.patch("TTS.model.TORCH_MMAP", False):
+            fast_synthesizer = Synthesizer(
+                *self.tts_paths, vocoder_checkpoint=vocoder_path, vocoder_config=self.vocoder_paths[1]
+            )
+        self.assertIsNone(fast_synthesizer.vocoder_model.model_d)
+        np.testing.assert_allclose(self._tts(fast_synthesizer), self._tts(synthesizer), atol=1e-6)
+
+    def test_fp16(self):
+        synthesizer = Synthesizer(
+            *self.tts_paths, vocoder_checkpoint=self.vocoder_paths[0], vocoder_config=self.vocoder_paths[1]
+        )
+        vocoder_path = os.path.join(OUTPUT_PATH, "melgan_fp16.pth")
+        save_inference_checkpoint(synthesizer.vocoder_model, vocoder_path, fp16=True)
+        self.assertTrue(all(v.dtype == torch.float16 for v in load_inference_state(vocoder_path)["model"].values()))
+        fast_synthesizer = Synthesizer(
+            *self.tts_paths, vocoder_checkpoint=vocoder_path, vocoder_config=self.vocoder_paths[1]
+        )
+        self.assertEqual(next(fast_synthesizer.vocoder_model.parameters()).dtype, torch.float32)
+        np.testing.assert_allclose(self._tts(fast_synthesizer), self._tts(synthesizer), atol=1e-2)
+
+    def test_tacotron_reduction_rate(self):
+        config_path = os.path.join(get_tests_output_path(), "dummy_model_config.json")
+        config = load_config(config_path)
+        model = setup_model(config)
+        model.decoder.set_r(2)
+        checkpoint_path = os.path.join(OUTPUT_PATH, "tacotron.pth")
+        save_inference_checkpoint(model, checkpoint_path, r=model.decoder.r)
+        synthesizer = Synthesizer(checkpoint_path, config_path)
+        self.assertEqual(synthesizer.tts_model.decoder.r, 2)
+        self.assertFalse(synthesizer.tts_model.training)
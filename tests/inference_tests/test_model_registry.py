@@ -0,0 +1,101 @@
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from tests import get_tests_output_path
+from TTS.tts.configs.glow_tts_config import GlowTTSConfig
+from TTS.tts.models import setup_model
+from TTS.utils.io import save_checkpoint
+from TTS.utils.model_registry import ModelRegistry, model_size_in_mb
+from TTS.utils.synthesizer import Synthesizer
+from TTS.vocoder.configs import MelganConfig
+from TTS.vocoder.models.gan import GAN
+
+
+def _save_model(config, model, name):
+    output_path = os.path.join(get_tests_output_path(), "model_registry", name)
+    os.makedirs(output_path, exist_ok=True)
+    config.save_json(os.path.join(output_path, "config.json"))
+    save_checkpoint(config, model, None, None, 10, 1, output_path)
+    return os.path.join(output_path, "checkpoint_10.pth.tar"), os.path.join(output_path, "config.json")
+
+
+class ModelRegistryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        config = GlowTTSConfig(num_chars=32, use_phonemes=False)
+        cls.tts_paths = [_save_model(config, setup_model(config), f"tts_{idx}") for idx in range(3)]
+        config = MelganConfig(generator_model_params={"upsample_factors": [8, 8, 2, 2], "num_res_blocks": 1})
+        cls.vocoder_paths = _save_model(config, GAN(config), "vocoder")
+
+    def _create_registry(self, max_memory_in_mb=4096):
+        registry = ModelRegistry(max_memory_in_mb=max_memory_in_mb)
+        for idx, (model_path, config_path) in enumerate(self.tts_paths):
+            registry.register(f"model_{idx}", model_path, config_path, *self.vocoder_paths)
+        return registry
+
+    def test_shared_vocoder(self):
+        registry = self._create_registry()
+        synthesizer_0 = registry.get("model_0")
+        synthesizer_1 = registry.get("model_1")
+        self.assertIs(registry.get("model_0"), synthesizer_0)
+        self.assertIs(synthesizer_0.vocoder_model, synthesizer_1.vocoder_model)
+        self.assertEqual(len(registry.vocoders), 1)
+        self.assertGreater(len(synthesizer_1.tts("Better this test works!!")), 0)
+        registry.unload("model_0")
+        self.assertEqual(len(registry.vocoders), 1)
+        registry.unload("model_1")
+        self.assertEqual(len(registry.vocoders), 0)
+        self.assertEqual(registry.memory_in_mb, 0)
+
+    def test_lru_eviction(self):
+        registry = self._create_registry()
+        synthesizer = registry.get("model_0")
+        # room for the vocoder and two TTS models
+        tts_size = model_size_in_mb(synthesizer.tts_model)
+        registry.max_memory_in_mb = model_size_in_mb(synthesizer.vocoder_model) + 2.5 * tts_size
+        registry.get("model_1")
+        registry.get("model_0")
+        registry.get("model_2")
+        self.assertEqual(registry.loaded_models, ["model_0", "model_2"])
+        self.assertLessEqual(registry.memory_in_mb, registry.max_memory_in_mb)
+
+    def test_pinned_model(self):
+        registry = self._create_registry(max_memory_in_mb=0)
+        registry.add("model_0", registry.get("model_0"), pin=True)
+        registry.get("model_1")
+        registry.get("model_2")
+        self.assertEqual(registry.loaded_models, ["model_0", "model_2"])
+
+    def test_concurrent_loading(self):
+        registry = self._create_registry()
+        synthesizer_0 = registry.get("model_0")
+        started, release = threading.Event(), threading.Event()
+
+        def slow_synthesizer(*args, **kwargs):
+            started.set()
+            release.wait(30)
+            return Synthesizer(*args, **kwargs)
+
+        with mock.patch("TTS.utils.model_registry.Synthesizer", side_effect=slow_synthesizer) as synthesizer_class:
+            with ThreadPoolExecutor(3) as pool:
+                futures = [pool.submit(registry.get, "model_1") for _ in range(2)]
+                self.assertTrue(started.wait(30))
+                # the loaded model is served while model_1 is loading
+                self.assertIs(pool.submit(registry.get, "model_0").result(timeout=5), synthesizer_0)
+                release.set()
+                synthesizers = [future.result(timeout=30) for future in futures]
+        # concurrent requests of model_1 wait for a single load
+        self.assertEqual(synthesizer_class.call_count, 1)
+        self.assertIs(synthesizers[0], synthesizers[1])
+        self.assertIs(synthesizers[0].vocoder_model, synthesizer_0.vocoder_model)
+        self.assertEqual(registry.loading, {})
+
+    def test_unknown_model(self):
+        registry = self._create_registry()
+        with self.assertRaises(ValueError):
+            registry.get("tts_models/xx/unknown/model")
+        with self.assertRaises(ValueError):
+            registry.get("unknown")
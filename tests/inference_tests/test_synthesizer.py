@@ -1,11 +1,17 @@
 import os
 import unittest
 
+import numpy as np
+
 from tests import get_tests_output_path
 from TTS.config import load_config
+from TTS.tts.configs.glow_tts_config import GlowTTSConfig
 from TTS.tts.models import setup_model
+from TTS.utils.batcher import DynamicBatcher
 from TTS.utils.io import save_checkpoint
 from TTS.utils.synthesizer import Synthesizer
+from TTS.vocoder.configs import MelganConfig
+from TTS.vocoder.models.gan import GAN
 
 
 class SynthesizerTest(unittest.TestCase):
@@ -25,6 +31,80 @@ class SynthesizerTest(unittest.TestCase):
         synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
         synthesizer.tts("Better this test works!!")
 
+    def _create_random_glow_tts_model(self):
+        config = GlowTTSConfig(num_chars=32, use_phonemes=False)
+        model = setup_model(config)
+        output_path = os.path.join(get_tests_output_path(), "batch")
+        os.makedirs(output_path, exist_ok=True)
+        config.save_json(os.path.join(output_path, "config.json"))
+        save_checkpoint(config, model, None, None, 10, 1, output_path)
+        return os.path.join(output_path, "checkpoint_10.pth.tar"), os.path.join(output_path, "config.json")
+
+    def test_tts_batch(self):
+        tts_checkpoint, tts_config = self._create_random_glow_tts_model()
+        synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
+        texts = ["Better this test works!! It has two sentences.", "Short one."]
+        wavs = synthesizer.tts_batch(texts, max_batch_size=2)
+        self.assertEqual(len(wavs), 2)
+        self.assertTrue(all(len(wav) > 0 for wav in wavs))
+
+    def test_tts_batch_fallback(self):
+        self._create_random_model()
+        tts_root_path = get_tests_output_path()
+        tts_checkpoint = os.path.join(tts_root_path, "checkpoint_10.pth.tar")
+        tts_config = os.path.join(tts_root_path, "dummy_model_config.json")
+        synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
+        wavs = synthesizer.tts_batch(["Better this test works!!", "Short one."])
+        self.assertEqual(len(wavs), 2)
+
+    def test_dynamic_batcher(self):
+        tts_checkpoint, tts_config = self._create_random_glow_tts_model()
+        synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
+        batcher = DynamicBatcher(synthesizer, max_batch_size=4, max_wait_time=0.1)
+        futures = [batcher.submit(text) for text in ["Better this test works!!", "Short one.", "Another one."]]
+        wavs = [future.result() for future in futures]
+        batcher.close()
+        self.assertEqual(len(wavs), 3)
+        self.assertTrue(all(len(wav) > 0 for wav in wavs))
+
+    def test_tts_stream(self):
+        tts_checkpoint, tts_config = self._create_random_glow_tts_model()
+        synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
+        chunks = list(synthesizer.tts_stream("Better this test works!! It has two sentences."))
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(all(chunk.dtype == np.int16 for chunk in chunks))
+
+    def _create_random_melgan_model(self):
+        config = MelganConfig(generator_model_params={"upsample_factors": [8, 8, 2, 2], "num_res_blocks": 1})
+        model = GAN(config)
+        output_path = os.path.join(get_tests_output_path(), "melgan")
+        os.makedirs(output_path, exist_ok=True)
+        config.save_json(os.path.join(output_path, "config.json"))
+        save_checkpoint(config, model, None, None, 10, 1, output_path)
+        return os.path.join(output_path, "checkpoint_10.pth.tar"), os.path.join(output_path, "config.json")
+
+    def test_tts_stream_chunked_vocoder(self):
+        tts_checkpoint, tts_config = self._create_random_glow_tts_model()
+        vocoder_checkpoint, vocoder_config = self._create_random_melgan_model()
+        synthesizer = Synthesizer(
+            tts_checkpoint, tts_config, vocoder_checkpoint=vocoder_checkpoint, vocoder_config=vocoder_config
+        )
+        wav = synthesizer.tts("Better this test works!!")
+        synthesizer = Synthesizer(
+            tts_checkpoint,
+            tts_config,
+            vocoder_checkpoint=vocoder_checkpoint,
+            vocoder_config=vocoder_config,
+            vocoder_chunk_size=8,
+        )
+        self.assertIsNotNone(synthesizer.chunked_vocoder)
+        chunked_wav = synthesizer.tts("Better this test works!!")
+        self.assertEqual(len(chunked_wav), len(wav))
+        self.assertTrue(np.allclose(chunked_wav, wav, atol=1e-4))
+        chunks = list(synthesizer.tts_stream("Better this test works!!"))
+        self.assertGreater(len(chunks), 2)
+        self.assertTrue(all(chunk.dtype == np.int16 for chunk in chunks))
+
     def test_split_into_sentences(self):
         """Check demo server sentences split as expected"""
         print("\n > Testing demo server sentence splitting")
@@ -0,0 +1,47 @@
+import subprocess
+import sys
+import unittest
+
+# modules that a grapheme-only model must not import at startup
+HEAVY_MODULES = ["gruut", "pypinyin", "jieba", "MeCab", "inflect"]
+
+SCRIPT = """
+from TTS.tts.configs.glow_tts_config import GlowTTSConfig
+from TTS.tts.utils.text.phonemizers import DEF_LANG_TO_PHONEMIZER
+from TTS.tts.utils.text.tokenizer import TTSTokenizer
+
+tokenizer, _ = TTSTokenizer.init_from_config(GlowTTSConfig(use_phonemes=False, text_cleaner="basic_cleaners"))
+tokenizer.text_to_ids("Hello world")
+assert not DEF_LANG_TO_PHONEMIZER.resolved
+"""
+
+
+def import_times(script: str):
+    """Run `script` with `python -X importtime` and return the cumulative import time of each module in us."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script], capture_output=True, text=True, check=True
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, module = line[len("import time:") :].split("|")
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+class ImportTimeTest(unittest.TestCase):
+    def test_lazy_phonemizers(self):
+        times = import_times(SCRIPT)
+        print(f" > TTS.tts.utils.text.tokenizer: {times['TTS.tts.utils.text.tokenizer'] / 1e6:.2f} sec")
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+        phonemizer_modules = [module for module in times if module.startswith("TTS.tts.utils.text.phonemizers.")]
+        self.assertEqual(phonemizer_modules, ["TTS.tts.utils.text.phonemizers.base"])
+
+    def test_phonemizer_lookup(self):
+        times = import_times(
+            "from TTS.tts.utils.text.phonemizers import DEF_LANG_TO_PHONEMIZER\n"
+            "assert DEF_LANG_TO_PHONEMIZER['ja-jp'] == 'ja_jp_phonemizer'"
+        )
+        self.assertIn("gruut", times)
+        self.assertNotIn("pypinyin", times)
@@ -1,6 +1,7 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
-from TTS.tts.utils.text.phonemizers import ESpeak, Gruut, JA_JP_Phonemizer, ZH_CN_Phonemizer
+from TTS.tts.utils.text.phonemizers import ESpeak, ESpeakLib, Gruut, JA_JP_Phonemizer, ZH_CN_Phonemizer
 
 EXAMPLE_TEXTs = [
     "Recent research at Harvard has shown meditating",
@@ -106,6 +107,40 @@ class TestEspeakNgPhonemizer(unittest.TestCase):
         self.assertTrue(self.phonemizer.is_available())
 
 
+class TestEspeakLibBackend(unittest.TestCase):
+    def test_backend_mismatch(self):
+        # the backend of the loaded library sets the output format, so a different one is rejected
+        with self.assertRaises(ValueError):
+            ESpeakLib(language="en-us", backend="espeak", lib_path="libespeak-ng.so.1")
+
+
+class TestEspeakLibPhonemizer(unittest.TestCase):
+    def setUp(self):
+        self.phonemizer = ESpeakLib(language="en-us", backend="espeak-ng")
+
+        for text, ph in zip(EXAMPLE_TEXTs, EXPECTED_ESPEAKNG_PHONEMES):
+            phonemes = self.phonemizer.phonemize(text)
+            self.assertEqual(phonemes, ph)
+
+    def test_threads(self):
+        texts = EXAMPLE_TEXTs * 4
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            outputs = list(executor.map(self.phonemizer.phonemize, texts))
+        self.assertEqual(outputs, EXPECTED_ESPEAKNG_PHONEMES * 4)
+
+    def test_name(self):
+        self.assertEqual(self.phonemizer.name(), "espeak_lib")
+
+    def test_get_supported_languages(self):
+        self.assertIsInstance(self.phonemizer.supported_languages(), dict)
+
+    def test_get_version(self):
+        self.assertIsInstance(self.phonemizer.version(), str)
+
+    def test_is_available(self):
+        self.assertTrue(self.phonemizer.is_available())
+
+
 class TestGruutPhonemizer(unittest.TestCase):
     def setUp(self):
         self.phonemizer = Gruut(language="en-us", use_espeak_phonemes=True, keep_stress=False)
@@ -1,10 +1,15 @@
+import os
 import unittest
 from dataclasses import dataclass
 
 from coqpit import Coqpit
 
+from tests import get_tests_output_path
+from TTS.tts.utils.text.cache import TextCache
 from TTS.tts.utils.text.characters import Graphemes, IPAPhonemes, _blank, _bos, _eos, _pad, _phonemes, _punctuations
+from TTS.tts.utils.text.cleaners import basic_cleaners
 from TTS.tts.utils.text.phonemizers import ESpeak
+from TTS.tts.utils.text.phonemizers.base import BasePhonemizer
 from TTS.tts.utils.text.tokenizer import TTSTokenizer
 
 
@@ -92,3 +97,76 @@ class TestTTSTokenizer(unittest.TestCase):
         ids = tokenizer_ph.text_to_ids(text)
         test_hat = tokenizer_ph.ids_to_text(ids)
         self.assertEqual(text_ph, test_hat)
+
+
+class UpperCasePhonemizer(BasePhonemizer):
+    """Dummy phonemizer counting the calls to `_phonemize()`."""
+
+    def __init__(self):
+        super().__init__("en", keep_puncs=True)
+        self.num_calls = 0
+
+    @staticmethod
+    def name():
+        return "upper_case"
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    @classmethod
+    def version(cls):
+        return "0.0.0"
+
+    @staticmethod
+    def supported_languages():
+        return {"en": "English"}
+
+    def _phonemize(self, text, separator):
+        self.num_calls += 1
+        return text.upper()
+
+
+class TestTTSTokenizerCache(unittest.TestCase):
+    def test_sentence_cache(self):
+        cache = TextCache(max_sentences=2)
+        tokenizer = TTSTokenizer(use_phonemes=False, text_cleaner=basic_cleaners, characters=Graphemes(), cache=cache)
+        tokenizer_no_cache = TTSTokenizer(use_phonemes=False, text_cleaner=basic_cleaners, characters=Graphemes())
+        texts = ["Hello world!", "hello  world!", "Hello world!", "Another one.", "Third one.", "Hello world!"]
+        for text in texts:
+            self.assertEqual(tokenizer.text_to_ids(text), tokenizer_no_cache.text_to_ids(text))
+        stats = cache.stats()["sentences"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 5)
+        self.assertEqual(stats["size"], 2)
+        self.assertIn((basic_cleaners.__name__, None, None, "Third one."), cache.sentences)
+        tokenizer.print_logs()
+
+    def test_word_cache(self):
+        phonemizer = UpperCasePhonemizer()
+        cache = TextCache(use_word_cache=True)
+        tokenizer = TTSTokenizer(use_phonemes=True, characters=Graphemes(), phonemizer=phonemizer, cache=cache)
+        text = "Hello, hello world! world?"
+        self.assertEqual(tokenizer.ids_to_text(tokenizer.text_to_ids(text)), phonemizer.phonemize(text))
+        phonemizer.num_calls = 0
+        ids = tokenizer.text_to_ids("world, Hello!")
+        self.assertEqual(tokenizer.ids_to_text(ids), "WORLD, HELLO!")
+        self.assertEqual(phonemizer.num_calls, 0)
+        self.assertIn(("upper_case", "en", "world"), cache.words)
+        self.assertEqual(cache.stats()["words"]["hits"], 3)
+
+    def test_save_load(self):
+        cache_path = os.path.join(get_tests_output_path(), "text_cache.json")
+        cache = TextCache(use_word_cache=True, cache_path=cache_path)
+        cache.clear()
+        tokenizer = TTSTokenizer(
+            use_phonemes=True, characters=Graphemes(), phonemizer=UpperCasePhonemizer(), cache=cache
+        )
+        ids = tokenizer.text_to_ids("Hello world.")
+        cache.save()
+        new_cache = TextCache(cache_path=cache_path)
+        self.assertEqual(new_cache.sentences.items(), cache.sentences.items())
+        self.assertEqual(new_cache.words.items(), cache.words.items())
+        tokenizer.cache = new_cache
+        self.assertEqual(tokenizer.text_to_ids("Hello world."), ids)
+        self.assertEqual(new_cache.stats()["sentences"]["hits"], 1)
@@ -145,3 +145,25 @@ def model_input_output_test():
     assert outputs["o_alignment_dur"].shape == (2, 21)
     assert outputs["pitch_avg"].shape == (2, 1, 21)
     assert outputs["pitch_avg_gt"].shape == (2, 1, 21)
+
+
+def batched_inference_test():
+    """Check that the batched inference with padded inputs matches the inference of each input alone"""
+    model = ForwardTTS(ForwardTTSArgs(num_chars=10, use_pitch=True, use_aligner=False))
+    model.eval()
+
+    x_1 = T.randint(0, 10, (1, 7))
+    x_2 = T.randint(0, 10, (1, 12))
+    x = T.zeros(2, 12).long()
+    x[0, :7] = x_1
+    x[1] = x_2
+
+    with T.no_grad():
+        outputs = model.inference(x, aux_input={"x_lengths": T.LongTensor([7, 12])})
+        outputs_1 = model.inference(x_1, aux_input={})
+        outputs_2 = model.inference(x_2, aux_input={})
+
+    y_lengths = outputs["alignments"].sum([1, 2]).long()
+    for idx, ref in enumerate([outputs_1, outputs_2]):
+        assert y_lengths[idx] == ref["model_outputs"].shape[1]
+        assert T.allclose(outputs["model_outputs"][idx, : y_lengths[idx]], ref["model_outputs"][0], atol=1e-4)
@@ -201,6 +201,29 @@ class TestGlowTTS(unittest.TestCase):
         self._test_inference(1)
         self._test_inference(3)
 
+    def test_batch_inference(self):
+        config = GlowTTSConfig(num_chars=32)
+        model = GlowTTS(config).to(device)
+        model.eval()
+        model.inference_noise_scale = 0.0
+        # the coupling output layers are zero at init and would hide the padding frames read by the decoder
+        with torch.no_grad():
+            for flow in model.decoder.flows:
+                if hasattr(flow, "end"):
+                    flow.end.weight.normal_(0, 0.02)
+                    flow.end.bias.normal_(0, 0.02)
+        input_lengths = torch.tensor([6, 20]).to(device)
+        input_dummy = torch.randint(1, 32, (2, 20)).long().to(device)
+        input_dummy[0, 6:] = 0
+        outputs = model.inference(input_dummy, {"x_lengths": input_lengths})["model_outputs"]
+        for idx in range(2):
+            single_outputs = model.inference(
+                input_dummy[idx : idx + 1, : input_lengths[idx]], {"x_lengths": input_lengths[idx : idx + 1]}
+            )["model_outputs"]
+            output_length = single_outputs.shape[1]
+            self.assertTrue(torch.allclose(outputs[idx, :output_length], single_outputs[0], atol=1e-5))
+            self.assertTrue((outputs[idx, output_length:] == 0).all())
+
     def _test_inference_with_d_vector(self, batch_size):
         input_dummy, input_lengths, mel_spec, mel_lengths, speaker_ids = self._create_inputs(batch_size)
         d_vector = torch.rand(batch_size, 256).to(device)
@@ -0,0 +1,48 @@
+import numpy as np
+import torch
+
+from TTS.vocoder.models.hifigan_generator import HifiganGenerator
+from TTS.vocoder.models.melgan_generator import MelganGenerator
+from TTS.vocoder.models.parallel_wavegan_generator import ParallelWaveganGenerator
+from TTS.vocoder.utils.chunked_vocoder import ChunkedVocoder, get_receptive_field_frames
+
+
+def test_chunked_vocoder_windows():
+    vocoder = ChunkedVocoder(None, num_channels=80, hop_length=256, chunk_size=32, pad=8, overlap=2)
+    assert vocoder.get_windows(70) == [(0, 34, 0, 42), (32, 66, 24, 70), (64, 70, 56, 70)]
+
+
+def test_chunked_vocoder_parity():
+    """Chunked output matches the full inference output when the chunks are padded by the receptive field."""
+    torch.manual_seed(0)
+    generators = [
+        MelganGenerator(in_channels=80, proj_kernel=7, base_channels=64, upsample_factors=(8, 8, 2, 2)),
+        HifiganGenerator(80, 1, "1", [[1, 3, 5]] * 3, [3, 7, 11], [16, 16, 4, 4], 64, [8, 8, 2, 2]),
+    ]
+    x = torch.rand(1, 80, 100)
+    for generator in generators:
+        generator.eval()
+        with torch.no_grad():
+            target = generator.inference(x).reshape(-1).numpy()
+        for batch_size in [1, 3]:
+            vocoder = ChunkedVocoder(generator, num_channels=80, hop_length=256, chunk_size=16, batch_size=batch_size)
+            chunks = list(vocoder.stream(x))
+            assert len(chunks) == 7
+            output = np.concatenate(chunks)
+            assert output.shape == target.shape
+            assert np.allclose(output, target, atol=1e-5)
+
+
+def test_chunked_vocoder_noise_generator():
+    generator = ParallelWaveganGenerator(
+        num_res_blocks=6, stacks=2, res_channels=16, gate_channels=32, skip_channels=16
+    )
+    generator.eval()
+    # the residual layers see 29 samples, the upsampling network widens the context to 2 frames
+    assert generator.receptive_field_size == 29
+    assert get_receptive_field_frames(generator, 80, 256) == 2
+    x = torch.rand(80, 50)
+    with torch.no_grad():
+        target = generator.inference(x.unsqueeze(0))
+    output = ChunkedVocoder(generator, num_channels=80, hop_length=256, chunk_size=16).inference(x)
+    assert output.shape == (target.shape[-1],)
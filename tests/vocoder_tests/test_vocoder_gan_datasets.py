@@ -5,6 +5,7 @@ from torch.utils.data import DataLoader
 
 from tests import get_tests_output_path, get_tests_path
 from TTS.utils.audio import AudioProcessor
+from TTS.utils.shared_cache import SharedArrayCache
 from TTS.vocoder.configs import BaseGANVocoderConfig
 from TTS.vocoder.datasets.gan_dataset import GANDataset
 from TTS.vocoder.datasets.preprocess import load_wav_data
@@ -107,3 +108,29 @@ def test_parametrized_gan_dataset():
     for param in params:
         print(param)
         gan_dataset_case(*param)
+
+
+def test_gan_dataset_shared_cache():
+    """Workers fill the shared feature cache and the cached couples match the loaded ones"""
+    ap = AudioProcessor(**C.audio)
+    _, train_items = load_wav_data(test_data_path, 10)
+    seq_len = C.audio["hop_length"] * 10
+    dataset = GANDataset(
+        ap, train_items, seq_len=seq_len, hop_len=ap.hop_length, pad_short=2000, return_pairs=False, use_cache=True
+    )
+    loader = DataLoader(dataset=dataset, batch_size=4, num_workers=2)
+    for _ in loader:
+        pass
+    assert len(dataset.cache) == len(train_items)
+    dataset.use_cache = False
+    for idx in range(len(train_items)):
+        audio, mel = dataset.load_features(idx)
+        cached_audio, cached_mel = dataset.cache.get(idx)
+        assert np.allclose(cached_audio, audio)
+        assert np.allclose(cached_mel, mel)
+
+    # items that do not fit in the budget are not cached
+    dataset = GANDataset(ap, train_items, seq_len=seq_len, hop_len=ap.hop_length, pad_short=2000, use_cache=True)
+    dataset.cache = SharedArrayCache(len(train_items), 10, ndims=(1, 2))
+    dataset.load_item(0)
+    assert len(dataset.cache) == 0
@@ -6,6 +6,7 @@ from librosa.core import load
 
 from tests import get_tests_input_path, get_tests_output_path, get_tests_path
 from TTS.vocoder.layers.pqmf import PQMF
+from TTS.vocoder.models.multiband_melgan_generator import MultibandMelganGenerator
 
 TESTS_PATH = get_tests_path()
 WAV_FILE = os.path.join(get_tests_input_path(), "example_1.wav")
@@ -24,3 +25,28 @@ def test_pqmf():
     print(w2_.min())
     print(w2_.mean())
     sf.write(os.path.join(get_tests_output_path(), "pqmf_output.wav"), w2_.flatten().detach(), sr)
+
+
+def test_pqmf_polyphase():
+    for N, taps in [(4, 62), (4, 63), (3, 30)]:
+        layer = PQMF(N=N, taps=taps)
+        reference = PQMF(N=N, taps=taps, polyphase=False)
+        assert list(layer.state_dict().keys()) == ["H", "G", "updown_filter"]
+        for num_samples in [4000, 4001, 4003]:
+            x = torch.randn(2, 1, num_samples)
+            subbands = reference.analysis(x)
+            assert torch.allclose(layer.analysis(x), subbands, atol=1e-5)
+            assert torch.allclose(layer.synthesis(subbands), reference.synthesis(subbands), atol=1e-5)
+
+
+def test_multiband_melgan_torchscript():
+    model = MultibandMelganGenerator(in_channels=80, base_channels=64, upsample_factors=(8, 4, 2), num_res_blocks=2)
+    model.eval()
+    x = torch.rand(2, 80, 20)
+    with torch.no_grad():
+        target = model.inference(x)
+    output_path = os.path.join(get_tests_output_path(), "multiband_melgan.pt")
+    model.export_torchscript(output_path)
+    scripted = torch.jit.load(output_path)
+    with torch.no_grad():
+        assert torch.allclose(scripted(x), target, atol=1e-5)
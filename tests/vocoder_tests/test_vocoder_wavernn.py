@@ -49,3 +49,61 @@ def test_wavernn():
     assert np.all(output.shape == (2, 1280, 2**4)), output.shape
     output = model.inference(dummy_y, True, 5500, 550)
     assert np.all(output.shape == (256 * (y_size - 1),))
+
+
+def test_fold_and_unfold():
+    target, overlap = 7, 3
+    x = torch.rand(1, 40, 5)
+    folded = Wavernn(WavernnConfig()).fold_with_overlap(x, target, overlap)
+    # reference: copy the folds one by one from the padded input
+    num_folds = folded.shape[0]
+    padded = torch.zeros(1, num_folds * (target + overlap) + overlap, 5)
+    padded[:, : x.shape[1]] = x
+    for i in range(num_folds):
+        start = i * (target + overlap)
+        assert torch.equal(folded[i], padded[0, start : start + target + 2 * overlap])
+
+    y = np.random.rand(num_folds, target + 2 * overlap)
+    unfolded = Wavernn.xfade_and_unfold(y.copy(), target, overlap)
+    silence_len = overlap // 2
+    t = np.linspace(-1, 1, overlap - silence_len, dtype=np.float64)
+    fade_in = np.concatenate([np.zeros(silence_len), np.sqrt(0.5 * (1 + t))])
+    fade_out = np.concatenate([np.sqrt(0.5 * (1 - t)), np.zeros(silence_len)])
+    y[:, :overlap] *= fade_in
+    y[:, -overlap:] *= fade_out
+    expected = np.zeros(num_folds * (target + overlap) + overlap)
+    for i in range(num_folds):
+        start = i * (target + overlap)
+        expected[start : start + target + 2 * overlap] += y[i]
+    np.testing.assert_allclose(unfolded, expected, rtol=0, atol=1e-12)
+
+
+def test_wavernn_inference_fast():
+    config = WavernnConfig()
+    config.audio.hop_length = 256
+    mels = [torch.rand(80, 9), torch.rand(80, 5)]
+    for mode, use_aux_net in [("mold", True), ("gauss", False), (4, True)]:
+        config.model_args = WavernnArgs(
+            rnn_dims=32,
+            fc_dims=32,
+            mode=mode,
+            mulaw=False,
+            use_aux_net=use_aux_net,
+            compute_dims=16,
+            res_out_dims=16,
+            num_res_blocks=2,
+        )
+        model = Wavernn(config)
+        wavs = model.inference_fast(mels, True, 500, 50)
+        assert [wav.shape for wav in wavs] == [(256 * 8,), (256 * 4,)]
+        assert all(np.abs(wav).max() <= 1.0 for wav in wavs)
+        wav = model.inference_fast(mels[0], batched=False)
+        assert wav.shape == (256 * 8,)
+        if mode != "gauss":
+            # `inference()` makes 2 GRU cells which draw random numbers before the sampling
+            torch.manual_seed(1)
+            ref = model.inference(mels[0], True, 500, 50)
+            torch.manual_seed(1)
+            model.get_gru_cell(model.rnn1)
+            model.get_gru_cell(model.rnn2)
+            np.testing.assert_allclose(model.inference_fast(mels[0], True, 500, 50), ref, atol=1e-5)
@@ -57,3 +57,54 @@ class WavegradTrainTest(unittest.TestCase):
                 count, param.shape, param, param_ref
             )
             count += 1
+
+    def test_noise_schedules(self):  # pylint: disable=no-self-use
+        args = WavegradArgs(
+            in_channels=80,
+            out_channels=1,
+            upsample_factors=[5, 5, 3, 2, 2],
+            upsample_dilations=[[1, 2, 1, 2], [1, 2, 1, 2], [1, 2, 4, 8], [1, 2, 4, 8], [1, 2, 4, 8]],
+        )
+        config = WavegradConfig(model_params=args)
+        model = Wavegrad(config)
+        # no schedules by default
+        assert model.select_noise_schedule(10 * 300, 1.0) is None
+        config.inference_noise_schedules = {
+            "6": {"min_val": 1e-6, "max_val": 1e-1, "num_steps": 6, "scale": "log"},
+            "12": {"min_val": 1e-6, "max_val": 1e-1, "num_steps": 12, "scale": "log"},
+            "50": {"min_val": 1e-6, "max_val": 1e-2, "num_steps": 50, "scale": "linear"},
+            "tuned": {"beta": [1e-6, 1e-4, 1e-2]},
+        }
+        model.to(device)
+        model.eval()
+
+        # named schedules match the schedules set by `compute_noise_level()`
+        betas = np.linspace(1e-6, 1e-2, 50)
+        model.compute_noise_level(betas)
+        schedule = model.get_noise_schedule("50")
+        assert schedule["c1"].device == next(model.parameters()).device
+        assert torch.allclose(schedule["c2"].cpu(), model.c2)
+        assert torch.allclose(schedule["sigma"].cpu(), model.sigma)
+        assert model.get_noise_schedule("50") is schedule
+        assert len(model.get_noise_schedule("6")["c1"]) == 6
+        assert len(model.get_noise_schedule("tuned")["c1"]) == 3
+
+        mel_spec = torch.rand(1, 80, 10).to(device)
+        torch.manual_seed(0)
+        y_ref = model.inference(mel_spec)
+        torch.manual_seed(0)
+        y_hat = model.inference(mel_spec, noise_schedule="50")
+        assert torch.allclose(y_hat, y_ref, atol=1e-5)
+
+        # batched inference of different lengths
+        mels = [torch.rand(80, 10).to(device), torch.rand(80, 6).to(device)]
+        ys = model.inference_batch(mels, noise_schedule="6")
+        assert [y.shape for y in ys] == [(1, 10 * 300), (1, 6 * 300)]
+
+        # the schedule is selected by the measured step time
+        assert model.step_time is not None
+        num_samples = 10 * 300
+        assert model.select_noise_schedule(num_samples, 0.0) == "tuned"
+        assert model.select_noise_schedule(num_samples, 1e6) == "50"
+        budget = 12.5 * num_samples * model.step_time
+        assert model.select_noise_schedule(num_samples, budget) == "12"